@@ -6,13 +6,12 @@ Replaces the single image with a dynamic gallery that supports multiple images.
 
 import os
 import re
-from pathlib import Path
 
-# The old single image pattern (supports .jpg, .webp, and .png)
-OLD_IMAGE_PATTERN = r'''<!-- Clinic Image -->
-                    <div class="clinic-main-image mb-6 rounded-xl overflow-hidden">
-                        <img src="https://cfls\.b-cdn\.net/stem-cell-clinics/([^/]+)/primary\.(jpg|webp|png)" alt="[^"]*" class="w-full h-64 object-cover" loading="lazy" onerror="this\.parentElement\.style\.display='none'">
-                    </div>'''
+import html_regions
+import profiling
+
+# The old single image block, matched to pull out the clinic slug
+OLD_IMAGE_RE = re.compile(html_regions.CLINIC_IMAGE_PATTERN)
 
 def get_new_gallery_html(clinic_slug):
     """Generate the new gallery HTML for a clinic"""
@@ -121,27 +120,29 @@ def get_clinic_slug_from_filename(filepath):
 # Pattern for pages without an existing image (insert before "About This Clinic")
 NO_IMAGE_PATTERN = r'''(                    </div>\s+<h2 class="text-2xl font-bold text-slate-900 mb-4">About This Clinic</h2>)'''
 
-def update_clinic_file(filepath):
-    """Update a single clinic profile file with the gallery component"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+def applies_to(page):
+    """Clinic profile pages under locations/ (not index pages)"""
+    return page['rel'].startswith('locations/') and page['path'].name != 'index.html'
 
+def transform(content, page):
+    """Add the gallery component to a single clinic profile page"""
     # Skip if already has gallery
     if 'clinicGallery' in content:
-        return False, "Already has gallery"
+        return content
 
     # Check if this file has the old image pattern
-    match = re.search(OLD_IMAGE_PATTERN, content)
-    if match:
-        clinic_slug = match.group(1)
+    index = html_regions.index_page(content)
+    image_spans = html_regions.regions(index, 'gallery')
+    if image_spans:
+        clinic_slug = OLD_IMAGE_RE.match(html_regions.region_text(index, image_spans[0])).group(1)
         # Replace the old image section with the new gallery
         new_gallery = get_new_gallery_html(clinic_slug)
-        content = re.sub(OLD_IMAGE_PATTERN, new_gallery, content)
+        content = html_regions.splice(content, html_regions.replace_regions(index, 'gallery', new_gallery))
     else:
         # Try to add gallery before "About This Clinic" for pages without images
         no_image_match = re.search(NO_IMAGE_PATTERN, content)
         if no_image_match:
-            clinic_slug = get_clinic_slug_from_filename(filepath)
+            clinic_slug = get_clinic_slug_from_filename(page['path'])
             new_gallery = get_new_gallery_html(clinic_slug)
             # Insert gallery before the "About This Clinic" section
             replacement = f'''                    </div>
@@ -151,51 +152,20 @@ def update_clinic_file(filepath):
                     <h2 class="text-2xl font-bold text-slate-900 mb-4">About This Clinic</h2>'''
             content = re.sub(NO_IMAGE_PATTERN, replacement, content)
         else:
-            return False, "No matching pattern found"
+            # No matching pattern found
+            return content
 
     # Add the gallery script if not already present
     if 'clinic-gallery.js' not in content:
         # Add before </head>
         content = content.replace('</head>', get_script_tag() + '</head>')
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    return True, clinic_slug
+    return content
 
 def main():
     """Main function to update all clinic profile pages"""
-    locations_dir = Path('locations')
-    updated = 0
-    skipped = 0
-    errors = []
-
-    # Find all clinic profile HTML files (not index.html)
-    for html_file in locations_dir.rglob('*.html'):
-        if html_file.name == 'index.html':
-            continue
-
-        try:
-            success, result = update_clinic_file(html_file)
-            if success:
-                print(f"Updated: {html_file} (slug: {result})")
-                updated += 1
-            else:
-                skipped += 1
-        except Exception as e:
-            errors.append((html_file, str(e)))
-            print(f"Error: {html_file} - {e}")
-
-    print(f"\n{'='*50}")
-    print(f"Summary:")
-    print(f"  Updated: {updated} files")
-    print(f"  Skipped: {skipped} files")
-    print(f"  Errors: {len(errors)} files")
-
-    if errors:
-        print(f"\nErrors:")
-        for filepath, error in errors:
-            print(f"  {filepath}: {error}")
+    from html_pipeline import main as pipeline_main
+    pipeline_main(transforms=['add_gallery_to_clinics'], root='.')
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -5,7 +5,13 @@ Replace Call Now buttons with lead capture onboarding forms on all clinic pages.
 
 import os
 import re
-from pathlib import Path
+
+import html_regions
+import includes
+import page_meta
+import profiling
+
+TRANSFORM_DEPS = ['includes', 'page_meta']
 
 # The lead capture form HTML to replace the Call Now button
 LEAD_FORM_HTML = '''<div x-data="{ 
@@ -134,9 +140,6 @@ LEAD_FORM_HTML = '''<div x-data="{
                             </div>
                         </div>'''
 
-# Pattern to find the Call Now button/link
-CALL_NOW_PATTERN = r'<a href="tel:[^"]*"\s*\n?\s*class="[^"]*"\s*>\s*Call Now\s*</a>'
-
 def get_clinic_info_from_html(content):
     """Extract clinic info from the HTML content"""
     # Extract clinic name from title
@@ -165,23 +168,30 @@ def get_clinic_info_from_html(content):
     
     return clinic_name, clinic_phone, city, state
 
-def update_clinic_page(file_path):
-    """Update a single clinic page with the lead form"""
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
+def get_clinic_info(content, page):
+    """(name, phone, city, state) the generator recorded for the page, else scraped from the HTML"""
+    fields = page_meta.fields(page)
+    if not fields or 'name' not in fields:
+        return get_clinic_info_from_html(content)
+    return fields['name'], fields.get('phone', ''), fields.get('city', ''), fields.get('state', '')
+
+def applies_to(page):
+    """Clinic pages under locations/ (not index pages)"""
+    return page['rel'].startswith('locations/') and page['path'].name != 'index.html'
+
+def transform(content, page):
+    """Replace the Call Now button on a single clinic page with the lead form"""
     # Check if already has the form
     if 'Get Free Consultation' in content:
-        print(f"Skipped (already has form): {file_path}")
-        return False
+        return content
     
     # Check if has Call Now button
-    if not re.search(CALL_NOW_PATTERN, content, re.IGNORECASE | re.MULTILINE):
-        print(f"Skipped (no Call Now button): {file_path}")
-        return False
+    index = html_regions.index_page(content)
+    if not html_regions.regions(index, 'lead_form'):
+        return content
     
     # Get clinic info
-    clinic_name, clinic_phone, city, state = get_clinic_info_from_html(content)
+    clinic_name, clinic_phone, city, state = get_clinic_info(content, page)
     
     # Create customized form
     form_html = LEAD_FORM_HTML.replace('{clinic_name}', clinic_name.replace("'", "\\'"))
@@ -190,35 +200,22 @@ def update_clinic_page(file_path):
     form_html = form_html.replace('{state}', state)
     
     # Replace Call Now button with form
-    new_content = re.sub(CALL_NOW_PATTERN, form_html, content, flags=re.IGNORECASE | re.MULTILINE)
+    new_content = html_regions.splice(content, html_regions.replace_regions(index, 'lead_form', form_html))
     
     # Add x-cloak style if not present
     if '[x-cloak]' not in new_content:
-        new_content = new_content.replace('</style>', '        [x-cloak] { display: none !important; }\n    </style>')
-    
-    with open(file_path, 'w') as f:
-        f.write(new_content)
+        new_content = html_regions.splice(new_content, [(pos, pos, '        [x-cloak] { display: none !important; }\n    ')
+                                                        for pos in includes.outside_blocks(new_content, '</style>')])
     
-    print(f"Updated: {file_path}")
-    return True
+    return new_content
 
 def main():
     print("=" * 60)
     print("ADDING LEAD CAPTURE FORMS TO CLINIC PAGES")
     print("=" * 60)
     
-    locations_dir = Path('/home/ubuntu/stem-cells/locations')
-    updated_count = 0
-    
-    # Find all clinic HTML files (not index.html)
-    for html_file in locations_dir.rglob('*.html'):
-        if html_file.name != 'index.html':
-            if update_clinic_page(html_file):
-                updated_count += 1
-    
-    print("\n" + "=" * 60)
-    print(f"COMPLETE: Updated {updated_count} clinic pages with lead forms")
-    print("=" * 60)
+    from html_pipeline import main as pipeline_main
+    pipeline_main(transforms=['add_lead_form'], root='/home/ubuntu/stem-cells')
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -7,7 +7,13 @@ Includes: LocalBusiness, MedicalBusiness, BreadcrumbList, ItemList, FAQPage, Web
 import os
 import re
 import json
-from pathlib import Path
+
+import html_regions
+import location_stats
+import page_meta
+import profiling
+
+TRANSFORM_DEPS = ['location_stats', 'page_meta']
 
 def get_clinic_schema(clinic_name, address, phone, city, state, specialty, price_low, price_high, url):
     """Generate schema for individual clinic pages"""
@@ -294,7 +300,7 @@ def get_state_schema(state, cities, url):
     }
     return schema
 
-def get_locations_index_schema():
+def get_locations_index_schema(state_count, city_count):
     """Generate schema for main locations index page"""
     schema = {
         "@context": "https://schema.org",
@@ -333,7 +339,7 @@ def get_locations_index_schema():
                 "@id": "https://stem-cells-dir.netlify.app/locations/#webpage",
                 "url": "https://stem-cells-dir.netlify.app/locations/",
                 "name": "Stem Cell Clinics by State - All Locations",
-                "description": "Browse stem cell therapy clinics across 30 US states and 50+ cities. Find regenerative medicine providers with pricing and treatment information.",
+                "description": f"Browse stem cell therapy clinics across {state_count} US states and {city_count} cities. Find regenerative medicine providers with pricing and treatment information.",
                 "isPartOf": {
                     "@id": "https://stem-cells-dir.netlify.app/#website"
                 },
@@ -358,7 +364,7 @@ def get_locations_index_schema():
                 "@type": "ItemList",
                 "@id": "https://stem-cells-dir.netlify.app/locations/#statelist",
                 "name": "US States with Stem Cell Clinics",
-                "numberOfItems": 30
+                "numberOfItems": state_count
             }
         ]
     }
@@ -407,7 +413,8 @@ def add_schema_to_html(html_content, schema):
     schema_script = f'<script type="application/ld+json">\n{json.dumps(schema, indent=2)}\n</script>\n</head>'
     
     # Remove existing schema if present
-    html_content = re.sub(r'<script type="application/ld\+json">.*?</script>\s*', '', html_content, flags=re.DOTALL)
+    index = html_regions.index_page(html_content)
+    html_content = html_regions.splice(html_content, html_regions.replace_regions(index, 'jsonld', ''))
     
     # Add new schema before </head>
     html_content = html_content.replace('</head>', schema_script)
@@ -437,200 +444,136 @@ def add_meta_tags(html_content, title, description, url, image_url=None):
     
     return html_content
 
-def process_clinic_pages():
-    """Process all clinic detail pages"""
-    locations_dir = Path('/home/ubuntu/stem-cells/locations')
-    updated = 0
-    
-    for html_file in locations_dir.rglob('*.html'):
-        if html_file.name == 'index.html':
-            continue
-            
-        with open(html_file, 'r') as f:
-            content = f.read()
-        
-        # Skip if already has schema
-        if 'application/ld+json' in content and '@graph' in content:
-            continue
-        
-        info = extract_clinic_info(content, html_file)
-        
-        if not info.get('name'):
-            continue
-        
-        # Build URL
-        rel_path = html_file.relative_to(Path('/home/ubuntu/stem-cells'))
-        url = f"https://stem-cells-dir.netlify.app/{rel_path}"
-        
-        # Generate schema
-        schema = get_clinic_schema(
-            clinic_name=info.get('name', 'Clinic'),
-            address=info.get('address', ''),
-            phone=info.get('phone', ''),
-            city=info.get('city', ''),
-            state=info.get('state', ''),
-            specialty=info.get('specialty', 'Regenerative Medicine'),
-            price_low=info.get('price_low', '3000'),
-            price_high=info.get('price_high', '10000'),
-            url=url
-        )
-        
-        # Add schema to HTML
-        content = add_schema_to_html(content, schema)
-        
-        # Add meta tags
-        title = f"{info.get('name', 'Clinic')} - Stem Cell Therapy in {info.get('city', '')}, {info.get('state', '')}"
-        description = f"Find stem cell therapy pricing and information for {info.get('name', 'this clinic')} in {info.get('city', '')}, {info.get('state', '')}. Treatments range from ${info.get('price_low', '3000')} to ${info.get('price_high', '10000')}."
-        content = add_meta_tags(content, title, description, url)
-        
-        with open(html_file, 'w') as f:
-            f.write(content)
-        
-        updated += 1
-        print(f"Updated: {html_file}")
-    
-    return updated
+SITE_URL = "https://stem-cells-dir.netlify.app"
 
-def process_city_pages():
-    """Process all city index pages"""
-    locations_dir = Path('/home/ubuntu/stem-cells/locations')
-    updated = 0
-    
-    for state_dir in locations_dir.iterdir():
-        if not state_dir.is_dir():
-            continue
-        
-        for city_dir in state_dir.iterdir():
-            if not city_dir.is_dir():
-                continue
-            
-            index_file = city_dir / 'index.html'
-            if not index_file.exists():
-                continue
-            
-            with open(index_file, 'r') as f:
-                content = f.read()
-            
-            # Skip if already has schema
-            if 'application/ld+json' in content and '@graph' in content:
-                continue
-            
-            # Get city and state names
-            state = state_dir.name.replace('-', ' ').title()
-            city = city_dir.name.replace('-', ' ').title()
-            
-            # Count clinics
-            clinics = [f for f in city_dir.glob('*.html') if f.name != 'index.html']
-            clinic_list = [{'name': c.stem.replace('-', ' ').title()} for c in clinics]
-            
-            # Build URL
-            url = f"https://stem-cells-dir.netlify.app/locations/{state_dir.name}/{city_dir.name}/"
-            
-            # Generate schema
-            schema = get_city_schema(city, state, clinic_list, url)
-            
-            # Add schema to HTML
-            content = add_schema_to_html(content, schema)
-            
-            # Add meta tags
-            title = f"Stem Cell Clinics in {city}, {state} - Directory & Pricing"
-            description = f"Find and compare {len(clinic_list)} stem cell therapy clinics in {city}, {state}. Get pricing information and contact details for regenerative medicine providers."
-            content = add_meta_tags(content, title, description, url)
-            
-            with open(index_file, 'w') as f:
-                f.write(content)
-            
-            updated += 1
-            print(f"Updated city: {index_file}")
-    
-    return updated
+def page_type(page):
+    """Classify a page by its position in the site tree"""
+    parts = page['rel'].split('/')
+    if page['rel'] == 'index.html':
+        return 'home'
+    if parts[0] != 'locations':
+        return None
+    if parts[-1] != 'index.html':
+        return 'clinic'
+    return {2: 'locations_index', 3: 'state', 4: 'city'}.get(len(parts))
 
-def process_state_pages():
-    """Process all state index pages"""
-    locations_dir = Path('/home/ubuntu/stem-cells/locations')
-    updated = 0
-    
-    for state_dir in locations_dir.iterdir():
-        if not state_dir.is_dir():
-            continue
-        
-        index_file = state_dir / 'index.html'
-        if not index_file.exists():
-            continue
-        
-        with open(index_file, 'r') as f:
-            content = f.read()
-        
-        # Skip if already has schema
-        if 'application/ld+json' in content and '@graph' in content:
-            continue
-        
-        # Get state name
-        state = state_dir.name.replace('-', ' ').title()
-        
-        # Get cities
-        cities = [d.name.replace('-', ' ').title() for d in state_dir.iterdir() if d.is_dir()]
-        
-        # Build URL
-        url = f"https://stem-cells-dir.netlify.app/locations/{state_dir.name}/"
-        
-        # Generate schema
-        schema = get_state_schema(state, cities, url)
-        
-        # Add schema to HTML
-        content = add_schema_to_html(content, schema)
-        
-        # Add meta tags
-        title = f"Stem Cell Clinics in {state} - Directory by City"
-        description = f"Browse stem cell therapy clinics across {state}. Find providers in {len(cities)} cities with pricing and treatment information."
-        content = add_meta_tags(content, title, description, url)
-        
-        with open(index_file, 'w') as f:
-            f.write(content)
-        
-        updated += 1
-        print(f"Updated state: {index_file}")
-    
-    return updated
+def has_schema(content):
+    return 'application/ld+json' in content and '@graph' in content
 
-def process_locations_index():
-    """Process main locations index page"""
-    index_file = Path('/home/ubuntu/stem-cells/locations/index.html')
+def transform_clinic_page(content, page):
+    """Add schema and meta tags to a clinic detail page"""
+    # Skip if already has schema
+    if has_schema(content):
+        return content
+    
+    # The fields the generator recorded for the page, scraped only for pages it did not record
+    info = page_meta.fields(page) or extract_clinic_info(content, page['path'])
     
-    if not index_file.exists():
-        return 0
+    if not info.get('name'):
+        return content
     
-    with open(index_file, 'r') as f:
-        content = f.read()
+    # Build URL
+    url = f"{SITE_URL}/{page['rel']}"
     
     # Generate schema
-    schema = get_locations_index_schema()
+    schema = get_clinic_schema(
+        clinic_name=info.get('name', 'Clinic'),
+        address=info.get('address', ''),
+        phone=info.get('phone', ''),
+        city=info.get('city', ''),
+        state=info.get('state', ''),
+        specialty=info.get('specialty', 'Regenerative Medicine'),
+        price_low=info.get('price_low', '3000'),
+        price_high=info.get('price_high', '10000'),
+        url=url
+    )
     
     # Add schema to HTML
     content = add_schema_to_html(content, schema)
     
     # Add meta tags
-    url = "https://stem-cells-dir.netlify.app/locations/"
-    title = "Stem Cell Clinics by State - All Locations | OrthoFinder"
-    description = "Browse stem cell therapy clinics across 30 US states and 50+ cities. Find regenerative medicine providers with pricing and treatment information."
-    content = add_meta_tags(content, title, description, url)
+    title = f"{info.get('name', 'Clinic')} - Stem Cell Therapy in {info.get('city', '')}, {info.get('state', '')}"
+    description = f"Find stem cell therapy pricing and information for {info.get('name', 'this clinic')} in {info.get('city', '')}, {info.get('state', '')}. Treatments range from ${info.get('price_low', '3000')} to ${info.get('price_high', '10000')}."
+    return add_meta_tags(content, title, description, url)
+
+def transform_city_page(content, page):
+    """Add schema and meta tags to a city index page"""
+    # Skip if already has schema
+    if has_schema(content):
+        return content
+    
+    city_dir = page['path'].parent
+    state_dir = city_dir.parent
+    
+    # Get city and state names
+    state = state_dir.name.replace('-', ' ').title()
+    city = city_dir.name.replace('-', ' ').title()
+    
+    # Count clinics
+    clinics = [f for f in city_dir.glob('*.html') if f.name != 'index.html']
+    clinic_list = [{'name': c.stem.replace('-', ' ').title()} for c in clinics]
+    
+    # Build URL
+    url = f"{SITE_URL}/locations/{state_dir.name}/{city_dir.name}/"
+    
+    # Generate schema
+    schema = get_city_schema(city, state, clinic_list, url)
     
-    with open(index_file, 'w') as f:
-        f.write(content)
+    # Add schema to HTML
+    content = add_schema_to_html(content, schema)
     
-    print(f"Updated locations index: {index_file}")
-    return 1
+    # Add meta tags
+    title = f"Stem Cell Clinics in {city}, {state} - Directory & Pricing"
+    description = f"Find and compare {len(clinic_list)} stem cell therapy clinics in {city}, {state}. Get pricing information and contact details for regenerative medicine providers."
+    return add_meta_tags(content, title, description, url)
 
-def process_home_page():
-    """Process main home page"""
-    index_file = Path('/home/ubuntu/stem-cells/index.html')
+def transform_state_page(content, page):
+    """Add schema and meta tags to a state index page"""
+    # Skip if already has schema
+    if has_schema(content):
+        return content
     
-    if not index_file.exists():
-        return 0
+    state_dir = page['path'].parent
     
-    with open(index_file, 'r') as f:
-        content = f.read()
+    # Get state name
+    state = state_dir.name.replace('-', ' ').title()
     
+    # Get cities
+    cities = [d.name.replace('-', ' ').title() for d in state_dir.iterdir() if d.is_dir()]
+    
+    # Build URL
+    url = f"{SITE_URL}/locations/{state_dir.name}/"
+    
+    # Generate schema
+    schema = get_state_schema(state, cities, url)
+    
+    # Add schema to HTML
+    content = add_schema_to_html(content, schema)
+    
+    # Add meta tags
+    title = f"Stem Cell Clinics in {state} - Directory by City"
+    description = f"Browse stem cell therapy clinics across {state}. Find providers in {len(cities)} cities with pricing and treatment information."
+    return add_meta_tags(content, title, description, url)
+
+def transform_locations_index(content, page):
+    """Add schema and meta tags to the main locations index page"""
+    # State and city counts of the page's listing, from the build's location aggregates
+    listed = location_stats.load_stats(page['root'])['scopes']['medical_centers']
+    
+    # Generate schema
+    schema = get_locations_index_schema(listed['state_count'], listed['city_count'])
+    
+    # Add schema to HTML
+    content = add_schema_to_html(content, schema)
+    
+    # Add meta tags
+    url = f"{SITE_URL}/locations/"
+    title = "Stem Cell Clinics by State - All Locations | OrthoFinder"
+    description = f"Browse stem cell therapy clinics across {listed['state_count']} US states and {listed['city_count']} cities. Find regenerative medicine providers with pricing and treatment information."
+    return add_meta_tags(content, title, description, url)
+
+def transform_home_page(content, page):
+    """Add schema and meta tags to the main home page"""
     # Home page schema
     schema = {
         "@context": "https://schema.org",
@@ -742,46 +685,34 @@ def process_home_page():
     content = add_schema_to_html(content, schema)
     
     # Add meta tags
-    url = "https://stem-cells-dir.netlify.app/"
+    url = f"{SITE_URL}/"
     title = "OrthoFinder - Find Stem Cell Therapy Clinics & Pricing Near You"
     description = "Compare stem cell therapy costs and find verified clinics near you. Browse 100+ providers across 30 states with transparent pricing from $3,000 to $25,000."
-    content = add_meta_tags(content, title, description, url)
-    
-    with open(index_file, 'w') as f:
-        f.write(content)
-    
-    print(f"Updated home page: {index_file}")
-    return 1
+    return add_meta_tags(content, title, description, url)
+
+PAGE_TRANSFORMS = {
+    'home': transform_home_page,
+    'locations_index': transform_locations_index,
+    'state': transform_state_page,
+    'city': transform_city_page,
+    'clinic': transform_clinic_page,
+}
+
+def applies_to(page):
+    """Home page, locations index and every state, city and clinic page"""
+    return page_type(page) in PAGE_TRANSFORMS
+
+def transform(content, page):
+    """Add schema.org structured data and meta tags to one page"""
+    return PAGE_TRANSFORMS[page_type(page)](content, page)
 
 def main():
     print("=" * 60)
     print("ADDING SCHEMA.ORG STRUCTURED DATA TO ALL PAGES")
     print("=" * 60)
     
-    # Process home page
-    home_count = process_home_page()
-    print(f"\nHome page updated: {home_count}")
-    
-    # Process locations index
-    locations_count = process_locations_index()
-    print(f"Locations index updated: {locations_count}")
-    
-    # Process state pages
-    state_count = process_state_pages()
-    print(f"State pages updated: {state_count}")
-    
-    # Process city pages
-    city_count = process_city_pages()
-    print(f"City pages updated: {city_count}")
-    
-    # Process clinic pages
-    clinic_count = process_clinic_pages()
-    print(f"Clinic pages updated: {clinic_count}")
-    
-    total = home_count + locations_count + state_count + city_count + clinic_count
-    print("\n" + "=" * 60)
-    print(f"COMPLETE: Added schema markup to {total} pages")
-    print("=" * 60)
+    from html_pipeline import main as pipeline_main
+    pipeline_main(transforms=['add_schema_markup'], root='/home/ubuntu/stem-cells')
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Airtable records API, for testing airtable_sync.py.
+Serves tables seeded from a directory of tbl*.json snapshots, keeps them in
+memory and tracks each record's last modified time so modified-since
+queries work. Edits made through the API are not written back to disk.
+
+Usage:
+    python3 airtable_stub.py --port 8789 --data api/airtable --max-page-size 5
+    python3 airtable_sync.py --api-url http://127.0.0.1:8789/v0 --base-id appLocal --token test
+
+Endpoints (any base ID is accepted):
+    GET    /v0/<base>/<table>?pageSize=&offset=&fields[]=&filterByFormula=
+    POST   /v0/<base>/<table>               {"records": [{"fields": {...}}]}
+    PATCH  /v0/<base>/<table>               {"records": [{"id", "fields": {...}}]}
+    DELETE /v0/<base>/<table>?records[]=<id>
+
+The only formula understood is IS_AFTER(LAST_MODIFIED_TIME(), '<ISO time>').
+"""
+
+import argparse
+import json
+import re
+import secrets
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+API_PREFIX = '/v0'
+MAX_PAGE_SIZE = 100
+MODIFIED_AFTER = re.compile(r"^IS_AFTER\(LAST_MODIFIED_TIME\(\),\s*'([^']+)'\)$")
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def load_tables(data_dir):
+    """{table_id: [record]} from the snapshots, each record's modified time set to its created time"""
+    tables = {}
+    for path in sorted(Path(data_dir).glob('tbl*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f).get('records', [])
+        tables[path.stem] = [dict(record, modified=record.get('createdTime') or now()) for record in records]
+    return tables
+
+
+def public(record, fields=None):
+    """A record as the API returns it, optionally limited to some fields"""
+    data = {key: record[key] for key in ['id', 'createdTime', 'fields']}
+    if fields:
+        data['fields'] = {name: value for name, value in record['fields'].items() if name in fields}
+    return data
+
+
+def make_handler(tables, max_page_size=MAX_PAGE_SIZE):
+    """Request handler bound to in-memory tables"""
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_error_json(self, status, error_type, message):
+            self.send_json(status, {'error': {'type': error_type, 'message': message}})
+
+        def read_records(self):
+            return json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0)))).get('records', [])
+
+        def route(self):
+            """(table ID, query) for /v0/<base>/<table>, or (None, None) after sending an error"""
+            url = urllib.parse.urlparse(self.path)
+            parts = urllib.parse.unquote(url.path)[len(API_PREFIX):].split('/')
+            if not self.headers.get('Authorization', '').startswith('Bearer '):
+                self.send_error_json(401, 'AUTHENTICATION_REQUIRED', 'Authentication required')
+                return None, None
+            if not url.path.startswith(API_PREFIX + '/') or len(parts) != 3 or parts[2] not in tables:
+                self.send_error_json(404, 'NOT_FOUND', 'Could not find what you are looking for')
+                return None, None
+            return parts[2], urllib.parse.parse_qs(url.query)
+
+        def do_GET(self):
+            table_id, query = self.route()
+            if table_id is None:
+                return
+            page_size = min(int(query.get('pageSize', [MAX_PAGE_SIZE])[0]), max_page_size)
+            start = int(query.get('offset', ['0'])[0].removeprefix('itr'))
+            formula = query.get('filterByFormula', [''])[0]
+
+            with lock:
+                records = list(tables[table_id])
+            if formula:
+                match = MODIFIED_AFTER.match(formula)
+                if not match:
+                    return self.send_error_json(422, 'INVALID_FILTER_BY_FORMULA', f'Unsupported formula: {formula}')
+                after = parse_time(match.group(1))
+                records = [record for record in records if parse_time(record['modified']) > after]
+
+            page = {'records': [public(record, query.get('fields[]')) for record in records[start:start + page_size]]}
+            if start + page_size < len(records):
+                page['offset'] = f"itr{start + page_size}"
+            self.send_json(200, page)
+
+        def do_POST(self):
+            table_id, _ = self.route()
+            if table_id is None:
+                return
+            created = []
+            with lock:
+                for record in self.read_records():
+                    timestamp = now()
+                    created.append({
+                        'id': 'rec' + secrets.token_hex(7),
+                        'createdTime': timestamp,
+                        'fields': record.get('fields', {}),
+                        'modified': timestamp,
+                    })
+                tables[table_id].extend(created)
+            self.send_json(200, {'records': [public(record) for record in created]})
+
+        def do_PATCH(self):
+            table_id, _ = self.route()
+            if table_id is None:
+                return
+            updated = []
+            with lock:
+                by_id = {record['id']: record for record in tables[table_id]}
+                for change in self.read_records():
+                    record = by_id.get(change.get('id'))
+                    if record is None:
+                        return self.send_error_json(404, 'ROW_DOES_NOT_EXIST', f"Record {change.get('id')} does not exist")
+                    record['fields'] = dict(record['fields'], **change.get('fields', {}))
+                    record['modified'] = now()
+                    updated.append(record)
+            self.send_json(200, {'records': [public(record) for record in updated]})
+
+        def do_DELETE(self):
+            table_id, query = self.route()
+            if table_id is None:
+                return
+            ids = set(query.get('records[]', []))
+            with lock:
+                tables[table_id] = [record for record in tables[table_id] if record['id'] not in ids]
+            self.send_json(200, {'records': [{'id': record_id, 'deleted': True} for record_id in sorted(ids)]})
+
+        def log_message(self, format, *args):
+            print(f"  {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Airtable records API")
+    parser.add_argument('--port', type=int, default=8789)
+    parser.add_argument('--data', default='api/airtable', help="directory of tbl*.json snapshots to serve")
+    parser.add_argument('--max-page-size', type=int, default=MAX_PAGE_SIZE,
+                        help="cap on records per page, to exercise pagination")
+    args = parser.parse_args(argv)
+
+    tables = load_tables(args.data)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(tables, args.max_page_size))
+    print(f"Airtable API stub on http://127.0.0.1:{args.port}{API_PREFIX} ({len(tables)} tables from {args.data})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of the api/airtable/tbl*.json snapshots.
+All tables are synced concurrently. After the first full pull each sync
+only asks for records modified since the previous one, plus a cheap pass
+listing the table's record IDs (primary field only) to find deletions.
+Upserts and deletes are merged into the snapshots in place and the changed
+record IDs are written to .build-cache/airtable-changes.json so later
+steps (e.g. download_airtable_assets.py --changed) touch only those.
+
+Usage:
+    AIRTABLE_TOKEN=... AIRTABLE_BASE_ID=... python3 airtable_sync.py
+    python3 airtable_sync.py --full                     # re-pull every table
+    python3 airtable_sync.py --api-url http://127.0.0.1:8789/v0 --base-id appLocal --token test
+
+Use airtable_stub.py as a local stand-in for the API.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import output_writer
+import profiling
+from build_graph import CACHE_DIR
+
+DEFAULT_API_URL = 'https://api.airtable.com/v0'
+SNAPSHOT_DIR = 'api/airtable'
+STATE_FILE = 'airtable-sync.json'
+CHANGES_FILE = 'airtable-changes.json'
+PAGE_SIZE = 100
+# Modified-since windows start this much before the previous sync started,
+# so edits racing the previous sync and small clock skew are not missed
+SYNC_OVERLAP = timedelta(minutes=5)
+MAX_RETRIES = 5
+
+# Table ID -> (name, primary field). The ID pass asks for the primary field only.
+TABLES = {
+    'tbl7QDqnaMQR6uWk9': ('Patient Journey', 'Stage'),
+    'tblJXEY3VIRCLWD0s': ('Content Plan', 'Title'),
+    'tblPWikHvOPh26JdJ': ('FAQs', 'Question'),
+    'tblZTuJ5gYzxrWann': ('Procedures', 'Procedure Name'),
+    'tblbI7Pbny0Hs9F8x': ('Clinical Studies', 'Study Name'),
+    'tblyxWUg8pDotWkus': ('Image Assets', 'Image Name'),
+}
+
+
+def api_get(url, token):
+    """GET a JSON response, retrying rate limits (429) and server errors"""
+    request = urllib.request.Request(url)
+    request.add_header('Authorization', f'Bearer {token}')
+    for attempt in range(MAX_RETRIES):
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if (e.code != 429 and e.code < 500) or attempt == MAX_RETRIES - 1:
+                raise
+            # Airtable asks clients to back off for 30s after a 429
+            delay = float(e.headers.get('Retry-After') or (30 if e.code == 429 else 2 ** attempt))
+            print(f"  HTTP {e.code}, retrying in {delay:g}s")
+            time.sleep(delay)
+
+
+def list_records(api_url, base_id, table_id, token, formula=None, fields=None):
+    """All records of a table (optionally filtered), following the offset pagination"""
+    records = []
+    requests = 0
+    offset = None
+    while True:
+        params = [('pageSize', PAGE_SIZE)]
+        if formula:
+            params.append(('filterByFormula', formula))
+        for field in fields or []:
+            params.append(('fields[]', field))
+        if offset:
+            params.append(('offset', offset))
+        page = api_get(f"{api_url}/{base_id}/{urllib.parse.quote(table_id)}?{urllib.parse.urlencode(params)}", token)
+        requests += 1
+        records.extend(page.get('records', []))
+        offset = page.get('offset')
+        if not offset:
+            return records, requests
+
+
+def modified_since_formula(since):
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), '{since}')"
+
+
+def merge_records(existing, upserts, live_ids=None):
+    """Merge upserted records into a snapshot's record list, keeping its order.
+    Records whose ID is not in live_ids are dropped. Returns (records, changes)."""
+    changes = {'added': [], 'updated': [], 'deleted': []}
+    records = list(existing)
+    positions = {record['id']: i for i, record in enumerate(records)}
+    for record in upserts:
+        i = positions.get(record['id'])
+        if i is None:
+            positions[record['id']] = len(records)
+            records.append(record)
+            changes['added'].append(record['id'])
+        elif records[i] != record:
+            records[i] = record
+            changes['updated'].append(record['id'])
+
+    if live_ids is not None:
+        changes['deleted'] = [record['id'] for record in records if record['id'] not in live_ids]
+        records = [record for record in records if record['id'] in live_ids]
+    return records, changes
+
+
+def snapshot_path(root, table_id):
+    return Path(root) / SNAPSHOT_DIR / f"{table_id}.json"
+
+
+def load_snapshot(path):
+    if not path.exists():
+        return {'records': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_snapshot(path, snapshot, stats=None):
+    """Write a snapshot in the compact form of the original Airtable dumps"""
+    return output_writer.write_if_changed(path, json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')), stats)
+
+
+def sync_table(root, api_url, base_id, token, table_id, since):
+    """Fetch one table's changes and merge them into its snapshot.
+    Returns (snapshot, change report); the caller writes the snapshot."""
+    start = time.perf_counter()
+    name, primary_field = TABLES.get(table_id, (table_id, None))
+    path = snapshot_path(root, table_id)
+    snapshot = load_snapshot(path)
+
+    if since is None:
+        # Full pull: the result is the whole table
+        upserts, requests = list_records(api_url, base_id, table_id, token)
+        live_ids = {record['id'] for record in upserts}
+    else:
+        upserts, requests = list_records(api_url, base_id, table_id, token, formula=modified_since_formula(since))
+        listed, id_requests = list_records(api_url, base_id, table_id, token,
+                                           fields=[primary_field] if primary_field else None)
+        requests += id_requests
+        # A record created between the two passes is live even if the ID pass missed it
+        live_ids = {record['id'] for record in listed} | {record['id'] for record in upserts}
+
+    records, changes = merge_records(snapshot.get('records', []), upserts, live_ids)
+    snapshot['records'] = records
+
+    changes.update({
+        'name': name,
+        'mode': 'full' if since is None else 'incremental',
+        'since': since,
+        'fetched': len(upserts),
+        'requests': requests,
+        'records': len(records),
+        'seconds': round(time.perf_counter() - start, 3),
+    })
+    profiling.record_page(table_id, changes['seconds'], 'sync')
+    return snapshot, changes
+
+
+def cache_path(root, name):
+    return Path(root) / CACHE_DIR / name
+
+
+def load_state(root):
+    path = cache_path(root, STATE_FILE)
+    if not path.exists():
+        return {'tables': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    output_writer.write_if_changed(path, json.dumps(data, indent=2, sort_keys=True))
+
+
+def snapshot_tables(root):
+    """Table IDs to sync: the known tables plus any other snapshot on disk"""
+    on_disk = sorted(path.stem for path in (Path(root) / SNAPSHOT_DIR).glob('tbl*.json'))
+    return list(TABLES) + [table_id for table_id in on_disk if table_id not in TABLES]
+
+
+def load_changes(root):
+    """Change report of the last sync ({} if there is none)"""
+    path = cache_path(root, CHANGES_FILE)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def changed_ids(root, table_id):
+    """(upserted, deleted) record IDs of one table in the last sync's report"""
+    table = load_changes(root).get('tables', {}).get(table_id, {})
+    return set(table.get('added', []) + table.get('updated', [])), set(table.get('deleted', []))
+
+
+def run_sync(root, api_url, base_id, token, tables=None, full=False, jobs=6):
+    """Sync the snapshots under root. Returns the change report."""
+    start = time.perf_counter()
+    started = datetime.now(timezone.utc)
+    state = load_state(root)
+    tables = tables or snapshot_tables(root)
+    write_stats = output_writer.new_write_stats()
+
+    def since(table_id):
+        last = state['tables'].get(table_id, {}).get('last_sync')
+        if full or not last or not snapshot_path(root, table_id).exists():
+            return None
+        window_start = datetime.fromisoformat(last) - SYNC_OVERLAP
+        return window_start.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+    report = {'started': started.isoformat(timespec='seconds'), 'tables': {}, 'errors': {}}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            table_id: executor.submit(sync_table, root, api_url, base_id, token, table_id, since(table_id))
+            for table_id in tables
+        }
+        for table_id, future in futures.items():
+            try:
+                snapshot, changes = future.result()
+            except Exception as e:
+                report['errors'][table_id] = f"{type(e).__name__}: {e}"
+                continue
+            # A table's sync time only advances once its snapshot is written
+            write_snapshot(snapshot_path(root, table_id), snapshot, write_stats)
+            report['tables'][table_id] = changes
+            state['tables'][table_id] = {'last_sync': started.isoformat()}
+
+    save_json(cache_path(root, STATE_FILE), state)
+    save_json(cache_path(root, CHANGES_FILE), report)
+    report['writes'] = write_stats
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def print_report(report):
+    print(f"\n{'Table':<20}{'Mode':<13}{'Fetched':>8}{'Added':>7}{'Updated':>9}{'Deleted':>9}{'Records':>9}{'Requests':>10}")
+    for table_id, table in report['tables'].items():
+        print(f"{table['name'][:19]:<20}{table['mode']:<13}{table['fetched']:>8}{len(table['added']):>7}"
+              f"{len(table['updated']):>9}{len(table['deleted']):>9}{table['records']:>9}{table['requests']:>10}")
+        for key in ['added', 'updated', 'deleted']:
+            if table[key]:
+                print(f"  {key.title()}: {', '.join(table[key])}")
+    for table_id, error in report['errors'].items():
+        print(f"  Error: {table_id} - {error}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally sync the Airtable snapshots in api/airtable")
+    parser.add_argument('--root', default='.', help="site root holding api/airtable")
+    parser.add_argument('--api-url', default=os.environ.get('AIRTABLE_API_URL', DEFAULT_API_URL))
+    parser.add_argument('--base-id', default=os.environ.get('AIRTABLE_BASE_ID'))
+    parser.add_argument('--token', default=os.environ.get('AIRTABLE_TOKEN'))
+    parser.add_argument('--table', action='append', help="sync only this table ID (repeatable)")
+    parser.add_argument('--full', action='store_true', help="re-pull whole tables instead of modified records")
+    parser.add_argument('--jobs', type=int, default=6, help="tables synced concurrently")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not (args.base_id and args.token):
+        print("Error: set AIRTABLE_BASE_ID and AIRTABLE_TOKEN (or pass --base-id and --token)")
+        sys.exit(1)
+
+    report = run_sync(args.root, args.api_url.rstrip('/'), args.base_id, args.token,
+                      tables=args.table, full=args.full, jobs=args.jobs)
+    print_report(report)
+
+    changed = sum(len(t['added']) + len(t['updated']) + len(t['deleted']) for t in report['tables'].values())
+    print(f"\n{'='*50}")
+    print(f"Synced {len(report['tables'])} tables, {changed} records changed, {len(report['errors'])} errors")
+    print(f"Snapshots - {output_writer.format_write_stats(report['writes'])}")
+    print(f"Changed record IDs written to {cache_path(args.root, CHANGES_FILE)}")
+    print(f"Finished in {report['seconds']}s")
+    if report['errors']:
+        sys.exit(1)
+    return report
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Benchmark the page generators and rewriters on synthetic provider datasets.
+For each dataset size a scratch site is created with a copy of the scripts
+and a synthetic api/clinics.json; every stage then runs in its own process
+so wall time, peak RSS, pages/sec and bytes written are measured per stage.
+
+Usage:
+    python3 benchmark.py                          # 45, 5k, 50k and 250k providers
+    python3 benchmark.py --sizes 45,5000          # quick run
+    python3 benchmark.py --compare OLD.json       # print changes against an earlier run
+
+Results go to .build-cache/benchmarks/<commit>.json unless --output is given.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from build_graph import CACHE_DIR
+import output_writer
+from slugs import slugify
+
+BASE_DIR = Path(__file__).resolve().parent
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [45, 5000, 50000, 250000]
+
+# Stage name -> (runner, modules). Builds run the generators with --force,
+# stream stages run a generator's memory-bounded --stream mode in a fresh
+# workspace (so its pages are really written) and pipeline stages run the
+# rewriters over every page the builds produced; the validate stage checks
+# every provider in the store.
+STAGES = {
+    'validate_providers': ('validate', ['validate_providers']),
+    'regenerate_locations': ('build', ['regenerate_locations']),
+    'regenerate_locations_stream': ('stream', ['regenerate_locations']),
+    'generate_provider_pages': ('build', ['generate_provider_pages']),
+    'add_schema_markup': ('pipeline', ['add_schema_markup']),
+    'nav_footer': ('pipeline', ['update_nav', 'update_footers']),
+}
+
+STATES = [
+    'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut', 'Delaware',
+    'Florida', 'Georgia', 'Hawaii', 'Idaho', 'Illinois', 'Indiana', 'Iowa', 'Kansas', 'Kentucky',
+    'Louisiana', 'Maine', 'Maryland', 'Massachusetts', 'Michigan', 'Minnesota', 'Mississippi',
+    'Missouri', 'Montana', 'Nebraska', 'Nevada', 'New Hampshire', 'New Jersey', 'New Mexico',
+    'New York', 'North Carolina', 'North Dakota', 'Ohio', 'Oklahoma', 'Oregon', 'Pennsylvania',
+    'Rhode Island', 'South Carolina', 'South Dakota', 'Tennessee', 'Texas', 'Utah', 'Vermont',
+    'Virginia', 'Washington', 'West Virginia', 'Wisconsin', 'Wyoming',
+]
+
+CITY_WORDS = ['Spring', 'River', 'Lake', 'Oak', 'Cedar', 'Maple', 'Pine', 'Fair', 'Green', 'Clear']
+CITY_SUFFIXES = ['field', 'ville', 'ton', 'wood', 'dale', ' Falls', ' Park', ' Heights']
+NAME_SUFFIXES = ['Sleep Center', 'Sleep Surgery Associates', 'ENT & Sleep Institute', 'Airway Clinic']
+
+
+def load_seed_data():
+    with open(BASE_DIR / 'api' / 'clinics.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def synthesize_clinics(count, seed_data, seed=0):
+    """A clinics.json document with count providers.
+
+    The real providers come first, unchanged, so the smallest size is the
+    real dataset. The rest are copies of real records with new names,
+    locations and contact details; cities grow with the dataset so state and
+    city pages scale the way a real directory would (about 8 providers per
+    city).
+    """
+    rng = random.Random(seed)
+    real = [('medical_centers', record) for record in seed_data['medical_centers']]
+    real += [('independent_clinics', record) for record in seed_data['independent_clinics']]
+
+    data = {'meta': dict(seed_data.get('meta', {})), 'medical_centers': [], 'independent_clinics': []}
+    for key, record in real[:count]:
+        data[key].append(record)
+
+    city_count = max(len(STATES), (count - len(real)) // 8)
+    cities = []
+    for i in range(city_count):
+        name = f"{rng.choice(CITY_WORDS)}{rng.choice(CITY_SUFFIXES)}"
+        cities.append((STATES[i % len(STATES)], f"{name} {i // len(STATES) + 1}" if i >= len(STATES) else name))
+
+    for i in range(len(real), count):
+        key, template = real[i % len(real)]
+        state, city = rng.choice(cities)
+        name = f"{city} {rng.choice(NAME_SUFFIXES)} {i:06d}"
+        record = dict(template)
+        record.update({
+            'id': f"synthetic-{i:06d}",
+            'name': name,
+            'slug': slugify(name),
+            'city': city,
+            'state': state,
+            'address': f"{rng.randint(1, 9999)} Main Street, {city}, {state}",
+            'phone': f"({rng.randint(200, 989)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+            'inspire_certified': rng.random() < 0.6,
+            'featured': rng.random() < 0.1,
+        })
+        data[key].append(record)
+
+    data['meta']['total_providers'] = len(data['medical_centers']) + len(data['independent_clinics'])
+    return data
+
+
+def create_workspace(parent, clinics):
+    """Scratch site with a copy of the scripts and the synthetic dataset"""
+    workspace = Path(tempfile.mkdtemp(prefix='benchmark-', dir=parent))
+    for script in BASE_DIR.glob('*.py'):
+        shutil.copy2(script, workspace / script.name)
+    (workspace / 'api').mkdir()
+    with open(workspace / 'api' / 'clinics.json', 'w', encoding='utf-8') as f:
+        json.dump(clinics, f)
+    return workspace
+
+
+def run_stage(name):
+    """Run one stage in this process (the site root is the working directory). Returns its stats."""
+    runner, modules = STAGES[name]
+    start = time.perf_counter()
+    if runner == 'build':
+        import build
+        stats = build.run_build(modules, root='.', force=True)
+        pages = stats['rendered']
+        errors = len(stats['errors'])
+    elif runner == 'validate':
+        report = importlib.import_module(modules[0]).run_validation(root='.')
+        stats = {'writes': output_writer.new_write_stats()}
+        pages = report['providers']
+        errors = 0
+    elif runner == 'stream':
+        stats = importlib.import_module(modules[0]).stream_pages(root='.')
+        pages = stats['pages']
+        errors = 0
+    else:
+        import html_pipeline
+        stats = html_pipeline.run_pipeline(modules, root='.', force=True)
+        pages = stats['files']
+        errors = len(stats['errors'])
+    seconds = time.perf_counter() - start
+
+    writes = stats['writes']
+    return {
+        'seconds': round(seconds, 3),
+        'pages': pages,
+        'pages_per_sec': round(pages / seconds, 1) if seconds else None,
+        'bytes_written': writes['new']['bytes'] + writes['changed']['bytes'],
+        'files_written': writes['new']['files'] + writes['changed']['files'],
+        'errors': errors,
+        # ru_maxrss is in KB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run_stage_process(workspace, name):
+    """Run a stage in a fresh interpreter inside the workspace and collect its stats"""
+    stats_path = workspace / f'.stage-{name}.json'
+    log_path = workspace / f'.stage-{name}.log'
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        result = subprocess.run([sys.executable, str(workspace / 'benchmark.py'), '--run-stage', name,
+                                 '--stats-out', str(stats_path)],
+                                cwd=workspace, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - start
+    if result.returncode != 0 or not stats_path.exists():
+        tail = log_path.read_text(errors='replace').splitlines()[-5:]
+        return {'error': f"exit {result.returncode}: {' | '.join(tail)}", 'wall_seconds': round(wall, 3)}
+
+    with open(stats_path, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    stats['wall_seconds'] = round(wall, 3)
+    return stats
+
+
+def run_size(size, seed_data, stages, workdir=None, seed=0, keep=False):
+    """Synthesize one dataset and run every stage on it"""
+    clinics = synthesize_clinics(size, seed_data, seed)
+    workspace = create_workspace(workdir, clinics)
+    print(f"\nProviders: {size} (workspace {workspace})")
+    results = {'providers': size, 'stages': {}}
+    try:
+        for name in stages:
+            if STAGES[name][0] == 'stream':
+                stats = run_fresh_stage(workdir, clinics, name, keep)
+            else:
+                stats = run_stage_process(workspace, name)
+            results['stages'][name] = stats
+            print(f"  {format_stage(name, stats)}")
+    finally:
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+    return results
+
+
+def run_fresh_stage(workdir, clinics, name, keep=False):
+    """Run a stage in a workspace of its own, where no earlier stage wrote its pages"""
+    workspace = create_workspace(workdir, clinics)
+    try:
+        return run_stage_process(workspace, name)
+    finally:
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def format_stage(name, stats):
+    if 'error' in stats:
+        return f"{name:<26}failed - {stats['error']}"
+    return (f"{name:<26}{stats['pages']:>8} pages {stats['seconds']:>9.2f}s {stats['pages_per_sec']:>9} pages/s "
+            f"{stats['peak_rss_mb']:>8} MB RSS {output_writer.format_bytes(stats['bytes_written']):>10}")
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare_results(old, new):
+    """Print seconds and peak RSS changes for every size and stage both runs have"""
+    old_runs = {run['providers']: run for run in old['runs']}
+    print(f"\nCompared with {old.get('commit') or 'unknown commit'}:")
+    print(f"{'Providers':>10}  {'Stage':<26}{'Seconds':>22}{'Peak RSS (MB)':>24}")
+    for run in new['runs']:
+        old_run = old_runs.get(run['providers'])
+        if not old_run:
+            continue
+        for name, stats in run['stages'].items():
+            before = old_run['stages'].get(name)
+            if not before or 'error' in before or 'error' in stats:
+                continue
+            change = (stats['seconds'] - before['seconds']) / before['seconds'] * 100 if before['seconds'] else 0
+            print(f"{run['providers']:>10}  {name:<26}{before['seconds']:>9.2f} -> {stats['seconds']:<8.2f}{change:+.0f}%"
+                  f"{before['peak_rss_mb']:>10} -> {stats['peak_rss_mb']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generators on synthetic provider datasets")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated provider counts")
+    parser.add_argument('--stage', action='append', choices=list(STAGES),
+                        help="run only this stage (repeatable); rewriter stages also run the builds")
+    parser.add_argument('--output', help="results file (default .build-cache/benchmarks/<commit>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    parser.add_argument('--workdir', help="directory for the scratch sites (default: system temp)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument('--keep', action='store_true', help="keep the scratch sites")
+    parser.add_argument('--run-stage', choices=list(STAGES), help=argparse.SUPPRESS)
+    parser.add_argument('--stats-out', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Worker mode: run one stage in this process and report its stats
+    if args.run_stage:
+        stats = run_stage(args.run_stage)
+        with open(args.stats_out, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        return stats
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    stages = list(STAGES)
+    if args.stage:
+        # The rewriters need pages to work on, so they always run after the builds
+        rewriting = any(STAGES[name][0] == 'pipeline' for name in args.stage)
+        stages = [name for name in STAGES if name in args.stage or (rewriting and STAGES[name][0] == 'build')]
+    seed_data = load_seed_data()
+    commit = git_commit()
+
+    results = {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'runs': [],
+    }
+    print(f"Benchmarking {', '.join(stages)} at {', '.join(str(size) for size in sizes)} providers")
+    for size in sizes:
+        results['runs'].append(run_size(size, seed_data, stages, args.workdir, args.seed, args.keep))
+
+    output = Path(args.output) if args.output else BASE_DIR / CACHE_DIR / 'benchmarks' / f"{(commit or 'local')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output_writer.write_if_changed(output, json.dumps(results, indent=2))
+
+    print(f"\n{'='*50}")
+    print(f"Results written to {output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(json.load(f), results)
+    return results
+
+
+if __name__ == '__main__':
+    main()
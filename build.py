@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Incremental build orchestrator for all page generators.
+Collects page jobs from every generator, re-renders only the pages whose
+input hashes changed since the last build and removes pages whose source
+records disappeared. The providers are validated first
+(validate_providers.py) and the front end's JSON shards (data_shards.py)
+and nearest-provider tables (geo_index.py) are refreshed after the pages.
+The entity and fields of every page go to the page metadata index
+(page_meta.py), so rewriters look pages up instead of scraping them.
+The site-wide partials a page includes are recorded in the include index
+(includes.py); a changed partial is resolved in just those pages, without
+re-rendering them.
+
+Usage:
+    python3 build.py                      # incremental build of every generator
+    python3 build.py --force              # re-render everything
+    python3 build.py --only generate_blog # build a single generator
+    python3 build.py --parallel           # render on a process pool sized to the CPU count
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_graph
+import build_manifest
+import data_shards
+import geo_index
+import includes
+import output_writer
+import page_meta
+import profiling
+import provider_store
+import validate_providers
+
+# Build order. When two generators claim the same output path the
+# earlier one wins. create_mexico_clinics builds the stem-cell site's Mexico
+# pages into its own SITE_DIR (its main()) and is not part of this site.
+GENERATORS = [
+    'regenerate_locations',
+    'generate_provider_pages',
+    'generate_cost_guides',
+    'generate_blog',
+    'generate_faq',
+]
+# Generators of the provider pages the nearby tables link to
+NEARBY_PAGE_GENERATORS = {'regenerate_locations', 'generate_provider_pages'}
+
+
+def collect_jobs(generators, root='.'):
+    """Gather page jobs from each generator's iter_pages(), reading its data from root"""
+    jobs = []
+    owners = {}
+    for name in generators:
+        module = importlib.import_module(name)
+        duplicates = {}
+        for job in module.iter_pages(root):
+            path = job['path']
+            if path in owners:
+                duplicates[owners[path]] = duplicates.get(owners[path], 0) + 1
+                continue
+            owners[path] = name
+            job['generator'] = name
+            jobs.append(job)
+        for owner, count in duplicates.items():
+            print(f"  Warning: {count} pages from {name} are already produced by {owner}, skipped")
+    return jobs
+
+
+def render_job(render, args):
+    """Render one page, returning (html, error, seconds) so failures are collected instead of aborting the build"""
+    start = time.perf_counter()
+    try:
+        return render(*args), None, time.perf_counter() - start
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def render_pages(jobs, workers=1):
+    """Render jobs, yielding (job, html, error, seconds) in job order.
+
+    With workers > 1 the jobs are fanned out over a process pool; results are
+    still consumed in submission order so the written output and the build
+    log are identical to a serial build.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield (job, *render_job(job['render'], job['args']))
+        return
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(render_job,
+                               [job['render'] for job in jobs],
+                               [job['args'] for job in jobs],
+                               chunksize=chunksize)
+        for job, result in zip(jobs, results):
+            yield (job, *result)
+
+
+def write_page(root, path, html, write_stats=None):
+    """Write a rendered page, skipping it if the file already has identical content"""
+    return output_writer.write_if_changed(Path(root) / path, html, write_stats)
+
+
+def remove_page(root, path):
+    """Delete a stale page and any directories it leaves empty"""
+    file_path = Path(root) / path
+    if file_path.exists():
+        file_path.unlink()
+    parent = file_path.parent
+    root_path = Path(root).resolve()
+    while parent.resolve() != root_path and parent.exists() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def run_build(generators=None, root='.', force=False, workers=1):
+    """Build the given generators incrementally. root is both where the
+    provider data is read from and where the pages go. Returns a stats dict."""
+    generators = generators or GENERATORS
+    start = time.perf_counter()
+
+    # This site's stages read root/api; without it they would quietly build an empty site
+    clinics_json = Path(root) / provider_store.CLINICS_JSON
+    if set(generators) & set(GENERATORS) and not clinics_json.exists():
+        raise FileNotFoundError(f"{clinics_json} not found; run parse_sleep_data.py first or pass the site --root")
+
+    # Warnings only; records are revalidated only when they changed
+    with profiling.stage('validate'):
+        validation = validate_providers.run_validation(root)
+
+    with profiling.stage('collect'):
+        graph = build_graph.load_graph(root)
+        include_index = includes.load_index(root)
+        jobs = collect_jobs(generators, root)
+
+    stats = {'pages': len(jobs), 'rendered': 0, 'unchanged': 0, 'removed': 0, 'errors': [],
+             'writes': output_writer.new_write_stats(), 'validation': validation}
+    produced = set()
+    pending = []
+
+    for job in jobs:
+        path = job['path']
+        produced.add(path)
+        job['key'] = build_graph.page_key(job['deps'])
+
+        if not force and build_graph.is_current(graph, root, path, job['key']):
+            stats['unchanged'] += 1
+        else:
+            pending.append(job)
+
+    for job, html, error, seconds in render_pages(pending, workers):
+        path = job['path']
+        profiling.record_page(path, seconds)
+        if error:
+            stats['errors'].append((path, error))
+            print(f"  Error: {path} - {error}")
+            continue
+        with profiling.stage('write'):
+            status = write_page(root, path, html, stats['writes'])
+        build_graph.record_page(graph, path, job['generator'], job['deps'], job['key'])
+        includes.record(include_index, path, html)
+        stats['rendered'] += 1
+        if status != 'unchanged':
+            print(f"  Generated: {path}")
+
+    for path in build_graph.stale_pages(graph, generators, produced):
+        remove_page(root, path)
+        del graph['pages'][path]
+        include_index.pop(path, None)
+        stats['removed'] += 1
+        print(f"  Removed: {path}")
+
+    with profiling.stage('write'):
+        build_graph.save_graph(root, graph)
+        failed = {path for path, _ in stats['errors']}
+        entries = {job['path']: page_meta.job_entry(job) for job in jobs if job['path'] not in failed}
+        page_meta.save_index(root, generators, {path: entry for path, entry in entries.items() if entry},
+                             stats['writes'])
+
+    # Partials changed since the pages that include them were written
+    with profiling.stage('includes'):
+        stats['includes'] = includes.update_pages(root, include_index, stats['writes'])
+        includes.save_index(root, include_index, stats['writes'])
+
+    # Front-end JSON shards of the directory and locations data
+    with profiling.stage('shards'):
+        stats['shards'] = data_shards.write_shards(root, stats['writes'])
+
+    # "Clinics near you" tables per ZIP prefix, city and state
+    with profiling.stage('nearby'):
+        stats['nearby'] = geo_index.write_tables(root, stats['writes'])
+    # A link to a page this build does not produce would be a 404
+    if NEARBY_PAGE_GENERATORS <= set(generators):
+        for url in geo_index.missing_pages(stats['nearby'], produced):
+            error = f"links to {url}, which no page job produces"
+            stats['errors'].append((geo_index.NEARBY_DIR, error))
+            print(f"  Error: {geo_index.NEARBY_DIR} - {error}")
+
+    # Digest manifest of the whole published site for diff-only deploys
+    with profiling.stage('manifest'):
+        manifest = build_manifest.update_manifest(root)
+    stats['manifest'] = {'files': len(manifest['files']), 'hashed': manifest['hashed']}
+
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def print_summary(stats):
+    print(f"\n{'='*50}")
+    print(f"Pages: {stats['pages']}, Rendered: {stats['rendered']}, "
+          f"Unchanged: {stats['unchanged']}, Removed: {stats['removed']}, Errors: {len(stats['errors'])}")
+    print(f"Written files - {output_writer.format_write_stats(stats['writes'])}")
+    print(f"Includes: {includes.format_include_stats(stats['includes'])}")
+    print(f"Validation: {validate_providers.format_report(stats['validation'])}")
+    print(f"Data shards: {data_shards.format_shard_stats(stats['shards'])}")
+    print(f"Nearby: {geo_index.format_geo_stats(stats['nearby'])}")
+    print(f"Manifest: {stats['manifest']['files']} published files, {stats['manifest']['hashed']} re-hashed")
+    print(f"Finished in {stats['seconds']}s")
+
+    if stats['errors']:
+        print("\nErrors:")
+        for path, error in stats['errors']:
+            print(f"  {path}: {error}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally build the static site pages")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if its inputs are unchanged")
+    parser.add_argument('--only', action='append', choices=GENERATORS, help="build only this generator (repeatable)")
+    parser.add_argument('--root', default='.', help="site root to read api/ data from and write pages into")
+    parser.add_argument('--parallel', action='store_true', help="render pages on a process pool with one worker per CPU core")
+    parser.add_argument('--jobs', type=int, help="number of render worker processes (implies --parallel)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None, generators=None, root=None):
+    """Command line entry point. Generator scripts call this with their own name."""
+    args = parse_args(argv)
+    generators = args.only or generators or GENERATORS
+    if root is None or args.root != '.':
+        root = args.root
+
+    workers = args.jobs or ((os.cpu_count() or 1) if args.parallel else 1)
+
+    print(f"Building: {', '.join(generators)}")
+    stats = run_build(generators, root=root, force=args.force, workers=workers)
+    print_summary(stats)
+    if stats['errors']:
+        sys.exit(1)
+    return stats
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Content-hash dependency graph for incremental page builds.
+Each generated page records the inputs it was rendered from (clinic records,
+FAQ records, template source) so a rebuild only re-renders pages whose
+inputs changed.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+
+CACHE_DIR = '.build-cache'
+GRAPH_FILE = 'graph.json'
+GRAPH_VERSION = 1
+
+_template_hashes = {}
+
+
+def content_hash(value):
+    """Stable SHA-1 of any JSON-serializable value"""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def group_hash(hashes):
+    """Combine a list of record hashes into one hash for aggregate pages"""
+    return content_hash(sorted(hashes))
+
+
+def template_hash(func):
+    """Hash the source of the module that defines a render function.
+
+    The whole module is hashed rather than the single function so edits to
+    shared helpers and constants (nav, footer, PROCEDURES, ...) invalidate
+    the pages built from them. The template engine (templates.py) that
+    renders them is hashed along with it.
+    """
+    return content_hash([module_hash(func.__module__), module_hash('templates')])
+
+
+def module_hash(module_name):
+    if module_name not in _template_hashes:
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
+        _template_hashes[module_name] = content_hash(inspect.getsource(module))
+    return _template_hashes[module_name]
+
+
+def page_job(path, render, args, deps, entity=None, fields=None):
+    """Describe one output page: where it goes, how to render it and what it depends on.
+    entity and fields are the page's metadata for the page index (page_meta.py)."""
+    deps = dict(deps)
+    # The site-wide partials are no dependency: build.py resolves a changed
+    # partial in the pages that include it (includes.py) without re-rendering them
+    deps[f"template:{render.__module__}.{render.__name__}"] = template_hash(render)
+    return {
+        'path': path,
+        'render': render,
+        'args': args,
+        'deps': deps,
+        'entity': entity,
+        'fields': fields,
+    }
+
+
+def page_key(deps):
+    """Single hash over all of a page's dependency hashes"""
+    return content_hash(deps)
+
+
+def graph_path(root):
+    return Path(root) / CACHE_DIR / GRAPH_FILE
+
+
+def load_graph(root):
+    """Load the dependency graph from the previous build (empty if missing or outdated)"""
+    path = graph_path(root)
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                graph = json.load(f)
+            if graph.get('version') == GRAPH_VERSION:
+                return graph
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable build graph {path}: {e}")
+    return {'version': GRAPH_VERSION, 'pages': {}}
+
+
+def save_graph(root, graph):
+    """Persist the dependency graph for the next build"""
+    path = graph_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_current(graph, root, path, key):
+    """True when the page was built from identical inputs and is still on disk"""
+    entry = graph['pages'].get(path)
+    return entry is not None and entry['key'] == key and (Path(root) / path).exists()
+
+
+def record_page(graph, path, generator, deps, key):
+    graph['pages'][path] = {
+        'generator': generator,
+        'key': key,
+        'deps': deps,
+    }
+
+
+def stale_pages(graph, generators, produced):
+    """Pages a previous build made for these generators that no longer have a job"""
+    return sorted(
+        path for path, entry in graph['pages'].items()
+        if entry['generator'] in generators and path not in produced
+    )
+
+
+def dependents(graph, dep_name):
+    """All pages that depend on a named input, e.g. 'clinic:center-001'"""
+    return sorted(path for path, entry in graph['pages'].items() if dep_name in entry['deps'])
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Manifest of every published file with its SHA-1, SHA-256 and size.
+The site publishes the repo root (netlify.toml: publish = "."), so the
+manifest covers everything a deploy would upload. Files whose size and mtime
+match the previous manifest reuse its digests instead of being re-hashed.
+
+Usage:
+    python3 build_manifest.py                 # write .build-cache/manifest.json
+    python3 build_manifest.py --diff OTHER    # compare against another manifest
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from build_graph import CACHE_DIR
+import output_writer
+import profiling
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Never published: tooling state and Python bytecode
+SKIP_DIRS = {'node_modules', '__pycache__'}
+SKIP_SUFFIXES = ('.pyc', '.tmp')
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_path(root, name=MANIFEST_FILE):
+    return Path(root) / CACHE_DIR / name
+
+
+def published_files(root):
+    """(deploy path, file path) for every published file, in a stable order.
+    Hidden files and directories are skipped, as the Netlify CLI does."""
+    root = Path(root)
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        for file in sorted(files):
+            if file.startswith('.') or file.endswith(SKIP_SUFFIXES):
+                continue
+            path = Path(dirpath) / file
+            yield '/' + path.relative_to(root).as_posix(), path
+
+
+def file_digests(path):
+    """SHA-1 and SHA-256 of a file, read in chunks"""
+    sha1 = hashlib.sha1()
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha1.update(chunk)
+            sha256.update(chunk)
+    return sha1.hexdigest(), sha256.hexdigest()
+
+
+def build_manifest(root, previous=None):
+    """Manifest for the site under root, reusing digests of untouched files from previous"""
+    previous_files = (previous or {}).get('files', {})
+    files = {}
+    hashed = 0
+    for deploy_path, path in published_files(root):
+        stat = path.stat()
+        entry = previous_files.get(deploy_path)
+        if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            sha1, sha256 = file_digests(path)
+            entry = {'sha1': sha1, 'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            hashed += 1
+        files[deploy_path] = entry
+    return {'version': MANIFEST_VERSION, 'files': files, 'hashed': hashed}
+
+
+def load_manifest(path):
+    """Load a manifest (empty if missing or outdated)"""
+    path = Path(path)
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable manifest {path}: {e}")
+    return {'version': MANIFEST_VERSION, 'files': {}}
+
+
+def save_manifest(path, manifest):
+    data = {'version': manifest['version'], 'files': manifest['files']}
+    return output_writer.write_if_changed(path, json.dumps(data, indent=1, sort_keys=True))
+
+
+def update_manifest(root):
+    """Rebuild the site manifest from the last one and save it. Returns the manifest."""
+    path = manifest_path(root)
+    manifest = build_manifest(root, load_manifest(path))
+    save_manifest(path, manifest)
+    return manifest
+
+
+def diff_manifests(old, new):
+    """Deploy paths added, changed, removed and unchanged between two manifests"""
+    old_files = old['files']
+    new_files = new['files']
+    diff = {'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+    for path, entry in new_files.items():
+        if path not in old_files:
+            diff['added'].append(path)
+        elif old_files[path]['sha1'] != entry['sha1']:
+            diff['changed'].append(path)
+        else:
+            diff['unchanged'].append(path)
+    diff['removed'] = sorted(path for path in old_files if path not in new_files)
+    return diff
+
+
+def total_size(manifest, paths):
+    return sum(manifest['files'][path]['size'] for path in paths)
+
+
+def print_diff(diff, old, new):
+    for key, manifest in [('added', new), ('changed', new), ('removed', old), ('unchanged', new)]:
+        paths = diff[key]
+        print(f"  {key.title()}: {len(paths)} ({output_writer.format_bytes(total_size(manifest, paths))})")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Write the published-file digest manifest")
+    parser.add_argument('--root', default='.', help="site root (the Netlify publish directory)")
+    parser.add_argument('--diff', help="manifest to compare the new one against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    manifest = update_manifest(args.root)
+    size = total_size(manifest, manifest['files'])
+    print(f"Manifest: {len(manifest['files'])} files ({output_writer.format_bytes(size)}), "
+          f"{manifest['hashed']} hashed, written to {manifest_path(args.root)}")
+
+    if args.diff:
+        old = load_manifest(args.diff)
+        print(f"\nChanges since {args.diff}:")
+        print_diff(diff_manifests(old, manifest), old, manifest)
+    return manifest
+
+
+if __name__ == '__main__':
+    profiling.run(main)
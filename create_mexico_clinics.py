@@ -4,10 +4,18 @@ Create individual clinic detail pages for all Mexico clinics
 with real researched data
 """
 
-import os
 import re
 
-# Real Mexico clinic data with researched information
+from build_graph import content_hash, page_job
+import page_meta
+import profiling
+import provider_store
+import templates
+
+SITE_DIR = "/home/ubuntu/stem-cells"
+
+# Real Mexico clinic data with researched information. Pages are built from
+# the provider store, which is rebuilt from this table when it changes.
 MEXICO_CLINICS = {
     "tijuana": {
         "city": "Tijuana",
@@ -256,23 +264,21 @@ MEXICO_CLINICS = {
     }
 }
 
-def create_clinic_detail_page(city_slug, city_data, clinic):
-    """Create an individual clinic detail page"""
-    
-    clinic_html = f'''<!DOCTYPE html>
+# Clinic detail page; see templates.py for the {{ }} placeholder syntax
+CLINIC_DETAIL_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{clinic["name"]} - Stem Cell Clinic in {city_data["city"]}, Mexico | StemCellPrices.com</title>
-    <meta name="description" content="{clinic["name"]} offers stem cell therapy in {city_data["city"]}, Mexico. {clinic["specialty"]}. Prices from {clinic["price_range"]}. Get a free consultation today.">
-    <meta name="keywords" content="{clinic["name"]}, stem cell therapy {city_data["city"]}, stem cell clinic Mexico, {clinic["specialty"].lower()}, regenerative medicine {city_data["city"]}">
-    <link rel="canonical" href="https://stemcellprices.com/locations/mexico/{city_slug}/{clinic["slug"]}.html">
+    <title>{{clinic.name}} - Stem Cell Clinic in {{city_data.city}}, Mexico | StemCellPrices.com</title>
+    <meta name="description" content="{{clinic.name}} offers stem cell therapy in {{city_data.city}}, Mexico. {{clinic.specialty}}. Prices from {{clinic.price_range}}. Get a free consultation today.">
+    <meta name="keywords" content="{{clinic.name}}, stem cell therapy {{city_data.city}}, stem cell clinic Mexico, {{specialty_lower}}, regenerative medicine {{city_data.city}}">
+    <link rel="canonical" href="https://stemcellprices.com/locations/mexico/{{city_slug}}/{{clinic.slug}}.html">
     
     <!-- Open Graph -->
-    <meta property="og:title" content="{clinic["name"]} - Stem Cell Clinic in {city_data["city"]}, Mexico">
-    <meta property="og:description" content="{clinic["specialty"]}. Prices from {clinic["price_range"]}. Get a free quote.">
-    <meta property="og:url" content="https://stemcellprices.com/locations/mexico/{city_slug}/{clinic["slug"]}.html">
+    <meta property="og:title" content="{{clinic.name}} - Stem Cell Clinic in {{city_data.city}}, Mexico">
+    <meta property="og:description" content="{{clinic.specialty}}. Prices from {{clinic.price_range}}. Get a free quote.">
+    <meta property="og:url" content="https://stemcellprices.com/locations/mexico/{{city_slug}}/{{clinic.slug}}.html">
     <meta property="og:type" content="business.business">
     
     <script src="https://cdn.tailwindcss.com"></script>
@@ -280,41 +286,41 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
     
     <!-- Schema.org Structured Data -->
     <script type="application/ld+json">
-    {{
+    {
         "@context": "https://schema.org",
         "@graph": [
-            {{
+            {
                 "@type": "MedicalBusiness",
-                "name": "{clinic["name"]}",
-                "description": "{clinic["description"]}",
-                "address": {{
+                "name": "{{clinic.name}}",
+                "description": "{{clinic.description}}",
+                "address": {
                     "@type": "PostalAddress",
-                    "streetAddress": "{clinic["address"]}",
-                    "addressLocality": "{city_data["city"]}",
-                    "addressRegion": "{city_data["state"]}",
+                    "streetAddress": "{{clinic.address}}",
+                    "addressLocality": "{{city_data.city}}",
+                    "addressRegion": "{{city_data.state}}",
                     "addressCountry": "MX"
-                }},
-                "telephone": "{clinic["phone"]}",
-                "priceRange": "{clinic["price_range"]}",
-                "medicalSpecialty": "{clinic["specialty"]}",
-                "url": "https://stemcellprices.com/locations/mexico/{city_slug}/{clinic["slug"]}.html"
-            }},
-            {{
+                },
+                "telephone": "{{clinic.phone}}",
+                "priceRange": "{{clinic.price_range}}",
+                "medicalSpecialty": "{{clinic.specialty}}",
+                "url": "https://stemcellprices.com/locations/mexico/{{city_slug}}/{{clinic.slug}}.html"
+            },
+            {
                 "@type": "BreadcrumbList",
                 "itemListElement": [
-                    {{"@type": "ListItem", "position": 1, "name": "Home", "item": "https://stemcellprices.com/"}},
-                    {{"@type": "ListItem", "position": 2, "name": "Locations", "item": "https://stemcellprices.com/locations/"}},
-                    {{"@type": "ListItem", "position": 3, "name": "Mexico", "item": "https://stemcellprices.com/locations/mexico/"}},
-                    {{"@type": "ListItem", "position": 4, "name": "{city_data["city"]}", "item": "https://stemcellprices.com/locations/mexico/{city_slug}/"}},
-                    {{"@type": "ListItem", "position": 5, "name": "{clinic["name"]}"}}
+                    {"@type": "ListItem", "position": 1, "name": "Home", "item": "https://stemcellprices.com/"},
+                    {"@type": "ListItem", "position": 2, "name": "Locations", "item": "https://stemcellprices.com/locations/"},
+                    {"@type": "ListItem", "position": 3, "name": "Mexico", "item": "https://stemcellprices.com/locations/mexico/"},
+                    {"@type": "ListItem", "position": 4, "name": "{{city_data.city}}", "item": "https://stemcellprices.com/locations/mexico/{{city_slug}}/"},
+                    {"@type": "ListItem", "position": 5, "name": "{{clinic.name}}"}
                 ]
-            }}
+            }
         ]
-    }}
+    }
     </script>
     <style>
-        [x-cloak] {{ display: none !important; }}
-        .price-panel {{
+        [x-cloak] { display: none !important; }
+        .price-panel {
             background: rgba(15, 23, 42, 0.75);
             backdrop-filter: blur(12px);
             -webkit-backdrop-filter: blur(12px);
@@ -322,26 +328,12 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
             border-radius: 16px;
             padding: 16px 24px;
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-        }}
+        }
     </style>
 </head>
 <body class="bg-gray-50">
     <!-- Header -->
-    <header class="bg-white shadow-sm sticky top-0 z-50">
-        <nav class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center">
-                    <img src="/assets/images/logo.png" alt="StemCellPrices.com" class="h-8">
-                </a>
-                <div class="hidden md:flex items-center space-x-8">
-                    <a href="/" class="text-gray-600 hover:text-teal-600">Home</a>
-                    <a href="/#cost-guide" class="text-gray-600 hover:text-teal-600">Cost Guide</a>
-                    <a href="/locations/" class="text-gray-600 hover:text-teal-600">Locations</a>
-                    <a href="/compare-costs/" class="text-gray-600 hover:text-teal-600">Compare Costs</a>
-                </div>
-            </div>
-        </nav>
-    </header>
+    {{> mexico_header }}
 
     <!-- Hero Section -->
     <section class="relative bg-gradient-to-r from-teal-600 to-teal-800 text-white py-16">
@@ -355,32 +347,32 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
                     <li>/</li>
                     <li><a href="/locations/mexico/" class="hover:text-white">Mexico</a></li>
                     <li>/</li>
-                    <li><a href="/locations/mexico/{city_slug}/" class="hover:text-white">{city_data["city"]}</a></li>
+                    <li><a href="/locations/mexico/{{city_slug}}/" class="hover:text-white">{{city_data.city}}</a></li>
                     <li>/</li>
-                    <li class="text-white font-medium">{clinic["name"]}</li>
+                    <li class="text-white font-medium">{{clinic.name}}</li>
                 </ol>
             </nav>
             
             <div class="flex flex-col md:flex-row md:items-center md:justify-between">
                 <div>
                     <div class="flex items-center gap-3 mb-4">
-                        {"<span class='bg-yellow-400 text-yellow-900 px-3 py-1 rounded-full text-sm font-semibold'>⭐ Featured</span>" if clinic["featured"] else ""}
-                        {"<span class='bg-green-400 text-green-900 px-3 py-1 rounded-full text-sm font-semibold'>✓ Verified</span>" if clinic["verified"] else ""}
+                        {{featured_badge}}
+                        {{verified_badge}}
                         <span class="bg-white/20 px-3 py-1 rounded-full text-sm">🇲🇽 Mexico</span>
                     </div>
-                    <h1 class="text-4xl font-bold mb-2">{clinic["name"]}</h1>
-                    <p class="text-xl text-teal-100 mb-4">{clinic["specialty"]}</p>
+                    <h1 class="text-4xl font-bold mb-2">{{clinic.name}}</h1>
+                    <p class="text-xl text-teal-100 mb-4">{{clinic.specialty}}</p>
                     <p class="text-teal-200">
                         <svg class="w-5 h-5 inline mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                             <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"></path>
                             <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15 11a3 3 0 11-6 0 3 3 0 016 0z"></path>
                         </svg>
-                        {clinic["address"]}
+                        {{clinic.address}}
                     </p>
                 </div>
                 <div class="mt-6 md:mt-0 text-right price-panel">
                     <div class="text-emerald-400 text-sm font-semibold mb-1">Price Range</div>
-                    <div class="text-3xl font-bold text-white">{clinic["price_range"]}</div>
+                    <div class="text-3xl font-bold text-white">{{clinic.price_range}}</div>
                 </div>
             </div>
         </div>
@@ -393,15 +385,15 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
             <div class="lg:col-span-2 space-y-8">
                 <!-- About -->
                 <div class="bg-white rounded-xl shadow-sm p-6">
-                    <h2 class="text-2xl font-bold text-gray-900 mb-4">About {clinic["name"]}</h2>
-                    <p class="text-gray-600 leading-relaxed">{clinic["description"]}</p>
+                    <h2 class="text-2xl font-bold text-gray-900 mb-4">About {{clinic.name}}</h2>
+                    <p class="text-gray-600 leading-relaxed">{{clinic.description}}</p>
                 </div>
 
                 <!-- Treatments -->
                 <div class="bg-white rounded-xl shadow-sm p-6">
                     <h2 class="text-2xl font-bold text-gray-900 mb-4">Treatments Offered</h2>
                     <div class="grid grid-cols-2 md:grid-cols-3 gap-3">
-                        {"".join([f'<div class="bg-teal-50 text-teal-700 px-4 py-2 rounded-lg text-sm font-medium">{t}</div>' for t in clinic["treatments"]])}
+                        {{treatments_html}}
                     </div>
                 </div>
 
@@ -409,13 +401,13 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
                 <div class="bg-white rounded-xl shadow-sm p-6">
                     <h2 class="text-2xl font-bold text-gray-900 mb-4">Clinic Features</h2>
                     <div class="grid grid-cols-2 gap-4">
-                        {"".join([f'<div class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path></svg><span class="text-gray-700">{f}</span></div>' for f in clinic["features"]])}
+                        {{features_html}}
                     </div>
                 </div>
 
                 <!-- Why Mexico -->
                 <div class="bg-gradient-to-r from-teal-50 to-blue-50 rounded-xl p-6">
-                    <h2 class="text-2xl font-bold text-gray-900 mb-4">Why Choose {city_data["city"]} for Stem Cell Therapy?</h2>
+                    <h2 class="text-2xl font-bold text-gray-900 mb-4">Why Choose {{city_data.city}} for Stem Cell Therapy?</h2>
                     <ul class="space-y-3 text-gray-700">
                         <li class="flex items-start gap-2">
                             <span class="text-teal-500 mt-1">✓</span>
@@ -431,7 +423,7 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
                         </li>
                         <li class="flex items-start gap-2">
                             <span class="text-teal-500 mt-1">✓</span>
-                            <span><strong>{"Easy Border Access" if city_slug == "tijuana" else "Direct Flights"}</strong> {"- just 20 minutes from San Diego" if city_slug == "tijuana" else "from most major US cities"}</span>
+                            <span><strong>{{travel_title}}</strong> {{travel_note}}</span>
                         </li>
                     </ul>
                 </div>
@@ -442,8 +434,8 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
                 <div class="bg-white rounded-xl shadow-sm p-6 sticky top-24">
                     <h3 class="text-xl font-bold text-gray-900 mb-4">Get a Free Quote</h3>
                     <form id="leadForm" class="space-y-4">
-                        <input type="hidden" id="clinicName" value="{clinic["name"]}">
-                        <input type="hidden" id="clinicCity" value="{city_data["city"]}">
+                        <input type="hidden" id="clinicName" value="{{clinic.name}}">
+                        <input type="hidden" id="clinicCity" value="{{city_data.city}}">
                         <input type="hidden" id="clinicCountry" value="Mexico">
                         
                         <div>
@@ -493,11 +485,11 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
 
         <!-- Other Clinics in City -->
         <div class="mt-12">
-            <h2 class="text-2xl font-bold text-gray-900 mb-6">Other Clinics in {city_data["city"]}</h2>
+            <h2 class="text-2xl font-bold text-gray-900 mb-6">Other Clinics in {{city_data.city}}</h2>
             <div class="grid grid-cols-1 md:grid-cols-3 gap-6">
-                <a href="/locations/mexico/{city_slug}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
-                    <div class="text-teal-600 font-semibold">← View All {city_data["city"]} Clinics</div>
-                    <p class="text-gray-500 text-sm mt-1">Compare {len(city_data["clinics"])} verified clinics</p>
+                <a href="/locations/mexico/{{city_slug}}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
+                    <div class="text-teal-600 font-semibold">← View All {{city_data.city}} Clinics</div>
+                    <p class="text-gray-500 text-sm mt-1">Compare {{clinic_count}} verified clinics</p>
                 </a>
                 <a href="/compare-costs/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
                     <div class="text-teal-600 font-semibold">Compare US vs Mexico Costs</div>
@@ -512,57 +504,14 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
     </main>
 
     <!-- Footer -->
-    <footer class="bg-slate-900 text-white py-12">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="grid grid-cols-2 md:grid-cols-4 gap-8">
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Popular States</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/locations/california/" class="text-gray-400 hover:text-teal-400 text-sm">California</a></li>
-                        <li><a href="/locations/texas/" class="text-gray-400 hover:text-teal-400 text-sm">Texas</a></li>
-                        <li><a href="/locations/florida/" class="text-gray-400 hover:text-teal-400 text-sm">Florida</a></li>
-                        <li><a href="/locations/arizona/" class="text-gray-400 hover:text-teal-400 text-sm">Arizona</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Mexico</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/locations/mexico/" class="text-gray-400 hover:text-teal-400 text-sm">Mexico Overview</a></li>
-                        <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-teal-400 text-sm">Tijuana</a></li>
-                        <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-teal-400 text-sm">Cancun</a></li>
-                        <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-teal-400 text-sm">Puerto Vallarta</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Resources</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/#cost-guide" class="text-gray-400 hover:text-teal-400 text-sm">Cost Guide</a></li>
-                        <li><a href="/compare-costs/" class="text-gray-400 hover:text-teal-400 text-sm">Compare Costs</a></li>
-                        <li><a href="/locations/" class="text-gray-400 hover:text-teal-400 text-sm">All Locations</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Legal</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/privacy/" class="text-gray-400 hover:text-teal-400 text-sm">Privacy Policy</a></li>
-                        <li><a href="/terms/" class="text-gray-400 hover:text-teal-400 text-sm">Terms of Service</a></li>
-                        <li><a href="/disclaimer/" class="text-gray-400 hover:text-teal-400 text-sm">Medical Disclaimer</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="mt-8 pt-8 border-t border-gray-800 text-center text-gray-400 text-sm">
-                <p>© 2025 StemCellPrices.com. All rights reserved.</p>
-                <p class="mt-2 text-xs">The information on this website is for educational purposes only and should not be considered medical advice. Always consult with a qualified healthcare provider.</p>
-            </div>
-        </div>
-    </footer>
+    {{> mexico_footer }}
 
     <script>
         // Lead form submission
-        document.getElementById('leadForm').addEventListener('submit', function(e) {{
+        document.getElementById('leadForm').addEventListener('submit', function(e) {
             e.preventDefault();
             
-            const lead = {{
+            const lead = {
                 clinic: document.getElementById('clinicName').value,
                 city: document.getElementById('clinicCity').value,
                 country: document.getElementById('clinicCountry').value,
@@ -573,7 +522,7 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
                 message: document.getElementById('message').value,
                 timestamp: new Date().toISOString(),
                 source: window.location.href
-            }};
+            };
             
             // Store lead
             const leads = JSON.parse(localStorage.getItem('stemcell_leads') || '[]');
@@ -581,20 +530,44 @@ def create_clinic_detail_page(city_slug, city_data, clinic):
             localStorage.setItem('stemcell_leads', JSON.stringify(leads));
             
             // Track conversion
-            if (typeof gtag !== 'undefined') {{
-                gtag('event', 'generate_lead', {{
+            if (typeof gtag !== 'undefined') {
+                gtag('event', 'generate_lead', {
                     'event_category': 'Lead',
                     'event_label': lead.clinic,
                     'value': 1
-                }});
-            }}
+                });
+            }
             
             alert('Thank you! Your request has been submitted. The clinic will contact you within 24-48 hours.');
             this.reset();
-        }});
+        });
     </script>
 </body>
 </html>'''
+
+templates.define('mexico_clinic_page', CLINIC_DETAIL_TEMPLATE)
+
+
+def create_clinic_detail_page(city_slug, city_data, clinic):
+    """Create an individual clinic detail page"""
+    
+    treatments_html = "".join([f'<div class="bg-teal-50 text-teal-700 px-4 py-2 rounded-lg text-sm font-medium">{t}</div>' for t in clinic["treatments"]])
+    features_html = "".join([f'<div class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path></svg><span class="text-gray-700">{f}</span></div>' for f in clinic["features"]])
+
+    clinic_html = templates.render(
+        'mexico_clinic_page',
+        clinic=clinic,
+        city_data=city_data,
+        city_slug=city_slug,
+        specialty_lower=clinic["specialty"].lower(),
+        featured_badge="<span class='bg-yellow-400 text-yellow-900 px-3 py-1 rounded-full text-sm font-semibold'>⭐ Featured</span>" if clinic["featured"] else "",
+        verified_badge="<span class='bg-green-400 text-green-900 px-3 py-1 rounded-full text-sm font-semibold'>✓ Verified</span>" if clinic["verified"] else "",
+        treatments_html=treatments_html,
+        features_html=features_html,
+        travel_title="Easy Border Access" if city_slug == "tijuana" else "Direct Flights",
+        travel_note="- just 20 minutes from San Diego" if city_slug == "tijuana" else "from most major US cities",
+        clinic_count=len(city_data["clinics"]),
+    )
     
     return clinic_html
 
@@ -759,36 +732,39 @@ def update_city_index_page(city_slug, city_data):
     return city_html
 
 
-def main():
-    base_dir = "/home/ubuntu/stem-cells/locations/mexico"
-    
-    total_clinics = 0
-    
-    for city_slug, city_data in MEXICO_CLINICS.items():
-        city_dir = os.path.join(base_dir, city_slug)
-        os.makedirs(city_dir, exist_ok=True)
-        
-        # Create individual clinic detail pages
+def load_cities():
+    """(city_slug, city_data) for every Mexico city"""
+    return [(city_slug, city_data) for _, _, city_slug, city_data in provider_store.city_groups('mexico_clinics')]
+
+
+def iter_pages(root='.'):
+    """Yield a build job for every Mexico clinic detail page and city index page"""
+    with profiling.stage('load'):
+        cities = load_cities()
+    for city_slug, city_data in cities:
+        city_dir = f"locations/mexico/{city_slug}"
+
         for clinic in city_data["clinics"]:
-            clinic_html = create_clinic_detail_page(city_slug, city_data, clinic)
-            clinic_path = os.path.join(city_dir, f"{clinic['slug']}.html")
-            with open(clinic_path, 'w') as f:
-                f.write(clinic_html)
-            print(f"Created: {clinic_path}")
-            total_clinics += 1
-        
-        # Update city index page
-        city_index_html = update_city_index_page(city_slug, city_data)
-        city_index_path = os.path.join(city_dir, "index.html")
-        with open(city_index_path, 'w') as f:
-            f.write(city_index_html)
-        print(f"Updated: {city_index_path} ({len(city_data['clinics'])} clinics)")
+            yield page_job(f"{city_dir}/{clinic['slug']}.html", create_clinic_detail_page,
+                           (city_slug, city_data, clinic),
+                           {f"mexico:{city_slug}": content_hash(city_data)},
+                           entity=f"mexico:{city_slug}:{clinic['slug']}",
+                           fields=page_meta.provider_fields(clinic, city_data['city'], city_data['state']))
+
+        yield page_job(f"{city_dir}/index.html", update_city_index_page, (city_slug, city_data),
+                       {f"mexico:{city_slug}": content_hash(city_data)}, entity=f"mexico:{city_slug}",
+                       fields={'city': city_data['city'], 'state': city_data['state'],
+                               'clinics': len(city_data['clinics'])})
+
+
+def main():
+    from build import main as build_main
+    build_main(generators=['create_mexico_clinics'], root=SITE_DIR)
     
     print(f"\n=== Summary ===")
-    print(f"Total clinic detail pages created: {total_clinics}")
-    for city_slug, city_data in MEXICO_CLINICS.items():
+    for city_slug, city_data in load_cities():
         print(f"  {city_data['city']}: {len(city_data['clinics'])} clinics")
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
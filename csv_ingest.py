@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Streaming, validated reading of the research CSV exports.
+
+    report = new_report(path)
+    for index, row in iter_rows(path, schema, report):
+        ...
+
+Records are read with the csv module CHUNK_ROWS at a time and checked
+against a schema. A bad record is logged in the report and skipped; it
+does not stop the parse. Memory stays bounded by the chunk size whatever
+the file size.
+
+A schema is a plain dict:
+    'key'       column a record must fill to count; records without it are skipped
+    'required'  columns the header must have (the file is rejected otherwise)
+    'columns'   other columns the parser reads; missing ones read as empty
+    'checks'    {column: (message, predicate)} run on the stripped values;
+                a failed check is a warning and the record is kept
+
+index is the record's position among the file's data records (1-based, as
+the ids built from it always were), so ids stay stable when other records
+are skipped or rejected.
+"""
+
+import csv
+
+CHUNK_ROWS = 1000
+# Errors and warnings listed per file; the rest are only counted
+MAX_REPORTED = 50
+# Long free-text columns (descriptions, findings) may exceed csv's 128 KB default
+FIELD_SIZE_LIMIT = 16 * 1024 * 1024
+
+YES_NO = ('expected Yes or No', lambda value: value.lower() in ('', 'yes', 'no'))
+URL = ('expected an http(s) URL', lambda value: not value or value.startswith(('http://', 'https://')))
+NOT_EMPTY = ('value is empty', bool)
+
+
+def parse_number(value):
+    """A number written as '5000', '$5,000' or '40%'; None if the value is not one"""
+    try:
+        number = float(value.replace('$', '').replace(',', '').rstrip('%'))
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+NUMBER = ('expected a number', lambda value: not value or parse_number(value) is not None)
+
+
+def new_report(path):
+    """Empty per-file ingestion report"""
+    return {
+        'file': str(path),
+        'records': 0,
+        'accepted': 0,
+        'skipped': 0,
+        'rejected': 0,
+        'warning_count': 0,
+        'errors': [],
+        'warnings': [],
+    }
+
+
+def add_issue(report, kind, line, message):
+    if kind == 'errors':
+        report['rejected'] += 1
+    else:
+        report['warning_count'] += 1
+    if len(report[kind]) < MAX_REPORTED:
+        report[kind].append({'line': line, 'message': message})
+
+
+def read_chunks(reader, report, size=CHUNK_ROWS):
+    """Lists of up to size (line, index, fields) records. Records the csv
+    module cannot parse are reported and dropped; blank lines are ignored."""
+    chunk = []
+    while True:
+        line = reader.line_num + 1
+        try:
+            fields = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            report['records'] += 1
+            add_issue(report, 'errors', line, f"malformed record: {e}")
+            continue
+        if not fields:
+            continue
+        report['records'] += 1
+        chunk.append((line, report['records'], fields))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def check_header(header, schema, report):
+    """Report missing columns. Returns False if the file cannot be used."""
+    missing = [column for column in schema.get('required', []) if column not in header]
+    if missing:
+        add_issue(report, 'errors', 1, f"missing required columns: {', '.join(missing)}")
+        return False
+    for column in schema.get('columns', []):
+        if column not in header:
+            add_issue(report, 'warnings', 1, f"missing column {column!r}, read as empty")
+    return True
+
+
+def validate_chunk(chunk, header, schema, report):
+    """Yield (index, row) for the records of a chunk that pass the schema"""
+    key = schema['key']
+    checks = schema.get('checks', {})
+    for line, index, fields in chunk:
+        if len(fields) != len(header):
+            add_issue(report, 'errors', line, f"expected {len(header)} fields, found {len(fields)}")
+            continue
+        row = dict(zip(header, fields))
+        if not row.get(key, '').strip():
+            report['skipped'] += 1
+            continue
+        for column, (message, predicate) in checks.items():
+            value = row.get(column, '').strip()
+            if not predicate(value):
+                add_issue(report, 'warnings', line, f"{column}: {message} ({value[:40]!r})")
+        report['accepted'] += 1
+        yield index, row
+
+
+def iter_rows(path, schema, report, chunk_size=CHUNK_ROWS):
+    """Yield (index, row) for the valid records of a CSV file, filling in report"""
+    csv.field_size_limit(FIELD_SIZE_LIMIT)
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            add_issue(report, 'errors', 1, "file is empty")
+            return
+        header = [column.strip() for column in header]
+        if not check_header(header, schema, report):
+            return
+
+        for chunk in read_chunks(reader, report, chunk_size):
+            yield from validate_chunk(chunk, header, schema, report)
+    # Parse errors are found as records are read, schema errors a chunk later
+    report['errors'].sort(key=lambda issue: issue['line'])
+
+
+def format_report(report):
+    """One-line summary of a file's ingestion report"""
+    return (f"{report['accepted']} accepted, {report['skipped']} skipped, "
+            f"{report['rejected']} rejected, {report['warning_count']} warnings")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Compact, sharded JSON data for the front end.
+
+The clinic directory (api/directory.json) and the specialist locations
+(api/locations.json) are split into one shard per state, so a page
+fetches only the data of the location it shows:
+
+    api/shards/index.json                 every state's totals and shard, city key -> shard
+    api/shards/california.json            {states, locations} slices, plus {cities} for small states
+    api/shards/california/los_angeles.json   {cities} slice of one city in a large state
+
+Shards are slices of the directory's own {states, cities} shape (and
+{locations} for the specialist data), written without indentation and
+with the field names shortened; index.json carries the key legend ('k')
+the front end expands them with. States with more than SPLIT_CLINICS
+clinics get a shard per city. Shards are only rewritten when their
+content changes and shards of removed states or cities are deleted.
+
+Usage:
+    python3 data_shards.py            # also run by build.py
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import output_writer
+import profiling
+from slugs import slugify
+
+DIRECTORY_JSON = 'api/directory.json'
+LOCATIONS_JSON = 'api/locations.json'
+SHARD_DIR = 'api/shards'
+INDEX_FILE = 'index.json'
+# States with more clinics than this are split into per-city shards
+SPLIT_CLINICS = 20
+
+# Field name -> short key used in the shards
+KEYS = {
+    'name': 'n',
+    'slug': 's',
+    'address': 'a',
+    'phone': 'p',
+    'specialty': 'sp',
+    'priceRange': 'pr',
+    'featured': 'f',
+    'verified': 'v',
+    'cityName': 'cn',
+    'state': 'st',
+    'avgPrice': 'ap',
+    'clinicCount': 'cc',
+    'clinics': 'c',
+    'description': 'd',
+    'cities': 'ci',
+    'states': 'ss',
+    'locations': 'l',
+    'providers': 'pv',
+    'id': 'i',
+    'type': 't',
+    'inspire_certified': 'ic',
+    'path': 'u',
+}
+LEGEND = {short: key for key, short in KEYS.items()}
+
+
+def compact(value):
+    """value with every object key shortened through KEYS"""
+    if isinstance(value, dict):
+        return {KEYS.get(key, key): compact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
+
+
+def expand(value):
+    """Inverse of compact(), as the front end does it"""
+    if isinstance(value, dict):
+        return {LEGEND.get(key, key): expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
+
+
+def shard_json(data, **extra):
+    """Compact JSON of a shard. A data key (a state, city key or slug) that
+    reads as a short key would not expand back to itself, so it is refused."""
+    compacted = compact(data)
+    if expand(compacted) != data:
+        raise ValueError("shard data has keys that clash with the short key legend")
+    return json.dumps({**extra, **compacted}, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_json(path, default):
+    if not path.exists():
+        print(f"  Warning: {path} not found")
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def state_summary(state, cities):
+    clinics = sum(city['clinics'] for city in cities)
+    prices = [city['avgPrice'] for city in cities]
+    return {
+        'name': state,
+        'cities': len(cities),
+        'clinics': clinics,
+        # Rounded half up, like the Math.round() app.js sums these with
+        'avgPrice': math.floor(sum(prices) / len(prices) + 0.5) if prices else 0,
+    }
+
+
+def build_shards(directory, locations):
+    """{shard path: data} for every shard, index.json included"""
+    by_state = {}
+    for key, city in directory.get('cities', {}).items():
+        by_state.setdefault(city['state'], {})[key] = city
+    # Specialist locations are keyed by state slug
+    locations_by_slug = locations.get('locations', {})
+    states = {slugify(state): state for state in directory.get('states', {})}
+    for slug, location in locations_by_slug.items():
+        states.setdefault(slug, location['name'])
+
+    shards = {}
+    index = {'states': {}, 'cities': {}}
+    for slug, state in sorted(states.items()):
+        state_data = directory.get('states', {}).get(state)
+        cities = by_state.get(state, {})
+        location = locations_by_slug.get(slug)
+        # Keys are not always slugs (the Singapore clinic's state is "n/a")
+        shard_slug = slugify(slug)
+        path = f"{shard_slug}.json"
+
+        shard = {}
+        if state_data is not None:
+            shard['states'] = {state: state_data}
+        if location is not None:
+            shard['locations'] = {slug: location}
+        split = state_data is not None and sum(city['clinics'] for city in state_data['cities']) > SPLIT_CLINICS
+        if split:
+            for key, city in cities.items():
+                city_path = f"{shard_slug}/{key}.json"
+                shards[city_path] = {'cities': {key: city}}
+                index['cities'][key] = city_path
+        elif cities:
+            shard['cities'] = cities
+            for key in cities:
+                index['cities'][key] = path
+        shards[path] = shard
+
+        summary = state_summary(state, state_data['cities'] if state_data else [])
+        summary['providers'] = sum(len(city['providers']) for city in (location or {}).get('cities', {}).values())
+        summary['path'] = path
+        index['states'][slug] = summary
+
+    shards[INDEX_FILE] = index
+    return shards
+
+
+def write_shards(root='.', write_stats=None):
+    """Write the shards under root/api/shards and delete stale ones. Returns a stats dict."""
+    root = Path(root)
+    shard_dir = root / SHARD_DIR
+    directory = load_json(root / DIRECTORY_JSON, {'states': {}, 'cities': {}})
+    locations = load_json(root / LOCATIONS_JSON, {'locations': {}})
+
+    stats = {'shards': 0, 'bytes': 0, 'index_bytes': 0, 'largest': 0, 'removed': 0}
+    produced = set()
+    for path, data in build_shards(directory, locations).items():
+        if path == INDEX_FILE:
+            content = shard_json(data, k=LEGEND)
+            stats['index_bytes'] = len(content.encode('utf-8'))
+        else:
+            content = shard_json(data)
+            stats['shards'] += 1
+            stats['largest'] = max(stats['largest'], len(content.encode('utf-8')))
+        stats['bytes'] += len(content.encode('utf-8'))
+        output_writer.write_if_changed(shard_dir / path, content, write_stats)
+        produced.add(shard_dir / path)
+
+    for path in sorted(shard_dir.rglob('*.json'), reverse=True):
+        if path not in produced:
+            path.unlink()
+            stats['removed'] += 1
+            print(f"  Removed: {path.relative_to(root)}")
+    for path in sorted(shard_dir.rglob('*'), reverse=True):
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+    return stats
+
+
+def format_shard_stats(stats):
+    return (f"{stats['shards']} shards + index ({stats['index_bytes']:,} bytes), "
+            f"largest {stats['largest']:,} bytes, {stats['removed']} removed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the sharded JSON data for the front end")
+    parser.add_argument('--root', default='.', help="site root holding api/")
+    args = parser.parse_args(argv)
+
+    write_stats = output_writer.new_write_stats()
+    stats = write_shards(args.root, write_stats)
+    sources = sum((Path(args.root) / path).stat().st_size
+                  for path in [DIRECTORY_JSON, LOCATIONS_JSON] if (Path(args.root) / path).exists())
+
+    print(f"\n{'='*50}")
+    print(f"Data shards: {format_shard_stats(stats)}")
+    print(f"Total {stats['bytes']:,} bytes (sources {sources:,} bytes)")
+    print(f"Written files - {output_writer.format_write_stats(write_stats)}")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
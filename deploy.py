@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Diff-only deploy through Netlify's digest-based deploy API.
+Refreshes the build manifest, compares it with the manifest of the last
+successful deploy, sends the full path -> SHA-1 map and uploads only the
+files the API reports as required.
+
+Usage:
+    NETLIFY_AUTH_TOKEN=... NETLIFY_SITE_ID=... python3 deploy.py
+    python3 deploy.py --dry-run                                  # show what changed
+    python3 deploy.py --api-url http://127.0.0.1:8788/api/v1 --site-id local --token test
+
+Use netlify_stub.py as a local stand-in for the API.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import build_manifest
+import output_writer
+import profiling
+
+DEFAULT_API_URL = 'https://api.netlify.com/api/v1'
+DEPLOYED_MANIFEST_FILE = 'deployed-manifest.json'
+
+
+def api_request(method, url, token, body=None, content_type='application/json'):
+    """Call the deploy API and return the decoded JSON response"""
+    if body is not None and content_type == 'application/json':
+        body = json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(url, data=body, method=method)
+    request.add_header('Authorization', f'Bearer {token}')
+    if body is not None:
+        request.add_header('Content-Type', content_type)
+    with urllib.request.urlopen(request, timeout=300) as response:
+        data = response.read()
+    return json.loads(data) if data else {}
+
+
+def create_deploy(api_url, site_id, token, manifest):
+    """Start a deploy from the full digest map; the API answers with the SHA-1s it still needs"""
+    files = {path: entry['sha1'] for path, entry in manifest['files'].items()}
+    return api_request('POST', f"{api_url}/sites/{site_id}/deploys", token, {'files': files})
+
+
+def upload_file(api_url, deploy_id, token, deploy_path, file_path):
+    url = f"{api_url}/deploys/{deploy_id}/files{urllib.parse.quote(deploy_path)}"
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    api_request('PUT', url, token, data, content_type='application/octet-stream')
+    return len(data)
+
+
+def wait_until_ready(api_url, deploy_id, token, timeout=120):
+    """Poll the deploy until the API has processed it, or until timeout seconds
+    have passed; the deploy returned then may still be uploading or processing"""
+    deadline = time.monotonic() + timeout
+    while True:
+        deploy = api_request('GET', f"{api_url}/deploys/{deploy_id}", token)
+        if deploy.get('state') in ('ready', 'error') or time.monotonic() > deadline:
+            return deploy
+        time.sleep(2)
+
+
+def run_deploy(root, api_url, site_id, token, jobs=8, dry_run=False):
+    """Deploy the site under root. Returns a stats dict."""
+    start = time.perf_counter()
+    manifest = build_manifest.update_manifest(root)
+    deployed_path = build_manifest.manifest_path(root, DEPLOYED_MANIFEST_FILE)
+    previous = build_manifest.load_manifest(deployed_path)
+    diff = build_manifest.diff_manifests(previous, manifest)
+
+    print(f"Manifest: {len(manifest['files'])} files, {manifest['hashed']} re-hashed")
+    print("Changes since last deploy:")
+    build_manifest.print_diff(diff, previous, manifest)
+
+    stats = {'diff': {key: len(paths) for key, paths in diff.items()}, 'uploaded': 0, 'uploaded_bytes': 0}
+    if dry_run:
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    deploy = create_deploy(api_url, site_id, token, manifest)
+    required = set(deploy.get('required', []))
+
+    # One upload per required digest; identical files share a digest
+    uploads = {}
+    for deploy_path, entry in manifest['files'].items():
+        if entry['sha1'] in required and entry['sha1'] not in uploads:
+            uploads[entry['sha1']] = deploy_path
+    changed = set(diff['added']) | set(diff['changed'])
+    unexpected = [path for path in uploads.values() if path not in changed]
+    if unexpected:
+        print(f"  Note: the API also needs {len(unexpected)} files unchanged since the last deploy")
+
+    print(f"Deploy {deploy['id']}: uploading {len(uploads)} files")
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        sizes = executor.map(
+            lambda deploy_path: upload_file(api_url, deploy['id'], token, deploy_path,
+                                            Path(root) / deploy_path.lstrip('/')),
+            sorted(uploads.values()))
+        for deploy_path, size in zip(sorted(uploads.values()), sizes):
+            stats['uploaded'] += 1
+            stats['uploaded_bytes'] += size
+            print(f"  Uploaded: {deploy_path}")
+
+    deploy = wait_until_ready(api_url, deploy['id'], token)
+    stats['state'] = deploy.get('state')
+    stats['deploy_id'] = deploy.get('id')
+    # Only a ready deploy is published; anything else is re-sent next time
+    if stats['state'] == 'ready':
+        build_manifest.save_manifest(deployed_path, manifest)
+    elif stats['state'] != 'error':
+        print(f"  Error: deploy {stats['deploy_id']} still {stats['state']} after waiting, not recorded as deployed")
+
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Deploy only changed files through the digest deploy API")
+    parser.add_argument('--root', default='.', help="site root (the Netlify publish directory)")
+    parser.add_argument('--api-url', default=os.environ.get('NETLIFY_API_URL', DEFAULT_API_URL))
+    parser.add_argument('--site-id', default=os.environ.get('NETLIFY_SITE_ID'))
+    parser.add_argument('--token', default=os.environ.get('NETLIFY_AUTH_TOKEN'))
+    parser.add_argument('--jobs', type=int, default=8, help="concurrent uploads")
+    parser.add_argument('--dry-run', action='store_true', help="only show what changed since the last deploy")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.dry_run and not (args.site_id and args.token):
+        print("Error: set NETLIFY_SITE_ID and NETLIFY_AUTH_TOKEN (or pass --site-id and --token)")
+        sys.exit(1)
+
+    stats = run_deploy(args.root, args.api_url.rstrip('/'), args.site_id, args.token,
+                       jobs=args.jobs, dry_run=args.dry_run)
+
+    print(f"\n{'='*50}")
+    if args.dry_run:
+        print("Dry run: nothing uploaded")
+    else:
+        print(f"Deploy {stats['deploy_id']}: {stats['state']}, uploaded {stats['uploaded']} files "
+              f"({output_writer.format_bytes(stats['uploaded_bytes'])})")
+    print(f"Finished in {stats['seconds']}s")
+    if not args.dry_run and stats['state'] != 'ready':
+        sys.exit(1)
+    return stats
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Dry-run mode shared by the HTML rewriters.
+
+    python3 html_pipeline.py --dry-run                     # the whole chain
+    python3 apply_universal_layout.py --dry-run --jobs 8   # any pipeline rewriter
+    python3 update_usa_clinics.py --dry-run
+
+Files are rewritten in memory on a process pool (one worker per CPU core
+unless --jobs says otherwise) and nothing under the site root is written.
+The unified diff of every file that would change goes to
+.build-cache/dry-run.diff (or --diff-out), and the summary reports the
+files touched, the lines and bytes added and removed, and the misses: per
+transform, the files it applied to but left unchanged - usually a pattern
+that no longer matches the pages.
+
+A rewriter provides a module-level function returning preview(...) or
+failed(...) for one file, and runs it with:
+
+    stats = collect(run(preview_file, items, workers), diff_path(root, args.diff_out))
+    print_summary(stats)
+"""
+
+import difflib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from build_graph import CACHE_DIR
+
+DIFF_FILE = 'dry-run.diff'
+
+
+def preview(rel, before, after, misses=()):
+    """Result of rewriting one file in memory: its diff and line/byte counts"""
+    result = {'rel': rel, 'changed': before != after, 'lines_added': 0, 'lines_removed': 0,
+              'bytes_added': 0, 'bytes_removed': 0, 'diff': '', 'misses': list(misses), 'error': None}
+    if not result['changed']:
+        return result
+    lines = list(difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True),
+                                      f"a/{rel}", f"b/{rel}"))
+    for line in lines[2:]:
+        if line.startswith('+'):
+            result['lines_added'] += 1
+            result['bytes_added'] += len(line.encode('utf-8')) - 1
+        elif line.startswith('-'):
+            result['lines_removed'] += 1
+            result['bytes_removed'] += len(line.encode('utf-8')) - 1
+    result['diff'] = ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n'
+                             for line in lines)
+    return result
+
+
+def failed(rel, error):
+    """Result of a file that could not be rewritten"""
+    return {'rel': rel, 'changed': False, 'error': error}
+
+
+def default_workers(jobs=None):
+    return jobs or os.cpu_count() or 1
+
+
+def run(func, items, workers=1):
+    """Yield func(*item) for every item in order, fanned out over a process
+    pool when workers > 1 (func must be a module-level function)"""
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(*item)
+        return
+
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, *zip(*items), chunksize=chunksize)
+
+
+def diff_path(root='.', diff_out=None):
+    return Path(diff_out) if diff_out else Path(root) / CACHE_DIR / DIFF_FILE
+
+
+def new_stats():
+    return {'files': 0, 'touched': 0, 'lines_added': 0, 'lines_removed': 0, 'bytes_added': 0,
+            'bytes_removed': 0, 'misses': {}, 'errors': [], 'diff': None}
+
+
+def collect(results, path):
+    """Stream the diffs of results to path and total them. Returns the stats."""
+    stats = new_stats()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as out:
+        for result in results:
+            stats['files'] += 1
+            if result['error']:
+                stats['errors'].append((result['rel'], result['error']))
+                continue
+            for name in result['misses']:
+                stats['misses'][name] = stats['misses'].get(name, 0) + 1
+            if not result['changed']:
+                continue
+            stats['touched'] += 1
+            for key in ('lines_added', 'lines_removed', 'bytes_added', 'bytes_removed'):
+                stats[key] += result[key]
+            out.write(result['diff'])
+    stats['diff'] = str(path)
+    return stats
+
+
+def print_summary(stats, label='Dry run'):
+    print(f"\n{'='*50}")
+    print(f"{label}: {stats['files']} files checked, {stats['touched']} would change, "
+          f"{len(stats['errors'])} errors - nothing written")
+    print(f"Lines: +{stats['lines_added']:,} -{stats['lines_removed']:,}   "
+          f"Bytes: +{stats['bytes_added']:,} -{stats['bytes_removed']:,}")
+    if stats['misses']:
+        print(f"\n{'Misses':<32}{'Files':>8}")
+        for name, count in sorted(stats['misses'].items()):
+            print(f"{name:<32}{count:>8}")
+    print(f"\nDiff written to {stats['diff']}")
+    if stats['errors']:
+        print("\nErrors:")
+        for rel, error in stats['errors'][:10]:
+            print(f"  {rel}: {error}")
+
+
+def add_arguments(parser):
+    """The dry-run options every rewriter accepts"""
+    parser.add_argument('--dry-run', action='store_true',
+                        help="rewrite in memory on a worker pool and report diffs and stats without writing")
+    parser.add_argument('--jobs', type=int, help="number of dry-run worker processes (default: one per CPU core)")
+    parser.add_argument('--diff-out', help=f"file for the dry-run diff (default: {CACHE_DIR}/{DIFF_FILE})")
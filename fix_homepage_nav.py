@@ -13,6 +13,10 @@ import os
 import re
 import json
 
+import profiling
+
+import html_regions
+
 # Paths
 BASE_DIR = '/home/ubuntu/stem-cells'
 INDEX_HTML = os.path.join(BASE_DIR, 'index.html')
@@ -832,9 +836,9 @@ def standardize_footer():
                     content = f.read()
                 
                 # Replace footer
-                footer_pattern = r'<footer[^>]*>.*?</footer>'
-                if re.search(footer_pattern, content, re.DOTALL):
-                    content = re.sub(footer_pattern, standard_footer.strip(), content, flags=re.DOTALL)
+                index = html_regions.index_page(content)
+                if html_regions.regions(index, 'footer'):
+                    content = html_regions.splice(content, html_regions.replace_regions(index, 'footer', standard_footer.strip()))
                     with open(filepath, 'w') as f:
                         f.write(content)
     
@@ -864,21 +868,30 @@ def check_mexico_images():
 # MAIN EXECUTION
 # ============================================
 
-if __name__ == '__main__':
+def main():
     print("=" * 50)
     print("StemCellPrices.com Homepage & Navigation Fix")
     print("=" * 50)
     
-    fix_broken_hrefs()
-    fix_popular_cities()
-    fix_nav_dropdown()
-    fix_city_links()
-    fix_compare_travel_costs()
-    fix_view_all_link()
-    create_mexico_locations()
-    standardize_footer()
-    check_mexico_images()
+    fixes = [
+        fix_broken_hrefs,
+        fix_popular_cities,
+        fix_nav_dropdown,
+        fix_city_links,
+        fix_compare_travel_costs,
+        fix_view_all_link,
+        create_mexico_locations,
+        standardize_footer,
+        check_mexico_images,
+    ]
+    for fix in fixes:
+        with profiling.stage(fix.__name__):
+            fix()
     
     print("\n" + "=" * 50)
     print("All fixes applied successfully!")
     print("=" * 50)
+
+
+if __name__ == '__main__':
+    profiling.run(main)
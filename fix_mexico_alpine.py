@@ -6,6 +6,8 @@ Script to add Alpine.js to Mexico clinic pages that are missing it.
 import os
 from pathlib import Path
 
+import profiling
+
 ALPINE_SCRIPT = '    <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>\n'
 
 def fix_mexico_clinic(filepath):
@@ -56,4 +58,4 @@ def main():
     print(f"Summary: Updated {updated}, Skipped {skipped}")
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -4,9 +4,11 @@ Fix SEO content formatting and add proper internal links
 """
 
 import os
-import re
 from pathlib import Path
 
+import html_regions
+import profiling
+
 # State data with cities and neighboring states for interlinking
 STATE_DATA = {
     "alaska": {"name": "Alaska", "cities": ["anchorage"], "neighbors": ["washington"], "abbrev": "AK"},
@@ -308,6 +310,22 @@ def get_city_seo_content(state_slug, city_slug, state_data):
 '''
     return content
 
+def replace_seo_section(content, new_seo_content):
+    """Replace the old SEO content section(s) ending at the medical disclaimer,
+    or insert the new content before the disclaimer if there are none"""
+    index = html_regions.index_page(content)
+    disclaimers = [start for start, end in html_regions.markers(index, 'disclaimer')]
+    disclaimer_starts = set(disclaimers)
+    
+    # Remove old SEO content section
+    edits = [(start, end, new_seo_content + '\n\n    ')
+             for start, end in html_regions.regions(index, 'seo') if end in disclaimer_starts]
+    if not edits:
+        # Insert before the medical disclaimer
+        edits = [(start, start, new_seo_content + '\n\n    ') for start in disclaimers]
+    
+    return html_regions.splice(content, edits)
+
 def update_state_page(state_slug):
     """Update a state page with new formatted SEO content"""
     file_path = Path(f"locations/{state_slug}/index.html")
@@ -320,18 +338,8 @@ def update_state_page(state_slug):
         return False
     
     content = file_path.read_text()
-    
-    # Remove old SEO content section
-    pattern = r'<!-- SEO Content Section -->.*?</div>\s*</div>\s*</div>\s*(?=<div class="bg-amber-50)'
     new_seo_content = get_state_seo_content(state_slug, STATE_DATA[state_slug])
-    
-    if re.search(pattern, content, re.DOTALL):
-        content = re.sub(pattern, new_seo_content + '\n\n    ', content, flags=re.DOTALL)
-    else:
-        # Insert before the medical disclaimer
-        disclaimer_pattern = r'(<div class="bg-amber-50 border-l-4 border-amber-400)'
-        content = re.sub(disclaimer_pattern, new_seo_content + '\n\n    \\1', content)
-    
+    content = replace_seo_section(content, new_seo_content)
     file_path.write_text(content)
     return True
 
@@ -347,18 +355,8 @@ def update_city_page(state_slug, city_slug):
         return False
     
     content = file_path.read_text()
-    
-    # Remove old SEO content section
-    pattern = r'<!-- SEO Content Section -->.*?</div>\s*</div>\s*</div>\s*(?=<div class="bg-amber-50)'
     new_seo_content = get_city_seo_content(state_slug, city_slug, STATE_DATA[state_slug])
-    
-    if re.search(pattern, content, re.DOTALL):
-        content = re.sub(pattern, new_seo_content + '\n\n    ', content, flags=re.DOTALL)
-    else:
-        # Insert before the medical disclaimer
-        disclaimer_pattern = r'(<div class="bg-amber-50 border-l-4 border-amber-400)'
-        content = re.sub(disclaimer_pattern, new_seo_content + '\n\n    \\1', content)
-    
+    content = replace_seo_section(content, new_seo_content)
     file_path.write_text(content)
     return True
 
@@ -386,4 +384,4 @@ def main():
     print(f"\nTotal pages updated: {state_count + city_count}")
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
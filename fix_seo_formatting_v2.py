@@ -5,9 +5,11 @@ Properly removes old content and adds new beautifully formatted content
 """
 
 import os
-import re
 from pathlib import Path
 
+import html_regions
+import profiling
+
 # State data with cities and neighboring states for interlinking
 STATE_DATA = {
     "alaska": {"name": "Alaska", "cities": ["anchorage"], "neighbors": ["washington"], "abbrev": "AK"},
@@ -306,38 +308,19 @@ def get_city_seo_content(state_slug, city_slug, state_data):
 def update_page(file_path, new_content):
     """Update a page by removing all old SEO content and adding new content"""
     content = file_path.read_text()
+    index = html_regions.index_page(content)
     
-    # Remove ALL SEO Content Sections (there might be multiple)
-    while '<!-- SEO Content Section -->' in content:
-        # Find start of SEO section
-        start_marker = '<!-- SEO Content Section -->'
-        start_idx = content.find(start_marker)
-        if start_idx == -1:
-            break
-        
-        # Find the medical disclaimer which comes after
-        end_marker = '<div class="bg-amber-50 border-l-4 border-amber-400'
-        end_idx = content.find(end_marker, start_idx)
-        
-        if end_idx == -1:
-            # If no disclaimer found, try to find the footer
-            end_marker = '<!-- Footer -->'
-            end_idx = content.find(end_marker, start_idx)
-        
-        if end_idx == -1:
-            # Last resort - find closing divs pattern
-            break
-        
-        # Remove the SEO section
-        content = content[:start_idx] + content[end_idx:]
+    # Remove ALL SEO Content Sections (there might be multiple). Each one runs
+    # up to the medical disclaimer after it, or failing that the footer.
+    edits = html_regions.replace_regions(index, 'seo', '')
     
     # Now insert the new content before the medical disclaimer
-    disclaimer_marker = '<div class="bg-amber-50 border-l-4 border-amber-400'
-    disclaimer_idx = content.find(disclaimer_marker)
-    
-    if disclaimer_idx != -1:
-        content = content[:disclaimer_idx] + new_content + '    ' + content[disclaimer_idx:]
+    disclaimers = html_regions.markers(index, 'disclaimer')
+    if disclaimers:
+        disclaimer_idx = disclaimers[0][0]
+        edits.append((disclaimer_idx, disclaimer_idx, new_content + '    '))
     
+    content = html_regions.splice(content, edits)
     file_path.write_text(content)
     return True
 
@@ -371,4 +354,4 @@ def main():
     print(f"\nTotal pages updated: {state_count + city_count}")
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
@@ -9,12 +9,9 @@ import os
 import re
 from pathlib import Path
 
-def slugify(text):
-    """Convert text to URL-friendly slug"""
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
-    return text.strip('-')[:60]
+from build_graph import content_hash, page_job
+import profiling
+import record_ids
 
 # Blog post templates from FAQ data - map FAQ ids to blog topics
 BLOG_POSTS = [
@@ -81,11 +78,16 @@ BLOG_POSTS = [
 ]
 
 
-def load_faqs():
-    """Load FAQ data from JSON file"""
-    with open('api/faqs.json', 'r') as f:
+def load_faqs(root='.'):
+    """Load FAQ data from JSON file, indexed by ID and by any older (migrated) ID"""
+    with open(Path(root) / 'api/faqs.json', 'r') as f:
         data = json.load(f)
-    return {faq['id']: faq for faq in data['faqs']}
+    faqs = {faq['id']: faq for faq in data['faqs']}
+    # BLOG_POSTS still names FAQs by their original positional IDs
+    for old_id, new_id in record_ids.load_migrations(Path(root) / 'api').items():
+        if new_id in faqs:
+            faqs.setdefault(old_id, faqs[new_id])
+    return faqs
 
 
 def generate_blog_post(post, faq):
@@ -583,42 +585,32 @@ def generate_blog_index(posts, faqs):
     return html
 
 
-def main():
-    """Generate all blog pages"""
-    print("Generating blog pages...")
-
-    # Load FAQs
-    faqs = load_faqs()
-
-    # Create blog directory
-    blog_dir = Path('blog')
-    blog_dir.mkdir(exist_ok=True)
+def iter_pages(root='.'):
+    """Yield a build job for the blog index and every blog post"""
+    with profiling.stage('load'):
+        faqs = load_faqs(root)
 
-    # Generate blog index
-    index_html = generate_blog_index(BLOG_POSTS, faqs)
-    with open(blog_dir / 'index.html', 'w') as f:
-        f.write(index_html)
-    print(f"  Generated: blog/index.html")
+    index_faqs = {post['faq_id']: content_hash(faqs.get(post['faq_id'])) for post in BLOG_POSTS}
+    yield page_job('blog/index.html', generate_blog_index, (BLOG_POSTS, faqs),
+                   {f"faq:{faq_id}": digest for faq_id, digest in index_faqs.items()},
+                   entity='blog', fields={'posts': len(BLOG_POSTS)})
 
-    # Generate individual posts
     for post in BLOG_POSTS:
         faq = faqs.get(post['faq_id'])
         if not faq:
             print(f"  Warning: FAQ {post['faq_id']} not found, skipping")
             continue
+        yield page_job(f"blog/{post['slug']}/index.html", generate_blog_post, (post, faq),
+                       {f"faq:{faq['id']}": content_hash(faq)},
+                       entity=f"faq:{faq['id']}", fields={'name': post['title']})
 
-        # Create post directory
-        post_dir = blog_dir / post['slug']
-        post_dir.mkdir(exist_ok=True)
 
-        # Generate post
-        post_html = generate_blog_post(post, faq)
-        with open(post_dir / 'index.html', 'w') as f:
-            f.write(post_html)
-        print(f"  Generated: blog/{post['slug']}/index.html")
-
-    print(f"\nTotal blog pages generated: {len(BLOG_POSTS) + 1}")
+def main():
+    """Generate all blog pages"""
+    print("Generating blog pages...")
+    from build import main as build_main
+    build_main(generators=['generate_blog'])
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 """
 Generate Procedure Cost Guide Pages for SleepApneaMatch.com
-Creates comprehensive cost guide pages for each major sleep apnea procedure
+Creates comprehensive cost guide pages for each major sleep apnea procedure,
+listing the states with providers offering it from the provider store's
+procedure index
 """
 
 import json
 import os
-from pathlib import Path
+
+from build_graph import content_hash, page_job
+import location_stats
+import profiling
+import provider_store
+from slugs import slugify
+import templates
+
+# Providers counted on the cost guides
+PROVIDER_SOURCES = sorted(provider_store.CLINICS_JSON_SOURCES)
 
 # Procedure data with comprehensive information
 PROCEDURES = {
@@ -228,145 +239,89 @@ PROCEDURES = {
     }
 }
 
-def generate_cost_guide_page(procedure):
-    """Generate the main cost guide page for a procedure"""
-    p = PROCEDURES[procedure]
-
-    considerations_html = ""
-    for consideration in p['considerations']:
-        considerations_html += f'''<li class="flex items-start gap-3">
-                            <svg class="w-5 h-5 text-primary mt-0.5 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-                            </svg>
-                            <span class="text-slate-600">{consideration}</span>
-                        </li>'''
-
-    compare_procedures_html = ""
-    for proc_id, proc in PROCEDURES.items():
-        active_class = 'bg-primary/10' if proc['id'] == procedure else ''
-        compare_procedures_html += f'''<a href="/{proc['slug']}/" class="block p-3 rounded-lg hover:bg-slate-50 transition-colors {active_class}">
-                                    <div class="font-medium text-slate-800">{proc['short_name']}</div>
-                                    <div class="text-sm text-slate-500">${proc['price_range']['low']:,} - ${proc['price_range']['high']:,}</div>
-                                </a>'''
-
-    html = f'''<!DOCTYPE html>
+# Procedure cost guide page; see templates.py for the {{ }} placeholder syntax
+COST_GUIDE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{p['short_name']} Cost Guide 2026 | {p['name']} Prices | SleepApneaMatch.com</title>
-    <meta name="description" content="{p['meta_description']}">
-    <meta name="keywords" content="{p['short_name']} cost, {p['short_name']} price, {p['short_name']} surgery cost, sleep apnea surgery cost, {p['short_name']} insurance">
+    <title>{{p.short_name}} Cost Guide 2026 | {{p.name}} Prices | SleepApneaMatch.com</title>
+    <meta name="description" content="{{p.meta_description}}">
+    <meta name="keywords" content="{{p.short_name}} cost, {{p.short_name}} price, {{p.short_name}} surgery cost, sleep apnea surgery cost, {{p.short_name}} insurance">
 
     <!-- Open Graph -->
-    <meta property="og:title" content="{p['short_name']} Surgery Cost Guide 2026 | SleepApneaMatch.com">
-    <meta property="og:description" content="{p['meta_description']}">
-    <meta property="og:image" content="https://sleepapneamatch.com/assets/images/og-{procedure}.jpg">
-    <meta property="og:url" content="https://sleepapneamatch.com/{p['slug']}/">
+    <meta property="og:title" content="{{p.short_name}} Surgery Cost Guide 2026 | SleepApneaMatch.com">
+    <meta property="og:description" content="{{p.meta_description}}">
+    <meta property="og:image" content="https://sleepapneamatch.com/assets/images/og-{{procedure}}.jpg">
+    <meta property="og:url" content="https://sleepapneamatch.com/{{p.slug}}/">
     <meta property="og:type" content="article">
 
     <!-- Twitter Card -->
     <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:title" content="{p['short_name']} Surgery Cost Guide 2026">
-    <meta name="twitter:description" content="{p['meta_description']}">
+    <meta name="twitter:title" content="{{p.short_name}} Surgery Cost Guide 2026">
+    <meta name="twitter:description" content="{{p.meta_description}}">
 
     <!-- Canonical -->
-    <link rel="canonical" href="https://sleepapneamatch.com/{p['slug']}/">
+    <link rel="canonical" href="https://sleepapneamatch.com/{{p.slug}}/">
 
     <!-- Tailwind CSS -->
     <script src="https://cdn.tailwindcss.com"></script>
     <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
+        tailwind.config = {
+            theme: {
+                extend: {
+                    colors: {
                         primary: '#2563eb',
                         secondary: '#1e40af'
-                    }}
-                }}
-            }}
-        }}
+                    }
+                }
+            }
+        }
     </script>
 
     <!-- Schema.org -->
     <script type="application/ld+json">
-    {{
+    {
         "@context": "https://schema.org",
         "@type": "MedicalWebPage",
-        "name": "{p['name']} Cost Guide",
-        "description": "{p['meta_description']}",
-        "url": "https://sleepapneamatch.com/{p['slug']}/",
+        "name": "{{p.name}} Cost Guide",
+        "description": "{{p.meta_description}}",
+        "url": "https://sleepapneamatch.com/{{p.slug}}/",
         "datePublished": "2026-01-10",
         "dateModified": "2026-01-10",
-        "author": {{
+        "author": {
             "@type": "Organization",
             "name": "SleepApneaMatch.com"
-        }},
-        "reviewedBy": {{
+        },
+        "reviewedBy": {
             "@type": "Person",
             "name": "Dr. Igor I. Bussel, MD",
             "jobTitle": "Board-Certified Physician",
-            "affiliation": {{
+            "affiliation": {
                 "@type": "Organization",
                 "name": "University of California, Irvine"
-            }}
-        }},
-        "about": {{
+            }
+        },
+        "about": {
             "@type": "MedicalProcedure",
-            "name": "{p['name']}",
+            "name": "{{p.name}}",
             "procedureType": "Surgical",
-            "description": "{p['description']}"
-        }}
-    }}
+            "description": "{{p.description}}"
+        }
+    }
     </script>
 
     <style>
-        .glass-panel {{
+        .glass-panel {
             background: rgba(255, 255, 255, 0.85);
             backdrop-filter: blur(10px);
             -webkit-backdrop-filter: blur(10px);
-        }}
+        }
     </style>
 </head>
 <body class="bg-slate-50 text-slate-800">
     <!-- Navigation -->
-    <nav class="bg-white shadow-sm sticky top-0 z-50">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <div class="w-8 h-8 bg-primary rounded-lg flex items-center justify-center">
-                        <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
-                        </svg>
-                    </div>
-                    <span class="font-bold text-xl text-slate-800">SleepApneaMatch</span>
-                </a>
-                <div class="hidden md:flex items-center gap-6">
-                    <a href="/locations/" class="text-slate-600 hover:text-primary">Find Providers</a>
-                    <div class="relative group">
-                        <button class="text-slate-600 hover:text-primary flex items-center gap-1">
-                            Cost Guides
-                            <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
-                            </svg>
-                        </button>
-                        <div class="absolute top-full left-0 mt-2 w-64 bg-white rounded-xl shadow-lg opacity-0 invisible group-hover:opacity-100 group-hover:visible transition-all duration-200 p-2">
-                            <a href="/inspire-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Inspire Therapy</a>
-                            <a href="/mma-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">MMA Surgery</a>
-                            <a href="/uppp-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">UPPP Surgery</a>
-                            <a href="/tors-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">TORS (Robotic Surgery)</a>
-                            <a href="/tonsillectomy-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Tonsillectomy</a>
-                            <a href="/genioglossus-advancement-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Genioglossus Adv.</a>
-                            <a href="/septoplasty-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Septoplasty</a>
-                            <a href="/turbinate-reduction-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Turbinate Reduction</a>
-                        </div>
-                    </div>
-                    <a href="/blog/" class="text-slate-600 hover:text-primary">Blog</a>
-                    <a href="/faq/" class="text-slate-600 hover:text-primary">FAQ</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    {{> cost_guide_nav }}
 
     <!-- Breadcrumbs -->
     <div class="bg-slate-100 border-b">
@@ -374,7 +329,7 @@ def generate_cost_guide_page(procedure):
             <nav class="flex text-sm">
                 <a href="/" class="text-slate-500 hover:text-primary">Home</a>
                 <span class="mx-2 text-slate-400">/</span>
-                <span class="text-slate-700">{p['short_name']} Cost Guide</span>
+                <span class="text-slate-700">{{p.short_name}} Cost Guide</span>
             </nav>
         </div>
     </div>
@@ -390,8 +345,8 @@ def generate_cost_guide_page(procedure):
                         </svg>
                         Updated January 2026
                     </div>
-                    <h1 class="text-4xl md:text-5xl font-bold mb-4">{p['name']} Cost Guide</h1>
-                    <p class="text-xl text-blue-100 mb-6">{p['description']}</p>
+                    <h1 class="text-4xl md:text-5xl font-bold mb-4">{{p.name}} Cost Guide</h1>
+                    <p class="text-xl text-blue-100 mb-6">{{p.description}}</p>
                     <div class="flex flex-wrap gap-4">
                         <a href="#providers" class="bg-white text-primary px-6 py-3 rounded-lg font-semibold hover:bg-blue-50 transition-colors">
                             Find Providers
@@ -404,19 +359,19 @@ def generate_cost_guide_page(procedure):
 
                 <!-- Price Panel -->
                 <div class="glass-panel rounded-2xl p-8 text-slate-800">
-                    <h2 class="text-lg font-semibold mb-4">2026 {p['short_name']} Cost Summary</h2>
+                    <h2 class="text-lg font-semibold mb-4">2026 {{p.short_name}} Cost Summary</h2>
                     <div class="space-y-4">
                         <div class="flex justify-between items-center pb-4 border-b">
                             <span class="text-slate-600">Price Range</span>
-                            <span class="text-2xl font-bold text-primary">${p['price_range']['low']:,} - ${p['price_range']['high']:,}</span>
+                            <span class="text-2xl font-bold text-primary">${{p.price_range.low:,}} - ${{p.price_range.high:,}}</span>
                         </div>
                         <div class="flex justify-between items-center pb-4 border-b">
                             <span class="text-slate-600">Average Cost</span>
-                            <span class="text-xl font-semibold">${p['price_range']['median']:,}</span>
+                            <span class="text-xl font-semibold">${{p.price_range.median:,}}</span>
                         </div>
                         <div class="flex justify-between items-center pb-4 border-b">
                             <span class="text-slate-600">Success Rate</span>
-                            <span class="text-xl font-semibold text-green-600">{p['success_rate']['min']}-{p['success_rate']['max']}%</span>
+                            <span class="text-xl font-semibold text-green-600">{{p.success_rate.min}}-{{p.success_rate.max}}%</span>
                         </div>
                         <div class="flex justify-between items-center pb-4 border-b">
                             <span class="text-slate-600">Insurance</span>
@@ -424,12 +379,12 @@ def generate_cost_guide_page(procedure):
                                 <svg class="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
                                 </svg>
-                                {'Typically Covered' if p['insurance_covered'] else 'Varies'}
+                                {{coverage_label}}
                             </span>
                         </div>
                         <div class="flex justify-between items-center">
                             <span class="text-slate-600">Recovery Time</span>
-                            <span class="font-medium">{p['recovery_time']}</span>
+                            <span class="font-medium">{{p.recovery_time}}</span>
                         </div>
                     </div>
                 </div>
@@ -461,13 +416,13 @@ def generate_cost_guide_page(procedure):
             <div class="grid lg:grid-cols-3 gap-12">
                 <!-- Main Content -->
                 <div class="lg:col-span-2">
-                    <h2 class="text-3xl font-bold mb-6">What is {p['name']}?</h2>
-                    <p class="text-lg text-slate-600 mb-8">{p['long_description']}</p>
+                    <h2 class="text-3xl font-bold mb-6">What is {{p.name}}?</h2>
+                    <p class="text-lg text-slate-600 mb-8">{{p.long_description}}</p>
 
-                    <h3 class="text-2xl font-bold mb-4">How Much Does {p['short_name']} Cost in 2026?</h3>
+                    <h3 class="text-2xl font-bold mb-4">How Much Does {{p.short_name}} Cost in 2026?</h3>
                     <p class="text-slate-600 mb-6">
-                        The cost of {p['short_name']} surgery ranges from <strong>${p['price_range']['low']:,} to ${p['price_range']['high']:,}</strong>,
-                        with an average cost of approximately <strong>${p['price_range']['median']:,}</strong>. These costs can vary significantly based on:
+                        The cost of {{p.short_name}} surgery ranges from <strong>${{p.price_range.low:,}} to ${{p.price_range.high:,}}</strong>,
+                        with an average cost of approximately <strong>${{p.price_range.median:,}}</strong>. These costs can vary significantly based on:
                     </p>
                     <ul class="list-disc list-inside text-slate-600 mb-8 space-y-2">
                         <li>Geographic location and local cost of living</li>
@@ -478,56 +433,56 @@ def generate_cost_guide_page(procedure):
                         <li>Your insurance coverage and deductible</li>
                     </ul>
 
-                    <h3 class="text-2xl font-bold mb-4">{p['short_name']} Success Rates</h3>
+                    <h3 class="text-2xl font-bold mb-4">{{p.short_name}} Success Rates</h3>
                     <div class="bg-gradient-to-r from-green-50 to-emerald-50 rounded-xl p-6 mb-8">
                         <div class="grid md:grid-cols-3 gap-6">
                             <div class="text-center">
-                                <div class="text-3xl font-bold text-green-600">{p['success_rate']['min']}-{p['success_rate']['max']}%</div>
+                                <div class="text-3xl font-bold text-green-600">{{p.success_rate.min}}-{{p.success_rate.max}}%</div>
                                 <div class="text-sm text-slate-600 mt-1">Success Rate</div>
                             </div>
                             <div class="text-center">
-                                <div class="text-3xl font-bold text-green-600">{p['cure_rate']['min']}-{p['cure_rate']['max']}%</div>
+                                <div class="text-3xl font-bold text-green-600">{{p.cure_rate.min}}-{{p.cure_rate.max}}%</div>
                                 <div class="text-sm text-slate-600 mt-1">Cure Rate</div>
                             </div>
                             <div class="text-center">
-                                <div class="text-3xl font-bold text-green-600">{p['ahi_reduction']['min']}-{p['ahi_reduction']['max']}%</div>
+                                <div class="text-3xl font-bold text-green-600">{{p.ahi_reduction.min}}-{{p.ahi_reduction.max}}%</div>
                                 <div class="text-sm text-slate-600 mt-1">AHI Reduction</div>
                             </div>
                         </div>
                     </div>
 
                     <h3 class="text-2xl font-bold mb-4">Who is a Good Candidate?</h3>
-                    <p class="text-slate-600 mb-6"><strong>Best for:</strong> {p['best_for']}</p>
+                    <p class="text-slate-600 mb-6"><strong>Best for:</strong> {{p.best_for}}</p>
 
                     <h3 class="text-2xl font-bold mb-4">Important Considerations</h3>
                     <ul class="space-y-3 mb-8">
-                        {considerations_html}
+                        {{considerations_html}}
                     </ul>
 
                     <h3 class="text-2xl font-bold mb-4">Recovery & Downtime</h3>
                     <div class="grid md:grid-cols-3 gap-4 mb-8">
                         <div class="bg-slate-100 rounded-xl p-4 text-center">
-                            <div class="text-lg font-bold text-slate-800">{p['recovery_time']}</div>
+                            <div class="text-lg font-bold text-slate-800">{{p.recovery_time}}</div>
                             <div class="text-sm text-slate-500">Full Recovery</div>
                         </div>
                         <div class="bg-slate-100 rounded-xl p-4 text-center">
-                            <div class="text-lg font-bold text-slate-800">{p['hospital_stay']}</div>
+                            <div class="text-lg font-bold text-slate-800">{{p.hospital_stay}}</div>
                             <div class="text-sm text-slate-500">Hospital Stay</div>
                         </div>
                         <div class="bg-slate-100 rounded-xl p-4 text-center">
-                            <div class="text-lg font-bold text-slate-800">{p['work_return']}</div>
+                            <div class="text-lg font-bold text-slate-800">{{p.work_return}}</div>
                             <div class="text-sm text-slate-500">Return to Work</div>
                         </div>
                     </div>
 
                     <h3 class="text-2xl font-bold mb-4">Insurance Coverage</h3>
                     <p class="text-slate-600 mb-4">
-                        {p['short_name']} is {'typically covered by insurance' if p['insurance_covered'] else 'coverage varies by insurance'}
+                        {{p.short_name}} is {{coverage_summary}}
                         when deemed medically necessary for obstructive sleep apnea treatment.
-                        {'Most major insurance companies, including Medicare, cover this procedure when patients meet specific criteria.' if p['insurance_covered'] else ''}
+                        {{coverage_detail}}
                     </p>
                     <p class="text-slate-600 mb-8">
-                        <strong>CPT Code(s):</strong> {', '.join(p['cpt_codes'])}
+                        <strong>CPT Code(s):</strong> {{cpt_codes}}
                     </p>
                 </div>
 
@@ -544,7 +499,7 @@ def generate_cost_guide_page(procedure):
                                 </div>
                                 <div class="flex justify-between">
                                     <span class="text-slate-500">Anesthesia</span>
-                                    <span class="font-medium">{p['anesthesia']}</span>
+                                    <span class="font-medium">{{p.anesthesia}}</span>
                                 </div>
                                 <div class="flex justify-between">
                                     <span class="text-slate-500">Procedure Time</span>
@@ -552,15 +507,15 @@ def generate_cost_guide_page(procedure):
                                 </div>
                                 <div class="flex justify-between">
                                     <span class="text-slate-500">CPT Code</span>
-                                    <span class="font-medium">{p['cpt_codes'][0]}</span>
+                                    <span class="font-medium">{{primary_cpt_code}}</span>
                                 </div>
                             </div>
                         </div>
 
                         <!-- CTA -->
                         <div class="bg-gradient-to-br from-primary to-secondary rounded-xl p-6 text-white">
-                            <h3 class="font-bold text-lg mb-2">Find {p['short_name']} Providers</h3>
-                            <p class="text-blue-100 text-sm mb-4">Compare 45+ verified sleep surgery specialists in your area.</p>
+                            <h3 class="font-bold text-lg mb-2">Find {{p.short_name}} Providers</h3>
+                            <p class="text-blue-100 text-sm mb-4">Compare {{total_providers}} verified sleep surgery specialists in your area.</p>
                             <a href="/locations/" class="block w-full bg-white text-primary text-center py-3 rounded-lg font-semibold hover:bg-blue-50 transition-colors">
                                 View Providers
                             </a>
@@ -570,7 +525,7 @@ def generate_cost_guide_page(procedure):
                         <div class="bg-white rounded-xl shadow-lg p-6">
                             <h3 class="font-bold text-lg mb-4">Compare Procedures</h3>
                             <div class="space-y-3">
-                                {compare_procedures_html}
+                                {{compare_procedures_html}}
                             </div>
                         </div>
                     </div>
@@ -582,11 +537,12 @@ def generate_cost_guide_page(procedure):
     <!-- Providers Section -->
     <section class="bg-white py-16" id="providers">
         <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <h2 class="text-3xl font-bold mb-8 text-center">Find {p['short_name']} Providers Near You</h2>
+            <h2 class="text-3xl font-bold mb-8 text-center">Find {{p.short_name}} Providers Near You</h2>
             <p class="text-center text-slate-600 mb-12 max-w-2xl mx-auto">
-                Compare 45+ verified sleep surgery specialists across the United States.
-                All providers are experienced in {p['short_name']} and other sleep apnea surgical treatments.
+                {{providers_summary}}
+                All providers are experienced in {{p.short_name}} and other sleep apnea surgical treatments.
             </p>
+            {{provider_states_html}}
             <div class="text-center">
                 <a href="/locations/" class="inline-flex items-center gap-2 bg-primary text-white px-8 py-4 rounded-xl font-semibold hover:bg-secondary transition-colors">
                     <svg class="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -605,102 +561,138 @@ def generate_cost_guide_page(procedure):
             <h2 class="text-3xl font-bold mb-8 text-center">Frequently Asked Questions</h2>
             <div class="space-y-4">
                 <div class="bg-white rounded-xl p-6 shadow-sm">
-                    <h3 class="font-bold text-lg mb-2">How much does {p['short_name']} cost without insurance?</h3>
-                    <p class="text-slate-600">Without insurance, {p['short_name']} typically costs between ${p['price_range']['low']:,} and ${p['price_range']['high']:,}, depending on the provider, location, and complexity of the case. Many providers offer payment plans or financing options.</p>
+                    <h3 class="font-bold text-lg mb-2">How much does {{p.short_name}} cost without insurance?</h3>
+                    <p class="text-slate-600">Without insurance, {{p.short_name}} typically costs between ${{p.price_range.low:,}} and ${{p.price_range.high:,}}, depending on the provider, location, and complexity of the case. Many providers offer payment plans or financing options.</p>
                 </div>
                 <div class="bg-white rounded-xl p-6 shadow-sm">
-                    <h3 class="font-bold text-lg mb-2">Is {p['short_name']} covered by insurance?</h3>
-                    <p class="text-slate-600">{'Yes, ' + p['short_name'] + ' is typically covered by insurance when deemed medically necessary for obstructive sleep apnea. Most patients need to have tried CPAP therapy first. Check with your insurance provider for specific coverage details.' if p['insurance_covered'] else 'Coverage varies by insurance plan. Contact your provider for specific details.'}</p>
+                    <h3 class="font-bold text-lg mb-2">Is {{p.short_name}} covered by insurance?</h3>
+                    <p class="text-slate-600">{{insurance_answer}}</p>
                 </div>
                 <div class="bg-white rounded-xl p-6 shadow-sm">
-                    <h3 class="font-bold text-lg mb-2">What is the success rate of {p['short_name']}?</h3>
-                    <p class="text-slate-600">{p['short_name']} has a success rate of {p['success_rate']['min']}-{p['success_rate']['max']}% in reducing sleep apnea severity. The procedure can reduce AHI (apnea-hypopnea index) by {p['ahi_reduction']['min']}-{p['ahi_reduction']['max']}% on average.</p>
+                    <h3 class="font-bold text-lg mb-2">What is the success rate of {{p.short_name}}?</h3>
+                    <p class="text-slate-600">{{p.short_name}} has a success rate of {{p.success_rate.min}}-{{p.success_rate.max}}% in reducing sleep apnea severity. The procedure can reduce AHI (apnea-hypopnea index) by {{p.ahi_reduction.min}}-{{p.ahi_reduction.max}}% on average.</p>
                 </div>
                 <div class="bg-white rounded-xl p-6 shadow-sm">
-                    <h3 class="font-bold text-lg mb-2">How long is recovery after {p['short_name']}?</h3>
-                    <p class="text-slate-600">Full recovery from {p['short_name']} typically takes {p['recovery_time']}. Most patients can return to work in {p['work_return']}. Hospital stay is usually {p['hospital_stay'].lower()}.</p>
+                    <h3 class="font-bold text-lg mb-2">How long is recovery after {{p.short_name}}?</h3>
+                    <p class="text-slate-600">Full recovery from {{p.short_name}} typically takes {{p.recovery_time}}. Most patients can return to work in {{p.work_return}}. Hospital stay is usually {{hospital_stay}}.</p>
                 </div>
             </div>
         </div>
     </section>
 
     <!-- Footer -->
-    <footer class="bg-slate-900 text-slate-400 py-16">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="grid md:grid-cols-4 gap-8">
-                <div>
-                    <div class="flex items-center gap-2 mb-4">
-                        <div class="w-8 h-8 bg-primary rounded-lg flex items-center justify-center">
-                            <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
-                            </svg>
-                        </div>
-                        <span class="font-bold text-white">SleepApneaMatch</span>
-                    </div>
-                    <p class="text-sm">Connecting patients with verified sleep apnea surgery specialists nationwide.</p>
-                </div>
-                <div>
-                    <h4 class="font-semibold text-white mb-4">Cost Guides</h4>
-                    <ul class="space-y-2 text-sm">
-                        <li><a href="/inspire-cost-guide/" class="hover:text-white">Inspire Therapy</a></li>
-                        <li><a href="/mma-cost-guide/" class="hover:text-white">MMA Surgery</a></li>
-                        <li><a href="/uppp-cost-guide/" class="hover:text-white">UPPP Surgery</a></li>
-                        <li><a href="/tors-cost-guide/" class="hover:text-white">TORS</a></li>
-                        <li><a href="/tonsillectomy-cost-guide/" class="hover:text-white">Tonsillectomy</a></li>
-                        <li><a href="/septoplasty-cost-guide/" class="hover:text-white">Septoplasty</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h4 class="font-semibold text-white mb-4">Resources</h4>
-                    <ul class="space-y-2 text-sm">
-                        <li><a href="/locations/" class="hover:text-white">Find Providers</a></li>
-                        <li><a href="/blog/" class="hover:text-white">Blog</a></li>
-                        <li><a href="/faq/" class="hover:text-white">FAQ</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h4 class="font-semibold text-white mb-4">Medical Review</h4>
-                    <div class="flex items-center gap-3">
-                        <img src="/assets/images/dr_igor.jpg" alt="Dr. Igor I. Bussel" class="w-10 h-10 rounded-full object-cover">
-                        <div class="text-sm">
-                            <div class="text-white font-medium">Dr. Igor I. Bussel, MD</div>
-                            <div class="text-xs">Board-Certified Physician</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            <div class="border-t border-slate-800 mt-12 pt-8 text-center text-sm">
-                <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
-                <p class="mt-2 text-xs">Information provided is for educational purposes only and should not replace medical advice.</p>
-            </div>
-        </div>
-    </footer>
+    {{> cost_guide_footer }}
 </body>
 </html>'''
-    return html
 
+templates.define('cost_guide_page', COST_GUIDE_TEMPLATE)
+
+
+def provider_states(index, procedure, directories):
+    """[[state, provider count, cities, has a directory page]] of the providers
+    offering a procedure, most providers first"""
+    states = [[state, sum(len(ids) for ids in cities.values()), sorted(cities), state in directories]
+              for state, cities in index.get(procedure, {}).items()]
+    return sorted(states, key=lambda item: (-item[1], item[0]))
+
+
+def provider_states_html(states):
+    if not states:
+        return ''
+    cards = ''
+    for state, count, cities, linked in states:
+        body = f'''<div class="font-semibold text-slate-800">{state}</div>
+                    <div class="text-sm text-slate-500">{count} provider{'s' if count != 1 else ''} &middot; {', '.join(cities)}</div>'''
+        if linked:
+            cards += f'''
+                <a href="/locations/{slugify(state)}/" class="block p-4 rounded-xl bg-slate-50 hover:bg-slate-100 transition-colors">
+                    {body}
+                </a>'''
+        else:
+            cards += f'''
+                <div class="p-4 rounded-xl bg-slate-50">
+                    {body}
+                </div>'''
+    return f'''<div class="grid sm:grid-cols-2 lg:grid-cols-4 gap-4 mb-12">{cards}
+            </div>'''
+
+
+def generate_cost_guide_page(procedure, states=(), totals=None):
+    """Generate the main cost guide page for a procedure; totals is the
+    site-wide {'providers', 'state_count'} of the sleep providers"""
+    p = PROCEDURES[procedure]
+    totals = totals or {'providers': 0, 'state_count': 0}
+    provider_count = sum(count for _, count, _, _ in states)
+    if provider_count:
+        providers_summary = (f"Compare {provider_count} verified sleep surgery specialist{'s' if provider_count != 1 else ''} "
+                             f"offering {p['short_name']} in {len(states)} state{'s' if len(states) != 1 else ''}.")
+    elif totals['providers']:
+        providers_summary = (f"Compare {totals['providers']} verified sleep surgery specialists "
+                             f"in {totals['state_count']} state{'s' if totals['state_count'] != 1 else ''}.")
+    else:
+        providers_summary = ''
 
-def main():
-    """Generate all cost guide pages"""
-    print("Generating procedure cost guide pages...")
+    considerations_html = ""
+    for consideration in p['considerations']:
+        considerations_html += f'''<li class="flex items-start gap-3">
+                            <svg class="w-5 h-5 text-primary mt-0.5 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
+                            </svg>
+                            <span class="text-slate-600">{consideration}</span>
+                        </li>'''
 
-    for procedure_id, procedure in PROCEDURES.items():
-        # Create directory
-        dir_path = Path(procedure['slug'])
-        dir_path.mkdir(parents=True, exist_ok=True)
+    compare_procedures_html = ""
+    for proc_id, proc in PROCEDURES.items():
+        active_class = 'bg-primary/10' if proc['id'] == procedure else ''
+        compare_procedures_html += f'''<a href="/{proc['slug']}/" class="block p-3 rounded-lg hover:bg-slate-50 transition-colors {active_class}">
+                                    <div class="font-medium text-slate-800">{proc['short_name']}</div>
+                                    <div class="text-sm text-slate-500">${proc['price_range']['low']:,} - ${proc['price_range']['high']:,}</div>
+                                </a>'''
 
-        # Generate main page
-        html = generate_cost_guide_page(procedure_id)
+    html = templates.render(
+        'cost_guide_page',
+        p=p,
+        procedure=procedure,
+        considerations_html=considerations_html,
+        compare_procedures_html=compare_procedures_html,
+        providers_summary=providers_summary,
+        total_providers=totals['providers'],
+        provider_states_html=provider_states_html(states),
+        coverage_label='Typically Covered' if p['insurance_covered'] else 'Varies',
+        coverage_summary='typically covered by insurance' if p['insurance_covered'] else 'coverage varies by insurance',
+        coverage_detail='Most major insurance companies, including Medicare, cover this procedure when patients meet specific criteria.' if p['insurance_covered'] else '',
+        cpt_codes=', '.join(p['cpt_codes']),
+        primary_cpt_code=p['cpt_codes'][0],
+        insurance_answer='Yes, ' + p['short_name'] + ' is typically covered by insurance when deemed medically necessary for obstructive sleep apnea. Most patients need to have tried CPAP therapy first. Check with your insurance provider for specific coverage details.' if p['insurance_covered'] else 'Coverage varies by insurance plan. Contact your provider for specific details.',
+        hospital_stay=p['hospital_stay'].lower(),
+    )
+    return html
 
-        # Write file
-        file_path = dir_path / 'index.html'
-        with open(file_path, 'w') as f:
-            f.write(html)
 
-        print(f"  Generated: {file_path}")
+def iter_pages(root='.'):
+    """Yield a build job for every cost guide page"""
+    index = provider_store.procedure_locations(root, source=PROVIDER_SOURCES)
+    # States with a /locations/<state>/ directory page
+    scopes = location_stats.load_stats(root)['scopes']
+    directories = set(scopes['medical_centers']['states'])
+    totals = {key: scopes['sleep_providers'][key] for key in ('providers', 'state_count')}
+    for procedure_id, procedure in PROCEDURES.items():
+        states = provider_states(index, procedure_id, directories)
+        yield page_job(f"{procedure['slug']}/index.html", generate_cost_guide_page, (procedure_id, states, totals),
+                       {f"procedure:{procedure_id}": content_hash(procedure),
+                        f"providers:{procedure_id}": content_hash(states),
+                        "providers:total": content_hash(totals)},
+                       entity=f"procedure:{procedure_id}",
+                       fields={'name': procedure['name'], 'price_low': procedure['price_range']['low'],
+                               'price_high': procedure['price_range']['high'], 'states': len(states)})
 
-    print(f"\nTotal cost guide pages generated: {len(PROCEDURES)}")
+
+def main():
+    """Generate all cost guide pages"""
+    print("Generating procedure cost guide pages...")
+    from build import main as build_main
+    build_main(generators=['generate_cost_guides'])
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
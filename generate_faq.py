@@ -7,10 +7,13 @@ Creates a comprehensive FAQ page with all 20 questions
 import json
 from pathlib import Path
 
+from build_graph import content_hash, page_job
+import profiling
 
-def load_faqs():
+
+def load_faqs(root='.'):
     """Load FAQ data from JSON file"""
-    with open('api/faqs.json', 'r') as f:
+    with open(Path(root) / 'api/faqs.json', 'r') as f:
         data = json.load(f)
     return data['faqs']
 
@@ -244,24 +247,21 @@ def generate_faq_page(faqs):
     return html
 
 
+def iter_pages(root='.'):
+    """Yield the build job for the FAQ page"""
+    with profiling.stage('load'):
+        faqs = load_faqs(root)
+    yield page_job('faq/index.html', generate_faq_page, (faqs,),
+                   {f"faq:{faq['id']}": content_hash(faq) for faq in faqs},
+                   entity='faq', fields={'questions': len(faqs)})
+
+
 def main():
     """Generate the FAQ page"""
     print("Generating FAQ page...")
-
-    # Load FAQs
-    faqs = load_faqs()
-
-    # Create faq directory
-    faq_dir = Path('faq')
-    faq_dir.mkdir(exist_ok=True)
-
-    # Generate FAQ page
-    html = generate_faq_page(faqs)
-    with open(faq_dir / 'index.html', 'w') as f:
-        f.write(html)
-
-    print(f"  Generated: faq/index.html with {len(faqs)} questions")
+    from build import main as build_main
+    build_main(generators=['generate_faq'])
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
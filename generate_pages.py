@@ -6,7 +6,10 @@ URL Structure: /locations/{state}/{city}/{clinic}.html
 
 import os
 import json
-import re
+
+from output_writer import new_write_stats, write_if_changed, format_write_stats
+import profiling
+from slugs import slugify
 
 # All states and cities from the CLINIC_DATABASE
 STATES_DATA = {
@@ -42,14 +45,6 @@ STATES_DATA = {
     'Wisconsin': {'cities': ['Milwaukee'], 'abbr': 'WI'},
 }
 
-def slugify(text):
-    """Convert text to URL-friendly slug"""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')
-
 def create_directories():
     """Create all necessary directories"""
     base_path = '/home/ubuntu/stem-cells/locations'
@@ -77,13 +72,19 @@ def get_all_locations():
             locations['cities'].append({'city': city, 'state': state})
     return locations
 
-if __name__ == '__main__':
-    create_directories()
-    locations = get_all_locations()
+def main():
+    with profiling.stage('write'):
+        create_directories()
+    with profiling.stage('load'):
+        locations = get_all_locations()
     print(f"States: {len(locations['states'])}")
     print(f"Cities: {len(locations['cities'])}")
     
     # Save locations for reference
-    with open('/home/ubuntu/stem-cells/locations_data.json', 'w') as f:
-        json.dump(locations, f, indent=2)
+    write_stats = new_write_stats()
+    write_if_changed('/home/ubuntu/stem-cells/locations_data.json', json.dumps(locations, indent=2), write_stats)
     print("Saved locations_data.json")
+    print(f"Written files - {format_write_stats(write_stats)}")
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -3,12 +3,21 @@
 Generate and inject SEO content into state and city landing pages.
 Adds approximately 500 words of customized content with H1/H2 structure,
 region-specific information, and internal links.
+Pages the transform ledger shows already processed by this version of the
+script are skipped without being read.
 """
 
 import os
-import re
 from openai import OpenAI
 
+import html_regions
+from html_pipeline import make_page
+import output_writer
+import profiling
+import transform_ledger
+
+SITE_DIR = "/home/ubuntu/stem-cells"
+
 # Initialize OpenAI client
 client = OpenAI()
 
@@ -503,7 +512,7 @@ Write in HTML format with proper <h2>, <p>, and <a> tags. Do not include any wra
     return response.choices[0].message.content
 
 
-def inject_seo_content_into_page(file_path, seo_content):
+def inject_seo_content_into_page(file_path, seo_content, write_stats=None):
     """Inject SEO content into an existing HTML page."""
     
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -520,64 +529,71 @@ def inject_seo_content_into_page(file_path, seo_content):
 '''
     
     # Find the position to insert - after the city/clinic grid and before the disclaimer
-    # Look for the disclaimer section
-    disclaimer_pattern = r'(<div class="bg-amber-50 border-l-4 border-amber-400)'
-    
-    if re.search(disclaimer_pattern, html_content):
-        # Insert before the disclaimer
-        html_content = re.sub(
-            disclaimer_pattern,
-            seo_section + r'\n    \1',
-            html_content,
-            count=1
-        )
-    else:
-        # Fallback: insert before footer
-        footer_pattern = r'(<!-- Footer -->)'
-        html_content = re.sub(
-            footer_pattern,
-            seo_section + r'\n    \1',
-            html_content,
-            count=1
-        )
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    index = html_regions.index_page(html_content)
+    for marker in ['disclaimer', 'footer_comment']:
+        # Insert before the disclaimer, falling back to before the footer
+        offsets = html_regions.markers(index, marker)
+        if offsets:
+            insert_at = offsets[0][0]
+            html_content = html_regions.splice(html_content, [(insert_at, insert_at, seo_section + '\n    ')])
+            break
+    
+    output_writer.write_if_changed(file_path, html_content, write_stats)
     
     return True
 
 
-def process_state_page(state_slug):
+def seo_page(file_path):
+    """Ledger page and transform versions of a landing page"""
+    return make_page(SITE_DIR, file_path), {'generate_seo_content': transform_ledger.transform_version(__name__, SITE_DIR)}
+
+
+def record_page(ledger, page, original, versions):
+    """Record the page as it is now on disk, given its content before this run"""
+    with open(page['path'], 'r', encoding='utf-8') as f:
+        transform_ledger.record(ledger, page, original, f.read(), versions)
+
+
+def process_state_page(state_slug, ledger=None, write_stats=None):
     """Process a single state page."""
     if state_slug not in STATE_DATA:
         print(f"  Skipping {state_slug} - no data available")
         return False
     
     state_data = STATE_DATA[state_slug]
-    file_path = f"/home/ubuntu/stem-cells/locations/{state_slug}/index.html"
+    file_path = f"{SITE_DIR}/locations/{state_slug}/index.html"
     
     if not os.path.exists(file_path):
         print(f"  File not found: {file_path}")
         return False
     
+    page, versions = seo_page(file_path)
+    if ledger is not None and transform_ledger.is_current(ledger, page, versions):
+        print(f"  SEO content already exists for {state_slug}")
+        return True
+    
     # Check if SEO content already exists
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
     if '<!-- SEO Content Section -->' in content:
         print(f"  SEO content already exists for {state_slug}")
+        if ledger is not None:
+            record_page(ledger, page, content, versions)
         return True
     
     print(f"  Generating SEO content for {state_data['name']}...")
     seo_content = generate_state_seo_content(state_slug, state_data)
     
     print(f"  Injecting content into {file_path}...")
-    inject_seo_content_into_page(file_path, seo_content)
+    inject_seo_content_into_page(file_path, seo_content, write_stats)
+    if ledger is not None:
+        record_page(ledger, page, content, versions)
     
     return True
 
 
-def process_city_page(city_slug, state_slug):
+def process_city_page(city_slug, state_slug, ledger=None, write_stats=None):
     """Process a single city page."""
     if city_slug not in CITY_DATA:
         print(f"  Skipping {city_slug} - no data available")
@@ -589,25 +605,34 @@ def process_city_page(city_slug, state_slug):
     
     city_data = CITY_DATA[city_slug]
     state_data = STATE_DATA[state_slug]
-    file_path = f"/home/ubuntu/stem-cells/locations/{state_slug}/{city_slug}/index.html"
+    file_path = f"{SITE_DIR}/locations/{state_slug}/{city_slug}/index.html"
     
     if not os.path.exists(file_path):
         print(f"  File not found: {file_path}")
         return False
     
+    page, versions = seo_page(file_path)
+    if ledger is not None and transform_ledger.is_current(ledger, page, versions):
+        print(f"  SEO content already exists for {city_slug}")
+        return True
+    
     # Check if SEO content already exists
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
     if '<!-- SEO Content Section -->' in content:
         print(f"  SEO content already exists for {city_slug}")
+        if ledger is not None:
+            record_page(ledger, page, content, versions)
         return True
     
     print(f"  Generating SEO content for {city_data['name']}, {state_data['name']}...")
     seo_content = generate_city_seo_content(city_slug, city_data, state_data)
     
     print(f"  Injecting content into {file_path}...")
-    inject_seo_content_into_page(file_path, seo_content)
+    inject_seo_content_into_page(file_path, seo_content, write_stats)
+    if ledger is not None:
+        record_page(ledger, page, content, versions)
     
     return True
 
@@ -618,13 +643,15 @@ def main():
     print("=" * 60)
     print("SEO Content Generator for StemCellPrices.com")
     print("=" * 60)
+    ledger = transform_ledger.load_ledger(SITE_DIR)
+    write_stats = output_writer.new_write_stats()
     
     # Process state pages
     print("\n[1/2] Processing State Pages...")
     state_count = 0
     for state_slug in STATE_DATA.keys():
         print(f"\nProcessing state: {state_slug}")
-        if process_state_page(state_slug):
+        if process_state_page(state_slug, ledger, write_stats):
             state_count += 1
     
     print(f"\nCompleted {state_count} state pages")
@@ -635,15 +662,17 @@ def main():
     for city_slug, city_data in CITY_DATA.items():
         state_slug = city_data["state"]
         print(f"\nProcessing city: {city_slug} ({state_slug})")
-        if process_city_page(city_slug, state_slug):
+        if process_city_page(city_slug, state_slug, ledger, write_stats):
             city_count += 1
     
     print(f"\nCompleted {city_count} city pages")
+    transform_ledger.save_ledger(SITE_DIR, ledger)
     
     print("\n" + "=" * 60)
     print(f"SUMMARY: Processed {state_count} state pages and {city_count} city pages")
+    print(f"Written files - {output_writer.format_write_stats(write_stats)}")
     print("=" * 60)
 
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
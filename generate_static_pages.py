@@ -7,10 +7,15 @@ Structure: /locations/{state}/index.html
 """
 
 import os
-import re
 import json
 
-# Clinic database from app.js
+from output_writer import new_write_stats, write_if_changed, format_write_stats
+import profiling
+import provider_store
+from slugs import slugify
+
+# Clinic database from app.js. Pages are built from the provider store,
+# which is rebuilt from this table when it changes.
 CLINIC_DATABASE = {
     'California': {
         'Los Angeles': {
@@ -426,14 +431,6 @@ CLINIC_DATABASE = {
     }
 }
 
-def slugify(text):
-    """Convert text to URL-friendly slug"""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')
-
 def get_state_image(state):
     """Get the image path for a state"""
     return f'/assets/images/states/{slugify(state)}.jpg'
@@ -857,7 +854,14 @@ def generate_clinic_page(state, city, clinic, city_data):
     html += generate_footer()
     return html
 
-def generate_all_states_page():
+def load_clinic_database():
+    """CLINIC_DATABASE as {state: {city: city_data}}"""
+    database = {}
+    for state, city, _, city_data in provider_store.city_groups('clinic_database'):
+        database.setdefault(state, {})[city] = city_data
+    return database
+
+def generate_all_states_page(database):
     """Generate the main locations index page"""
     title = "All Stem Cell Clinic Locations"
     description = "Browse stem cell therapy clinics across all 50 US states. Find verified providers, compare prices, and locate the best regenerative medicine clinics near you."
@@ -887,7 +891,7 @@ def generate_all_states_page():
         <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
     '''
     
-    for state, cities_data in sorted(CLINIC_DATABASE.items()):
+    for state, cities_data in sorted(database.items()):
         state_slug = slugify(state)
         state_image = get_state_image(state)
         total_clinics = sum(len(city_data['clinics']) for city_data in cities_data.values())
@@ -910,18 +914,24 @@ def generate_all_states_page():
     html += generate_footer()
     return html
 
+def write_page(path, html, write_stats):
+    with profiling.stage('write'):
+        return write_if_changed(path, html, write_stats)
+
 def main():
     """Generate all static pages"""
     base_path = '/home/ubuntu/stem-cells/locations'
+    write_stats = new_write_stats()
+    with profiling.stage('load'):
+        database = load_clinic_database()
     
     # Generate main locations index
     print("Generating locations index page...")
-    index_html = generate_all_states_page()
-    with open(os.path.join(base_path, 'index.html'), 'w') as f:
-        f.write(index_html)
+    index_html = profiling.timed_page('index.html', generate_all_states_page, database)
+    write_page(os.path.join(base_path, 'index.html'), index_html, write_stats)
     
     # Generate state and city pages
-    for state, cities_data in CLINIC_DATABASE.items():
+    for state, cities_data in database.items():
         state_slug = slugify(state)
         state_path = os.path.join(base_path, state_slug)
         os.makedirs(state_path, exist_ok=True)
@@ -929,9 +939,8 @@ def main():
         print(f"Generating {state} pages...")
         
         # State index page
-        state_html = generate_state_page(state, cities_data)
-        with open(os.path.join(state_path, 'index.html'), 'w') as f:
-            f.write(state_html)
+        state_html = profiling.timed_page(f'{state_slug}/index.html', generate_state_page, state, cities_data)
+        write_page(os.path.join(state_path, 'index.html'), state_html, write_stats)
         
         # City pages
         for city, city_data in cities_data.items():
@@ -940,18 +949,19 @@ def main():
             os.makedirs(city_path, exist_ok=True)
             
             # City index page
-            city_html = generate_city_page(state, city, city_data)
-            with open(os.path.join(city_path, 'index.html'), 'w') as f:
-                f.write(city_html)
+            city_html = profiling.timed_page(f'{state_slug}/{city_slug}/index.html', generate_city_page,
+                                             state, city, city_data)
+            write_page(os.path.join(city_path, 'index.html'), city_html, write_stats)
             
             # Individual clinic pages
             for clinic in city_data['clinics']:
                 clinic_slug = slugify(clinic['name'])
-                clinic_html = generate_clinic_page(state, city, clinic, city_data)
-                with open(os.path.join(city_path, f'{clinic_slug}.html'), 'w') as f:
-                    f.write(clinic_html)
+                clinic_html = profiling.timed_page(f'{state_slug}/{city_slug}/{clinic_slug}.html', generate_clinic_page,
+                                                   state, city, clinic, city_data)
+                write_page(os.path.join(city_path, f'{clinic_slug}.html'), clinic_html, write_stats)
     
+    print(f"Written files - {format_write_stats(write_stats)}")
     print("Done! All pages generated.")
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -110,6 +110,73 @@ function findNearestSupportedCity(detectedLocation) {
     return null;
 }
 
+/**
+ * Base URL of the nearest-provider tables written by geo_index.py
+ */
+const NEARBY_URL = '/api/nearby/';
+
+/**
+ * Slug of a city name, as slugs.slugify() makes it at build time
+ * @param {string} text - City name
+ * @returns {string} Slug
+ */
+function slugifyCity(text) {
+    return text.toLowerCase()
+        .replace(/[^a-z0-9\s-]/g, '')
+        .replace(/[\s_]+/g, '-')
+        .replace(/-+/g, '-')
+        .replace(/^-+|-+$/g, '');
+}
+
+/**
+ * Lookup tables that can answer for a location, most precise first
+ * @param {Object} location - Location from geo-detection
+ * @returns {string[]} Table paths under NEARBY_URL
+ */
+function nearbyTablePaths(location) {
+    const paths = [];
+    const stateCode = (location.stateCode || (location.state ? getStateCode(location.state) : '')).toLowerCase();
+    const postal = /^\d{5}/.test(location.postal || '') ? location.postal.substring(0, 3) : null;
+
+    if (postal) {
+        paths.push(`zip/${postal}.json`);
+    }
+    if (location.city && stateCode) {
+        paths.push(`city/${stateCode}/${slugifyCity(location.city)}.json`);
+    }
+    if (stateCode) {
+        paths.push(`state/${stateCode}.json`);
+    }
+    return paths;
+}
+
+/**
+ * Find the clinics nearest to a location from the precomputed tables.
+ * Every US ZIP prefix has a table, so a detected location takes one fetch.
+ * @param {Object} location - Location from geo-detection
+ * @returns {Promise<Object|null>} {near, precision, clinics: [{name, url, city, state, miles}]}
+ */
+async function findNearbyClinics(location) {
+    if (!location) return null;
+
+    for (const path of nearbyTablePaths(location)) {
+        try {
+            const response = await fetch(NEARBY_URL + path);
+            if (!response.ok) continue;
+
+            const table = await response.json();
+            const clinics = table.providers.map(row =>
+                Object.fromEntries(table.columns.map((column, i) => [column, row[i]]))
+            );
+            return { near: table.near, precision: table.precision, clinics };
+        } catch (error) {
+            console.warn('Nearby lookup failed:', path, error.message);
+        }
+    }
+
+    return null;
+}
+
 /**
  * Save user's location preference
  * @param {string} citySlug - The city slug to save
@@ -169,6 +236,7 @@ if (typeof module !== 'undefined' && module.exports) {
         detectUserLocation,
         getDefaultLocation,
         findNearestSupportedCity,
+        findNearbyClinics,
         saveLocationPreference,
         clearLocationPreference,
         getStateCode
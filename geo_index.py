@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Nearest-provider lookup tables for "clinics near you".
+
+Provider addresses are geocoded offline against the bundled gazetteer
+(gazetteer.csv: state centroids, and places with the ZIP3 prefixes they
+serve) - by the address's ZIP code, else by city and state, else at the
+state's centroid. The geocoded providers go into a KD-tree, and the
+NEAREST closest providers of every gazetteer place, every US ZIP3 prefix
+and every state are written as small JSON tables:
+
+    api/nearby/zip/941.json                    by the visitor's ZIP code prefix
+    api/nearby/city/ca/san-francisco.json      by city and state code
+    api/nearby/state/ca.json                   by state code
+
+so geo-detect.js gets the clinics near a visitor with one fetch and no
+distance math. Every prefix in validate_providers.ZIP_PREFIXES has a table;
+prefixes the gazetteer does not list are located at their state's
+centroid. Tables are only rewritten when their content changes and tables
+no longer produced are deleted.
+
+Usage:
+    python3 geo_index.py                 # also run by build.py
+    python3 geo_index.py --near 77030    # print the table for a ZIP code
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import math
+from contextlib import closing
+from pathlib import Path
+
+import output_writer
+import profiling
+import provider_store
+from slugs import slugify
+from validate_providers import STATE_CODES, STATE_ZIP, ZIP_PREFIXES
+
+GAZETTEER_CSV = 'gazetteer.csv'
+NEARBY_DIR = 'api/nearby'
+# Providers listed per table
+NEAREST = 10
+EARTH_RADIUS_MILES = 3958.8
+COLUMNS = ['name', 'url', 'city', 'state', 'miles']
+
+PROVIDERS_QUERY = '''
+SELECT state, city, name, state_slug, city_slug, slug, json_extract(record, '$.address')
+FROM providers WHERE source IN ({}) AND country = ? ORDER BY rowid
+'''
+
+
+def unit_vector(lat, lng):
+    """Point on the unit sphere; straight-line distances between these
+    order the same as great-circle distances"""
+    lat, lng = math.radians(lat), math.radians(lng)
+    return (math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng), math.sin(lat))
+
+
+def miles(chord):
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, chord / 2))
+
+
+def load_gazetteer(root='.'):
+    """{'states': {code: entry}, 'places': {(code, name): entry}, 'zip3': {prefix: entry}}
+    with entry = {'name', 'state', 'point'}; a place is listed under each of its names"""
+    gazetteer = {'states': {}, 'places': {}, 'zip3': {}}
+    path = Path(root) / GAZETTEER_CSV
+    if not path.exists():
+        print(f"  Warning: {path} not found")
+        return gazetteer
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            names = row['name'].split('|')
+            entry = {'name': names[0], 'state': row['state'],
+                     'point': unit_vector(float(row['lat']), float(row['lng']))}
+            if row['kind'] == 'state':
+                gazetteer['states'][row['state']] = entry
+                continue
+            entry['names'] = names
+            for name in names:
+                gazetteer['places'][(row['state'], name.lower())] = entry
+            for prefix in row['zip3'].split():
+                gazetteer['zip3'][prefix] = entry
+    return gazetteer
+
+
+def geocode(gazetteer, code, city, address):
+    """(precision, point) of an address in state code: 'zip', 'city' or 'state', None if unknown"""
+    matches = STATE_ZIP.findall(address or '')
+    if matches and matches[-1][0] == code:
+        place = gazetteer['zip3'].get(matches[-1][1][:3])
+        if place and place['state'] == code:
+            return 'zip', place['point']
+    place = gazetteer['places'].get((code, (city or '').strip().lower()))
+    if place:
+        return 'city', place['point']
+    state = gazetteer['states'].get(code)
+    if state:
+        return 'state', state['point']
+    return None
+
+
+def geocode_providers(root, gazetteer):
+    """({point: [provider row, ...]}, {precision: count}) of the US sleep providers in the store.
+    Their URLs are built from the store's page slugs, the ones their pages are published under."""
+    points = {}
+    counts = {'zip': 0, 'city': 0, 'state': 0, 'unknown': 0}
+    sources = sorted(provider_store.CLINICS_JSON_SOURCES)
+    query = PROVIDERS_QUERY.format(', '.join('?' * len(sources)))
+    with closing(provider_store.open_store(root)) as conn:
+        for state, city, name, state_slug, city_slug, slug, address in conn.execute(query, [*sources, 'United States']):
+            code = STATE_CODES.get(state)
+            located = geocode(gazetteer, code, city, address)
+            if located is None:
+                counts['unknown'] += 1
+                continue
+            precision, point = located
+            counts[precision] += 1
+            points.setdefault(point, []).append([name, f"/locations/{state_slug}/{city_slug}/{slug}.html", city, code])
+    return points, counts
+
+
+def build_tree(points, depth=0):
+    """KD-tree node (point, axis, left, right) over a list of 3D points"""
+    if not points:
+        return None
+    axis = depth % 3
+    points.sort(key=lambda point: point[axis])
+    middle = len(points) // 2
+    return (points[middle], axis, build_tree(points[:middle], depth + 1), build_tree(points[middle + 1:], depth + 1))
+
+
+def nearest_points(tree, target, k):
+    """[(chord distance, point)] of the k points closest to target, closest first"""
+    heap = []
+
+    def search(node):
+        if node is None:
+            return
+        point, axis, left, right = node
+        distance = sum((a - b) ** 2 for a, b in zip(point, target))
+        if len(heap) < k:
+            heapq.heappush(heap, (-distance, point))
+        elif distance < -heap[0][0]:
+            heapq.heapreplace(heap, (-distance, point))
+        offset = target[axis] - point[axis]
+        near, far = (left, right) if offset < 0 else (right, left)
+        search(near)
+        if len(heap) < k or offset * offset < -heap[0][0]:
+            search(far)
+
+    search(tree)
+    return sorted((math.sqrt(-distance), point) for distance, point in heap)
+
+
+def nearest_providers(tree, points, target, n=NEAREST):
+    """Rows of the n providers closest to target, with their distance in miles.
+    Every point holds at least one provider, so the n closest points hold them all."""
+    rows = []
+    for chord, point in nearest_points(tree, target, n):
+        rows.extend(provider + [round(miles(chord), 1)] for provider in points[point][:n - len(rows)])
+    return rows
+
+
+def table(near, precision, rows):
+    return {'near': near, 'precision': precision, 'columns': COLUMNS, 'providers': rows}
+
+
+def build_tables(gazetteer, points):
+    """{table path: data} for every ZIP3 prefix, gazetteer place and state"""
+    tree = build_tree(list(points))
+    tables = {}
+    if tree is None:
+        return tables
+
+    for code, state in gazetteer['states'].items():
+        rows = nearest_providers(tree, points, state['point'])
+        tables[f"state/{code.lower()}.json"] = table(state['name'], 'state', rows)
+
+    places = {id(place): place for place in gazetteer['places'].values()}
+    for place in places.values():
+        data = table(f"{place['name']}, {place['state']}", 'city', nearest_providers(tree, points, place['point']))
+        for name in place['names']:
+            tables[f"city/{place['state'].lower()}/{slugify(name)}.json"] = data
+
+    for code, ranges in ZIP_PREFIXES.items():
+        for low, high in ranges:
+            for number in range(low, high + 1):
+                prefix = f"{number:03d}"
+                place = gazetteer['zip3'].get(prefix)
+                if place is not None:
+                    tables[f"zip/{prefix}.json"] = tables[f"city/{place['state'].lower()}/{slugify(place['name'])}.json"]
+                elif code in gazetteer['states']:
+                    tables[f"zip/{prefix}.json"] = tables[f"state/{code.lower()}.json"]
+    return dict(sorted(tables.items()))
+
+
+def table_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_tables(root='.', write_stats=None):
+    """Geocode the providers and write the nearby tables under root/api/nearby,
+    deleting stale ones. Returns a stats dict."""
+    root = Path(root)
+    nearby_dir = root / NEARBY_DIR
+    gazetteer = load_gazetteer(root)
+    points, geocoded = geocode_providers(root, gazetteer)
+
+    stats = {'tables': 0, 'bytes': 0, 'largest': 0, 'removed': 0, 'points': len(points), 'geocoded': geocoded}
+    produced = set()
+    urls = set()
+    for path, data in build_tables(gazetteer, points).items():
+        urls.update(row[1] for row in data['providers'])
+        content = table_json(data)
+        size = len(content.encode('utf-8'))
+        stats['tables'] += 1
+        stats['bytes'] += size
+        stats['largest'] = max(stats['largest'], size)
+        output_writer.write_if_changed(nearby_dir / path, content, write_stats)
+        produced.add(nearby_dir / path)
+
+    if nearby_dir.exists():
+        for path in sorted(nearby_dir.rglob('*.json'), reverse=True):
+            if path not in produced:
+                path.unlink()
+                stats['removed'] += 1
+                print(f"  Removed: {path.relative_to(root)}")
+        for path in sorted(nearby_dir.rglob('*'), reverse=True):
+            if path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+    # Provider pages the tables link to
+    stats['urls'] = sorted(urls)
+    return stats
+
+
+def missing_pages(stats, pages):
+    """URLs in the written tables that are not among pages (page paths relative to the site root)"""
+    return [url for url in stats['urls'] if url.lstrip('/') not in pages]
+
+
+def format_geo_stats(stats):
+    geocoded = stats['geocoded']
+    return (f"{stats['tables']} nearby tables, largest {stats['largest']:,} bytes, {stats['removed']} removed; "
+            f"geocoded by ZIP {geocoded['zip']}, city {geocoded['city']}, state {geocoded['state']}, "
+            f"unknown {geocoded['unknown']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the nearest-provider lookup tables")
+    parser.add_argument('--root', default='.', help="site root holding api/ and gazetteer.csv")
+    parser.add_argument('--near', metavar='ZIP', help="print the table for this ZIP code instead")
+    args = parser.parse_args(argv)
+
+    if args.near:
+        path = Path(args.root) / NEARBY_DIR / 'zip' / f"{args.near[:3]}.json"
+        if not path.exists():
+            parser.error(f"no table for ZIP {args.near} (run python3 geo_index.py first)")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        print(f"Nearest to {data['near']} ({data['precision']}):")
+        for name, url, city, state, distance in data['providers']:
+            print(f"  {distance:>7.1f} mi  {name} - {city}, {state}  {url}")
+        return
+
+    write_stats = output_writer.new_write_stats()
+    stats = write_tables(args.root, write_stats)
+    print(f"\n{'='*50}")
+    print(f"Nearby: {format_geo_stats(stats)}")
+    print(f"Total {stats['bytes']:,} bytes, {stats['points']} distinct provider locations")
+    print(f"Written files - {output_writer.format_write_stats(write_stats)}")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Single-pass field extractor for legacy clinic pages.
+
+Pages that predate the page metadata index (page_meta.py) still have to be
+read for their clinic's details. Instead of one whole-document regex per
+field, FieldParser collects every field in one linear html.parser pass:
+
+    fields = extract(content)
+    # {'title', 'jsonld', 'meta_description', 'specialty', 'about', 'treatments',
+    #  'conditions', 'address', 'phone', 'price', 'other_clinics'}
+
+A section is recognised by its heading and taken from the element right
+after it ("Specialty" then a <p>, "Treatments Offered" then a <ul>); the
+sibling clinic cards are the links of the grid after "Other Clinics in".
+Phone and price are matched in the page's text, comments and JSON-LD in
+document order - where the old whole-page regexes found them, minus the
+tags and attributes in between. Element text keeps its character
+references as written, so values can go back into HTML unchanged.
+
+Results are cached by file content hash in .build-cache/html-fields.json:
+
+    cache = load_cache(root)
+    fields = file_fields(path, cache)
+    save_cache(root, cache)
+
+Usage:
+    python3 html_fields.py locations/texas/houston/some-clinic.html
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+import output_writer
+import profiling
+from build_graph import CACHE_DIR, module_hash
+
+CACHE_FILE = 'html-fields.json'
+
+# Heading text -> (field, element holding the field right after the heading)
+SECTIONS = {
+    'specialty': ('specialty', 'p'),
+    'treatments offered': ('treatments', 'ul'),
+    'conditions treated': ('conditions', 'ul'),
+}
+ADDRESS_WORDS = re.compile(r'.(?:St|Ave|Blvd|Dr|Rd|Way|Lane|Ct|Suite|#)')
+PHONE = re.compile(r'(?:Phone|telephone)[^(]*(\([0-9]{3}\)\s*[0-9]{3}[-.]?[0-9]{4}|\+?[0-9]{1,3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', re.IGNORECASE)
+PRICE = re.compile(r'Price [Rr]ange[^$]*\$([0-9,]+)\s*[-–]\s*\$([0-9,]+)')
+OTHER_CLINICS = 'other clinics in'
+
+
+def new_fields():
+    return {'title': None, 'jsonld': None, 'meta_description': None, 'specialty': None, 'about': None,
+            'treatments': [], 'conditions': [], 'address': None, 'phone': None, 'price': None,
+            'other_clinics': []}
+
+
+class FieldParser(HTMLParser):
+    """Collects the clinic fields of a page as it is fed"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.fields = new_fields()
+        # Visible text, comments and JSON-LD, searched for phone and price
+        self.text = []
+        # Element whose text is being collected: (tag, handler, parts). Like the
+        # regexes this replaces, only elements holding nothing but text are read.
+        self.capture = None
+        # (field, tag) the next element must be to hold a section's content
+        self.expect = None
+        # Open <ul> of a list section: [field, depth]
+        self.list = None
+        self.raw = None
+        self.other_pending = False
+        # Depth of the open sibling clinics grid, and the card being read
+        self.grid = 0
+        self.card = None
+
+    # Text
+
+    def handle_data(self, data):
+        if self.raw:
+            if self.raw == 'jsonld':
+                self.capture[2].append(data)
+                self.text.append(data)
+            return
+        if self.capture:
+            self.capture[2].append(data)
+        if data.strip():
+            self.expect = None
+            self.text.append(data)
+            if not self.other_pending and not self.grid and OTHER_CLINICS in data.lower():
+                self.other_pending = True
+
+    def handle_comment(self, data):
+        self.text.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
+
+    def start_capture(self, tag, handler):
+        self.capture = (tag, handler, [])
+
+    # Tags
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        self.capture = None
+
+        expect, self.expect = self.expect, None
+        if tag in ('script', 'style'):
+            self.raw = tag
+            if tag == 'script' and attrs.get('type') == 'application/ld+json' and self.fields['jsonld'] is None:
+                self.raw = 'jsonld'
+                self.start_capture(tag, self.end_jsonld)
+            return
+
+        if tag == 'title':
+            self.start_capture(tag, self.end_title)
+        elif tag == 'meta' and attrs.get('name') == 'description' and self.fields['meta_description'] is None:
+            self.fields['meta_description'] = attrs.get('content') or None
+        elif expect and tag == expect[1]:
+            if tag == 'ul':
+                self.list = [expect[0], 1]
+            else:
+                self.start_capture(tag, lambda text, field=expect[0]: self.set_once(field, text.strip()))
+        elif self.list and tag == 'ul':
+            self.list[1] += 1
+        elif self.list and tag == 'li':
+            self.start_capture(tag, self.end_item)
+        elif tag in ('h2', 'h3'):
+            self.start_capture(tag, self.end_heading)
+        elif tag == 'p' and 'text-slate-900' in attrs.get('class', '') and self.fields['address'] is None:
+            self.start_capture(tag, self.end_address)
+
+        if tag == 'div':
+            if self.grid:
+                self.grid += 1
+            elif self.other_pending and attrs.get('class', '').startswith('grid'):
+                self.other_pending = False
+                self.grid = 1
+        elif self.grid and tag == 'a' and 'href' in attrs:
+            self.card = {'href': attrs['href']}
+        elif self.card is not None and tag in ('h3', 'p'):
+            self.start_capture(tag, lambda text, css=attrs.get('class', ''): self.card_text(tag, css, text))
+
+    def handle_endtag(self, tag):
+        if self.raw and tag in ('script', 'style'):
+            self.raw = None
+        capture, self.capture = self.capture, None
+        if capture and tag == capture[0]:
+            capture[1](''.join(capture[2]))
+        if self.list and tag == 'ul':
+            self.list[1] -= 1
+            if self.list[1] == 0:
+                self.list = None
+        if self.grid:
+            if tag == 'a' and self.card is not None:
+                if len(self.card) == 4:
+                    self.fields['other_clinics'].append(self.card)
+                self.card = None
+            elif tag == 'div':
+                self.grid -= 1
+
+    # Fields
+
+    def set_once(self, field, value):
+        if value and self.fields[field] is None:
+            self.fields[field] = value
+
+    def end_title(self, text):
+        self.set_once('title', text)
+
+    def end_jsonld(self, text):
+        try:
+            self.fields['jsonld'] = json.loads(text)
+        except ValueError:
+            self.fields['jsonld'] = {}
+
+    def end_heading(self, text):
+        heading = text.strip().lower()
+        if heading in SECTIONS:
+            self.expect = SECTIONS[heading]
+        elif heading.startswith('about'):
+            self.expect = ('about', 'p')
+
+    def end_item(self, text):
+        self.fields[self.list[0]].append(text.strip())
+
+    def end_address(self, text):
+        if ADDRESS_WORDS.search(text):
+            self.fields['address'] = text.strip()
+
+    def card_text(self, tag, css, text):
+        text = text.strip()
+        if tag == 'h3':
+            self.card.setdefault('name', text)
+        elif 'text-blue' in css and 'specialty' in self.card:
+            self.card.setdefault('price', text)
+        elif 'name' in self.card:
+            self.card.setdefault('specialty', text)
+
+    def close(self):
+        super().close()
+        text = ' '.join(self.text)
+        phone = PHONE.search(text)
+        if phone:
+            self.fields['phone'] = phone.group(1)
+        price = PRICE.search(text)
+        if price:
+            self.fields['price'] = f"{price.group(1)} - {price.group(2)}"
+        return self.fields
+
+
+def extract(content):
+    """Fields of a clinic page's HTML (see the module docstring)"""
+    parser = FieldParser()
+    parser.feed(content)
+    return parser.close()
+
+
+def cache_path(root='.'):
+    return Path(root) / CACHE_DIR / CACHE_FILE
+
+
+def load_cache(root='.'):
+    """{content hash: fields} of the pages extracted before, empty if this module changed"""
+    path = cache_path(root)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == module_hash(__name__):
+            return cache['files']
+    return {}
+
+
+def save_cache(root, cache):
+    path = cache_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return output_writer.write_if_changed(
+        path, json.dumps({'version': module_hash(__name__), 'files': cache}, ensure_ascii=False,
+                         separators=(',', ':')))
+
+
+def file_fields(path, cache=None):
+    """Fields of an HTML file, extracted only if its content is not in cache"""
+    data = Path(path).read_bytes()
+    key = hashlib.sha1(data).hexdigest()
+    if cache is not None and key in cache:
+        return cache[key]
+    fields = extract(data.decode('utf-8'))
+    if cache is not None:
+        cache[key] = fields
+    return fields
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the clinic fields extracted from HTML pages")
+    parser.add_argument('paths', nargs='+', help="HTML files")
+    parser.add_argument('--root', default='.', help="site root holding .build-cache/")
+    args = parser.parse_args(argv)
+
+    cache = load_cache(args.root)
+    for path in args.paths:
+        print(json.dumps({path: file_fields(path, cache)}, indent=2, ensure_ascii=False))
+    save_cache(args.root, cache)
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Single-pass HTML transform pipeline.
+Each rewriter script exposes an in-memory transform; the pipeline reads every
+HTML file once, runs it through the ordered chain of transforms that apply
+to it and writes it back at most once, timing each transform.
+
+Usage:
+    python3 html_pipeline.py                                    # default chain
+    python3 html_pipeline.py --transform update_nav --transform update_footers
+    python3 html_pipeline.py --list
+    python3 html_pipeline.py --dry-run --transform update_nav   # diffs and stats only (dry_run.py)
+
+A transform module provides:
+    applies_to(page) -> bool
+    transform(content, page) -> str
+where page is a dict with 'path' (absolute Path), 'rel' (posix path relative
+to the site root) and 'root' (Path), and optionally
+    TRANSFORM_DEPS = ['site_partials', ...]
+naming the modules whose partials or data its output also depends on.
+
+Files the transform ledger (transform_ledger.py) shows unchanged since the
+same transform versions ran on them are skipped without being read;
+--force runs every transform on every file. The site partials each file
+it processes includes go to the include index (includes.py).
+"""
+
+import argparse
+import importlib
+import os
+import time
+from pathlib import Path
+
+import dry_run
+import includes
+import output_writer
+import profiling
+import transform_ledger
+
+# Default chain order. Layout rewriters run first so content injection and
+# schema/meta passes see the final nav and footer.
+TRANSFORMS = [
+    'update_all_pages',
+    'standardize_nav_footer',
+    'apply_universal_layout',
+    'update_nav',
+    'update_footers',
+    'add_lead_form',
+    'add_gallery_to_clinics',
+    'add_schema_markup',
+    'update_html_images',
+]
+
+SKIP_DIRS = {'node_modules', '.git', '.netlify', '.claude', '.build-cache'}
+
+# Transform chains already loaded in this (worker) process
+_chains = {}
+
+
+def load_transform(name, root='.'):
+    """Import a rewriter script and return its transform entry"""
+    module = importlib.import_module(name)
+    return {
+        'name': name,
+        'applies_to': module.applies_to,
+        'transform': module.transform,
+        'version': transform_ledger.transform_version(name, root),
+    }
+
+
+def find_html_files(root):
+    """All HTML files under root in a stable order, skipping hidden and tooling directories"""
+    html_files = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        for file in sorted(files):
+            if file.endswith('.html'):
+                html_files.append(Path(dirpath) / file)
+    return html_files
+
+
+def make_page(root, path):
+    root = Path(root).resolve()
+    path = Path(path).resolve()
+    return {
+        'path': path,
+        'rel': path.relative_to(root).as_posix(),
+        'root': root,
+    }
+
+
+def chain_for(transforms, page):
+    return [t for t in transforms if t['applies_to'](page)]
+
+
+def preview_page(names, root, path):
+    """Dry-run one file through the transforms of names that apply to it"""
+    if names not in _chains:
+        _chains[names] = [load_transform(name, root) for name in names]
+    page = make_page(root, path)
+    try:
+        with open(page['path'], 'r', encoding='utf-8') as f:
+            original = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return dry_run.failed(page['rel'], f"read: {e}")
+
+    content = original
+    misses = []
+    for t in chain_for(_chains[names], page):
+        try:
+            new_content = t['transform'](content, page)
+        except Exception as e:
+            return dry_run.failed(page['rel'], f"{t['name']}: {e}")
+        if new_content == content:
+            misses.append(t['name'])
+        content = new_content
+    return dry_run.preview(page['rel'], original, content, misses)
+
+
+def dry_run_pipeline(names=None, root='.', workers=1, force=False, diff_out=None):
+    """Run the transform chain over the site in memory on a process pool and
+    collect the diffs (see dry_run.py). Files the ledger shows are done are
+    left out unless force. Nothing under root is written."""
+    names = tuple(names or TRANSFORMS)
+    transforms = [load_transform(name, root) for name in names]
+    ledger = transform_ledger.load_ledger(root)
+    start = time.perf_counter()
+
+    items = []
+    skipped = 0
+    for path in find_html_files(root):
+        page = make_page(root, path)
+        chain = chain_for(transforms, page)
+        if not chain:
+            continue
+        if not force and transform_ledger.is_current(ledger, page, {t['name']: t['version'] for t in chain}):
+            skipped += 1
+            continue
+        items.append((names, root, path))
+
+    stats = dry_run.collect(dry_run.run(preview_page, items, workers), dry_run.diff_path(root, diff_out))
+    stats['skipped'] = skipped
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def run_pipeline(names=None, root='.', files=None, force=False):
+    """Run the transform chain over the site, skipping files the ledger shows
+    are done unless force. Returns a stats dict with per-transform timings."""
+    transforms = [load_transform(name, root) for name in names or TRANSFORMS]
+    timings = {t['name']: {'seconds': 0.0, 'files': 0, 'changed': 0} for t in transforms}
+    stats = {'files': 0, 'updated': 0, 'skipped': 0, 'errors': [], 'timings': timings,
+             'writes': output_writer.new_write_stats()}
+    start = time.perf_counter()
+    ledger = transform_ledger.load_ledger(root)
+    include_index = includes.load_index(root)
+
+    with profiling.stage('load'):
+        paths = files if files is not None else find_html_files(root)
+
+    for path in paths:
+        page = make_page(root, path)
+        chain = chain_for(transforms, page)
+        if not chain:
+            continue
+
+        stats['files'] += 1
+        versions = {t['name']: t['version'] for t in chain}
+        if not force and transform_ledger.is_current(ledger, page, versions):
+            stats['skipped'] += 1
+            continue
+        try:
+            with profiling.stage('read'), open(page['path'], 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            stats['errors'].append((page['rel'], f"read: {e}"))
+            print(f"Error: {page['rel']} - {e}")
+            continue
+
+        if not force and transform_ledger.content_current(ledger, page, content, versions):
+            # Touched but not changed since the ledger recorded it
+            transform_ledger.record(ledger, page, content, content, versions)
+            stats['skipped'] += 1
+            continue
+
+        original = content
+        failed = False
+        page_start = time.perf_counter()
+        for t in chain:
+            timing = timings[t['name']]
+            t_start = time.perf_counter()
+            try:
+                new_content = t['transform'](content, page)
+            except Exception as e:
+                stats['errors'].append((page['rel'], f"{t['name']}: {e}"))
+                print(f"Error: {page['rel']} - {t['name']}: {e}")
+                failed = True
+                break
+            finally:
+                timing['seconds'] += time.perf_counter() - t_start
+                timing['files'] += 1
+            if new_content != content:
+                timing['changed'] += 1
+            content = new_content
+        profiling.record_page(page['rel'], time.perf_counter() - page_start, 'transform')
+
+        # A failed transform leaves the file untouched rather than half-rewritten
+        if failed:
+            continue
+        if content == original:
+            output_writer.record_write(stats['writes'], 'unchanged', len(original.encode('utf-8')))
+        else:
+            with profiling.stage('write'):
+                output_writer.write_if_changed(page['path'], content, stats['writes'])
+            stats['updated'] += 1
+            print(f"Updated: {page['rel']}")
+        transform_ledger.record(ledger, page, original, content, versions)
+        includes.record(include_index, page['rel'], content)
+
+    transform_ledger.save_ledger(root, ledger)
+    includes.save_index(root, include_index)
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def print_summary(stats):
+    print(f"\n{'='*50}")
+    print(f"Summary: Processed {stats['files']}, Skipped {stats['skipped']} (ledger), Updated {stats['updated']}, "
+          f"Errors {len(stats['errors'])}")
+    print(f"Written files - {output_writer.format_write_stats(stats['writes'])}")
+    print(f"\n{'Transform':<26}{'Files':>8}{'Changed':>9}{'Seconds':>10}")
+    for name, timing in stats['timings'].items():
+        print(f"{name:<26}{timing['files']:>8}{timing['changed']:>9}{timing['seconds']:>10.3f}")
+    print(f"\nFinished in {stats['seconds']}s")
+
+    if stats['errors']:
+        print("\nErrors:")
+        for rel, error in stats['errors'][:10]:
+            print(f"  {rel}: {error}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run HTML rewriters as a single pass over the site")
+    parser.add_argument('--transform', action='append', choices=TRANSFORMS, help="run only this transform (repeatable, keeps default order)")
+    parser.add_argument('--root', default='.', help="site root to process")
+    parser.add_argument('--list', action='store_true', help="list the registered transforms in chain order")
+    parser.add_argument('--force', action='store_true', help="ignore the transform ledger and process every file")
+    dry_run.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None, transforms=None, root=None):
+    """Command line entry point. Rewriter scripts call this with their own transform name."""
+    args = parse_args(argv)
+    if args.list:
+        for name in TRANSFORMS:
+            print(name)
+        return None
+
+    names = transforms or TRANSFORMS
+    if args.transform:
+        names = [name for name in TRANSFORMS if name in args.transform]
+    if root is None or args.root != '.':
+        root = args.root
+
+    if args.dry_run:
+        stats = dry_run_pipeline(names, root=root, workers=dry_run.default_workers(args.jobs), force=args.force,
+                                 diff_out=args.diff_out)
+        dry_run.print_summary(stats)
+        print(f"Skipped {stats['skipped']} files (ledger), finished in {stats['seconds']}s")
+        return stats
+
+    stats = run_pipeline(names, root=root, force=args.force)
+    print_summary(stats)
+    return stats
+
+
+if __name__ == '__main__':
+    profiling.run(main)
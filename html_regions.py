@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Marker-based region index for HTML pages.
+Scans a page once for the markers that open the regions the rewriters
+replace (nav, header, footer, SEO section, lead form, JSON-LD, gallery),
+pairs each opening marker with its end and splices replacements back in a
+single join, instead of running a whole-document DOTALL regex per region.
+
+Usage:
+    index = index_page(content)
+    edits = replace_regions(index, 'header', NEW_NAV)
+    edits += replace_regions(index, 'footer', NEW_FOOTER)
+    content = splice(content, edits)
+
+Regions pair like a lazy regex (`<footer[^>]*>.*?</footer>`): the leftmost
+opening marker is closed by the first end after it, and the next region is
+looked for after that end, so spans of one region never overlap.
+"""
+
+import bisect
+import re
+
+# Opening and point markers, matched in one pass over the page. Every
+# marker starts with '<'; MARKER_RE matches that literal first, so the scan
+# jumps from '<' to '<' instead of trying every alternative at every character.
+MARKERS = {
+    'nav_comment': r'<!-- Navigation -->',
+    'nav': r'<nav[^>]*>',
+    'header': r'<header[^>]*>',
+    'footer_comment': r'<!-- Footer -->',
+    'footer': r'<footer[^>]*>',
+    'seo': r'<!-- SEO Content Section -->',
+    'disclaimer': r'<div class="bg-amber-50 border-l-4 border-amber-400',
+    'tel_link': r'<a href="tel:',
+    'jsonld': r'<script type="application/ld\+json">',
+    'clinic_image': r'<!-- Clinic Image -->',
+    'body': r'<body[^>]*>',
+}
+
+MARKER_RE = re.compile('<(?:' + '|'.join(f'(?P<{name}>{pattern[1:]})' for name, pattern in MARKERS.items()) + ')',
+                       re.IGNORECASE)
+
+# Call Now button the lead form replaces
+CALL_NOW_PATTERN = r'<a href="tel:[^"]*"\s*\n?\s*class="[^"]*"\s*>\s*Call Now\s*</a>'
+
+# Single clinic image block the gallery replaces (supports .jpg, .webp, and .png)
+CLINIC_IMAGE_PATTERN = r'''<!-- Clinic Image -->
+                    <div class="clinic-main-image mb-6 rounded-xl overflow-hidden">
+                        <img src="https://cfls\.b-cdn\.net/stem-cell-clinics/([^/]+)/primary\.(jpg|webp|png)" alt="[^"]*" class="w-full h-64 object-cover" loading="lazy" onerror="this\.parentElement\.style\.display='none'">
+                    </div>'''
+
+# Region name -> opening markers and how the region ends.
+# 'end' is a pattern whose match is included in the region;
+# 'until' lists point markers (in priority order) the region stops in front of;
+# 'match' is a pattern the whole region must match starting at the marker.
+REGIONS = {
+    'nav': {'start': ['nav'], 'end': r'</nav>'},
+    'nav_section': {'start': ['nav_comment'], 'end': r'</nav>'},
+    'header': {'start': ['header'], 'end': r'</header>'},
+    'footer': {'start': ['footer'], 'end': r'</footer>'},
+    'footer_section': {'start': ['footer_comment'], 'end': r'</footer>'},
+    'seo': {'start': ['seo'], 'until': ['disclaimer', 'footer_comment']},
+    'lead_form': {'start': ['tel_link'], 'match': CALL_NOW_PATTERN, 'flags': re.IGNORECASE},
+    'jsonld': {'start': ['jsonld'], 'end': r'</script>\s*'},
+    'gallery': {'start': ['clinic_image'], 'match': CLINIC_IMAGE_PATTERN},
+}
+
+_patterns = {}
+
+
+def index_page(content):
+    """One pass over the page: offsets of every marker, by marker name.
+
+    Region spans are resolved lazily from the marker offsets and cached on
+    the returned index.
+    """
+    markers = {name: [] for name in MARKERS}
+    for match in MARKER_RE.finditer(content):
+        markers[match.lastgroup].append((match.start(), match.end()))
+    return {'content': content, 'markers': markers, 'regions': {}}
+
+
+def markers(index, name):
+    """(start, end) offsets of a marker, in page order"""
+    return index['markers'][name]
+
+
+def _compiled(pattern, flags):
+    if (pattern, flags) not in _patterns:
+        _patterns[(pattern, flags)] = re.compile(pattern, flags)
+    return _patterns[(pattern, flags)]
+
+
+def _next_marker(index, names, pos):
+    """Start of the first marker at or after pos, trying names in priority order"""
+    for name in names:
+        offsets = index['markers'][name]
+        i = bisect.bisect_left(offsets, (pos, pos))
+        if i < len(offsets):
+            return offsets[i][0]
+    return -1
+
+
+def regions(index, name):
+    """Non-overlapping (start, end) spans of a named region, in page order"""
+    if name in index['regions']:
+        return index['regions'][name]
+
+    spec = REGIONS[name]
+    starts = sorted(offset for marker in spec['start'] for offset in index['markers'][marker])
+
+    spans = []
+    pos = 0
+    for marker in starts:
+        if marker[0] < pos:
+            # Opening marker inside the previous region
+            continue
+        end = region_end(index, name, marker)
+        if end is None:
+            continue
+        if end == -1:
+            # Unterminated: no later opening marker can be closed either
+            break
+        spans.append((marker[0], end))
+        pos = end
+
+    index['regions'][name] = spans
+    return spans
+
+
+def region_end(index, name, marker):
+    """End offset of the region opened by a (start, end) marker.
+
+    -1 when the region is never closed; None when a 'match' region's pattern
+    does not match at the marker.
+    """
+    spec = REGIONS[name]
+    content = index['content']
+    start, open_end = marker
+    if 'match' in spec:
+        match = _compiled(spec['match'], spec.get('flags', 0)).match(content, start)
+        return match.end() if match else None
+    if 'end' in spec:
+        match = _compiled(spec['end'], re.IGNORECASE).search(content, open_end)
+        return match.end() if match else -1
+    return _next_marker(index, spec['until'], open_end)
+
+
+def region_text(index, span):
+    return index['content'][span[0]:span[1]]
+
+
+def splice(content, edits):
+    """Apply (start, end, text) edits in one pass.
+
+    Edits resolve the way successive re.sub calls would: an edit inside or
+    partly over an earlier one is dropped (its region was already replaced),
+    and an edit that wholly contains earlier ones replaces them.
+    """
+    accepted = []
+    starts = []
+    ends = []
+    for order, (start, end, text) in enumerate(edits):
+        # Accepted edits never overlap, so both lists stay sorted and the
+        # edits overlapping [start, end) are the contiguous run lo:hi
+        lo = bisect.bisect_right(ends, start)
+        hi = bisect.bisect_left(starts, end) if end > start else lo
+        overlapping = accepted[lo:hi]
+        if any(not (start <= e_start and e_end <= end) or (e_start, e_end) == (start, end)
+               for e_start, e_end, _, _ in overlapping):
+            continue
+        accepted[lo:hi] = [(start, end, order, text)]
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+
+    parts = []
+    pos = 0
+    for start, end, order, text in accepted:
+        parts.append(content[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def replace_regions(index, name, text):
+    """Edits replacing every span of a region with text"""
+    return [(start, end, text) for start, end in regions(index, name)]
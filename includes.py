@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Include markers for the site-wide partials, resolved at build time.
+
+A shared partial (site_partials.PARTIALS) is never pasted into a page bare.
+Templates ({{> universal_nav }}) and rewriters (block('universal_nav'))
+put it between markers naming it:
+
+    <!-- include:universal_nav --><nav class="sticky ...">...</nav><!-- /include:universal_nav -->
+
+.build-cache/includes.json records which pages include which partial, and
+the version (text hash) of the partial each page holds:
+
+    {"locations/texas/index.html": {"tailwind_brand_config": "5e0b1c9d2a7f", "universal_nav": "a41f07c3e9b2"}}
+
+A generator streaming its pages (regenerate_locations --stream) appends its
+records to .build-cache/includes.log instead (appending()); the log is read
+with the index and folded into it by the next save_index.
+
+When a partial is edited, build.py resolves it again in exactly the pages
+recorded with another version - the text between its markers is replaced,
+nothing else on the page is read or re-rendered. A rewriter that replaces
+a region holding a whole block replaces the block (widen), so a page keeps
+one marked copy however often the rewriters run; one that edits inside a
+block drops its markers, as the page no longer holds the partial verbatim.
+
+Usage:
+    python3 includes.py               # resolve changed partials in the recorded pages
+    python3 includes.py --scan        # re-index every HTML file under the site root
+    python3 includes.py --list        # pages per partial, and how many are stale
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import output_writer
+import profiling
+import site_partials
+from build_graph import CACHE_DIR
+
+INDEX_FILE = 'includes.json'
+LOG_FILE = 'includes.log'
+INDEX_VERSION = 1
+# Characters of the text hash kept as a partial's version
+VERSION_DIGEST = 12
+
+MARKER_RE = re.compile(r'<!-- (/?)include:([\w-]+) -->')
+
+
+def opening(name):
+    return f"<!-- include:{name} -->"
+
+
+def closing(name):
+    return f"<!-- /include:{name} -->"
+
+
+def text_version(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:VERSION_DIGEST]
+
+
+def partial_versions():
+    """{name: version} of every site partial"""
+    return {name: text_version(text) for name, text in site_partials.PARTIALS.items()}
+
+
+def block(name):
+    """A site partial wrapped in its include markers, ready to splice into a page"""
+    return opening(name) + site_partials.PARTIALS[name] + closing(name)
+
+
+def find_blocks(content):
+    """(name, start, inner_start, inner_end, end) of every include block, in page order.
+    An opening marker pairs with the next closing marker of the same name;
+    unpaired markers are ignored."""
+    blocks = []
+    open_block = None
+    for match in MARKER_RE.finditer(content):
+        is_close, name = match.groups()
+        if not is_close:
+            open_block = (name, match.start(), match.end())
+        elif open_block and open_block[0] == name:
+            blocks.append((*open_block, match.start(), match.end()))
+            open_block = None
+    return blocks
+
+
+def outside_blocks(content, text):
+    """Offsets of text in content that lie outside every include block, for a
+    rewriter inserting next to a tag a partial may hold (e.g. '</style>')"""
+    blocks = find_blocks(content)
+    return [match.start() for match in re.finditer(re.escape(text), content)
+            if not any(start <= match.start() < end for _, start, _, _, end in blocks)]
+
+
+def included(content):
+    """{name: version} of the partials a page includes. A partial included
+    more than once with differing text has no single version ('mixed')."""
+    versions = {}
+    for name, _, inner_start, inner_end, _ in find_blocks(content):
+        version = text_version(content[inner_start:inner_end])
+        versions[name] = version if versions.get(name, version) == version else 'mixed'
+    return versions
+
+
+def resolve(content):
+    """content with every block of a site partial holding the partial's current text"""
+    parts = []
+    pos = 0
+    for name, _, inner_start, inner_end, _ in find_blocks(content):
+        if name in site_partials.PARTIALS:
+            parts.append(content[pos:inner_start])
+            parts.append(site_partials.PARTIALS[name])
+            pos = inner_end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def widen(content, edits):
+    """Rewriter (start, end, text) edits adjusted for the page's include blocks.
+
+    An edit whose span is a block's whole text (give or take whitespace)
+    replaces the block with its markers; a block an edit only partly
+    rewrites loses its markers.
+    """
+    blocks = find_blocks(content)
+    if not blocks:
+        return edits
+
+    widened = []
+    touched = set()
+    for start, end, text in edits:
+        for i, (_, b_start, inner_start, inner_end, b_end) in enumerate(blocks):
+            if end <= inner_start or start >= inner_end or (start <= b_start and b_end <= end):
+                continue
+            if (inner_start <= start and end <= inner_end and not content[inner_start:start].strip()
+                    and not content[end:inner_end].strip()):
+                start, end = b_start, b_end
+            else:
+                touched.add(i)
+        widened.append((start, end, text))
+
+    for i in sorted(touched):
+        _, b_start, inner_start, inner_end, b_end = blocks[i]
+        for m_start, m_end in ((b_start, inner_start), (inner_end, b_end)):
+            if not any(start < m_end and m_start < end for start, end, _ in widened):
+                widened.append((m_start, m_end, ''))
+    return widened
+
+
+def index_path(root='.'):
+    return Path(root) / CACHE_DIR / INDEX_FILE
+
+
+def log_path(root='.'):
+    return Path(root) / CACHE_DIR / LOG_FILE
+
+
+def load_index(root='.'):
+    """{rel path: {partial: version}} of the pages recorded under root, with the appended log applied"""
+    index = {}
+    path = index_path(root)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION:
+            index = data['pages']
+    if log_path(root).exists():
+        with open(log_path(root), 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['partials']:
+                    index[entry['path']] = entry['partials']
+                else:
+                    index.pop(entry['path'], None)
+    return index
+
+
+def save_index(root, index, write_stats=None):
+    path = index_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'version': INDEX_VERSION, 'pages': dict(sorted(index.items()))}
+    status = output_writer.write_if_changed(path, json.dumps(data, separators=(',', ':')), write_stats)
+    # The log is part of the index now
+    log_path(root).unlink(missing_ok=True)
+    return status
+
+
+@contextmanager
+def appending(root):
+    """Yield add(rel, names), which records a page just rendered with the
+    current text of the named partials by appending it to the log. The
+    lines join the log on a clean exit only."""
+    path = log_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{LOG_FILE}.{os.getpid()}.tmp")
+    current = partial_versions()
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yield lambda rel, names: f.write(
+                json.dumps({'path': rel, 'partials': {name: current[name] for name in sorted(names)}}) + '\n')
+        with open(tmp_path, 'r', encoding='utf-8') as src, open(path, 'a', encoding='utf-8') as dst:
+            for line in src:
+                dst.write(line)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def record(index, rel, content):
+    """Record the partials a page's content includes (dropping a page that includes none)"""
+    versions = included(content)
+    if versions:
+        index[rel] = versions
+    else:
+        index.pop(rel, None)
+
+
+def record_partials(index, rel, names):
+    """Record a page just rendered with the current text of the named partials"""
+    current = partial_versions()
+    if names:
+        index[rel] = {name: current[name] for name in sorted(names)}
+    else:
+        index.pop(rel, None)
+
+
+def stale_pages(index):
+    """Pages holding a site partial at another version than its current text"""
+    current = partial_versions()
+    return sorted(rel for rel, versions in index.items()
+                  if any(name in current and version != current[name] for name, version in versions.items()))
+
+
+def dependents(index, name):
+    """Pages that include a partial"""
+    return sorted(rel for rel, versions in index.items() if name in versions)
+
+
+def update_pages(root, index, write_stats=None):
+    """Resolve the changed partials in the stale pages of index, forgetting
+    pages that no longer exist. Returns the stats dict."""
+    stats = {'stale': 0, 'updated': 0, 'missing': 0}
+    for rel in stale_pages(index):
+        stats['stale'] += 1
+        path = Path(root) / rel
+        try:
+            content = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            del index[rel]
+            stats['missing'] += 1
+            continue
+        content = resolve(content)
+        if output_writer.write_if_changed(path, content, write_stats) != 'unchanged':
+            stats['updated'] += 1
+            print(f"  Resolved includes: {rel}")
+        record(index, rel, content)
+    return stats
+
+
+def format_include_stats(stats):
+    return f"{stats['updated']} pages re-resolved ({stats['stale']} stale, {stats['missing']} missing)"
+
+
+def scan(root, index):
+    """Record every HTML file under root"""
+    # Imported here: html_pipeline imports this module
+    from html_pipeline import find_html_files, make_page
+
+    index.clear()
+    for path in find_html_files(root):
+        page = make_page(root, path)
+        try:
+            content = page['path'].read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: {page['rel']} - {e}")
+            continue
+        record(index, page['rel'], content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve the site partials in the pages that include them")
+    parser.add_argument('--root', default='.', help="site root holding .build-cache/")
+    parser.add_argument('--scan', action='store_true', help="re-index every HTML file before resolving")
+    parser.add_argument('--list', action='store_true', help="show the pages per partial without writing")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = load_index(args.root)
+    if args.scan:
+        with profiling.stage('scan'):
+            scan(args.root, index)
+
+    if args.list:
+        stale = set(stale_pages(index))
+        print(f"\n{'Partial':<30}{'Pages':>8}{'Stale':>8}")
+        for name in site_partials.PARTIALS:
+            pages = dependents(index, name)
+            print(f"{name:<30}{len(pages):>8}{len(stale.intersection(pages)):>8}")
+        if args.scan:
+            save_index(args.root, index)
+        return None
+
+    write_stats = output_writer.new_write_stats()
+    stats = update_pages(args.root, index, write_stats)
+    save_index(args.root, index)
+    print(f"\n{'='*50}")
+    print(f"Includes: {format_include_stats(stats)}, {len(index)} pages recorded")
+    print(f"Written files - {output_writer.format_write_stats(write_stats)}")
+    print(f"Finished in {round(time.perf_counter() - start, 3)}s")
+    return stats
+
+
+if __name__ == '__main__':
+    profiling.run(main)
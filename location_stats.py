@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Per-location aggregates of the provider store, computed once per build.
+
+For every scope (a store source, or one of the SCOPES combining several)
+the table holds, in total and per state and city: the provider count, the
+Inspire-certified count, price low/median/high and procedure coverage
+(providers offering each catalogue procedure). Pages, JSON-LD and
+api/data.json all read these numbers instead of re-counting:
+
+    stats = load_stats()
+    texas = stats['scopes']['medical_centers']['states']['Texas']
+    texas['providers'], texas['price']['median'], texas['cities']['Houston']['procedures']['inspire']
+
+The table is cached in .build-cache/location-stats.json and recomputed
+only when the provider store's sources or the procedure catalogue change.
+
+A provider's price is its own price range ("$4,000 - $8,000") where the
+record has one, else the catalogue costs (api/procedures.json) of the
+procedures it offers (as procedure_index matches them). low and high are
+the extremes over a location's providers, median is the median of their
+midpoints.
+
+Usage:
+    python3 location_stats.py                     # per-state table of the sleep providers
+    python3 location_stats.py --scope independent_clinics
+"""
+
+import argparse
+import json
+import os
+import re
+from statistics import median
+from pathlib import Path
+
+import output_writer
+import procedure_index
+import profiling
+import provider_store
+from build_graph import CACHE_DIR, content_hash
+
+STATS_FILE = 'location-stats.json'
+PROCEDURES_JSON = 'api/procedures.json'
+
+# Scopes beyond the single sources: the research providers of api/clinics.json
+SCOPES = {
+    'sleep_providers': list(provider_store.CLINICS_JSON_SOURCES),
+}
+PRICE = re.compile(r'\$\s*(\d[\d,]*)')
+
+_loaded = {}
+
+
+def stats_path(root='.'):
+    return Path(root) / CACHE_DIR / STATS_FILE
+
+
+def signature(root='.'):
+    """The store's source signature plus the catalogue and this module"""
+    signature = provider_store.source_signature(root)
+    for path in [Path(root) / PROCEDURES_JSON, Path(__file__).resolve()]:
+        try:
+            stat = os.stat(path)
+            signature[path.name] = [stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            signature[path.name] = None
+    return signature
+
+
+def load_catalogue(root='.'):
+    path = Path(root) / PROCEDURES_JSON
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('procedures', [])
+
+
+def price_range(text):
+    """(low, high) from a '$4,000 - $8,000' style range, None without prices"""
+    prices = [int(value.replace(',', '')) for value in PRICE.findall(text or '')]
+    if not prices:
+        return None
+    return min(prices), max(prices)
+
+
+def provider_summary(record, catalogue):
+    """(inspire certified, (low, high) or None, offered procedure slugs) of one provider"""
+    ids = procedure_index.canonical_procedures(record.get('procedures_offered') or record.get('treatments'))
+    offered = [procedure for procedure in catalogue if procedure['id'] in ids]
+    price = price_range(record.get('priceRange') or record.get('price_range'))
+    if price is None and offered:
+        price = (min(p['cost_low'] for p in offered), max(p['cost_high'] for p in offered))
+    return bool(record.get('inspire_certified')), price, [procedure['slug'] for procedure in offered]
+
+
+def new_aggregate():
+    return {'providers': 0, 'inspire_certified': 0, 'prices': [], 'procedures': {}}
+
+
+def add_provider(aggregate, summary):
+    inspire, price, procedures = summary
+    aggregate['providers'] += 1
+    aggregate['inspire_certified'] += inspire
+    if price:
+        aggregate['prices'].append(price)
+    for slug in procedures:
+        aggregate['procedures'][slug] = aggregate['procedures'].get(slug, 0) + 1
+
+
+def finish(aggregate):
+    """Replace the collected prices by low/median/high (None without prices)"""
+    prices = aggregate.pop('prices')
+    aggregate['price'] = {
+        'low': min(low for low, _ in prices),
+        'median': median((low + high) / 2 for low, high in prices),
+        'high': max(high for _, high in prices),
+    } if prices else None
+    aggregate['procedures'] = dict(sorted(aggregate['procedures'].items()))
+    return aggregate
+
+
+def scope_stats(root, sources, catalogue):
+    """Totals and per-state/per-city aggregates of the providers of some sources"""
+    total = new_aggregate()
+    states = {}
+    for state, city, records in provider_store.iter_cities(root, source=sources):
+        state_aggregate = states.setdefault(state, dict(new_aggregate(), cities={}))
+        city_aggregate = state_aggregate['cities'][city] = new_aggregate()
+        for record in records:
+            summary = provider_summary(record, catalogue)
+            for aggregate in (total, state_aggregate, city_aggregate):
+                add_provider(aggregate, summary)
+        finish(city_aggregate)
+
+    for state_aggregate in states.values():
+        finish(state_aggregate)
+        state_aggregate['city_count'] = len(state_aggregate['cities'])
+    finish(total)
+    total['state_count'] = len(states)
+    total['city_count'] = sum(len(state['cities']) for state in states.values())
+    total['states'] = states
+    return total
+
+
+def compute_stats(root='.'):
+    catalogue = load_catalogue(root)
+    scopes = {source: [source] for source in provider_store.CLINICS_JSON_SOURCES}
+    scopes.update(SCOPES)
+    return {name: scope_stats(root, sources, catalogue) for name, sources in scopes.items()}
+
+
+def load_stats(root='.'):
+    """The aggregates table, recomputed if the store or the catalogue changed"""
+    current = signature(root)
+    key = str(Path(root).resolve())
+    if key in _loaded and _loaded[key]['signature'] == current:
+        return _loaded[key]
+
+    path = stats_path(root)
+    stats = None
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+    if stats is None or stats.get('signature') != current:
+        with profiling.stage('aggregate'):
+            stats = {'signature': current, 'scopes': compute_stats(root)}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            output_writer.write_if_changed(path, json.dumps(stats, indent=1, ensure_ascii=False))
+    _loaded[key] = stats
+    return stats
+
+
+def data_version(root='.'):
+    """Hash of the aggregates under root, for the rewriters that read them (transform_ledger.py)"""
+    return content_hash(load_stats(root)['scopes'])
+
+
+def format_price(price):
+    if not price:
+        return '-'
+    return f"${price['low']:,}-${price['high']:,} (median ${price['median']:,.0f})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the per-location aggregates")
+    parser.add_argument('--root', default='.', help="site root holding api/")
+    parser.add_argument('--scope', default='sleep_providers', help="store source or combined scope")
+    args = parser.parse_args(argv)
+
+    scopes = load_stats(args.root)['scopes']
+    if args.scope not in scopes:
+        parser.error(f"unknown scope {args.scope!r}, choose from {', '.join(scopes)}")
+    scope = scopes[args.scope]
+
+    print(f"\n{'State':<24}{'Cities':>7}{'Providers':>10}{'Inspire':>9}  Price")
+    for state, aggregate in sorted(scope['states'].items()):
+        print(f"{state[:23]:<24}{aggregate['city_count']:>7}{aggregate['providers']:>10}"
+              f"{aggregate['inspire_certified']:>9}  {format_price(aggregate['price'])}")
+    print(f"\n{'='*50}")
+    print(f"{args.scope}: {scope['providers']} providers ({scope['inspire_certified']} Inspire certified) "
+          f"in {scope['state_count']} states and {scope['city_count']} cities")
+    print(f"Price: {format_price(scope['price'])}")
+    coverage = ', '.join(f"{slug} {count}" for slug, count in scope['procedures'].items())
+    print(f"Procedure coverage: {coverage or '-'}")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
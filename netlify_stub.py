@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Netlify digest deploy API, for testing deploy.py.
+Keeps uploaded files in a content-addressed store so later deploys only
+ask for digests it has not seen.
+
+Usage:
+    python3 netlify_stub.py --port 8788 --store /tmp/netlify-stub
+    python3 deploy.py --api-url http://127.0.0.1:8788/api/v1 --site-id local --token test
+
+Endpoints:
+    POST /api/v1/sites/<site_id>/deploys       {"files": {path: sha1}} -> {"id", "required"}
+    PUT  /api/v1/deploys/<deploy_id>/files/<path>
+    GET  /api/v1/deploys/<deploy_id>
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+API_PREFIX = '/api/v1'
+
+
+def make_handler(store):
+    """Request handler bound to a blob store directory"""
+    deploys = {}
+    lock = threading.Lock()
+
+    def blob_path(sha1):
+        return store / sha1[:2] / sha1
+
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status, data):
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def read_body(self):
+            return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        def route(self):
+            path = urllib.parse.unquote(urllib.parse.urlparse(self.path).path)
+            if not path.startswith(API_PREFIX):
+                return []
+            return path[len(API_PREFIX):].split('/', 4)
+
+        def do_POST(self):
+            parts = self.route()
+            if len(parts) != 4 or parts[1] != 'sites' or parts[3] != 'deploys':
+                return self.send_json(404, {'message': 'Not Found'})
+            files = json.loads(self.read_body()).get('files', {})
+            required = sorted({sha1 for sha1 in files.values() if not blob_path(sha1).exists()})
+            deploy = {
+                'id': uuid.uuid4().hex[:24],
+                'site_id': parts[2],
+                'files': files,
+                'required': required,
+                'state': 'uploading' if required else 'ready',
+            }
+            with lock:
+                deploys[deploy['id']] = deploy
+            self.send_json(200, {key: deploy[key] for key in ['id', 'site_id', 'required', 'state']})
+
+        def do_PUT(self):
+            parts = self.route()
+            if len(parts) != 5 or parts[1] != 'deploys' or parts[3] != 'files':
+                return self.send_json(404, {'message': 'Not Found'})
+            deploy = deploys.get(parts[2])
+            deploy_path = '/' + parts[4]
+            if deploy is None or deploy_path not in deploy['files']:
+                return self.send_json(404, {'message': 'Not Found'})
+
+            data = self.read_body()
+            sha1 = hashlib.sha1(data).hexdigest()
+            if sha1 != deploy['files'][deploy_path]:
+                return self.send_json(422, {'message': f'digest mismatch for {deploy_path}'})
+            path = blob_path(sha1)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+            with lock:
+                deploy['required'] = [digest for digest in deploy['required'] if digest != sha1]
+                if not deploy['required']:
+                    deploy['state'] = 'ready'
+            self.send_json(200, {'id': sha1, 'path': deploy_path, 'size': len(data)})
+
+        def do_GET(self):
+            parts = self.route()
+            if len(parts) != 3 or parts[1] != 'deploys' or parts[2] not in deploys:
+                return self.send_json(404, {'message': 'Not Found'})
+            deploy = deploys[parts[2]]
+            self.send_json(200, {key: deploy[key] for key in ['id', 'site_id', 'required', 'state']})
+
+        def log_message(self, format, *args):
+            print(f"  {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Netlify deploy API")
+    parser.add_argument('--port', type=int, default=8788)
+    parser.add_argument('--store', default='.netlify-stub', help="directory for uploaded file blobs")
+    args = parser.parse_args(argv)
+
+    store = Path(args.store)
+    store.mkdir(parents=True, exist_ok=True)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(store))
+    print(f"Deploy API stub on http://127.0.0.1:{args.port}{API_PREFIX} (store: {store})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,8 @@ from PIL import Image
 from pathlib import Path
 import shutil
 
+import profiling
+
 # Configuration
 QUALITY_JPG = 75  # JPEG quality (0-100)
 QUALITY_WEBP = 80  # WebP quality (0-100)
@@ -154,4 +156,4 @@ def main():
     print("=" * 60)
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Write-if-changed output layer for generated files.
+Compares new content with what is already on disk, leaves identical files
+(and their mtimes) alone and replaces changed files atomically via a temp
+file + rename, so deploys and CDN invalidations only see real changes.
+
+Usage:
+    write_stats = new_write_stats()
+    write_if_changed('locations/index.html', html, write_stats)
+    print(format_write_stats(write_stats))
+
+write_chunks_if_changed() does the same for content produced in pieces
+(e.g. templates.render_iter), streaming it to the temp file so the whole
+page is never held in memory.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+WRITE_STATUSES = ['new', 'changed', 'unchanged']
+
+
+def new_write_stats():
+    """Empty per-status file and byte counters"""
+    return {status: {'files': 0, 'bytes': 0} for status in WRITE_STATUSES}
+
+
+def record_write(stats, status, size):
+    if stats is not None:
+        stats[status]['files'] += 1
+        stats[status]['bytes'] += size
+
+
+def file_status(path, data):
+    """'new', 'changed' or 'unchanged' for data about to be written to path"""
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        return 'new'
+    if size != len(data):
+        return 'changed'
+    with open(path, 'rb') as f:
+        existing = f.read()
+    return 'unchanged' if hashlib.sha1(existing).digest() == hashlib.sha1(data).digest() else 'changed'
+
+
+def atomic_write(path, data):
+    """Replace path with data via a temp file in the same directory"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_if_changed(path, content, stats=None, encoding='utf-8'):
+    """Write content (str or bytes) to path unless the file already holds it.
+    Returns 'new', 'changed' or 'unchanged'."""
+    data = content.encode(encoding) if isinstance(content, str) else content
+    status = file_status(path, data)
+    if status != 'unchanged':
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, data)
+    record_write(stats, status, len(data))
+    return status
+
+
+def same_file_content(path, size, digest):
+    """Whether path holds size bytes hashing to the SHA-1 digest"""
+    try:
+        if os.stat(path).st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha1.update(block)
+    return sha1.digest() == digest
+
+
+def write_chunks_if_changed(path, chunks, stats=None, encoding='utf-8'):
+    """Stream chunks (str or bytes) into path unless the file already holds
+    the same content. Returns 'new', 'changed' or 'unchanged'."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    sha1 = hashlib.sha1()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                data = chunk.encode(encoding) if isinstance(chunk, str) else chunk
+                sha1.update(data)
+                size += len(data)
+                f.write(data)
+        if same_file_content(path, size, sha1.digest()):
+            status = 'unchanged'
+        else:
+            status = 'changed' if path.exists() else 'new'
+            if status == 'changed':
+                shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    record_write(stats, status, size)
+    return status
+
+
+def format_bytes(size):
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_write_stats(stats):
+    """One line summary, e.g. 'New: 2 (14.1 KB), Changed: 1 (7.0 KB), Unchanged: 85 (601.3 KB)'"""
+    return ', '.join(
+        f"{status.title()}: {stats[status]['files']} ({format_bytes(stats[status]['bytes'])})"
+        for status in WRITE_STATUSES
+    )
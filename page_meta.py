@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Metadata of every generated page, recorded when the page is rendered.
+
+A generator already holds the record behind each page, so its page jobs
+carry the entity ID and the page's display fields:
+
+    page_job(path, render, args, deps, entity=clinic['id'], fields=provider_fields(clinic, city, state))
+
+and build.py writes them for every page it produced to
+.build-cache/page-meta.json, along with the page's template version:
+
+    {"locations/texas/houston/houston-methodist.html":
+        {"entity": "center-3f9a0c1b22de", "generator": "regenerate_locations",
+         "template": "1c9e0d2a4b7f", "fields": {"name": ..., "phone": ..., "city": "Houston", ...}}}
+
+A generator that writes its pages itself (regenerate_locations --stream)
+appends the entries to .build-cache/page-meta.log as it goes instead of
+holding them; the log is read with the index and folded into it by the
+next save_index:
+
+    with page_meta.appending(root, ['regenerate_locations']) as add:
+        add(path, entry)
+
+Rewriters look a page up instead of scraping its HTML with regexes:
+
+    fields = page_meta.fields(page)     # None for pages no generator recorded
+
+Usage:
+    python3 page_meta.py                                  # pages per generator
+    python3 page_meta.py locations/texas/houston/index.html
+"""
+
+import argparse
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import output_writer
+import profiling
+import provider_store
+from build_graph import CACHE_DIR, content_hash
+from location_stats import price_range
+
+META_FILE = 'page-meta.json'
+LOG_FILE = 'page-meta.log'
+META_VERSION = 1
+# Characters of the template hash kept as the template version
+TEMPLATE_DIGEST = 12
+
+_loaded = {}
+
+
+def meta_path(root='.'):
+    return Path(root) / CACHE_DIR / META_FILE
+
+
+def log_path(root='.'):
+    return Path(root) / CACHE_DIR / LOG_FILE
+
+
+def provider_fields(record, city, state):
+    """Display fields of a provider or clinic page, as the extractors used to scrape them"""
+    fields = {
+        'name': record.get('name'),
+        'phone': record.get('phone'),
+        'address': record.get('address'),
+        'city': city,
+        'state': provider_store.canonical_state(state),
+        'specialty': record.get('specialty') or record.get('specializations'),
+    }
+    price = price_range(record.get('priceRange') or record.get('price_range'))
+    if price:
+        fields['price_low'], fields['price_high'] = price
+    return {key: value for key, value in fields.items() if value not in (None, '')}
+
+
+def entry(entity, generator, template, fields=None):
+    return {'entity': entity, 'generator': generator, 'template': template[:TEMPLATE_DIGEST], 'fields': fields or {}}
+
+
+def job_entry(job):
+    """Index entry of a build job, None if its generator recorded no entity"""
+    if job.get('entity') is None:
+        return None
+    render = job['render']
+    template = job['deps'][f"template:{render.__module__}.{render.__name__}"]
+    return entry(job['entity'], job['generator'], template, job.get('fields'))
+
+
+def read_index(root='.'):
+    """{path: entry} of the index file, with the appended log applied"""
+    pages = {}
+    path = meta_path(root)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == META_VERSION:
+            pages = data['pages']
+    if log_path(root).exists():
+        with open(log_path(root), 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'drop' in record:
+                    pages = {path: page for path, page in pages.items() if page['generator'] not in record['drop']}
+                else:
+                    pages[record['path']] = record['entry']
+    return pages
+
+
+def save_index(root, generators, entries, write_stats=None):
+    """Replace the entries of some generators with {path: entry}. Returns the write status."""
+    pages = {path: page for path, page in read_index(root).items() if page['generator'] not in generators}
+    pages.update(entries)
+    path = meta_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'version': META_VERSION, 'pages': dict(sorted(pages.items()))}
+    status = output_writer.write_if_changed(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                                            write_stats)
+    # The log is part of the index now
+    log_path(root).unlink(missing_ok=True)
+    return status
+
+
+@contextmanager
+def appending(root, generators):
+    """Replace the entries of some generators with the ones passed to the
+    yielded add(path, entry), streamed to the log as they come. The log
+    lines are written to a temp file that joins the log on a clean exit,
+    so an interrupted run leaves the index as it was."""
+    path = log_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{LOG_FILE}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'drop': list(generators)}) + '\n')
+            yield lambda page, entry: f.write(
+                json.dumps({'path': page, 'entry': entry}, ensure_ascii=False) + '\n')
+        with open(tmp_path, 'r', encoding='utf-8') as src, open(path, 'a', encoding='utf-8') as dst:
+            for line in src:
+                dst.write(line)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_index(root='.'):
+    """{path: entry} of the pages under root, re-read only when the file or its log changes"""
+    path = meta_path(root)
+    version = ()
+    for file in (path, log_path(root)):
+        try:
+            stat = os.stat(file)
+            version += (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version += (None, None)
+    if version == (None,) * 4:
+        return {}
+    key = str(path.resolve())
+    if key not in _loaded or _loaded[key][0] != version:
+        _loaded[key] = (version, read_index(root))
+    return _loaded[key][1]
+
+
+def data_version(root='.'):
+    """Hash of the page index under root, for the rewriters that read it (transform_ledger.py)"""
+    return content_hash(load_index(root))
+
+
+def lookup(page):
+    """Entry of a pipeline page (a dict with 'root' and 'rel'), None if unrecorded"""
+    return load_index(page['root']).get(page['rel'])
+
+
+def fields(page):
+    entry = lookup(page)
+    return entry['fields'] if entry else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the recorded page metadata")
+    parser.add_argument('paths', nargs='*', help="page paths relative to the site root")
+    parser.add_argument('--root', default='.', help="site root holding .build-cache/")
+    args = parser.parse_args(argv)
+
+    pages = load_index(args.root)
+    for path in args.paths:
+        print(json.dumps({path: pages.get(path)}, indent=2, ensure_ascii=False))
+    if args.paths:
+        return
+
+    generators = {}
+    for page in pages.values():
+        generators[page['generator']] = generators.get(page['generator'], 0) + 1
+    for generator, count in sorted(generators.items()):
+        print(f"  {generator:<28}{count:>6} pages")
+    print(f"\n{'='*50}")
+    print(f"{len(pages)} pages recorded in {meta_path(args.root)}")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -1,324 +1,454 @@
 #!/usr/bin/env python3
 """
 Parse Sleep Apnea research CSV files and generate JSON data for the website.
+The CSVs are streamed and validated by csv_ingest; rejected rows and
+warnings are summarised per file and written to .build-cache/ingest-report.json,
+along with the procedure fields filled from the curated KEY_PROCEDURES.
+
+Usage:
+    python3 parse_sleep_data.py
+    python3 parse_sleep_data.py --research-dir ~/exports --output-dir /tmp/api
 """
 
-import csv
+import argparse
 import json
 import os
 from pathlib import Path
 
-# Paths
-RESEARCH_DIR = Path("/Users/tang/Projects/sleep-apnea")
-OUTPUT_DIR = Path("/Users/tang/Projects/sleep-apnea-match/api")
-
-def parse_medical_centers():
+from build_graph import CACHE_DIR
+import csv_ingest
+from csv_ingest import NOT_EMPTY, NUMBER, URL, YES_NO, parse_number
+from output_writer import new_write_stats, write_if_changed, format_write_stats
+import location_stats
+import procedure_index
+import profiling
+import provider_store
+import record_ids
+from record_ids import assign_id, record_key
+import slugs
+from slugs import slugify
+from streaming import iter_json_arrays
+
+# Paths: the research exports live next to this repository
+REPO_DIR = Path(__file__).resolve().parent
+RESEARCH_DIR = REPO_DIR.parent / "sleep-apnea"
+OUTPUT_DIR = REPO_DIR / "api"
+INGEST_REPORT = "ingest-report.json"
+# Issues printed per file; the full list is in the ingest report
+PRINTED_ISSUES = 5
+
+MEDICAL_CENTERS_SCHEMA = {
+    'key': 'Center Name',
+    'required': ['Center Name', 'City', 'State'],
+    'columns': ['Address', 'Phone', 'Website', 'Specializations', 'Key Surgeons', 'Procedures Offered',
+                'Inspire Certified', 'Center of Excellence', 'Research Programs', 'Patient Volume',
+                'Insurance Accepted', 'Notes'],
+    'checks': {'City': NOT_EMPTY, 'State': NOT_EMPTY, 'Website': URL, 'Inspire Certified': YES_NO},
+}
+
+INDEPENDENT_CLINICS_SCHEMA = {
+    'key': 'Clinic Name',
+    'required': ['Clinic Name', 'City', 'State'],
+    'columns': ['Lead Surgeon', 'Address', 'Phone', 'Website', 'Specializations', 'Procedures Offered',
+                'Inspire Certified', 'Notable Achievements', 'Patient Reviews Summary', 'Insurance Accepted',
+                'Unique Services', 'Practice Type'],
+    'checks': {'City': NOT_EMPTY, 'State': NOT_EMPTY, 'Website': URL, 'Inspire Certified': YES_NO},
+}
+
+# Procedure field -> (CSV column, value parser); fields the CSV leaves empty
+# are taken from KEY_PROCEDURES and reported as gaps
+PROCEDURE_COLUMNS = {
+    'description': ('Description', str),
+    'category': ('Category', str),
+    'cost_low': ('Cost Low', parse_number),
+    'cost_high': ('Cost High', parse_number),
+    'median_cost': ('Median Cost', parse_number),
+    'success_rate_min': ('Success Rate Min', parse_number),
+    'success_rate_max': ('Success Rate Max', parse_number),
+    'cure_rate_min': ('Cure Rate Min', parse_number),
+    'cure_rate_max': ('Cure Rate Max', parse_number),
+    'recovery_time': ('Recovery Time', str),
+    'hospital_stay': ('Hospital Stay', str),
+    'anesthesia': ('Anesthesia', str),
+    'insurance_covered': ('Insurance Covered', lambda value: value.lower() == 'yes'),
+    'cpt_codes': ('CPT Codes', str),
+}
+
+PROCEDURES_SCHEMA = {
+    'key': 'Procedure Name',
+    'required': ['Procedure Name'],
+    'columns': [column for column, _ in PROCEDURE_COLUMNS.values()],
+    'checks': {
+        **{column: NUMBER for column, parse in PROCEDURE_COLUMNS.values() if parse is parse_number},
+        'Insurance Covered': YES_NO,
+    },
+}
+
+FAQS_SCHEMA = {
+    'key': 'Question',
+    'required': ['Question', 'Answer'],
+    'columns': ['Category', 'Related Procedures', 'Sources', 'SEO Keywords'],
+    'checks': {'Answer': NOT_EMPTY},
+}
+
+CLINICAL_STUDIES_SCHEMA = {
+    'key': 'Study Name',
+    'required': ['Study Name'],
+    'columns': ['Study Type', 'Sample Size', 'Follow-up Duration', 'AHI Reduction', 'Success Rate',
+                'Cure Rate', 'Key Findings', 'Source'],
+}
+
+def write_json(path, data, write_stats):
+    """Write a JSON file, leaving it untouched if the content is unchanged."""
+    with profiling.stage('write'):
+        status = write_if_changed(path, json.dumps(data, indent=2, ensure_ascii=False), write_stats)
+    label = "Unchanged" if status == 'unchanged' else "Written"
+    print(f"  {label}: {path}")
+
+def read_research_csv(research_dir, filename, schema, reports):
+    """Stream the valid (index, row) records of a research CSV, adding its report to reports"""
+    report = csv_ingest.new_report(filename)
+    reports[filename] = report
+    return csv_ingest.iter_rows(Path(research_dir) / filename, schema, report)
+
+def provider_key(provider):
+    return record_key(provider.get('name'), provider.get('city'), provider_store.canonical_state(provider.get('state')))
+
+def provider_secondary_key(provider):
+    """Address and phone, which pair up a provider's IDs across a rename; None if neither is known"""
+    if not (provider.get('address') or provider.get('phone')):
+        return None
+    return record_key(provider.get('address'), provider.get('phone'))
+
+def faq_key(faq):
+    return record_key(faq.get('question'))
+
+def study_key(study):
+    return record_key(study.get('name'))
+
+def parse_medical_centers(research_dir, reports):
     """Parse medical centers CSV into structured JSON."""
     centers = []
-    csv_path = RESEARCH_DIR / "research_medical_centers.csv"
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            if not row.get('Center Name'):
-                continue
-            center = {
-                "id": f"center-{i+1:03d}",
-                "name": row.get('Center Name', '').strip(),
-                "slug": row.get('Center Name', '').lower().replace(' ', '-').replace(',', '').replace('.', ''),
-                "type": "academic_medical_center",
-                "city": row.get('City', '').strip(),
-                "state": row.get('State', '').strip(),
-                "address": row.get('Address', '').strip(),
-                "phone": row.get('Phone', '').strip(),
-                "website": row.get('Website', '').strip(),
-                "specializations": row.get('Specializations', '').strip(),
-                "key_surgeons": row.get('Key Surgeons', '').strip(),
-                "procedures_offered": row.get('Procedures Offered', '').strip(),
-                "inspire_certified": row.get('Inspire Certified', '').strip().lower() == 'yes',
-                "center_of_excellence": row.get('Center of Excellence', '').strip(),
-                "research_programs": row.get('Research Programs', '').strip(),
-                "patient_volume": row.get('Patient Volume', '').strip(),
-                "insurance_accepted": row.get('Insurance Accepted', '').strip(),
-                "notes": row.get('Notes', '').strip(),
-                "featured": True,
-                "verified": True
-            }
-            centers.append(center)
+    ids = {}
+    rows = read_research_csv(research_dir, "research_medical_centers.csv", MEDICAL_CENTERS_SCHEMA, reports)
+
+    for _, row in rows:
+        center = {
+            "id": None,
+            "name": row.get('Center Name', '').strip(),
+            "slug": None,
+            "type": "academic_medical_center",
+            "city": row.get('City', '').strip(),
+            "state": row.get('State', '').strip(),
+            "address": row.get('Address', '').strip(),
+            "phone": row.get('Phone', '').strip(),
+            "website": row.get('Website', '').strip(),
+            "specializations": row.get('Specializations', '').strip(),
+            "key_surgeons": row.get('Key Surgeons', '').strip(),
+            "procedures_offered": row.get('Procedures Offered', '').strip(),
+            "inspire_certified": row.get('Inspire Certified', '').strip().lower() == 'yes',
+            "center_of_excellence": row.get('Center of Excellence', '').strip(),
+            "research_programs": row.get('Research Programs', '').strip(),
+            "patient_volume": row.get('Patient Volume', '').strip(),
+            "insurance_accepted": row.get('Insurance Accepted', '').strip(),
+            "notes": row.get('Notes', '').strip(),
+            "featured": True,
+            "verified": True
+        }
+        center["id"] = assign_id(ids, "center", provider_key(center))
+        centers.append(center)
 
     return centers
 
-def parse_independent_clinics():
+def parse_independent_clinics(research_dir, reports):
     """Parse independent clinics CSV into structured JSON."""
     clinics = []
-    csv_path = RESEARCH_DIR / "research_independent_clinics.csv"
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            if not row.get('Clinic Name'):
-                continue
-            clinic = {
-                "id": f"clinic-{i+1:03d}",
-                "name": row.get('Clinic Name', '').strip(),
-                "slug": row.get('Clinic Name', '').lower().replace(' ', '-').replace(',', '').replace('.', '').replace("'", ''),
-                "type": "independent_practice",
-                "lead_surgeon": row.get('Lead Surgeon', '').strip(),
-                "city": row.get('City', '').strip(),
-                "state": row.get('State', '').strip(),
-                "address": row.get('Address', '').strip(),
-                "phone": row.get('Phone', '').strip(),
-                "website": row.get('Website', '').strip(),
-                "specializations": row.get('Specializations', '').strip(),
-                "procedures_offered": row.get('Procedures Offered', '').strip(),
-                "inspire_certified": row.get('Inspire Certified', '').strip().lower() == 'yes',
-                "notable_achievements": row.get('Notable Achievements', '').strip(),
-                "patient_reviews": row.get('Patient Reviews Summary', '').strip(),
-                "insurance_accepted": row.get('Insurance Accepted', '').strip(),
-                "unique_services": row.get('Unique Services', '').strip(),
-                "practice_type": row.get('Practice Type', '').strip(),
-                "featured": False,
-                "verified": True
-            }
-            clinics.append(clinic)
+    ids = {}
+    rows = read_research_csv(research_dir, "research_independent_clinics.csv", INDEPENDENT_CLINICS_SCHEMA, reports)
+
+    for _, row in rows:
+        clinic = {
+            "id": None,
+            "name": row.get('Clinic Name', '').strip(),
+            "slug": None,
+            "type": "independent_practice",
+            "lead_surgeon": row.get('Lead Surgeon', '').strip(),
+            "city": row.get('City', '').strip(),
+            "state": row.get('State', '').strip(),
+            "address": row.get('Address', '').strip(),
+            "phone": row.get('Phone', '').strip(),
+            "website": row.get('Website', '').strip(),
+            "specializations": row.get('Specializations', '').strip(),
+            "procedures_offered": row.get('Procedures Offered', '').strip(),
+            "inspire_certified": row.get('Inspire Certified', '').strip().lower() == 'yes',
+            "notable_achievements": row.get('Notable Achievements', '').strip(),
+            "patient_reviews": row.get('Patient Reviews Summary', '').strip(),
+            "insurance_accepted": row.get('Insurance Accepted', '').strip(),
+            "unique_services": row.get('Unique Services', '').strip(),
+            "practice_type": row.get('Practice Type', '').strip(),
+            "featured": False,
+            "verified": True
+        }
+        clinic["id"] = assign_id(ids, "clinic", provider_key(clinic))
+        clinics.append(clinic)
 
     return clinics
 
-def parse_procedures():
-    """Parse procedures CSV into structured JSON."""
+# Curated values of the site's procedures, used for the fields the research
+# CSV does not fill. Their IDs and slugs are the ones the site links to.
+KEY_PROCEDURES = [
+    {
+        "id": "uppp",
+        "name": "UPPP (Uvulopalatopharyngoplasty)",
+        "slug": "uppp",
+        "description": "Surgical removal and repositioning of excess tissue in the throat including the uvula, soft palate, and tonsils to widen the airway.",
+        "category": "soft_palate",
+        "cost_low": 5000,
+        "cost_high": 15000,
+        "median_cost": 10000,
+        "success_rate_min": 40,
+        "success_rate_max": 60,
+        "cure_rate_min": 15,
+        "cure_rate_max": 25,
+        "recovery_time": "2-4 weeks",
+        "hospital_stay": "1 day or outpatient",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "42145"
+    },
+    {
+        "id": "inspire",
+        "name": "Inspire (Hypoglossal Nerve Stimulation)",
+        "slug": "inspire",
+        "description": "Implantable device that stimulates the hypoglossal nerve to keep the airway open during sleep.",
+        "category": "neuromodulation",
+        "cost_low": 30000,
+        "cost_high": 65000,
+        "median_cost": 45000,
+        "success_rate_min": 66,
+        "success_rate_max": 75,
+        "cure_rate_min": 20,
+        "cure_rate_max": 30,
+        "recovery_time": "1-2 weeks",
+        "hospital_stay": "Outpatient or 1 day",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "64568"
+    },
+    {
+        "id": "mma",
+        "name": "MMA (Maxillomandibular Advancement)",
+        "slug": "mma",
+        "description": "Surgical advancement of both the upper and lower jaw to enlarge the airway.",
+        "category": "skeletal",
+        "cost_low": 40000,
+        "cost_high": 100000,
+        "median_cost": 65000,
+        "success_rate_min": 85,
+        "success_rate_max": 95,
+        "cure_rate_min": 40,
+        "cure_rate_max": 50,
+        "recovery_time": "4-6 weeks",
+        "hospital_stay": "1-2 days",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "21141, 21196"
+    },
+    {
+        "id": "septoplasty",
+        "name": "Septoplasty",
+        "slug": "septoplasty",
+        "description": "Surgical correction of a deviated nasal septum to improve nasal airflow.",
+        "category": "nasal",
+        "cost_low": 3000,
+        "cost_high": 10000,
+        "median_cost": 6000,
+        "success_rate_min": 70,
+        "success_rate_max": 90,
+        "cure_rate_min": 5,
+        "cure_rate_max": 15,
+        "recovery_time": "1-2 weeks",
+        "hospital_stay": "Outpatient",
+        "anesthesia": "General or local",
+        "insurance_covered": True,
+        "cpt_codes": "30520"
+    },
+    {
+        "id": "turbinate-reduction",
+        "name": "Turbinate Reduction",
+        "slug": "turbinate-reduction",
+        "description": "Surgical reduction of the turbinates to improve nasal airflow.",
+        "category": "nasal",
+        "cost_low": 2000,
+        "cost_high": 5000,
+        "median_cost": 3500,
+        "success_rate_min": 70,
+        "success_rate_max": 85,
+        "cure_rate_min": 5,
+        "cure_rate_max": 10,
+        "recovery_time": "1 week",
+        "hospital_stay": "Outpatient",
+        "anesthesia": "Local or general",
+        "insurance_covered": True,
+        "cpt_codes": "30140"
+    },
+    {
+        "id": "tonsillectomy",
+        "name": "Tonsillectomy",
+        "slug": "tonsillectomy",
+        "description": "Surgical removal of the tonsils, often combined with adenoidectomy for sleep apnea.",
+        "category": "soft_palate",
+        "cost_low": 3000,
+        "cost_high": 8000,
+        "median_cost": 5000,
+        "success_rate_min": 75,
+        "success_rate_max": 82,
+        "cure_rate_min": 50,
+        "cure_rate_max": 70,
+        "recovery_time": "1-2 weeks",
+        "hospital_stay": "Outpatient or 1 day",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "42826"
+    },
+    {
+        "id": "genioglossus-advancement",
+        "name": "Genioglossus Advancement",
+        "slug": "genioglossus-advancement",
+        "description": "Surgical procedure to pull the tongue muscle attachment forward to prevent airway collapse.",
+        "category": "tongue",
+        "cost_low": 8000,
+        "cost_high": 20000,
+        "median_cost": 12000,
+        "success_rate_min": 39,
+        "success_rate_max": 65,
+        "cure_rate_min": 15,
+        "cure_rate_max": 25,
+        "recovery_time": "2-3 weeks",
+        "hospital_stay": "1 day",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "21199"
+    },
+    {
+        "id": "tors",
+        "name": "TORS (Transoral Robotic Surgery)",
+        "slug": "tors",
+        "description": "Minimally invasive robotic surgery to remove tissue at the base of the tongue.",
+        "category": "tongue",
+        "cost_low": 15000,
+        "cost_high": 40000,
+        "median_cost": 25000,
+        "success_rate_min": 60,
+        "success_rate_max": 68,
+        "cure_rate_min": 20,
+        "cure_rate_max": 30,
+        "recovery_time": "2-3 weeks",
+        "hospital_stay": "1-2 days",
+        "anesthesia": "General",
+        "insurance_covered": True,
+        "cpt_codes": "41530"
+    }
+]
+
+def procedure_matches(procedure, research_name):
+    """Whether a research CSV procedure name refers to a site procedure"""
+    name = research_name.lower()
+    return name == procedure["name"].lower() or procedure["id"] in procedure_index.canonicalize(name)
+
+def procedure_from_row(row, curated):
+    """A procedure from its CSV row, with the curated values (if any) for the
+    fields the row leaves empty. Returns (procedure, fields taken from curated)."""
+    name = row['Procedure Name'].strip()
+    slug = curated["slug"] if curated else slugify(name)
+    procedure = {"id": curated["id"] if curated else slug, "name": name, "slug": slug}
+    gaps = []
+    for field, (column, parse) in PROCEDURE_COLUMNS.items():
+        value = row.get(column, '').strip()
+        parsed = parse(value) if value else None
+        if parsed is None and curated and field in curated:
+            parsed = curated[field]
+            gaps.append(field)
+        if parsed is not None:
+            procedure[field] = parsed
+    return procedure, gaps
+
+def parse_procedures(research_dir, reports):
+    """Parse procedures CSV into structured JSON.
+
+    Rows naming a KEY_PROCEDURES entry keep its ID and slug and fall back to
+    its values for the fields they leave empty; curated procedures the CSV
+    does not list are kept whole. Both are listed as 'gaps' in the file's
+    ingest report: {procedure ID: fields not from the CSV}.
+    """
+    filename = "research_sleep_apnea_procedures.csv"
+    rows = read_research_csv(research_dir, filename, PROCEDURES_SCHEMA, reports)
     procedures = []
-    csv_path = RESEARCH_DIR / "research_sleep_apnea_procedures.csv"
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # The CSV has a complex structure, parse manually
-    lines = content.split('\n')
-    if len(lines) < 2:
-        return procedures
-
-    # Get header
-    header_line = lines[0]
-    headers = []
-    in_quote = False
-    current = ''
-    for char in header_line:
-        if char == '"':
-            in_quote = not in_quote
-        elif char == ',' and not in_quote:
-            headers.append(current.strip().strip('"'))
-            current = ''
-        else:
-            current += char
-    headers.append(current.strip().strip('"'))
-
-    # Parse data rows - simplified approach
-    # Key procedures we need
-    key_procedures = [
-        {
-            "id": "uppp",
-            "name": "UPPP (Uvulopalatopharyngoplasty)",
-            "slug": "uppp",
-            "description": "Surgical removal and repositioning of excess tissue in the throat including the uvula, soft palate, and tonsils to widen the airway.",
-            "category": "soft_palate",
-            "cost_low": 5000,
-            "cost_high": 15000,
-            "median_cost": 10000,
-            "success_rate_min": 40,
-            "success_rate_max": 60,
-            "cure_rate_min": 15,
-            "cure_rate_max": 25,
-            "recovery_time": "2-4 weeks",
-            "hospital_stay": "1 day or outpatient",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "42145"
-        },
-        {
-            "id": "inspire",
-            "name": "Inspire (Hypoglossal Nerve Stimulation)",
-            "slug": "inspire",
-            "description": "Implantable device that stimulates the hypoglossal nerve to keep the airway open during sleep.",
-            "category": "neuromodulation",
-            "cost_low": 30000,
-            "cost_high": 65000,
-            "median_cost": 45000,
-            "success_rate_min": 66,
-            "success_rate_max": 75,
-            "cure_rate_min": 20,
-            "cure_rate_max": 30,
-            "recovery_time": "1-2 weeks",
-            "hospital_stay": "Outpatient or 1 day",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "64568"
-        },
-        {
-            "id": "mma",
-            "name": "MMA (Maxillomandibular Advancement)",
-            "slug": "mma",
-            "description": "Surgical advancement of both the upper and lower jaw to enlarge the airway.",
-            "category": "skeletal",
-            "cost_low": 40000,
-            "cost_high": 100000,
-            "median_cost": 65000,
-            "success_rate_min": 85,
-            "success_rate_max": 95,
-            "cure_rate_min": 40,
-            "cure_rate_max": 50,
-            "recovery_time": "4-6 weeks",
-            "hospital_stay": "1-2 days",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "21141, 21196"
-        },
-        {
-            "id": "septoplasty",
-            "name": "Septoplasty",
-            "slug": "septoplasty",
-            "description": "Surgical correction of a deviated nasal septum to improve nasal airflow.",
-            "category": "nasal",
-            "cost_low": 3000,
-            "cost_high": 10000,
-            "median_cost": 6000,
-            "success_rate_min": 70,
-            "success_rate_max": 90,
-            "cure_rate_min": 5,
-            "cure_rate_max": 15,
-            "recovery_time": "1-2 weeks",
-            "hospital_stay": "Outpatient",
-            "anesthesia": "General or local",
-            "insurance_covered": True,
-            "cpt_codes": "30520"
-        },
-        {
-            "id": "turbinate-reduction",
-            "name": "Turbinate Reduction",
-            "slug": "turbinate-reduction",
-            "description": "Surgical reduction of the turbinates to improve nasal airflow.",
-            "category": "nasal",
-            "cost_low": 2000,
-            "cost_high": 5000,
-            "median_cost": 3500,
-            "success_rate_min": 70,
-            "success_rate_max": 85,
-            "cure_rate_min": 5,
-            "cure_rate_max": 10,
-            "recovery_time": "1 week",
-            "hospital_stay": "Outpatient",
-            "anesthesia": "Local or general",
-            "insurance_covered": True,
-            "cpt_codes": "30140"
-        },
-        {
-            "id": "tonsillectomy",
-            "name": "Tonsillectomy",
-            "slug": "tonsillectomy",
-            "description": "Surgical removal of the tonsils, often combined with adenoidectomy for sleep apnea.",
-            "category": "soft_palate",
-            "cost_low": 3000,
-            "cost_high": 8000,
-            "median_cost": 5000,
-            "success_rate_min": 75,
-            "success_rate_max": 82,
-            "cure_rate_min": 50,
-            "cure_rate_max": 70,
-            "recovery_time": "1-2 weeks",
-            "hospital_stay": "Outpatient or 1 day",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "42826"
-        },
-        {
-            "id": "genioglossus-advancement",
-            "name": "Genioglossus Advancement",
-            "slug": "genioglossus-advancement",
-            "description": "Surgical procedure to pull the tongue muscle attachment forward to prevent airway collapse.",
-            "category": "tongue",
-            "cost_low": 8000,
-            "cost_high": 20000,
-            "median_cost": 12000,
-            "success_rate_min": 39,
-            "success_rate_max": 65,
-            "cure_rate_min": 15,
-            "cure_rate_max": 25,
-            "recovery_time": "2-3 weeks",
-            "hospital_stay": "1 day",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "21199"
-        },
-        {
-            "id": "tors",
-            "name": "TORS (Transoral Robotic Surgery)",
-            "slug": "tors",
-            "description": "Minimally invasive robotic surgery to remove tissue at the base of the tongue.",
-            "category": "tongue",
-            "cost_low": 15000,
-            "cost_high": 40000,
-            "median_cost": 25000,
-            "success_rate_min": 60,
-            "success_rate_max": 68,
-            "cure_rate_min": 20,
-            "cure_rate_max": 30,
-            "recovery_time": "2-3 weeks",
-            "hospital_stay": "1-2 days",
-            "anesthesia": "General",
-            "insurance_covered": True,
-            "cpt_codes": "41530"
-        }
-    ]
-
-    return key_procedures
+    gaps = {}
 
-def parse_faqs():
+    for _, row in rows:
+        name = row['Procedure Name'].strip()
+        curated = next((p for p in KEY_PROCEDURES if procedure_matches(p, name)), None)
+        procedure, fields = procedure_from_row(row, curated)
+        if any(p["id"] == procedure["id"] for p in procedures):
+            continue
+        procedures.append(procedure)
+        if fields:
+            gaps[procedure["id"]] = fields
+
+    for curated in KEY_PROCEDURES:
+        if not any(p["id"] == curated["id"] for p in procedures):
+            procedures.append(dict(curated))
+            gaps[curated["id"]] = [field for field in PROCEDURE_COLUMNS if field in curated]
+
+    reports[filename]['gaps'] = gaps
+    if gaps:
+        print(f"    Curated values used for {len(gaps)} procedures: "
+              + ", ".join(f"{id_} ({len(fields)} fields)" for id_, fields in gaps.items()))
+    return procedures
+
+def parse_faqs(research_dir, reports):
     """Parse FAQs CSV into structured JSON."""
     faqs = []
-    csv_path = RESEARCH_DIR / "research_faqs.csv"
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            question = row.get('Question', '').strip()
-            if not question:
-                continue
-            faq = {
-                "id": f"faq-{i+1:03d}",
-                "question": question,
-                "answer": row.get('Answer', '').strip(),
-                "category": row.get('Category', '').strip(),
-                "related_procedures": row.get('Related Procedures', '').strip(),
-                "sources": row.get('Sources', '').strip(),
-                "seo_keywords": row.get('SEO Keywords', '').strip()
-            }
-            faqs.append(faq)
+    ids = {}
+    rows = read_research_csv(research_dir, "research_faqs.csv", FAQS_SCHEMA, reports)
+
+    for _, row in rows:
+        question = row.get('Question', '').strip()
+        faq = {
+            "id": assign_id(ids, "faq", record_key(question)),
+            "question": question,
+            "answer": row.get('Answer', '').strip(),
+            "category": row.get('Category', '').strip(),
+            "related_procedures": row.get('Related Procedures', '').strip(),
+            "sources": row.get('Sources', '').strip(),
+            "seo_keywords": row.get('SEO Keywords', '').strip()
+        }
+        faqs.append(faq)
 
     return faqs
 
-def parse_clinical_studies():
+def parse_clinical_studies(research_dir, reports):
     """Parse clinical studies CSV into structured JSON."""
     studies = []
-    csv_path = RESEARCH_DIR / "research_clinical_studies.csv"
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            study_name = row.get('Study Name', '').strip()
-            if not study_name:
-                continue
-            study = {
-                "id": f"study-{i+1:03d}",
-                "name": study_name,
-                "type": row.get('Study Type', '').strip(),
-                "sample_size": row.get('Sample Size', '').strip(),
-                "follow_up": row.get('Follow-up Duration', '').strip(),
-                "ahi_reduction": row.get('AHI Reduction', '').strip(),
-                "success_rate": row.get('Success Rate', '').strip(),
-                "cure_rate": row.get('Cure Rate', '').strip(),
-                "key_findings": row.get('Key Findings', '').strip(),
-                "source": row.get('Source', '').strip()
-            }
-            studies.append(study)
+    ids = {}
+    rows = read_research_csv(research_dir, "research_clinical_studies.csv", CLINICAL_STUDIES_SCHEMA, reports)
+
+    for _, row in rows:
+        study_name = row.get('Study Name', '').strip()
+        study = {
+            "id": assign_id(ids, "study", record_key(study_name)),
+            "name": study_name,
+            "type": row.get('Study Type', '').strip(),
+            "sample_size": row.get('Sample Size', '').strip(),
+            "follow_up": row.get('Follow-up Duration', '').strip(),
+            "ahi_reduction": row.get('AHI Reduction', '').strip(),
+            "success_rate": row.get('Success Rate', '').strip(),
+            "cure_rate": row.get('Cure Rate', '').strip(),
+            "key_findings": row.get('Key Findings', '').strip(),
+            "source": row.get('Source', '').strip()
+        }
+        studies.append(study)
 
     return studies
 
@@ -335,8 +465,8 @@ def generate_locations_data(centers, clinics):
         if not state or not city:
             continue
 
-        state_slug = state.lower().replace(' ', '-')
-        city_slug = city.lower().replace(' ', '-').replace('.', '')
+        state_slug = slugify(state)
+        city_slug = slugify(city)
 
         if state_slug not in locations:
             locations[state_slug] = {
@@ -362,37 +492,183 @@ def generate_locations_data(centers, clinics):
 
     return locations
 
-def main():
+def record_keys(kind, records, key, secondary_key=None):
+    """(key, id, secondary key) of each record for record_ids.find_migrations"""
+    for record in records:
+        secondary = secondary_key(record) if secondary_key else None
+        yield (kind, key(record)), record.get('id'), (kind, secondary) if secondary else None
+
+def published_record_keys(output_dir):
+    """(key, id, secondary key) for the records in the JSON files from the previous run"""
+    clinics_path = output_dir / "clinics.json"
+    if clinics_path.exists():
+        for kind, provider in iter_json_arrays(clinics_path, ['medical_centers', 'independent_clinics']):
+            yield from record_keys(kind, [provider], provider_key, provider_secondary_key)
+    for filename, kind, key in [("faqs.json", "faqs", faq_key), ("studies.json", "studies", study_key)]:
+        path = output_dir / filename
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from record_keys(kind, json.load(f).get(kind, []), key)
+
+def provider_scope(provider):
+    """URL directory of a provider's page"""
+    state = provider_store.canonical_state(provider.get('state'))
+    return f"locations/{slugify(state)}/{slugify(provider.get('city', '').strip())}"
+
+def unregistered_page_urls(kind, provider):
+    """Where a provider's pages were published before the slug registry:
+    generate_provider_pages slugged the raw state, city and name itself, and
+    the medical center location pages used the record's slug"""
+    def provider_page_slug(text):
+        return text.strip().lower().replace(' ', '-').replace(',', '').replace('.', '').replace("'", '').replace('&', 'and').replace('(', '').replace(')', '')
+
+    urls = []
+    # International clinics never had provider pages
+    if provider.get('state', '').strip() not in ('N/A', 'Singapore'):
+        urls.append("/locations/" + "/".join(provider_page_slug(provider.get(field, ''))
+                                             for field in ['state', 'city', 'name']) + ".html")
+    if kind == 'medical_centers' and provider.get('slug'):
+        urls.append(slugs.page_url(provider_scope(provider), provider['slug']))
+    return urls
+
+def published_page_urls(output_dir):
+    """{(scope, name): [url]} of the providers in the previous clinics.json"""
+    path = output_dir / "clinics.json"
+    if not path.exists():
+        return {}
+    return {
+        (provider_scope(provider), provider.get('name')): unregistered_page_urls(kind, provider)
+        for kind, provider in iter_json_arrays(path, ['medical_centers', 'independent_clinics'])
+    }
+
+def assign_slugs(providers, output_dir, write_stats):
+    """Give every provider its page slug from the slug registry"""
+    registry = slugs.load_registry(output_dir)
+    # The first run redirects the pages published before the registry existed
+    previous = {} if registry['scopes'] else published_page_urls(output_dir)
+    for provider in providers:
+        scope = provider_scope(provider)
+        provider["slug"] = slugs.slug_for(registry, scope, provider["name"], previous.get((scope, provider["name"]), ()))
+    slugs.print_collisions(registry)
+    slugs.save_registry(registry, write_stats)
+    slugs.write_redirects(registry, output_dir.parent, write_stats)
+
+def write_id_migrations(output_dir, current, write_stats):
+    """Record old -> new IDs for records whose ID changed since the previous run"""
+    found = record_ids.find_migrations(published_record_keys(output_dir), current)
+    migrations = record_ids.merge_migrations(record_ids.load_migrations(output_dir), found)
+    path = output_dir / record_ids.ID_MIGRATIONS
+    if migrations or path.exists():
+        write_json(path, {"migrations": migrations}, write_stats)
+    if found:
+        print(f"    {len(found)} record IDs changed; old IDs kept in {path.name}")
+
+def summary_data(scopes, procedures, faqs, studies):
+    """Contents of data.json: site totals and per-state aggregates of the research providers"""
+    providers = scopes["sleep_providers"]
+    return {
+        "meta": {
+            "version": "1.0",
+            "generated": "2026-01-10",
+            "site": "SleepApneaMatch.com"
+        },
+        "stats": {
+            "total_providers": providers["providers"],
+            "medical_centers": scopes["medical_centers"]["providers"],
+            "independent_clinics": scopes["independent_clinics"]["providers"],
+            "inspire_certified": providers["inspire_certified"],
+            "states_covered": providers["state_count"],
+            "cities_covered": providers["city_count"],
+            "procedures": len(procedures),
+            "faqs": len(faqs),
+            "clinical_studies": len(studies)
+        },
+        "price_ranges": {
+            procedure["slug"].replace("-", "_"): {
+                "low": procedure["cost_low"],
+                "median": procedure["median_cost"],
+                "high": procedure["cost_high"]
+            }
+            for procedure in procedures
+            if all(field in procedure for field in ("cost_low", "median_cost", "cost_high"))
+        },
+        "states": {
+            state: {
+                "providers": aggregate["providers"],
+                "inspire_certified": aggregate["inspire_certified"],
+                "cities": aggregate["city_count"],
+                "price": aggregate["price"],
+                "procedures": aggregate["procedures"]
+            }
+            for state, aggregate in providers["states"].items()
+        }
+    }
+
+def print_ingest_report(report):
+    """Print a file's rejected rows and warnings, if any"""
+    if not (report['rejected'] or report['warning_count']):
+        return
+    print(f"    {report['file']}: {csv_ingest.format_report(report)}")
+    for issue in (report['errors'] + report['warnings'])[:PRINTED_ISSUES]:
+        print(f"      line {issue['line']}: {issue['message']}")
+
+def write_ingest_report(reports, output_dir, write_stats):
+    """Write every file's ingestion report to the build cache"""
+    path = Path(output_dir).parent / CACHE_DIR / INGEST_REPORT
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, {"files": reports}, write_stats)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the site's JSON data from the research CSVs")
+    parser.add_argument('--research-dir', default=str(RESEARCH_DIR), help="directory of research_*.csv exports")
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR), help="directory for the generated JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to parse all data and generate JSON files."""
+    args = parse_args(argv)
+    research_dir = Path(args.research_dir)
+    output_dir = Path(args.output_dir)
     print("Parsing sleep apnea research data...")
 
     # Create output directory
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Parse all data
-    print("  Parsing medical centers...")
-    centers = parse_medical_centers()
-    print(f"    Found {len(centers)} medical centers")
+    reports = {}
+    with profiling.stage('load'):
+        print("  Parsing medical centers...")
+        centers = parse_medical_centers(research_dir, reports)
+        print(f"    Found {len(centers)} medical centers")
+
+        print("  Parsing independent clinics...")
+        clinics = parse_independent_clinics(research_dir, reports)
+        print(f"    Found {len(clinics)} independent clinics")
 
-    print("  Parsing independent clinics...")
-    clinics = parse_independent_clinics()
-    print(f"    Found {len(clinics)} independent clinics")
+        print("  Parsing procedures...")
+        procedures = parse_procedures(research_dir, reports)
+        print(f"    Found {len(procedures)} procedures")
 
-    print("  Parsing procedures...")
-    procedures = parse_procedures()
-    print(f"    Found {len(procedures)} procedures")
+        print("  Parsing FAQs...")
+        faqs = parse_faqs(research_dir, reports)
+        print(f"    Found {len(faqs)} FAQs")
 
-    print("  Parsing FAQs...")
-    faqs = parse_faqs()
-    print(f"    Found {len(faqs)} FAQs")
+        print("  Parsing clinical studies...")
+        studies = parse_clinical_studies(research_dir, reports)
+        print(f"    Found {len(studies)} clinical studies")
 
-    print("  Parsing clinical studies...")
-    studies = parse_clinical_studies()
-    print(f"    Found {len(studies)} clinical studies")
+    for report in reports.values():
+        print_ingest_report(report)
 
-    print("  Generating locations data...")
-    locations = generate_locations_data(centers, clinics)
-    print(f"    Found {len(locations)} states with providers")
+    write_stats = new_write_stats()
+    with profiling.stage('slugs'):
+        print("  Assigning page slugs...")
+        assign_slugs(centers + clinics, output_dir, write_stats)
+
+    with profiling.stage('group'):
+        print("  Generating locations data...")
+        locations = generate_locations_data(centers, clinics)
+        print(f"    Found {len(locations)} states with providers")
 
     # Generate combined clinics.json
     all_providers = {
@@ -408,57 +684,37 @@ def main():
     # Write JSON files
     print("\nWriting JSON files...")
 
-    with open(OUTPUT_DIR / "clinics.json", 'w', encoding='utf-8') as f:
-        json.dump(all_providers, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'clinics.json'}")
+    # Before clinics.json and friends are replaced: the previous IDs are read from them
+    current = [
+        *record_keys("medical_centers", centers, provider_key, provider_secondary_key),
+        *record_keys("independent_clinics", clinics, provider_key, provider_secondary_key),
+        *record_keys("faqs", faqs, faq_key),
+        *record_keys("studies", studies, study_key),
+    ]
+    write_id_migrations(output_dir, current, write_stats)
 
-    with open(OUTPUT_DIR / "procedures.json", 'w', encoding='utf-8') as f:
-        json.dump({"procedures": procedures}, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'procedures.json'}")
+    write_json(output_dir / "clinics.json", all_providers, write_stats)
 
-    with open(OUTPUT_DIR / "faqs.json", 'w', encoding='utf-8') as f:
-        json.dump({"faqs": faqs}, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'faqs.json'}")
+    write_json(output_dir / "procedures.json", {"procedures": procedures}, write_stats)
 
-    with open(OUTPUT_DIR / "studies.json", 'w', encoding='utf-8') as f:
-        json.dump({"studies": studies}, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'studies.json'}")
+    write_json(output_dir / "faqs.json", {"faqs": faqs}, write_stats)
 
-    with open(OUTPUT_DIR / "locations.json", 'w', encoding='utf-8') as f:
-        json.dump({"locations": locations}, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'locations.json'}")
+    write_json(output_dir / "studies.json", {"studies": studies}, write_stats)
 
-    # Generate summary data.json
-    summary = {
-        "meta": {
-            "version": "1.0",
-            "generated": "2026-01-10",
-            "site": "SleepApneaMatch.com"
-        },
-        "stats": {
-            "total_providers": len(centers) + len(clinics),
-            "medical_centers": len(centers),
-            "independent_clinics": len(clinics),
-            "states_covered": len(locations),
-            "procedures": len(procedures),
-            "faqs": len(faqs),
-            "clinical_studies": len(studies)
-        },
-        "price_ranges": {
-            "uppp": {"low": 5000, "high": 15000},
-            "inspire": {"low": 30000, "high": 65000},
-            "mma": {"low": 40000, "high": 100000},
-            "septoplasty": {"low": 3000, "high": 10000},
-            "turbinate_reduction": {"low": 2000, "high": 5000},
-            "tonsillectomy": {"low": 3000, "high": 8000}
-        }
-    }
+    write_json(output_dir / "locations.json", {"locations": locations}, write_stats)
+
+    # The generators read providers from the indexed store, not clinics.json
+    with profiling.stage('index'):
+        provider_store.update_store(output_dir.parent)
+
+    # Generate summary data.json from the location aggregates of the new store
+    scopes = location_stats.load_stats(output_dir.parent)['scopes']
+    write_json(output_dir / "data.json", summary_data(scopes, procedures, faqs, studies), write_stats)
 
-    with open(OUTPUT_DIR / "data.json", 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
-    print(f"  Written: {OUTPUT_DIR / 'data.json'}")
+    write_ingest_report(reports, output_dir, write_stats)
 
+    print(f"\nWritten files - {format_write_stats(write_stats)}")
     print("\nDone! All JSON files generated.")
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Canonical procedure IDs for the free-text procedure lists of providers.
+
+procedures_offered (and the Mexico clinics' treatments) is free text -
+"Nasal surgery (septoplasty, turbinate reduction), UPPP, Inspire therapy".
+canonical_procedures() maps it to the procedure IDs of api/procedures.json:
+
+    canonical_procedures("Nasal surgery (septoplasty, turbinate reduction), UPPP")
+    # ['septoplasty', 'turbinate-reduction', 'uppp']
+
+The text is split into terms at commas, semicolons and brackets, and each
+term is matched against ALIASES as whole words; a term with no exact alias
+is compared word by word against the longer aliases, so misspellings
+("uvulopalatopharyngoplasy") still match. Terms are resolved once and
+cached.
+
+The provider store keeps the IDs in its provider_procedures table, the
+inverted index from procedure to providers:
+
+    provider_store.iter_providers(procedure='inspire', state='Texas')
+    provider_store.procedure_locations(source=['medical_centers'])   # {id: {state: {city: [ids]}}}
+
+Usage:
+    python3 procedure_index.py             # providers per procedure, and the unmatched terms
+"""
+
+import argparse
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import profiling
+
+# Procedure ID -> phrases naming it, matched as whole words of a lower-cased term
+ALIASES = {
+    'uppp': ['uppp', 'uvulopalatopharyngoplasty', 'uvulopharyngopalatoplasty'],
+    'inspire': ['inspire', 'hypoglossal nerve stimulation', 'hypoglossal nerve stimulator',
+                'upper airway stimulation', 'hgns'],
+    'mma': ['mma', 'maxillomandibular', 'orthognathic surgery', 'jaw surgery', 'bimaxillary advancement'],
+    'septoplasty': ['septoplasty', 'deviated septum', 'septal surgery'],
+    'turbinate-reduction': ['turbinate', 'turbinates', 'turbinoplasty', 'turbinectomy'],
+    'tonsillectomy': ['tonsillectomy', 'tonsil removal', 't&a'],
+    'genioglossus-advancement': ['genioglossus', 'genial tubercle advancement', 'tongue advancement'],
+    'tors': ['tors', 'transoral robotic surgery', 'robotic surgery'],
+}
+# Phrases that contain an alias but name another procedure
+EXCLUDED = {
+    'tonsillectomy': ['lingual tonsillectomy'],
+}
+# Aliases at least this long are also matched approximately
+FUZZY_MIN_LENGTH = 8
+# SequenceMatcher ratio for an approximate match; palatopharyngoplasty
+# against uvulopalatopharyngoplasty (a different procedure) is 0.89
+FUZZY_CUTOFF = 0.92
+
+TERM_SEPARATORS = re.compile(r'[,;()\[\]]')
+NON_WORD = re.compile(r'[^a-z0-9&]+')
+
+
+def normalize(text):
+    """Lower-cased words of text, separated by single spaces"""
+    return NON_WORD.sub(' ', (text or '').lower()).strip()
+
+
+def split_terms(value):
+    """Normalized terms of a free-text procedure list (or a list of them)"""
+    items = value if isinstance(value, list) else [value or '']
+    terms = []
+    for item in items:
+        for term in TERM_SEPARATORS.split(item or ''):
+            term = normalize(term)
+            if term and term not in terms:
+                terms.append(term)
+    return terms
+
+
+def fuzzy_match(words, alias):
+    size = len(alias.split())
+    return any(SequenceMatcher(None, ' '.join(words[i:i + size]), alias).ratio() >= FUZZY_CUTOFF
+               for i in range(len(words) - size + 1))
+
+
+def without_excluded(term, procedure):
+    """term, padded with spaces, without the phrases EXCLUDED for procedure"""
+    text = f" {term} "
+    for phrase in EXCLUDED.get(procedure, []):
+        text = text.replace(f" {phrase} ", ' ')
+    return text
+
+
+@lru_cache(maxsize=None)
+def canonicalize(term):
+    """Procedure IDs a single term names, in ALIASES order"""
+    term = normalize(term)
+    texts = {procedure: without_excluded(term, procedure) for procedure in ALIASES}
+    found = tuple(procedure for procedure, aliases in ALIASES.items()
+                  if any(f" {alias} " in texts[procedure] for alias in aliases))
+    if found:
+        return found
+    return tuple(procedure for procedure, aliases in ALIASES.items()
+                 if any(len(alias) >= FUZZY_MIN_LENGTH and fuzzy_match(texts[procedure].split(), alias)
+                        for alias in aliases))
+
+
+def canonical_procedures(value):
+    """Procedure IDs named in a free-text procedure list, in order of first mention"""
+    procedures = []
+    for term in split_terms(value):
+        for procedure in canonicalize(term):
+            if procedure not in procedures:
+                procedures.append(procedure)
+    return procedures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show how provider procedure lists map to procedure IDs")
+    parser.add_argument('--root', default='.', help="site root holding api/clinics.json")
+    parser.add_argument('--unmatched', type=int, default=20, help="number of unmatched terms to list")
+    args = parser.parse_args(argv)
+
+    # Imported here: provider_store imports this module
+    import provider_store
+
+    unmatched = {}
+    for record in provider_store.iter_providers(args.root):
+        for term in split_terms(record.get('procedures_offered') or record.get('treatments')):
+            if not canonicalize(term):
+                unmatched[term] = unmatched.get(term, 0) + 1
+
+    index = provider_store.procedure_locations(args.root)
+    print(f"\n{'Procedure':<28}{'Providers':>10}{'States':>8}{'Cities':>8}")
+    for procedure in ALIASES:
+        states = index.get(procedure, {})
+        providers = sum(len(ids) for cities in states.values() for ids in cities.values())
+        cities = sum(len(cities) for cities in states.values())
+        print(f"{procedure:<28}{providers:>10}{len(states):>8}{cities:>8}")
+
+    print(f"\n{'='*50}")
+    print(f"{len(unmatched)} terms name no catalogue procedure")
+    for term, count in sorted(unmatched.items(), key=lambda item: (-item[1], item[0]))[:args.unmatched]:
+        print(f"  {count:>4}  {term}")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
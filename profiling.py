@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Shared --profile instrumentation for the build scripts.
+Every script starts through run(main), which takes the profiling flags off
+the command line before the script parses its own arguments:
+
+    python3 regenerate_locations.py --profile
+    python3 html_pipeline.py --profile --profile-top 20
+    python3 parse_sleep_data.py --profile --cprofile parse.prof
+
+With --profile the script reports stage timers (load, group, render,
+write, ...), a per-page render-time histogram and the slowest pages, then
+writes the same summary as JSON to .build-cache/profile/<script>.json (or
+--profile-out). --cprofile also runs the script under cProfile and dumps
+pstats data to the given file.
+
+Instrumented code uses stage() and record_page(); both do nothing unless a
+profile is active.
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from build_graph import CACHE_DIR
+
+PROFILE_DIR = 'profile'
+DEFAULT_TOP = 10
+
+# Upper bounds (ms) of the render-time histogram buckets; the last one is open
+HISTOGRAM_BOUNDS_MS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+_session = None
+
+
+def start(script):
+    """Begin collecting stage and page timings for a script"""
+    global _session
+    _session = {
+        'script': script,
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'start': time.perf_counter(),
+        'stages': {},
+        'pages': [],
+    }
+
+
+def add_stage_time(name, seconds):
+    stages = _session['stages']
+    if name not in stages:
+        stages[name] = {'seconds': 0.0, 'calls': 0}
+    stages[name]['seconds'] += seconds
+    stages[name]['calls'] += 1
+
+
+@contextmanager
+def stage(name):
+    """Time a block under a stage name. Stages may nest and repeat; repeated
+    blocks are added up."""
+    if _session is None:
+        yield
+        return
+    stage_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(name, time.perf_counter() - stage_start)
+
+
+def record_page(page, seconds, stage_name='render'):
+    """Record how long one page took; the time is also added to stage_name"""
+    if _session is None:
+        return
+    _session['pages'].append((seconds, page))
+    add_stage_time(stage_name, seconds)
+
+
+def timed_page(page, render, *args):
+    """Call render(*args) and record its time under page. Returns render's result."""
+    if _session is None:
+        return render(*args)
+    page_start = time.perf_counter()
+    try:
+        return render(*args)
+    finally:
+        record_page(page, time.perf_counter() - page_start)
+
+
+def page_histogram(pages):
+    """Page counts per render-time bucket"""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for seconds, _ in pages:
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(HISTOGRAM_BOUNDS_MS) and ms > HISTOGRAM_BOUNDS_MS[bucket]:
+            bucket += 1
+        counts[bucket] += 1
+    labels = [f"<= {bound:g} ms" for bound in HISTOGRAM_BOUNDS_MS] + [f"> {HISTOGRAM_BOUNDS_MS[-1]:g} ms"]
+    return [{'bucket': label, 'pages': count} for label, count in zip(labels, counts)]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summary(top=DEFAULT_TOP):
+    """Machine-readable summary of the active profile"""
+    pages = _session['pages']
+    times = sorted(seconds for seconds, _ in pages)
+    total = sum(times)
+    return {
+        'script': _session['script'],
+        'argv': sys.argv[1:],
+        'started': _session['started'],
+        'seconds': round(time.perf_counter() - _session['start'], 3),
+        # ru_maxrss is in KB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'stages': {
+            name: {'seconds': round(timing['seconds'], 4), 'calls': timing['calls']}
+            for name, timing in _session['stages'].items()
+        },
+        'pages': {
+            'count': len(times),
+            'total_seconds': round(total, 4),
+            'mean_ms': round(total / len(times) * 1000, 3) if times else 0.0,
+            'p50_ms': round(percentile(times, 0.5) * 1000, 3),
+            'p95_ms': round(percentile(times, 0.95) * 1000, 3),
+            'max_ms': round(times[-1] * 1000, 3) if times else 0.0,
+            'histogram': page_histogram(pages),
+            'slowest': [
+                {'page': page, 'ms': round(seconds * 1000, 3)}
+                for seconds, page in sorted(pages, key=lambda item: item[0], reverse=True)[:top]
+            ],
+        },
+    }
+
+
+def print_summary(data):
+    print(f"\n{'='*50}")
+    print(f"Profile: {data['script']} - {data['seconds']}s, peak RSS {data['peak_rss_mb']} MB")
+    if data['stages']:
+        print(f"\n{'Stage':<26}{'Calls':>8}{'Seconds':>10}")
+        for name, timing in data['stages'].items():
+            print(f"{name:<26}{timing['calls']:>8}{timing['seconds']:>10.3f}")
+
+    pages = data['pages']
+    if pages['count']:
+        print(f"\nPages: {pages['count']}, mean {pages['mean_ms']} ms, p50 {pages['p50_ms']} ms, "
+              f"p95 {pages['p95_ms']} ms, max {pages['max_ms']} ms")
+        # Only the buckets between the fastest and the slowest page
+        rows = pages['histogram']
+        used = [i for i, row in enumerate(rows) if row['pages']]
+        widest = max(row['pages'] for row in rows)
+        for row in rows[used[0]:used[-1] + 1]:
+            bar = '#' * round(row['pages'] / widest * 40)
+            print(f"  {row['bucket']:>12} {row['pages']:>8} {bar}")
+        print(f"\nSlowest {len(pages['slowest'])} pages:")
+        for row in pages['slowest']:
+            print(f"  {row['ms']:>10.3f} ms  {row['page']}")
+
+
+def parse_profile_args(argv):
+    """Split the profiling flags from a script's own arguments"""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--profile-out')
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP)
+    parser.add_argument('--cprofile')
+    return parser.parse_known_args(argv)
+
+
+def run(main):
+    """Run a script's main() with the --profile, --profile-out, --profile-top
+    and --cprofile flags handled here. Returns main()'s result."""
+    args, rest = parse_profile_args(sys.argv[1:])
+    sys.argv[1:] = rest
+    if not (args.profile or args.cprofile):
+        return main()
+
+    script = Path(sys.argv[0]).stem
+    start(script)
+    profiler = cProfile.Profile() if args.cprofile else None
+    try:
+        if profiler:
+            return profiler.runcall(main)
+        return main()
+    finally:
+        data = summary(args.profile_top)
+        if profiler:
+            profiler.dump_stats(args.cprofile)
+            data['cprofile'] = args.cprofile
+        print_summary(data)
+        if profiler:
+            print(f"\ncProfile data written to {args.cprofile}; top functions by cumulative time:")
+            pstats.Stats(args.cprofile).sort_stats('cumulative').print_stats(args.profile_top)
+
+        out = Path(args.profile_out) if args.profile_out else Path(CACHE_DIR) / PROFILE_DIR / f"{script}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profile summary written to {out}")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite store of every provider the site publishes.
+Built from the parse_sleep_data output (api/clinics.json) and rebuilt
+automatically the first time it is opened after it changes.
+
+    for clinic in iter_providers(state='TX', inspire_certified=True):
+        ...
+    for state, city, clinics in iter_cities(source='medical_centers'):
+        ...
+
+    python3 provider_store.py                               # rebuild if stale, print counts
+    python3 provider_store.py --state Texas --inspire       # query from the command line
+    python3 provider_store.py --procedure septoplasty --rebuild
+
+Providers are indexed on state, city, type, Inspire certification and the
+catalogue procedures they offer (IDs from procedure_index.py). Each row keeps its source record as JSON, so
+generators render exactly what the source held; results come back in
+source order unless grouped by location. The page slug of each provider is
+resolved through the slug registry (api/slugs.json) when the store is built,
+so every consumer links to the URL its page is published under.
+
+The hand-maintained stem-cell clinic tables (MEXICO_CLINICS,
+CLINIC_DATABASE) are not this site's providers and stay out of the store;
+their generators opt in to them through city_groups().
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+import procedure_index
+import profiling
+import slugs
+import streaming
+from build_graph import CACHE_DIR
+from slugs import slugify
+
+BASE_DIR = Path(__file__).resolve().parent
+STORE_FILE = 'providers.sqlite'
+SCHEMA_VERSION = 4
+CLINICS_JSON = 'api/clinics.json'
+
+# Source name -> provider type for the arrays of api/clinics.json
+CLINICS_JSON_SOURCES = {
+    'medical_centers': 'academic_medical_center',
+    'independent_clinics': 'independent_practice',
+}
+# Opt-in source name -> module holding a {city: {..., 'clinics': [...]}}
+# table; read by city_groups(), never stored
+MODULE_SOURCES = {
+    'mexico_clinics': 'create_mexico_clinics',
+    'clinic_database': 'generate_static_pages',
+}
+
+SCHEMA = '''
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE providers (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    country TEXT NOT NULL,
+    state TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state_slug TEXT NOT NULL,
+    city_slug TEXT NOT NULL,
+    inspire_certified INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE provider_procedures (
+    procedure TEXT NOT NULL,
+    provider_id TEXT NOT NULL,
+    PRIMARY KEY (procedure, provider_id)
+) WITHOUT ROWID;
+'''
+
+# Created after the bulk insert, which is much faster than maintaining them row by row
+INDEXES = '''
+CREATE INDEX providers_location ON providers (state, city);
+CREATE INDEX providers_source_location ON providers (source, state, city);
+CREATE INDEX providers_type ON providers (type, state, city);
+CREATE INDEX providers_inspire ON providers (inspire_certified, state, city);
+CREATE INDEX providers_page ON providers (state_slug, city_slug, slug);
+'''
+
+STATE_ABBREVIATIONS = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+
+
+def canonical_state(state):
+    """Full state name for a US postal abbreviation ('TX' -> 'Texas'); other values unchanged"""
+    state = (state or '').strip()
+    return STATE_ABBREVIATIONS.get(state.upper(), state)
+
+
+def store_path(root='.'):
+    return Path(root) / CACHE_DIR / STORE_FILE
+
+
+def source_files(root='.'):
+    """Files the store is built from"""
+    return [Path(root) / CLINICS_JSON, Path(root) / 'api' / slugs.REGISTRY_FILE, BASE_DIR / 'provider_store.py',
+            BASE_DIR / 'procedure_index.py']
+
+
+def source_signature(root='.'):
+    """Size and mtime of every source file; the store is rebuilt when this changes"""
+    signature = {'schema': SCHEMA_VERSION}
+    for path in source_files(root):
+        try:
+            stat = os.stat(path)
+            signature[path.name] = [stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            signature[path.name] = None
+    return signature
+
+
+def page_slug(registry, source, record, state, city):
+    """Slug of a clinics.json provider's page. It is the one the slug registry
+    gave the provider (see parse_sleep_data). Until it has one, a medical
+    center keeps the slug of its location page, so both pages share one URL,
+    and an independent clinic gets slugify(name) - the slug field of its
+    record predates the registry and is not a URL of any page."""
+    scope = f"locations/{slugify(canonical_state(state))}/{slugify((city or '').strip())}"
+    slug = registry['scopes'].get(scope, {}).get(record.get('name'))
+    if slug is None and source == 'medical_centers':
+        slug = record.get('slug')
+    return slug or slugify((record.get('name') or '').strip())
+
+
+def provider_row(provider_id, source, record, provider_type, country, state, city, slug=None):
+    name = (record.get('name') or '').strip()
+    state = canonical_state(state)
+    city = (city or '').strip()
+    return (
+        provider_id, source, provider_type, name, slug or record.get('slug') or slugify(name), country,
+        state, city, slugify(state), slugify(city), int(bool(record.get('inspire_certified'))),
+        json.dumps(record, ensure_ascii=False),
+    )
+
+
+def iter_source_rows(root='.'):
+    """Yield (row, procedures) for every provider of api/clinics.json"""
+    clinics_json = Path(root) / CLINICS_JSON
+    if clinics_json.exists():
+        registry = slugs.load_registry(Path(root) / 'api')
+        for source, record in streaming.iter_json_arrays(clinics_json, CLINICS_JSON_SOURCES):
+            provider_id = record.get('id') or f"{source}:{record.get('slug') or slugify(record.get('name', ''))}"
+            slug = page_slug(registry, source, record, record.get('state'), record.get('city'))
+            row = provider_row(provider_id, source, record, record.get('type') or CLINICS_JSON_SOURCES[source],
+                               'United States', record.get('state'), record.get('city'), slug=slug)
+            yield row, procedure_index.canonical_procedures(record.get('procedures_offered'))
+    else:
+        print(f"  Warning: {clinics_json} not found; run parse_sleep_data.py first")
+
+
+def build_store(root='.'):
+    """Build the store from scratch into a temp file and swap it in. Returns the provider count."""
+    path = store_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    count = 0
+    try:
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.executescript(SCHEMA)
+            for row, procedures in iter_source_rows(root):
+                conn.execute('INSERT INTO providers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+                conn.executemany('INSERT OR IGNORE INTO provider_procedures VALUES (?, ?)',
+                                 [(procedure, row[0]) for procedure in procedures])
+                count += 1
+            conn.executescript(INDEXES)
+            conn.execute('INSERT INTO meta VALUES (?, ?)', ('signature', json.dumps(source_signature(root))))
+            conn.execute('ANALYZE')
+            conn.commit()
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def stored_signature(path):
+    try:
+        with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return json.loads(row[0]) if row else None
+    except sqlite3.Error:
+        return None
+
+
+def update_store(root='.', force=False):
+    """Rebuild the store if any source changed since it was built. Returns True if it was rebuilt."""
+    path = store_path(root)
+    if not force and path.exists() and stored_signature(path) == source_signature(root):
+        return False
+    start = time.perf_counter()
+    count = build_store(root)
+    print(f"  Provider store: {count} providers indexed in {time.perf_counter() - start:.2f}s ({path})")
+    return True
+
+
+def open_store(root='.'):
+    """Read-only connection to an up-to-date store"""
+    update_store(root)
+    return sqlite3.connect(f"file:{store_path(root)}?mode=ro", uri=True)
+
+
+def provider_filters(state=None, city=None, type=None, source=None, country=None,
+                     inspire_certified=None, procedure=None):
+    """SQL WHERE clause and parameters for the query keyword arguments"""
+    clauses = []
+    params = []
+    for column, value in [('state', canonical_state(state) if state else None), ('city', city),
+                          ('type', type), ('source', source), ('country', country)]:
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if inspire_certified is not None:
+        clauses.append('inspire_certified = ?')
+        params.append(int(inspire_certified))
+    if procedure:
+        procedures = [procedure] if procedure in procedure_index.ALIASES else procedure_index.canonicalize(procedure)
+        clauses.append(f"id IN (SELECT provider_id FROM provider_procedures "
+                       f"WHERE procedure IN ({', '.join('?' * len(procedures)) or 'NULL'}))")
+        params.extend(procedures)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def iter_providers(root='.', **filters):
+    """Yield the source records of matching providers in source order.
+    Filters: state, city, type, source, country, inspire_certified, procedure
+    (a procedure ID, or a term canonicalized to one);
+    state/city/type/source/country also accept a list of values."""
+    where, params = provider_filters(**filters)
+    with closing(open_store(root)) as conn:
+        for (record,) in conn.execute(f"SELECT record FROM providers{where} ORDER BY rowid", params):
+            yield json.loads(record)
+
+
+def iter_provider_pages(root='.', **filters):
+    """Yield (record, (state_slug, city_slug, slug)) of matching providers in
+    source order; the slugs are the path of the provider's page under locations/"""
+    where, params = provider_filters(**filters)
+    with closing(open_store(root)) as conn:
+        rows = conn.execute(f"SELECT record, state_slug, city_slug, slug FROM providers{where} ORDER BY rowid", params)
+        for record, state_slug, city_slug, slug in rows:
+            yield json.loads(record), (state_slug, city_slug, slug)
+
+
+def iter_cities(root='.', **filters):
+    """Yield (state, city, records) for matching providers in state/city order,
+    read city by city from the location index"""
+    where, params = provider_filters(**filters)
+    with closing(open_store(root)) as conn:
+        rows = conn.execute(f"SELECT state, city, record FROM providers{where} ORDER BY state, city, rowid", params)
+        for (state, city), group in groupby(rows, key=itemgetter(0, 1)):
+            yield state, city, [json.loads(record) for _, _, record in group]
+
+
+def procedure_locations(root='.', **filters):
+    """{procedure ID: {state: {city: [provider id, ...]}}} of matching providers,
+    read from the procedure index without touching the records"""
+    where, params = provider_filters(**filters)
+    index = {}
+    with closing(open_store(root)) as conn:
+        rows = conn.execute(f"SELECT pp.procedure, p.state, p.city, p.id FROM provider_procedures pp "
+                            f"JOIN providers p ON p.id = pp.provider_id{where} "
+                            f"ORDER BY pp.procedure, p.state, p.city, p.rowid", params)
+        for procedure, state, city, provider_id in rows:
+            index.setdefault(procedure, {}).setdefault(state, {}).setdefault(city, []).append(provider_id)
+    return index
+
+
+def city_groups(source):
+    """Yield (state, city, key, city_data) for an opt-in MODULE_SOURCES table,
+    with city_data in its original shape including the city's 'clinics' list"""
+    # Imported here: both generator modules import this one
+    module = importlib.import_module(MODULE_SOURCES[source])
+    if source == 'mexico_clinics':
+        for city_slug, city_data in module.MEXICO_CLINICS.items():
+            yield city_data['state'], city_data['city'], city_slug, city_data
+    else:
+        for state, cities in module.CLINIC_DATABASE.items():
+            for city, city_data in cities.items():
+                yield state, city, f"{state}/{city}", city_data
+
+
+def find_provider(state_slug, city_slug, slug, root='.'):
+    """Source record of the provider behind /locations/<state>/<city>/<slug>.html, or None"""
+    with closing(open_store(root)) as conn:
+        row = conn.execute('SELECT record FROM providers WHERE state_slug = ? AND city_slug = ? AND slug = ? '
+                           'ORDER BY rowid LIMIT 1', (state_slug, city_slug, slug)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_provider(provider_id, root='.'):
+    """Source record of the provider with this ID, or None"""
+    with closing(open_store(root)) as conn:
+        row = conn.execute('SELECT record FROM providers WHERE id = ?', (provider_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def print_counts(root='.'):
+    with closing(open_store(root)) as conn:
+        print(f"\n{'Source':<24}{'Providers':>10}{'States':>8}{'Cities':>8}{'Inspire':>9}")
+        for row in conn.execute('SELECT source, COUNT(*), COUNT(DISTINCT state), COUNT(DISTINCT state || city), '
+                                'SUM(inspire_certified) FROM providers GROUP BY source ORDER BY MIN(rowid)'):
+            print(f"{row[0]:<24}{row[1]:>10}{row[2]:>8}{row[3]:>8}{row[4]:>9}")
+        procedures, links = conn.execute('SELECT COUNT(DISTINCT procedure), COUNT(*) FROM provider_procedures').fetchone()
+        print(f"{procedures} catalogue procedures indexed, {links} provider links")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the indexed provider store")
+    parser.add_argument('--root', default='.', help="site root holding api/clinics.json")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild even if no source changed")
+    parser.add_argument('--state', help="state name or postal code")
+    parser.add_argument('--city')
+    parser.add_argument('--type', help="provider type, e.g. academic_medical_center")
+    parser.add_argument('--source', choices=list(CLINICS_JSON_SOURCES))
+    parser.add_argument('--procedure', help="procedure ID or term, e.g. septoplasty or 'Inspire therapy'")
+    parser.add_argument('--inspire', action='store_true', help="only Inspire-certified providers")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not update_store(args.root, force=args.rebuild):
+        print(f"  Provider store is up to date ({store_path(args.root)})")
+
+    filters = {key: getattr(args, key) for key in ['state', 'city', 'type', 'source', 'procedure'] if getattr(args, key)}
+    if args.inspire:
+        filters['inspire_certified'] = True
+    if not filters:
+        print_counts(args.root)
+        return
+
+    start = time.perf_counter()
+    providers = list(iter_providers(args.root, **filters))
+    elapsed = time.perf_counter() - start
+    for provider in providers:
+        print(f"  {provider.get('name', '')} - {provider.get('city', '')}, {provider.get('state', '')}")
+    print(f"\n{len(providers)} providers in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Stable record IDs for the generated data.
+
+IDs are derived from a record's natural key (e.g. provider name, city and
+state) instead of its row position, so inserting or reordering CSV rows
+leaves every other record's ID, and the pages and caches keyed on it,
+untouched:
+
+    ids = {}
+    assign_id(ids, 'center', record_key(name, city, state))   # 'center-3f9a0c1b22de'
+
+When a record's ID changes (the switch from positional IDs, or a renamed
+key), find_migrations() pairs the old and new IDs - by key, and a record
+whose key was renamed by a secondary key such as a provider's address and
+phone - and the map is kept in api/id-migrations.json, so old references
+still resolve.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+ID_MIGRATIONS = 'id-migrations.json'
+# 48 bits: collisions are unlikely even at millions of records, and are
+# resolved by a suffix when they do happen
+DIGEST_LENGTH = 12
+
+
+def normalize(value):
+    """Case- and whitespace-insensitive form of a key part"""
+    return ' '.join(str(value or '').split()).lower()
+
+
+def record_key(*parts):
+    return '|'.join(normalize(part) for part in parts)
+
+
+def stable_id(prefix, key):
+    return f"{prefix}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:DIGEST_LENGTH]}"
+
+
+def assign_id(ids, prefix, key):
+    """Stable ID for key, unique within ids ({id: key}, updated in place).
+    Duplicate keys get -2, -3, ... in the order they are assigned."""
+    base = stable_id(prefix, key)
+    record_id = base
+    n = 1
+    while record_id in ids:
+        n += 1
+        record_id = f"{base}-{n}"
+    ids[record_id] = key
+    return record_id
+
+
+def unique_by_secondary(records):
+    """{secondary key: id} of the (id, secondary key) records whose secondary
+    key is set and held by no other record"""
+    ids = {}
+    for record_id, secondary in records:
+        if secondary is not None:
+            ids.setdefault(secondary, []).append(record_id)
+    return {secondary: record_ids[0] for secondary, record_ids in ids.items() if len(record_ids) == 1}
+
+
+def find_migrations(previous, current):
+    """{old id: new id} for records whose ID changed. previous and current are
+    iterables of (key, id, secondary key), the secondary key None if unknown.
+    Records are paired by key; the ones left unpaired (a renamed key) are
+    paired by their secondary key where it is unique on both sides. Records
+    no longer present are left out."""
+    previous_ids = {}
+    for key, record_id, secondary in previous:
+        previous_ids.setdefault(key, []).append((record_id, secondary))
+    current_ids = {}
+    for key, record_id, secondary in current:
+        current_ids.setdefault(key, []).append((record_id, secondary))
+
+    migrations = {}
+    unpaired_old = []
+    for key, old_ids in previous_ids.items():
+        new_ids = current_ids.get(key, [])
+        for (old_id, _), (new_id, _) in zip(old_ids, new_ids):
+            if old_id != new_id:
+                migrations[old_id] = new_id
+        unpaired_old.extend(old_ids[len(new_ids):])
+    unpaired_new = []
+    for key, new_ids in current_ids.items():
+        unpaired_new.extend(new_ids[len(previous_ids.get(key, [])):])
+
+    renamed = unique_by_secondary(unpaired_new)
+    for secondary, old_id in unique_by_secondary(unpaired_old).items():
+        new_id = renamed.get(secondary)
+        if new_id is not None and new_id != old_id:
+            migrations[old_id] = new_id
+    return migrations
+
+
+def merge_migrations(migrations, new):
+    """Add new migrations, re-pointing earlier entries so every old ID maps
+    straight to its current ID. Returns the merged map."""
+    merged = {old: new.get(current, current) for old, current in migrations.items()}
+    merged.update(new)
+    return {old: current for old, current in sorted(merged.items()) if old != current}
+
+
+def load_migrations(data_dir):
+    path = Path(data_dir) / ID_MIGRATIONS
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('migrations', {})
+
+
+def resolve(migrations, record_id):
+    """Current ID for a possibly migrated one"""
+    return migrations.get(record_id, record_id)
@@ -1,108 +1,65 @@
 #!/usr/bin/env python3
 """
 Regenerate location pages with correct sleep apnea provider data
+
+Usage:
+    python3 regenerate_locations.py            # incremental build through build.py
+    python3 regenerate_locations.py --stream   # one memory-bounded pass for very large datasets
 """
 
-import os
-import json
-import re
-from collections import defaultdict
-
-def slugify(text):
-    """Convert text to URL-friendly slug"""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'[\s_]+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')
-
-def load_clinics():
-    """Load clinic data from JSON"""
-    with open('api/clinics.json', 'r') as f:
-        data = json.load(f)
-    return data['medical_centers']
-
-def group_by_location(clinics):
-    """Group clinics by state and city"""
-    locations = defaultdict(lambda: defaultdict(list))
-    for clinic in clinics:
-        state = clinic.get('state', 'Unknown')
-        city = clinic.get('city', 'Unknown')
-        locations[state][city].append(clinic)
+import argparse
+import time
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from build_graph import content_hash, group_hash, page_job, template_hash
+import includes
+import location_stats
+import output_writer
+import page_meta
+import profiling
+import provider_store
+from slugs import slugify
+import templates
+
+def load_locations(root='.'):
+    """Clinics grouped by state and city, {state: {city: [clinics]}}, from the provider store"""
+    locations = {}
+    for state, city, clinics in provider_store.iter_cities(root, source='medical_centers'):
+        locations.setdefault(state, {})[city] = clinics
     return locations
 
-def generate_clinic_page(clinic, state, city, state_slug, city_slug):
-    """Generate individual clinic detail page"""
-
-    procedures = clinic.get('procedures_offered', 'Sleep apnea surgery').split(', ')
-    procedures_html = ''.join([f'<li class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="currentColor" viewBox="0 0 20 20"><path fill-rule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clip-rule="evenodd"></path></svg>{proc.strip()}</li>' for proc in procedures[:10]])
-
-    surgeons = clinic.get('key_surgeons', '').split(';')
-    surgeons_html = ''.join([f'<li class="py-2 border-b border-slate-100 last:border-0">{surgeon.strip()}</li>' for surgeon in surgeons if surgeon.strip()])
-
-    inspire_badge = ""
-    if clinic.get('inspire_certified'):
-        inspire_badge = '<span class="inline-flex items-center gap-1 bg-green-100 text-green-800 px-3 py-1 rounded-full text-sm font-medium"><svg class="w-4 h-4" fill="currentColor" viewBox="0 0 20 20"><path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"></path></svg>Inspire Certified</span>'
-
-    html = f'''<!DOCTYPE html>
+# Clinic detail page; see templates.py for the {{ }} placeholder syntax
+CLINIC_PAGE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{clinic['name']} - Sleep Apnea Surgery in {city}, {state} | SleepApneaMatch.com</title>
-    <meta name="description" content="{clinic['name']} offers sleep apnea surgery in {city}, {state}. {clinic.get('specializations', 'Sleep surgery specialists')}. Contact for consultation.">
-    <link rel="canonical" href="https://sleepapneamatch.com/locations/{state_slug}/{city_slug}/{clinic['slug']}.html">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        brand: {{
-                            50: '#f0f7ff',
-                            100: '#e0effe',
-                            600: '#2563eb',
-                            700: '#1d4ed8',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
+    <title>{{clinic.name}} - Sleep Apnea Surgery in {{city}}, {{state}} | SleepApneaMatch.com</title>
+    <meta name="description" content="{{clinic.name}} offers sleep apnea surgery in {{city}}, {{state}}. {{summary}}. Contact for consultation.">
+    <link rel="canonical" href="https://sleepapneamatch.com/locations/{{state_slug}}/{{city_slug}}/{{clinic.slug}}.html">
+    {{> tailwind_brand_config }}
 </head>
 <body class="bg-slate-50">
-    <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
-                </a>
-                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
-                    <a href="/" class="hover:text-brand-600 transition">Home</a>
-                    <a href="/locations/" class="hover:text-brand-600 transition">Locations</a>
-                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
-                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    {{> locations_nav }}
 
     <div class="relative h-64 bg-gradient-to-r from-blue-900 to-blue-700">
-        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/cities/{city_slug}-large.webp');"></div>
+        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/cities/{{city_slug}}-large.webp');"></div>
         <div class="relative max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 h-full flex flex-col justify-center">
             <nav class="text-sm text-blue-200 mb-4">
                 <a href="/" class="hover:text-white">Home</a>
                 <span class="mx-2">/</span>
                 <a href="/locations/" class="hover:text-white">Locations</a>
                 <span class="mx-2">/</span>
-                <a href="/locations/{state_slug}/" class="hover:text-white">{state}</a>
+                <a href="/locations/{{state_slug}}/" class="hover:text-white">{{state}}</a>
                 <span class="mx-2">/</span>
-                <a href="/locations/{state_slug}/{city_slug}/" class="hover:text-white">{city}</a>
+                <a href="/locations/{{state_slug}}/{{city_slug}}/" class="hover:text-white">{{city}}</a>
                 <span class="mx-2">/</span>
-                <span class="text-white">{clinic['name']}</span>
+                <span class="text-white">{{clinic.name}}</span>
             </nav>
-            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">{clinic['name']}</h1>
-            <p class="text-blue-100">{city}, {state}</p>
+            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">{{clinic.name}}</h1>
+            <p class="text-blue-100">{{city}}, {{state}}</p>
         </div>
     </div>
 
@@ -114,17 +71,17 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
                 <div class="bg-white rounded-xl shadow-md p-6">
                     <div class="flex items-center gap-4 mb-4">
                         <h2 class="text-2xl font-bold text-slate-900">Overview</h2>
-                        {inspire_badge}
+                        {{inspire_badge}}
                     </div>
-                    <p class="text-slate-600 mb-4">{clinic.get('specializations', 'Comprehensive sleep apnea surgery program')}</p>
-                    <p class="text-slate-600">{clinic.get('notes', '')}</p>
+                    <p class="text-slate-600 mb-4">{{specializations}}</p>
+                    <p class="text-slate-600">{{notes}}</p>
                 </div>
 
                 <!-- Procedures -->
                 <div class="bg-white rounded-xl shadow-md p-6">
                     <h2 class="text-2xl font-bold text-slate-900 mb-4">Procedures Offered</h2>
                     <ul class="space-y-2 text-slate-600">
-                        {procedures_html}
+                        {{procedures_html}}
                     </ul>
                 </div>
 
@@ -132,14 +89,14 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
                 <div class="bg-white rounded-xl shadow-md p-6">
                     <h2 class="text-2xl font-bold text-slate-900 mb-4">Key Surgeons</h2>
                     <ul class="text-slate-600">
-                        {surgeons_html if surgeons_html else '<li>Contact clinic for surgeon information</li>'}
+                        {{surgeons_html}}
                     </ul>
                 </div>
 
                 <!-- Center of Excellence -->
                 <div class="bg-white rounded-xl shadow-md p-6">
                     <h2 class="text-2xl font-bold text-slate-900 mb-4">Recognition</h2>
-                    <p class="text-slate-600">{clinic.get('center_of_excellence', 'Contact for accreditation information')}</p>
+                    <p class="text-slate-600">{{center_of_excellence}}</p>
                 </div>
             </div>
 
@@ -151,15 +108,15 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
                     <div class="space-y-3">
                         <div class="flex items-start gap-3">
                             <svg class="w-5 h-5 text-brand-600 mt-0.5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"></path><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15 11a3 3 0 11-6 0 3 3 0 016 0z"></path></svg>
-                            <span class="text-slate-600 text-sm">{clinic.get('address', '')}</span>
+                            <span class="text-slate-600 text-sm">{{address}}</span>
                         </div>
                         <div class="flex items-center gap-3">
                             <svg class="w-5 h-5 text-brand-600" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 5a2 2 0 012-2h3.28a1 1 0 01.948.684l1.498 4.493a1 1 0 01-.502 1.21l-2.257 1.13a11.042 11.042 0 005.516 5.516l1.13-2.257a1 1 0 011.21-.502l4.493 1.498a1 1 0 01.684.949V19a2 2 0 01-2 2h-1C9.716 21 3 14.284 3 6V5z"></path></svg>
-                            <a href="tel:{clinic.get('phone', '')}" class="text-brand-600 font-semibold">{clinic.get('phone', '')}</a>
+                            <a href="tel:{{phone}}" class="text-brand-600 font-semibold">{{phone}}</a>
                         </div>
                         <div class="flex items-center gap-3">
                             <svg class="w-5 h-5 text-brand-600" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M21 12a9 9 0 01-9 9m9-9a9 9 0 00-9-9m9 9H3m9 9a9 9 0 01-9-9m9 9c1.657 0 3-4.03 3-9s-1.343-9-3-9m0 18c-1.657 0-3-4.03-3-9s1.343-9 3-9m-9 9a9 9 0 019-9"></path></svg>
-                            <a href="{clinic.get('website', '#')}" target="_blank" class="text-brand-600 hover:underline text-sm">Visit Website</a>
+                            <a href="{{website}}" target="_blank" class="text-brand-600 hover:underline text-sm">Visit Website</a>
                         </div>
                     </div>
                 </div>
@@ -167,7 +124,7 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
                 <!-- Insurance -->
                 <div class="bg-white rounded-xl shadow-md p-6">
                     <h3 class="text-lg font-bold text-slate-900 mb-4">Insurance</h3>
-                    <p class="text-slate-600 text-sm">{clinic.get('insurance_accepted', 'Contact for insurance information')}</p>
+                    <p class="text-slate-600 text-sm">{{insurance_accepted}}</p>
                 </div>
 
                 <!-- Lead Form -->
@@ -175,9 +132,9 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
                     <h3 class="text-lg font-bold text-slate-900 mb-4">Get a Free Consultation</h3>
                     <form action="/thank-you/" method="POST" name="consultation" data-netlify="true" class="space-y-4">
                         <input type="hidden" name="form-name" value="consultation">
-                        <input type="hidden" name="clinic_name" value="{clinic['name']}">
-                        <input type="hidden" name="clinic_city" value="{city}">
-                        <input type="hidden" name="clinic_state" value="{state}">
+                        <input type="hidden" name="clinic_name" value="{{clinic.name}}">
+                        <input type="hidden" name="clinic_city" value="{{city}}">
+                        <input type="hidden" name="clinic_state" value="{{state}}">
 
                         <div>
                             <label class="block text-sm font-medium text-slate-700 mb-1">Full Name *</label>
@@ -225,274 +182,143 @@ def generate_clinic_page(clinic, state, city, state_slug, city_slug):
         </div>
     </div>
 
-    <footer class="bg-slate-900 text-slate-400 py-12">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center">
-            <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
-        </div>
-    </footer>
+    {{> locations_footer }}
 </body>
 </html>'''
-    return html
-
-
-def generate_city_page(state, city, clinics, state_slug, city_slug):
-    """Generate a city index page with clinic listings"""
 
-    clinic_cards = ""
+templates.define('clinic_page', CLINIC_PAGE_TEMPLATE)
 
-    for i, clinic in enumerate(clinics):
-        procedures = clinic.get('procedures_offered', 'Sleep apnea surgery')
-        if len(procedures) > 100:
-            procedures = procedures[:100] + '...'
-
-        inspire_badge = ""
-        if clinic.get('inspire_certified'):
-            inspire_badge = '<span class="inline-block bg-green-100 text-green-800 text-xs px-2 py-1 rounded-full ml-2">Inspire Certified</span>'
-
-        clinic_cards += f'''
+# Listing card for one clinic on a city page
+CLINIC_CARD_TEMPLATE = '''
             <div class="bg-white rounded-xl shadow-md overflow-hidden card-hover">
                 <div class="p-6">
                     <div class="flex justify-between items-start mb-3">
-                        <h3 class="text-xl font-bold text-slate-900">{clinic['name']}</h3>
-                        {inspire_badge}
+                        <h3 class="text-xl font-bold text-slate-900">{{clinic.name}}</h3>
+                        {{inspire_badge}}
                     </div>
-                    <p class="text-slate-600 text-sm mb-2">{clinic.get('address', '')}</p>
-                    <p class="text-slate-500 text-sm mb-3">{clinic.get('specializations', 'Sleep Surgery')}</p>
-                    <p class="text-sm text-slate-600 mb-4">{procedures}</p>
+                    <p class="text-slate-600 text-sm mb-2">{{address}}</p>
+                    <p class="text-slate-500 text-sm mb-3">{{specializations}}</p>
+                    <p class="text-sm text-slate-600 mb-4">{{procedures}}</p>
                     <div class="flex justify-between items-center">
-                        <span class="text-brand-600 font-semibold">{clinic.get('phone', '')}</span>
-                        <a href="/locations/{state_slug}/{city_slug}/{clinic['slug']}.html" class="bg-brand-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-brand-700 transition">View Details</a>
+                        <span class="text-brand-600 font-semibold">{{phone}}</span>
+                        <a href="/locations/{{state_slug}}/{{city_slug}}/{{clinic.slug}}.html" class="bg-brand-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-brand-700 transition">View Details</a>
                     </div>
                 </div>
             </div>
         '''
 
-    html = f'''<!DOCTYPE html>
+# City page; clinic_cards may be a generator so the listing can be streamed
+CITY_PAGE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Sleep Apnea Surgery Clinics in {city}, {state} | SleepApneaMatch.com</title>
-    <meta name="description" content="Find {len(clinics)} verified sleep apnea surgery clinics in {city}, {state}. Compare providers, view procedures offered, and connect with sleep surgery specialists.">
-    <link rel="canonical" href="https://sleepapneamatch.com/locations/{state_slug}/{city_slug}/">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        brand: {{
-                            50: '#f0f7ff',
-                            100: '#e0effe',
-                            600: '#2563eb',
-                            700: '#1d4ed8',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
-    <style>
-        .card-hover {{ transition: all 0.3s ease; }}
-        .card-hover:hover {{ transform: translateY(-4px); box-shadow: 0 20px 40px rgba(0,0,0,0.15); }}
-    </style>
+    <title>Sleep Apnea Surgery Clinics in {{city}}, {{state}} | SleepApneaMatch.com</title>
+    <meta name="description" content="Find {{clinic_count}} verified sleep apnea surgery clinics in {{city}}, {{state}}. Compare providers, view procedures offered, and connect with sleep surgery specialists.">
+    <link rel="canonical" href="https://sleepapneamatch.com/locations/{{state_slug}}/{{city_slug}}/">
+    {{> tailwind_brand_config }}
+    {{> card_hover_style }}
 </head>
 <body class="bg-slate-50">
-    <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
-                </a>
-                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
-                    <a href="/" class="hover:text-brand-600 transition">Home</a>
-                    <a href="/locations/" class="hover:text-brand-600 transition">Locations</a>
-                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
-                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    {{> locations_nav }}
 
     <div class="relative h-64 bg-gradient-to-r from-blue-900 to-blue-700">
-        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/cities/{city_slug}-large.webp');"></div>
+        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/cities/{{city_slug}}-large.webp');"></div>
         <div class="relative max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 h-full flex flex-col justify-center">
             <nav class="text-sm text-blue-200 mb-4">
                 <a href="/" class="hover:text-white">Home</a>
                 <span class="mx-2">/</span>
                 <a href="/locations/" class="hover:text-white">Locations</a>
                 <span class="mx-2">/</span>
-                <a href="/locations/{state_slug}/" class="hover:text-white">{state}</a>
+                <a href="/locations/{{state_slug}}/" class="hover:text-white">{{state}}</a>
                 <span class="mx-2">/</span>
-                <span class="text-white">{city}</span>
+                <span class="text-white">{{city}}</span>
             </nav>
-            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">Sleep Apnea Surgery in {city}</h1>
-            <p class="text-blue-100">{len(clinics)} verified sleep surgery providers</p>
+            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">Sleep Apnea Surgery in {{city}}</h1>
+            <p class="text-blue-100">{{clinic_count}} verified sleep surgery providers</p>
         </div>
     </div>
 
     <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
         <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
-            {clinic_cards}
+            {{clinic_cards}}
         </div>
     </div>
 
-    <footer class="bg-slate-900 text-slate-400 py-12">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center">
-            <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
-        </div>
-    </footer>
+    {{> locations_footer }}
 </body>
 </html>'''
-    return html
-
 
-def generate_state_page(state, cities, state_slug):
-    """Generate a state index page"""
-    total_clinics = sum(len(clinics) for clinics in cities.values())
-
-    city_cards = ""
-    for city, clinics in sorted(cities.items()):
-        city_slug = slugify(city)
-        city_cards += f'''
-            <a href="/locations/{state_slug}/{city_slug}/" class="card-hover bg-white rounded-xl overflow-hidden shadow-md">
-                <div class="h-40 bg-cover bg-center" style="background-image: url('/assets/images/cities/{city_slug}-medium.webp');"></div>
+CITY_CARD_TEMPLATE = '''
+            <a href="/locations/{{state_slug}}/{{city_slug}}/" class="card-hover bg-white rounded-xl overflow-hidden shadow-md">
+                <div class="h-40 bg-cover bg-center" style="background-image: url('/assets/images/cities/{{city_slug}}-medium.webp');"></div>
                 <div class="p-6">
-                    <h3 class="text-lg font-bold text-slate-900">{city}</h3>
-                    <p class="text-sm text-slate-600">{len(clinics)} Sleep Surgery Provider{"s" if len(clinics) > 1 else ""}</p>
+                    <h3 class="text-lg font-bold text-slate-900">{{city}}</h3>
+                    <p class="text-sm text-slate-600">{{clinic_count}} Sleep Surgery Provider{{plural}}</p>
                 </div>
             </a>
         '''
 
-    html = f'''<!DOCTYPE html>
+STATE_PAGE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Sleep Apnea Surgery Clinics in {state} | SleepApneaMatch.com</title>
-    <meta name="description" content="Find {total_clinics} verified sleep apnea surgery clinics across {len(cities)} cities in {state}. Compare providers and connect with sleep surgery specialists.">
-    <link rel="canonical" href="https://sleepapneamatch.com/locations/{state_slug}/">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        brand: {{
-                            50: '#f0f7ff',
-                            100: '#e0effe',
-                            600: '#2563eb',
-                            700: '#1d4ed8',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
-    <style>
-        .card-hover {{ transition: all 0.3s ease; }}
-        .card-hover:hover {{ transform: translateY(-4px); box-shadow: 0 20px 40px rgba(0,0,0,0.15); }}
-    </style>
+    <title>Sleep Apnea Surgery Clinics in {{state}} | SleepApneaMatch.com</title>
+    <meta name="description" content="Find {{total_clinics}} verified sleep apnea surgery clinics across {{city_count}} cities in {{state}}. Compare providers and connect with sleep surgery specialists.">
+    <link rel="canonical" href="https://sleepapneamatch.com/locations/{{state_slug}}/">
+    {{> tailwind_brand_config }}
+    {{> card_hover_style }}
 </head>
 <body class="bg-slate-50">
-    <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
-                </a>
-                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
-                    <a href="/" class="hover:text-brand-600 transition">Home</a>
-                    <a href="/locations/" class="hover:text-brand-600 transition">Locations</a>
-                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
-                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    {{> locations_nav }}
 
     <div class="relative h-64 bg-gradient-to-r from-blue-900 to-blue-700">
-        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/states/{state_slug}-large.webp');"></div>
+        <div class="absolute inset-0 bg-cover bg-center opacity-30" style="background-image: url('/assets/images/states/{{state_slug}}-large.webp');"></div>
         <div class="relative max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 h-full flex flex-col justify-center">
             <nav class="text-sm text-blue-200 mb-4">
                 <a href="/" class="hover:text-white">Home</a>
                 <span class="mx-2">/</span>
                 <a href="/locations/" class="hover:text-white">Locations</a>
                 <span class="mx-2">/</span>
-                <span class="text-white">{state}</span>
+                <span class="text-white">{{state}}</span>
             </nav>
-            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">Sleep Apnea Surgery in {state}</h1>
-            <p class="text-blue-100">{total_clinics} providers across {len(cities)} cities</p>
+            <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">Sleep Apnea Surgery in {{state}}</h1>
+            <p class="text-blue-100">{{total_clinics}} providers across {{city_count}} cities</p>
         </div>
     </div>
 
     <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
-        <h2 class="text-2xl font-bold text-slate-900 mb-6">Cities in {state}</h2>
+        <h2 class="text-2xl font-bold text-slate-900 mb-6">Cities in {{state}}</h2>
         <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {city_cards}
+            {{city_cards}}
         </div>
     </div>
 
-    <footer class="bg-slate-900 text-slate-400 py-12">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center">
-            <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
-        </div>
-    </footer>
+    {{> locations_footer }}
 </body>
 </html>'''
-    return html
-
 
-def generate_locations_index(locations):
-    """Generate the main locations index page"""
-    total_clinics = sum(
-        sum(len(clinics) for clinics in cities.values())
-        for cities in locations.values()
-    )
-
-    state_cards = ""
-    for state, cities in sorted(locations.items()):
-        state_slug = slugify(state)
-        clinic_count = sum(len(clinics) for clinics in cities.values())
-        state_cards += f'''
-            <a href="/locations/{state_slug}/" class="card-hover bg-white rounded-xl overflow-hidden shadow-md">
-                <div class="h-32 bg-cover bg-center" style="background-image: url('/assets/images/states/{state_slug}-medium.webp');"></div>
+STATE_CARD_TEMPLATE = '''
+            <a href="/locations/{{state_slug}}/" class="card-hover bg-white rounded-xl overflow-hidden shadow-md">
+                <div class="h-32 bg-cover bg-center" style="background-image: url('/assets/images/states/{{state_slug}}-medium.webp');"></div>
                 <div class="p-4">
-                    <h3 class="text-lg font-bold text-slate-900">{state}</h3>
-                    <p class="text-sm text-slate-600">{clinic_count} Providers · {len(cities)} Cities</p>
+                    <h3 class="text-lg font-bold text-slate-900">{{state}}</h3>
+                    <p class="text-sm text-slate-600">{{clinic_count}} Providers · {{city_count}} Cities</p>
                 </div>
             </a>
         '''
 
-    html = f'''<!DOCTYPE html>
+LOCATIONS_INDEX_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Sleep Apnea Surgery Clinics by State | SleepApneaMatch.com</title>
-    <meta name="description" content="Find {total_clinics} verified sleep apnea surgery clinics across the United States. Browse by state and connect with sleep surgery specialists.">
+    <meta name="description" content="Find {{total_clinics}} verified sleep apnea surgery clinics across the United States. Browse by state and connect with sleep surgery specialists.">
     <link rel="canonical" href="https://sleepapneamatch.com/locations/">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        brand: {{
-                            50: '#f0f7ff',
-                            100: '#e0effe',
-                            600: '#2563eb',
-                            700: '#1d4ed8',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
-    <style>
-        .card-hover {{ transition: all 0.3s ease; }}
-        .card-hover:hover {{ transform: translateY(-4px); box-shadow: 0 20px 40px rgba(0,0,0,0.15); }}
-    </style>
+    {{> tailwind_brand_config }}
+    {{> card_hover_style }}
 </head>
 <body class="bg-slate-50">
     <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
@@ -520,73 +346,313 @@ def generate_locations_index(locations):
                 <span class="text-white">Locations</span>
             </nav>
             <h1 class="text-3xl md:text-4xl font-bold text-white mb-2">Sleep Apnea Surgery Directory</h1>
-            <p class="text-blue-100">{total_clinics} verified providers across {len(locations)} states</p>
+            <p class="text-blue-100">{{total_clinics}} verified providers across {{state_count}} states</p>
         </div>
     </div>
 
+    <div id="nearby" class="hidden max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 pt-12">
+        <h2 class="text-2xl font-bold text-slate-900 mb-6">Providers Near <span id="nearby-place"></span></h2>
+        <div id="nearby-clinics" class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4"></div>
+    </div>
+
     <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
         <h2 class="text-2xl font-bold text-slate-900 mb-6">Browse by State</h2>
         <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
-            {state_cards}
+            {{state_cards}}
         </div>
     </div>
 
-    <footer class="bg-slate-900 text-slate-400 py-12">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center">
-            <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
-        </div>
-    </footer>
+    {{> locations_footer }}
+
+    <script src="/geo-detect.js"></script>
+    <script>
+        // Nearest providers from the api/nearby tables written by geo_index.py
+        detectUserLocation().then(findNearbyClinics).then(result => {
+            if (!result || !result.clinics.length) return;
+            document.getElementById('nearby-place').textContent = result.near;
+            const list = document.getElementById('nearby-clinics');
+            for (const clinic of result.clinics) {
+                const card = document.createElement('a');
+                card.href = clinic.url;
+                card.className = 'card-hover block bg-white rounded-xl shadow-md p-4';
+                const name = document.createElement('h3');
+                name.className = 'font-bold text-slate-900';
+                name.textContent = clinic.name;
+                const place = document.createElement('p');
+                place.className = 'text-sm text-slate-600';
+                place.textContent = `${clinic.city}, ${clinic.state} · ${clinic.miles} mi`;
+                card.append(name, place);
+                list.append(card);
+            }
+            document.getElementById('nearby').classList.remove('hidden');
+        });
+    </script>
 </body>
 </html>'''
-    return html
 
+templates.define('clinic_card', CLINIC_CARD_TEMPLATE)
+templates.define('city_page', CITY_PAGE_TEMPLATE)
+templates.define('city_card', CITY_CARD_TEMPLATE)
+templates.define('state_page', STATE_PAGE_TEMPLATE)
+templates.define('state_card', STATE_CARD_TEMPLATE)
+templates.define('locations_index', LOCATIONS_INDEX_TEMPLATE)
+
+
+def clinic_page_context(clinic, state, city, state_slug, city_slug):
+    """Template values for a clinic detail page"""
+    procedures = clinic.get('procedures_offered', 'Sleep apnea surgery').split(', ')
+    procedures_html = ''.join([f'<li class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="currentColor" viewBox="0 0 20 20"><path fill-rule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clip-rule="evenodd"></path></svg>{proc.strip()}</li>' for proc in procedures[:10]])
+
+    surgeons = clinic.get('key_surgeons', '').split(';')
+    surgeons_html = ''.join([f'<li class="py-2 border-b border-slate-100 last:border-0">{surgeon.strip()}</li>' for surgeon in surgeons if surgeon.strip()])
+
+    inspire_badge = ""
+    if clinic.get('inspire_certified'):
+        inspire_badge = '<span class="inline-flex items-center gap-1 bg-green-100 text-green-800 px-3 py-1 rounded-full text-sm font-medium"><svg class="w-4 h-4" fill="currentColor" viewBox="0 0 20 20"><path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"></path></svg>Inspire Certified</span>'
+
+    return dict(
+        clinic=clinic,
+        city=city,
+        state=state,
+        state_slug=state_slug,
+        city_slug=city_slug,
+        summary=clinic.get('specializations', 'Sleep surgery specialists'),
+        specializations=clinic.get('specializations', 'Comprehensive sleep apnea surgery program'),
+        notes=clinic.get('notes', ''),
+        center_of_excellence=clinic.get('center_of_excellence', 'Contact for accreditation information'),
+        address=clinic.get('address', ''),
+        phone=clinic.get('phone', ''),
+        website=clinic.get('website', '#'),
+        insurance_accepted=clinic.get('insurance_accepted', 'Contact for insurance information'),
+        inspire_badge=inspire_badge,
+        procedures_html=procedures_html,
+        surgeons_html=surgeons_html if surgeons_html else '<li>Contact clinic for surgeon information</li>',
+    )
+
+
+def generate_clinic_page(clinic, state, city, state_slug, city_slug):
+    """Generate individual clinic detail page"""
+    return templates.render('clinic_page', **clinic_page_context(clinic, state, city, state_slug, city_slug))
+
+
+def clinic_card(clinic, state_slug, city_slug):
+    """Listing card for one clinic on its city page"""
+    procedures = clinic.get('procedures_offered', 'Sleep apnea surgery')
+    if len(procedures) > 100:
+        procedures = procedures[:100] + '...'
+
+    inspire_badge = ""
+    if clinic.get('inspire_certified'):
+        inspire_badge = '<span class="inline-block bg-green-100 text-green-800 text-xs px-2 py-1 rounded-full ml-2">Inspire Certified</span>'
+
+    return templates.render(
+        'clinic_card',
+        clinic=clinic,
+        address=clinic.get('address', ''),
+        specializations=clinic.get('specializations', 'Sleep Surgery'),
+        procedures=procedures,
+        phone=clinic.get('phone', ''),
+        inspire_badge=inspire_badge,
+        state_slug=state_slug,
+        city_slug=city_slug,
+    )
+
+
+def city_page_context(state, city, clinics, state_slug, city_slug):
+    """Template values for a city page; the clinic cards are rendered lazily"""
+    return dict(
+        state=state,
+        city=city,
+        state_slug=state_slug,
+        city_slug=city_slug,
+        clinic_count=len(clinics),
+        clinic_cards=(clinic_card(clinic, state_slug, city_slug) for clinic in clinics),
+    )
+
+
+def generate_city_page(state, city, clinics, state_slug, city_slug):
+    """Generate a city index page with clinic listings"""
+    return templates.render('city_page', **city_page_context(state, city, clinics, state_slug, city_slug))
+
+
+def count_by_location(root='.'):
+    """Clinic counts per city, {state: {city: count}}; all the state and index
+    pages need, read from the build's location aggregates"""
+    states = location_stats.load_stats(root)['scopes']['medical_centers']['states']
+    return {state: {city: aggregate['providers'] for city, aggregate in stats['cities'].items()}
+            for state, stats in states.items()}
+
+
+def state_page_context(state, city_counts, state_slug):
+    """Template values for a state page from its {city: clinic count} map"""
+    city_cards = (
+        templates.render('city_card', city=city, city_slug=slugify(city), state_slug=state_slug,
+                         clinic_count=count, plural="s" if count > 1 else "")
+        for city, count in sorted(city_counts.items())
+    )
+    return dict(
+        state=state,
+        state_slug=state_slug,
+        total_clinics=sum(city_counts.values()),
+        city_count=len(city_counts),
+        city_cards=city_cards,
+    )
 
-def main():
-    print("Loading clinic data...")
-    clinics = load_clinics()
-    print(f"Loaded {len(clinics)} clinics")
 
-    print("Grouping by location...")
-    locations = group_by_location(clinics)
-    print(f"Found {len(locations)} states")
+def generate_state_page(state, city_counts, state_slug):
+    """Generate a state index page"""
+    return templates.render('state_page', **state_page_context(state, city_counts, state_slug))
 
-    # Delete old location pages
-    print("Cleaning up old location pages...")
-    os.system("rm -rf locations/*/")
 
-    # Generate locations index
-    print("Generating locations index...")
-    os.makedirs("locations", exist_ok=True)
-    with open("locations/index.html", "w") as f:
-        f.write(generate_locations_index(locations))
+def locations_index_context(state_counts):
+    """Template values for the locations index from {state: {city: clinic count}}"""
+    state_cards = (
+        templates.render('state_card', state=state, state_slug=slugify(state),
+                         clinic_count=sum(city_counts.values()), city_count=len(city_counts))
+        for state, city_counts in sorted(state_counts.items())
+    )
+    return dict(
+        total_clinics=sum(sum(city_counts.values()) for city_counts in state_counts.values()),
+        state_count=len(state_counts),
+        state_cards=state_cards,
+    )
+
+
+def generate_locations_index(state_counts):
+    """Generate the main locations index page"""
+    return templates.render('locations_index', **locations_index_context(state_counts))
+
+
+def clinic_key(clinic):
+    """Dependency name for a clinic record"""
+    return f"clinic:{clinic.get('id') or clinic['slug']}"
+
+
+def iter_pages(root='.'):
+    """Yield a build job for the locations index and every state, city and clinic page"""
+    with profiling.stage('load'):
+        locations = load_locations(root)
+    with profiling.stage('group'):
+        clinics = [c for cities in locations.values() for city_clinics in cities.values() for c in city_clinics]
+        counts = count_by_location(root)
+        hashes = {clinic_key(clinic): content_hash(clinic) for clinic in clinics}
+
+    def clinics_dep(name, group):
+        return {name: group_hash([hashes[clinic_key(c)] for c in group])}
+
+    yield page_job("locations/index.html", generate_locations_index, (counts,),
+                   clinics_dep("clinics:*", clinics), entity="locations",
+                   fields={'states': len(counts), 'clinics': len(clinics)})
 
-    # Generate state, city, and clinic pages
     for state, cities in locations.items():
         state_slug = slugify(state)
-        state_dir = f"locations/{state_slug}"
-        os.makedirs(state_dir, exist_ok=True)
-
-        print(f"  Generating {state}...")
-        with open(f"{state_dir}/index.html", "w") as f:
-            f.write(generate_state_page(state, cities, state_slug))
+        state_clinics = [c for city_clinics in cities.values() for c in city_clinics]
+        yield page_job(f"locations/{state_slug}/index.html", generate_state_page,
+                       (state, counts[state], state_slug),
+                       clinics_dep(f"clinics:{state}", state_clinics), entity=f"location:{state}",
+                       fields={'state': state, 'cities': len(cities), 'clinics': len(state_clinics)})
 
         for city, city_clinics in cities.items():
             city_slug = slugify(city)
-            city_dir = f"{state_dir}/{city_slug}"
-            os.makedirs(city_dir, exist_ok=True)
+            yield page_job(f"locations/{state_slug}/{city_slug}/index.html", generate_city_page,
+                           (state, city, city_clinics, state_slug, city_slug),
+                           clinics_dep(f"clinics:{state}/{city}", city_clinics), entity=f"location:{state}/{city}",
+                           fields={'state': state, 'city': city, 'clinics': len(city_clinics)})
 
-            with open(f"{city_dir}/index.html", "w") as f:
-                f.write(generate_city_page(state, city, city_clinics, state_slug, city_slug))
-
-            # Generate individual clinic pages
             for clinic in city_clinics:
-                clinic_html = generate_clinic_page(clinic, state, city, state_slug, city_slug)
-                with open(f"{city_dir}/{clinic['slug']}.html", "w") as f:
-                    f.write(clinic_html)
-                print(f"    Generated: {clinic['name']}")
-
-    print("Done!")
-    print(f"Generated pages for {len(locations)} states with {len(clinics)} clinics")
+                key = clinic_key(clinic)
+                yield page_job(f"locations/{state_slug}/{city_slug}/{clinic['slug']}.html",
+                               generate_clinic_page,
+                               (clinic, state, city, state_slug, city_slug),
+                               {key: hashes[key]}, entity=clinic.get('id') or key,
+                               fields=page_meta.provider_fields(clinic, city, state))
+
+
+def stream_pages(root='.'):
+    """Write every location page in one pass over the clinics, read city by
+    city in state/city order from the provider store's location index.
+
+    Only one city's records are in memory at a time; pages are rendered
+    chunk by chunk straight into their files. The state and index pages
+    need just the per-city clinic counts, which come from the location
+    aggregates. The digest manifest (one entry per site file) is left to
+    deploy.py, which refreshes it anyway. Each page's metadata and the
+    partials it includes are appended to the page index and include index
+    logs as it is written, so they are not held either. Returns a stats dict.
+    """
+    start = time.perf_counter()
+    stats = {'pages': 0, 'clinics': 0, 'writes': output_writer.new_write_stats()}
+    out = Path(root) / 'locations'
+    # Site partials per template (a handful of templates)
+    template_partials = {}
+
+    def write(path, template, context, render, entity, fields):
+        page_start = time.perf_counter()
+        status = output_writer.write_chunks_if_changed(
+            out / path, templates.render_iter(template, **context), stats['writes'])
+        profiling.record_page(f"locations/{path}", time.perf_counter() - page_start)
+        add_meta(f"locations/{path}", page_meta.entry(entity, 'regenerate_locations', template_hash(render), fields))
+        if template not in template_partials:
+            template_partials[template] = templates.partials(template)
+        add_includes(f"locations/{path}", template_partials[template])
+        stats['pages'] += 1
+        if status != 'unchanged':
+            print(f"  Generated: locations/{path}")
+
+    state_counts = count_by_location(root)
+    with page_meta.appending(root, ['regenerate_locations']) as add_meta, includes.appending(root) as add_includes:
+        for state, state_cities in groupby(provider_store.iter_cities(root, source='medical_centers'), key=itemgetter(0)):
+            state_slug = slugify(state)
+            for _, city, clinics in state_cities:
+                city_slug = slugify(city)
+                for clinic in clinics:
+                    write(f"{state_slug}/{city_slug}/{clinic['slug']}.html", 'clinic_page',
+                          clinic_page_context(clinic, state, city, state_slug, city_slug),
+                          generate_clinic_page, clinic.get('id') or clinic_key(clinic),
+                          page_meta.provider_fields(clinic, city, state))
+                write(f"{state_slug}/{city_slug}/index.html", 'city_page',
+                      city_page_context(state, city, clinics, state_slug, city_slug),
+                      generate_city_page, f"location:{state}/{city}",
+                      {'state': state, 'city': city, 'clinics': len(clinics)})
+                stats['clinics'] += len(clinics)
+            write(f"{state_slug}/index.html", 'state_page', state_page_context(state, state_counts[state], state_slug),
+                  generate_state_page, f"location:{state}",
+                  {'state': state, 'cities': len(state_counts[state]), 'clinics': sum(state_counts[state].values())})
+        write("index.html", 'locations_index', locations_index_context(state_counts),
+              generate_locations_index, "locations",
+              {'states': len(state_counts), 'clinics': stats['clinics']})
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Regenerate the location pages",
+        epilog="Without --stream the pages are built incrementally by build.py; "
+               "other options (--force, --parallel, ...) are passed on to it.",
+        allow_abbrev=False)
+    parser.add_argument('--stream', action='store_true',
+                        help="write every page in one memory-bounded pass over the clinic data")
+    parser.add_argument('--root', default='.', help="site root to read api/ data from and write pages into")
+    return parser.parse_known_args(argv)
+
+
+def main(argv=None):
+    args, build_args = parse_args(argv)
+    if not args.stream:
+        # Only pages whose clinic records or templates changed are re-rendered;
+        # pages for removed clinics are deleted instead of wiping locations/*/
+        from build import main as build_main
+        return build_main(build_args + ['--root', args.root], generators=['regenerate_locations'])
+
+    # Streaming rewrites every page without the build graph, so pages of
+    # removed clinics are left in place; run build.py to clean those up
+    print("Streaming location pages...")
+    stats = stream_pages(args.root)
+    print(f"\n{'='*50}")
+    print(f"Wrote {stats['pages']} pages for {stats['clinics']} clinics in {stats['seconds']}s")
+    print(f"Written files - {output_writer.format_write_stats(stats['writes'])}")
+    return stats
 
 if __name__ == "__main__":
-    main()
+    profiling.run(main)
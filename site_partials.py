@@ -0,0 +1,674 @@
+#!/usr/bin/env python3
+"""
+Site-wide HTML partials shared by the page generators and the rewriters.
+Page templates include them by name (see templates.py), e.g. {{> universal_nav }},
+and the rewriters insert them by name (see includes.py). Either way the
+partial lands in the page between include markers, so a partial edited
+here is re-resolved into exactly the pages that include it. That holds
+for the headers and footers of one section (locations_nav, provider_footer,
+...) too, so they live here rather than in their generator.
+Partials are static HTML: they have no {{ }} slots.
+"""
+
+# Universal navigation HTML (static version for non-SPA pages)
+UNIVERSAL_NAV = '''<nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200" x-data="{ mobileMenu: false, locationsOpen: false }">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center gap-2">
+                    <img src="/assets/images/logo-icon.png" alt="StemCellPrices.com" class="w-8 h-8 rounded-lg">
+                    <span class="text-xl font-bold tracking-tight text-slate-900">StemCellPrices.com<span class="text-brand-600">.</span></span>
+                </a>
+                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
+                    <a href="/" class="hover:text-brand-600 transition">Find Clinics</a>
+                    <a href="/#cost-guide" class="hover:text-brand-600 transition">Cost Guide</a>
+                    <a href="/conditions/" class="hover:text-brand-600 transition">Conditions</a>
+                    <div class="relative" @mouseenter="locationsOpen = true" @mouseleave="locationsOpen = false">
+                        <a href="/locations/" class="hover:text-brand-600 transition inline-flex items-center gap-1">Locations <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path></svg></a>
+                        <div x-show="locationsOpen" x-cloak class="absolute top-full left-0 pt-0 w-64 bg-white rounded-xl shadow-xl border border-slate-200 py-2 z-50 max-h-96 overflow-y-auto">
+                            <a href="/locations/" class="block px-4 py-2 text-sm font-bold text-brand-600 hover:bg-brand-50">View All 30 States &rarr;</a>
+                            <div class="border-t border-slate-100 my-2"></div>
+                            <a href="/locations/california/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">California</a>
+                            <a href="/locations/texas/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Texas</a>
+                            <a href="/locations/florida/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Florida</a>
+                            <a href="/locations/new-york/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">New York</a>
+                            <a href="/locations/arizona/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Arizona</a>
+                            <a href="/locations/colorado/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Colorado</a>
+                            <a href="/locations/illinois/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Illinois</a>
+                            <a href="/locations/georgia/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Georgia</a>
+                            <a href="/locations/washington/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Washington</a>
+                            <a href="/locations/massachusetts/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Massachusetts</a>
+                            <div class="border-t border-slate-100 my-2"></div>
+                            <p class="px-4 py-1 text-xs text-slate-400 uppercase tracking-wider">International</p>
+                            <a href="/locations/mexico/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Mexico</a>
+                            <a href="/locations/caribbean/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Caribbean</a>
+                        </div>
+                    </div>
+                </div>
+                <div class="flex items-center gap-4">
+                    <a href="/#clinic-login" class="hidden sm:block text-sm font-bold text-brand-700 bg-brand-50 px-4 py-2 rounded-full hover:bg-brand-100 transition">Clinic Login</a>
+                    <button class="md:hidden p-2" @click="mobileMenu = !mobileMenu">
+                        <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path></svg>
+                    </button>
+                </div>
+            </div>
+            <div x-show="mobileMenu" x-cloak class="md:hidden py-4 border-t border-slate-100">
+                <div class="flex flex-col space-y-3">
+                    <a href="/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Find Clinics</a>
+                    <a href="/#cost-guide" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Cost Guide</a>
+                    <a href="/conditions/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Conditions</a>
+                    <a href="/locations/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Locations</a>
+                </div>
+            </div>
+        </div>
+    </nav>'''
+
+# Universal footer HTML
+UNIVERSAL_FOOTER = '''<!-- Footer -->
+    <footer class="bg-slate-900">
+        <div class="max-w-7xl mx-auto px-4 py-12">
+            <div class="grid grid-cols-2 md:grid-cols-4 gap-8">
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Conditions</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/knee-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Knee</a></li>
+                        <li><a href="/hip-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Hip</a></li>
+                        <li><a href="/shoulder-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Shoulder</a></li>
+                        <li><a href="/spine-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Spine</a></li>
+                        <li><a href="/neck-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Neck</a></li>
+                        <li><a href="/si-joint-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">SI Joint</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Top Locations</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/locations/california/los-angeles/" class="text-gray-400 hover:text-blue-400 text-sm">Los Angeles</a></li>
+                        <li><a href="/locations/new-york/new-york-city/" class="text-gray-400 hover:text-blue-400 text-sm">New York</a></li>
+                        <li><a href="/locations/florida/miami/" class="text-gray-400 hover:text-blue-400 text-sm">Miami</a></li>
+                        <li><a href="/locations/texas/houston/" class="text-gray-400 hover:text-blue-400 text-sm">Houston</a></li>
+                        <li><a href="/locations/arizona/scottsdale/" class="text-gray-400 hover:text-blue-400 text-sm">Scottsdale</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Mexico</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/locations/mexico/" class="text-gray-400 hover:text-blue-400 text-sm">All Mexico Clinics</a></li>
+                        <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-blue-400 text-sm">Tijuana</a></li>
+                        <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-blue-400 text-sm">Cancun</a></li>
+                        <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-blue-400 text-sm">Puerto Vallarta</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Company</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/#cost-guide" class="text-gray-400 hover:text-blue-400 text-sm">Cost Guide</a></li>
+                        <li><a href="/locations/" class="text-gray-400 hover:text-blue-400 text-sm">All Locations</a></li>
+                        <li><a href="/privacy-policy/" class="text-gray-400 hover:text-blue-400 text-sm">Privacy Policy</a></li>
+                        <li><a href="/terms-of-service/" class="text-gray-400 hover:text-blue-400 text-sm">Terms of Service</a></li>
+                    </ul>
+                </div>
+            </div>
+            <div class="border-t border-gray-800 mt-8 pt-8">
+                <div class="flex flex-col md:flex-row justify-between items-center gap-4">
+                    <p class="text-gray-400 text-sm">&copy; 2025 StemCellPrices.com. All rights reserved.</p>
+                    <p class="text-gray-500 text-xs">The information on this website is for educational purposes only and should not be considered medical advice.</p>
+                </div>
+            </div>
+        </div>
+    </footer>'''
+
+# Tailwind CDN script with the brand colour palette
+TAILWIND_BRAND_CONFIG = '''<script src="https://cdn.tailwindcss.com"></script>
+    <script>
+        tailwind.config = {
+            theme: {
+                extend: {
+                    colors: {
+                        brand: {
+                            50: '#f0f7ff',
+                            100: '#e0effe',
+                            600: '#2563eb',
+                            700: '#1d4ed8',
+                        }
+                    }
+                }
+            }
+        }
+    </script>'''
+
+# Nav and footer of the page layout apply_universal_layout.py applies
+LAYOUT_NAV = '''    <!-- Navigation -->
+    <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200" x-data="{ mobileMenu: false }">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center gap-2">
+                    <div class="w-8 h-8 rounded-lg bg-brand-600 flex items-center justify-center">
+                        <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                        </svg>
+                    </div>
+                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
+                </a>
+
+                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
+                    <a href="/" class="hover:text-brand-600 transition">Find Providers</a>
+                    <a href="/guides/" class="hover:text-brand-600 transition">Guides</a>
+                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
+                    <a href="/patient-journey/" class="hover:text-brand-600 transition">Patient Journey</a>
+                    <div class="nav-dropdown-container">
+                        <a href="/locations/" class="hover:text-brand-600 transition inline-flex items-center gap-1">
+                            Locations
+                            <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
+                            </svg>
+                        </a>
+                        <div class="nav-dropdown-menu">
+                            <a href="/locations/" class="font-bold text-brand-600">View All Locations &rarr;</a>
+                            <div class="h-px bg-slate-100 my-2"></div>
+                            <a href="/locations/california/">California</a>
+                            <a href="/locations/new-york/">New York</a>
+                            <a href="/locations/texas/">Texas</a>
+                            <a href="/locations/pennsylvania/">Pennsylvania</a>
+                            <a href="/locations/illinois/">Illinois</a>
+                            <a href="/locations/massachusetts/">Massachusetts</a>
+                        </div>
+                    </div>
+                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
+                </div>
+
+                <div class="hidden md:flex items-center gap-4">
+                    <a href="/#consultation" class="bg-brand-600 text-white px-4 py-2 rounded-lg font-semibold text-sm hover:bg-brand-700 transition">
+                        Get Matched
+                    </a>
+                </div>
+
+                <!-- Mobile menu button -->
+                <button @click="mobileMenu = !mobileMenu" class="md:hidden p-2">
+                    <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path>
+                    </svg>
+                </button>
+            </div>
+
+            <!-- Mobile menu -->
+            <div x-show="mobileMenu" x-cloak class="md:hidden py-4 border-t border-slate-200">
+                <a href="/" class="block py-2 text-slate-600 font-medium">Find Providers</a>
+                <a href="/guides/" class="block py-2 text-slate-600 font-medium">Guides</a>
+                <a href="/blog/" class="block py-2 text-slate-600 font-medium">Blog</a>
+                <a href="/patient-journey/" class="block py-2 text-slate-600 font-medium">Patient Journey</a>
+                <a href="/locations/" class="block py-2 text-slate-600 font-medium">Locations</a>
+                <a href="/faq/" class="block py-2 text-slate-600 font-medium">FAQ</a>
+                <a href="/#consultation" class="block mt-4 bg-brand-600 text-white text-center py-2 rounded-lg font-semibold">Get Matched</a>
+            </div>
+        </div>
+    </nav>'''
+
+LAYOUT_FOOTER = '''    <!-- Footer -->
+    <footer class="bg-slate-900 text-slate-400 py-16">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="grid md:grid-cols-4 gap-8 mb-12">
+                <div>
+                    <div class="flex items-center gap-2 mb-4">
+                        <div class="w-8 h-8 rounded-lg bg-brand-600 flex items-center justify-center">
+                            <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                            </svg>
+                        </div>
+                        <span class="text-xl font-bold text-white">SleepApneaMatch</span>
+                    </div>
+                    <p class="text-sm">
+                        Compare sleep apnea surgery costs and find verified providers. Medically reviewed by Dr. Igor I. Bussel, MD.
+                    </p>
+                </div>
+
+                <div>
+                    <h4 class="text-white font-semibold mb-4">Procedures</h4>
+                    <ul class="space-y-2 text-sm">
+                        <li><a href="/uppp-cost-guide/" class="hover:text-white transition">UPPP</a></li>
+                        <li><a href="/inspire-cost-guide/" class="hover:text-white transition">Inspire Therapy</a></li>
+                        <li><a href="/mma-cost-guide/" class="hover:text-white transition">MMA Surgery</a></li>
+                        <li><a href="/septoplasty-cost-guide/" class="hover:text-white transition">Septoplasty</a></li>
+                        <li><a href="/turbinate-reduction-cost-guide/" class="hover:text-white transition">Turbinate Reduction</a></li>
+                        <li><a href="/tonsillectomy-cost-guide/" class="hover:text-white transition">Tonsillectomy</a></li>
+                    </ul>
+                </div>
+
+                <div>
+                    <h4 class="text-white font-semibold mb-4">Top Locations</h4>
+                    <ul class="space-y-2 text-sm">
+                        <li><a href="/locations/california/" class="hover:text-white transition">California</a></li>
+                        <li><a href="/locations/new-york/" class="hover:text-white transition">New York</a></li>
+                        <li><a href="/locations/texas/" class="hover:text-white transition">Texas</a></li>
+                        <li><a href="/locations/pennsylvania/" class="hover:text-white transition">Pennsylvania</a></li>
+                        <li><a href="/locations/ohio/" class="hover:text-white transition">Ohio</a></li>
+                        <li><a href="/locations/" class="hover:text-white transition">All Locations &rarr;</a></li>
+                    </ul>
+                </div>
+
+                <div>
+                    <h4 class="text-white font-semibold mb-4">Resources</h4>
+                    <ul class="space-y-2 text-sm">
+                        <li><a href="/guides/" class="hover:text-white transition">Guides</a></li>
+                        <li><a href="/blog/" class="hover:text-white transition">Blog</a></li>
+                        <li><a href="/patient-journey/" class="hover:text-white transition">Patient Journey</a></li>
+                        <li><a href="/faq/" class="hover:text-white transition">FAQ</a></li>
+                    </ul>
+                </div>
+            </div>
+
+            <div class="border-t border-slate-800 pt-8 flex flex-col md:flex-row justify-between items-center gap-4">
+                <p class="text-sm">
+                    &copy; 2026 SleepApneaMatch.com. All rights reserved.
+                </p>
+                <p class="text-xs text-slate-500">
+                    Medical information is reviewed by Dr. Igor I. Bussel, MD. This site does not provide medical advice.
+                </p>
+            </div>
+        </div>
+    </footer>'''
+
+# Header and footer of the older standardized layout (update_all_pages.py)
+STANDARD_HEADER = '''<header class="bg-white shadow-sm sticky top-0 z-50">
+    <nav class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+        <div class="flex justify-between h-16">
+            <div class="flex items-center">
+                <a href="/" class="flex items-center">
+                    <img src="/assets/images/logo-dark.png" alt="StemCellPrices.com" class="h-8 w-auto">
+                </a>
+            </div>
+            <div class="hidden md:flex items-center space-x-8">
+                <a href="/" class="text-gray-700 hover:text-teal-600 font-medium">Home</a>
+                <a href="/#cost-guide" class="text-gray-700 hover:text-teal-600 font-medium">Cost Guide</a>
+                <div class="relative group">
+                    <a href="/locations/" class="text-gray-700 hover:text-teal-600 font-medium inline-flex items-center">
+                        Locations
+                        <svg class="ml-1 h-4 w-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
+                        </svg>
+                    </a>
+                    <div class="absolute left-0 mt-0 w-56 opacity-0 invisible group-hover:opacity-100 group-hover:visible transition-all duration-200 ease-in-out z-50">
+                        <div class="pt-2">
+                            <div class="bg-white rounded-lg shadow-lg ring-1 ring-black ring-opacity-5 py-2">
+                                <a href="/locations/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">All Locations</a>
+                                <div class="border-t border-gray-100 my-1"></div>
+                                <p class="px-4 py-1 text-xs text-gray-400 uppercase tracking-wider">Popular States</p>
+                                <a href="/locations/california/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">California</a>
+                                <a href="/locations/texas/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">Texas</a>
+                                <a href="/locations/florida/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">Florida</a>
+                                <a href="/locations/arizona/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">Arizona</a>
+                                <a href="/locations/new-york/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">New York</a>
+                                <div class="border-t border-gray-100 my-1"></div>
+                                <p class="px-4 py-1 text-xs text-gray-400 uppercase tracking-wider">International</p>
+                                <a href="/locations/mexico/" class="block px-4 py-2 text-sm text-gray-700 hover:bg-teal-50 hover:text-teal-600">🇲🇽 Mexico</a>
+                                <div class="border-t border-gray-100 my-1"></div>
+                                <a href="/locations/" class="block px-4 py-2 text-sm text-teal-600 font-medium hover:bg-teal-50">View All 30+ States →</a>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+                <a href="/compare-costs/" class="text-gray-700 hover:text-teal-600 font-medium">Compare Costs</a>
+            </div>
+            <div class="flex items-center md:hidden">
+                <button type="button" onclick="document.getElementById('mobile-menu').classList.toggle('hidden')" class="text-gray-700 hover:text-teal-600">
+                    <svg class="h-6 w-6" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path>
+                    </svg>
+                </button>
+            </div>
+        </div>
+        <!-- Mobile menu -->
+        <div id="mobile-menu" class="hidden md:hidden pb-4">
+            <a href="/" class="block py-2 text-gray-700 hover:text-teal-600">Home</a>
+            <a href="/#cost-guide" class="block py-2 text-gray-700 hover:text-teal-600">Cost Guide</a>
+            <a href="/locations/" class="block py-2 text-gray-700 hover:text-teal-600">All Locations</a>
+            <a href="/locations/california/" class="block py-2 pl-4 text-gray-600 hover:text-teal-600">→ California</a>
+            <a href="/locations/texas/" class="block py-2 pl-4 text-gray-600 hover:text-teal-600">→ Texas</a>
+            <a href="/locations/florida/" class="block py-2 pl-4 text-gray-600 hover:text-teal-600">→ Florida</a>
+            <a href="/locations/mexico/" class="block py-2 pl-4 text-gray-600 hover:text-teal-600">→ Mexico</a>
+            <a href="/compare-costs/" class="block py-2 text-gray-700 hover:text-teal-600">Compare Costs</a>
+        </div>
+    </nav>
+</header>'''
+
+STANDARD_FOOTER = '''<footer class="bg-gray-900 text-white">
+    <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
+        <div class="grid grid-cols-1 md:grid-cols-4 gap-8">
+            <div class="col-span-1 md:col-span-1">
+                <a href="/" class="flex items-center mb-4">
+                    <img src="/assets/images/logo-dark.png" alt="StemCellPrices.com" class="h-8 w-auto brightness-0 invert">
+                </a>
+                <p class="text-gray-400 text-sm">Compare stem cell therapy costs across the US and Mexico. Find verified clinics and transparent pricing.</p>
+            </div>
+            <div>
+                <h3 class="text-white font-semibold mb-4">Popular States</h3>
+                <ul class="space-y-2">
+                    <li><a href="/locations/california/" class="text-gray-400 hover:text-teal-400 text-sm">California</a></li>
+                    <li><a href="/locations/texas/" class="text-gray-400 hover:text-teal-400 text-sm">Texas</a></li>
+                    <li><a href="/locations/florida/" class="text-gray-400 hover:text-teal-400 text-sm">Florida</a></li>
+                    <li><a href="/locations/arizona/" class="text-gray-400 hover:text-teal-400 text-sm">Arizona</a></li>
+                </ul>
+            </div>
+            <div>
+                <h3 class="text-white font-semibold mb-4">Mexico</h3>
+                <ul class="space-y-2">
+                    <li><a href="/locations/mexico/" class="text-gray-400 hover:text-teal-400 text-sm">Mexico Overview</a></li>
+                    <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-teal-400 text-sm">Tijuana</a></li>
+                    <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-teal-400 text-sm">Cancun</a></li>
+                    <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-teal-400 text-sm">Puerto Vallarta</a></li>
+                </ul>
+            </div>
+            <div>
+                <h3 class="text-white font-semibold mb-4">Resources</h3>
+                <ul class="space-y-2">
+                    <li><a href="/#cost-guide" class="text-gray-400 hover:text-teal-400 text-sm">Cost Guide</a></li>
+                    <li><a href="/compare-costs/" class="text-gray-400 hover:text-teal-400 text-sm">Compare Costs</a></li>
+                    <li><a href="/locations/" class="text-gray-400 hover:text-teal-400 text-sm">All Locations</a></li>
+                </ul>
+            </div>
+        </div>
+        <div class="border-t border-gray-800 mt-8 pt-8 text-center">
+            <p class="text-gray-400 text-sm">&copy; 2025 StemCellPrices.com. All rights reserved.</p>
+        </div>
+    </div>
+</footer>'''
+
+# Standardized footer with the brand, link columns and medical disclaimer
+# (standardize_nav_footer.py)
+STANDARD_FOOTER_DISCLAIMER = '''<footer class="bg-gray-900 text-white">
+    <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
+        <div class="grid grid-cols-1 md:grid-cols-4 gap-8">
+            <!-- Brand -->
+            <div class="col-span-1 md:col-span-1">
+                <a href="/" class="flex items-center mb-4">
+                    <img src="/assets/images/logo-dark.png" alt="StemCellPrices.com" class="h-8 w-auto brightness-0 invert">
+                </a>
+                <p class="text-gray-400 text-sm">Compare stem cell therapy costs across the US and Mexico. Find verified clinics and transparent pricing.</p>
+            </div>
+            
+            <!-- Popular States -->
+            <div>
+                <h3 class="text-white font-semibold mb-4">Popular States</h3>
+                <ul class="space-y-2">
+                    <li><a href="/locations/california/" class="text-gray-400 hover:text-teal-400 text-sm">California</a></li>
+                    <li><a href="/locations/texas/" class="text-gray-400 hover:text-teal-400 text-sm">Texas</a></li>
+                    <li><a href="/locations/florida/" class="text-gray-400 hover:text-teal-400 text-sm">Florida</a></li>
+                    <li><a href="/locations/arizona/" class="text-gray-400 hover:text-teal-400 text-sm">Arizona</a></li>
+                    <li><a href="/locations/new-york/" class="text-gray-400 hover:text-teal-400 text-sm">New York</a></li>
+                    <li><a href="/locations/colorado/" class="text-gray-400 hover:text-teal-400 text-sm">Colorado</a></li>
+                </ul>
+            </div>
+            
+            <!-- International -->
+            <div>
+                <h3 class="text-white font-semibold mb-4">International</h3>
+                <ul class="space-y-2">
+                    <li><a href="/locations/mexico/" class="text-gray-400 hover:text-teal-400 text-sm">Mexico Overview</a></li>
+                    <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-teal-400 text-sm">Tijuana Clinics</a></li>
+                    <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-teal-400 text-sm">Cancun Clinics</a></li>
+                    <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-teal-400 text-sm">Puerto Vallarta</a></li>
+                    <li><a href="/compare-costs/" class="text-gray-400 hover:text-teal-400 text-sm">Compare US vs Mexico</a></li>
+                </ul>
+            </div>
+            
+            <!-- Resources -->
+            <div>
+                <h3 class="text-white font-semibold mb-4">Resources</h3>
+                <ul class="space-y-2">
+                    <li><a href="/#cost-guide" class="text-gray-400 hover:text-teal-400 text-sm">Cost Guide</a></li>
+                    <li><a href="/locations/" class="text-gray-400 hover:text-teal-400 text-sm">All Locations</a></li>
+                    <li><a href="/compare-costs/" class="text-gray-400 hover:text-teal-400 text-sm">Compare Costs</a></li>
+                    <li><a href="/lp/" class="text-gray-400 hover:text-teal-400 text-sm">Treatment Info</a></li>
+                </ul>
+            </div>
+        </div>
+        
+        <div class="border-t border-gray-800 mt-8 pt-8">
+            <div class="flex flex-col md:flex-row justify-between items-center">
+                <p class="text-gray-400 text-sm">&copy; 2025 StemCellPrices.com. All rights reserved.</p>
+                <p class="text-gray-500 text-xs mt-2 md:mt-0">Disclaimer: Information provided is for educational purposes only. Always consult with a qualified healthcare provider.</p>
+            </div>
+        </div>
+    </div>
+</footer>'''
+
+# Header and footer of the location pages (regenerate_locations.py)
+LOCATIONS_NAV = '''<nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center gap-2">
+                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
+                </a>
+                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
+                    <a href="/" class="hover:text-brand-600 transition">Home</a>
+                    <a href="/locations/" class="hover:text-brand-600 transition">Locations</a>
+                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
+                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
+                </div>
+            </div>
+        </div>
+    </nav>'''
+
+LOCATIONS_FOOTER = '''<footer class="bg-slate-900 text-slate-400 py-12">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center">
+            <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
+        </div>
+    </footer>'''
+
+# Hover lift of the listing cards on the location pages
+CARD_HOVER_STYLE = '''<style>
+        .card-hover { transition: all 0.3s ease; }
+        .card-hover:hover { transform: translateY(-4px); box-shadow: 0 20px 40px rgba(0,0,0,0.15); }
+    </style>'''
+
+# Header and footer of the provider pages (generate_provider_pages.py)
+PROVIDER_NAV = '''<nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center gap-2">
+                    <div class="w-8 h-8 rounded-lg bg-brand-600 flex items-center justify-center">
+                        <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                        </svg>
+                    </div>
+                    <span class="text-xl font-bold tracking-tight text-slate-900">SleepApneaMatch<span class="text-brand-600">.</span></span>
+                </a>
+                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
+                    <a href="/" class="hover:text-brand-600 transition">Find Providers</a>
+                    <a href="/#procedures" class="hover:text-brand-600 transition">Procedures</a>
+                    <a href="/blog/" class="hover:text-brand-600 transition">Blog</a>
+                    <a href="/locations/" class="hover:text-brand-600 transition">Locations</a>
+                    <a href="/faq/" class="hover:text-brand-600 transition">FAQ</a>
+                </div>
+                <a href="/#consultation" class="hidden md:block bg-brand-600 text-white px-4 py-2 rounded-lg font-semibold text-sm hover:bg-brand-700 transition">
+                    Get Matched
+                </a>
+            </div>
+        </div>
+    </nav>'''
+
+PROVIDER_FOOTER = '''<footer class="bg-slate-900 text-slate-400 py-12">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex flex-col md:flex-row justify-between items-center gap-4">
+                <div class="flex items-center gap-2">
+                    <div class="w-8 h-8 rounded-lg bg-brand-600 flex items-center justify-center">
+                        <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                        </svg>
+                    </div>
+                    <span class="text-white font-bold">SleepApneaMatch</span>
+                </div>
+                <p class="text-sm">&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
+            </div>
+        </div>
+    </footer>'''
+
+# Header and footer of the cost guide pages (generate_cost_guides.py)
+COST_GUIDE_NAV = '''<nav class="bg-white shadow-sm sticky top-0 z-50">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center gap-2">
+                    <div class="w-8 h-8 bg-primary rounded-lg flex items-center justify-center">
+                        <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                        </svg>
+                    </div>
+                    <span class="font-bold text-xl text-slate-800">SleepApneaMatch</span>
+                </a>
+                <div class="hidden md:flex items-center gap-6">
+                    <a href="/locations/" class="text-slate-600 hover:text-primary">Find Providers</a>
+                    <div class="relative group">
+                        <button class="text-slate-600 hover:text-primary flex items-center gap-1">
+                            Cost Guides
+                            <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
+                            </svg>
+                        </button>
+                        <div class="absolute top-full left-0 mt-2 w-64 bg-white rounded-xl shadow-lg opacity-0 invisible group-hover:opacity-100 group-hover:visible transition-all duration-200 p-2">
+                            <a href="/inspire-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Inspire Therapy</a>
+                            <a href="/mma-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">MMA Surgery</a>
+                            <a href="/uppp-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">UPPP Surgery</a>
+                            <a href="/tors-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">TORS (Robotic Surgery)</a>
+                            <a href="/tonsillectomy-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Tonsillectomy</a>
+                            <a href="/genioglossus-advancement-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Genioglossus Adv.</a>
+                            <a href="/septoplasty-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Septoplasty</a>
+                            <a href="/turbinate-reduction-cost-guide/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-slate-50 rounded-lg">Turbinate Reduction</a>
+                        </div>
+                    </div>
+                    <a href="/blog/" class="text-slate-600 hover:text-primary">Blog</a>
+                    <a href="/faq/" class="text-slate-600 hover:text-primary">FAQ</a>
+                </div>
+            </div>
+        </div>
+    </nav>'''
+
+COST_GUIDE_FOOTER = '''<footer class="bg-slate-900 text-slate-400 py-16">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="grid md:grid-cols-4 gap-8">
+                <div>
+                    <div class="flex items-center gap-2 mb-4">
+                        <div class="w-8 h-8 bg-primary rounded-lg flex items-center justify-center">
+                            <svg class="w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21a9.003 9.003 0 008.354-5.646z"></path>
+                            </svg>
+                        </div>
+                        <span class="font-bold text-white">SleepApneaMatch</span>
+                    </div>
+                    <p class="text-sm">Connecting patients with verified sleep apnea surgery specialists nationwide.</p>
+                </div>
+                <div>
+                    <h4 class="font-semibold text-white mb-4">Cost Guides</h4>
+                    <ul class="space-y-2 text-sm">
+                        <li><a href="/inspire-cost-guide/" class="hover:text-white">Inspire Therapy</a></li>
+                        <li><a href="/mma-cost-guide/" class="hover:text-white">MMA Surgery</a></li>
+                        <li><a href="/uppp-cost-guide/" class="hover:text-white">UPPP Surgery</a></li>
+                        <li><a href="/tors-cost-guide/" class="hover:text-white">TORS</a></li>
+                        <li><a href="/tonsillectomy-cost-guide/" class="hover:text-white">Tonsillectomy</a></li>
+                        <li><a href="/septoplasty-cost-guide/" class="hover:text-white">Septoplasty</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h4 class="font-semibold text-white mb-4">Resources</h4>
+                    <ul class="space-y-2 text-sm">
+                        <li><a href="/locations/" class="hover:text-white">Find Providers</a></li>
+                        <li><a href="/blog/" class="hover:text-white">Blog</a></li>
+                        <li><a href="/faq/" class="hover:text-white">FAQ</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h4 class="font-semibold text-white mb-4">Medical Review</h4>
+                    <div class="flex items-center gap-3">
+                        <img src="/assets/images/dr_igor.jpg" alt="Dr. Igor I. Bussel" class="w-10 h-10 rounded-full object-cover">
+                        <div class="text-sm">
+                            <div class="text-white font-medium">Dr. Igor I. Bussel, MD</div>
+                            <div class="text-xs">Board-Certified Physician</div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            <div class="border-t border-slate-800 mt-12 pt-8 text-center text-sm">
+                <p>&copy; 2026 SleepApneaMatch.com. All rights reserved.</p>
+                <p class="mt-2 text-xs">Information provided is for educational purposes only and should not replace medical advice.</p>
+            </div>
+        </div>
+    </footer>'''
+
+# Header and footer of the Mexico pages (create_mexico_clinics.py)
+MEXICO_HEADER = '''<header class="bg-white shadow-sm sticky top-0 z-50">
+        <nav class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="flex justify-between h-16 items-center">
+                <a href="/" class="flex items-center">
+                    <img src="/assets/images/logo.png" alt="StemCellPrices.com" class="h-8">
+                </a>
+                <div class="hidden md:flex items-center space-x-8">
+                    <a href="/" class="text-gray-600 hover:text-teal-600">Home</a>
+                    <a href="/#cost-guide" class="text-gray-600 hover:text-teal-600">Cost Guide</a>
+                    <a href="/locations/" class="text-gray-600 hover:text-teal-600">Locations</a>
+                    <a href="/compare-costs/" class="text-gray-600 hover:text-teal-600">Compare Costs</a>
+                </div>
+            </div>
+        </nav>
+    </header>'''
+
+MEXICO_FOOTER = '''<footer class="bg-slate-900 text-white py-12">
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
+            <div class="grid grid-cols-2 md:grid-cols-4 gap-8">
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Popular States</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/locations/california/" class="text-gray-400 hover:text-teal-400 text-sm">California</a></li>
+                        <li><a href="/locations/texas/" class="text-gray-400 hover:text-teal-400 text-sm">Texas</a></li>
+                        <li><a href="/locations/florida/" class="text-gray-400 hover:text-teal-400 text-sm">Florida</a></li>
+                        <li><a href="/locations/arizona/" class="text-gray-400 hover:text-teal-400 text-sm">Arizona</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Mexico</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/locations/mexico/" class="text-gray-400 hover:text-teal-400 text-sm">Mexico Overview</a></li>
+                        <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-teal-400 text-sm">Tijuana</a></li>
+                        <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-teal-400 text-sm">Cancun</a></li>
+                        <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-teal-400 text-sm">Puerto Vallarta</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Resources</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/#cost-guide" class="text-gray-400 hover:text-teal-400 text-sm">Cost Guide</a></li>
+                        <li><a href="/compare-costs/" class="text-gray-400 hover:text-teal-400 text-sm">Compare Costs</a></li>
+                        <li><a href="/locations/" class="text-gray-400 hover:text-teal-400 text-sm">All Locations</a></li>
+                    </ul>
+                </div>
+                <div>
+                    <h3 class="text-white font-semibold mb-4">Legal</h3>
+                    <ul class="space-y-2">
+                        <li><a href="/privacy/" class="text-gray-400 hover:text-teal-400 text-sm">Privacy Policy</a></li>
+                        <li><a href="/terms/" class="text-gray-400 hover:text-teal-400 text-sm">Terms of Service</a></li>
+                        <li><a href="/disclaimer/" class="text-gray-400 hover:text-teal-400 text-sm">Medical Disclaimer</a></li>
+                    </ul>
+                </div>
+            </div>
+            <div class="mt-8 pt-8 border-t border-gray-800 text-center text-gray-400 text-sm">
+                <p>© 2025 StemCellPrices.com. All rights reserved.</p>
+                <p class="mt-2 text-xs">The information on this website is for educational purposes only and should not be considered medical advice. Always consult with a qualified healthcare provider.</p>
+            </div>
+        </div>
+    </footer>'''
+
+PARTIALS = {
+    'universal_nav': UNIVERSAL_NAV,
+    'universal_footer': UNIVERSAL_FOOTER,
+    'tailwind_brand_config': TAILWIND_BRAND_CONFIG,
+    'layout_nav': LAYOUT_NAV,
+    'layout_footer': LAYOUT_FOOTER,
+    'standard_header': STANDARD_HEADER,
+    'standard_footer': STANDARD_FOOTER,
+    'standard_footer_disclaimer': STANDARD_FOOTER_DISCLAIMER,
+    'locations_nav': LOCATIONS_NAV,
+    'locations_footer': LOCATIONS_FOOTER,
+    'card_hover_style': CARD_HOVER_STYLE,
+    'provider_nav': PROVIDER_NAV,
+    'provider_footer': PROVIDER_FOOTER,
+    'cost_guide_nav': COST_GUIDE_NAV,
+    'cost_guide_footer': COST_GUIDE_FOOTER,
+    'mexico_header': MEXICO_HEADER,
+    'mexico_footer': MEXICO_FOOTER,
+}
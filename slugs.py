@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+The site's one slug function and a persistent registry of the slugs in use.
+
+slugify() is the only slug algorithm; every script imports it from here.
+Page slugs for records go through the registry in api/slugs.json, which
+maps each name to its slug per URL directory ("scope"):
+
+    registry = load_registry('api')
+    slug = slug_for(registry, 'locations/texas/houston', 'Houston ENT & Allergy')
+    save_registry(registry)
+    write_redirects(registry, '.')
+
+A registered name keeps its slug even if slugify() changes later, and a
+lookup is a dict hit. A new name whose slug is already taken in its scope
+gets -2, -3, ... and is reported as a collision. When a slug does change
+(the page was published at another URL before it was registered, or
+--refresh re-slugs everything) a 301 is recorded; the redirects are kept
+in the registry and written to a generated block of _redirects.
+
+Usage:
+    python3 slugs.py                 # registry summary and collisions
+    python3 slugs.py --refresh       # re-slug every name with slugify(), recording redirects
+"""
+
+import argparse
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import profiling
+from output_writer import write_if_changed
+
+REGISTRY_FILE = 'slugs.json'
+REDIRECTS_FILE = '_redirects'
+REDIRECTS_BEGIN = '# BEGIN slug redirects (generated by slugs.py - do not edit by hand)'
+REDIRECTS_END = '# END slug redirects'
+
+
+@lru_cache(maxsize=None)
+def slugify(text):
+    """Convert text to URL-friendly slug"""
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9\s-]', '', text)
+    text = re.sub(r'[\s_]+', '-', text)
+    text = re.sub(r'-+', '-', text)
+    return text.strip('-')
+
+
+def load_registry(data_dir='api'):
+    path = Path(data_dir) / REGISTRY_FILE
+    data = {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return {
+        'path': path,
+        'scopes': data.get('scopes', {}),
+        'redirects': data.get('redirects', {}),
+        # Per-scope {slug: name}, built on first use
+        'taken': {},
+        'collisions': [],
+    }
+
+
+def taken_slugs(registry, scope):
+    taken = registry['taken'].get(scope)
+    if taken is None:
+        names = registry['scopes'].get(scope, {})
+        taken = registry['taken'][scope] = {slug: name for name, slug in names.items()}
+    return taken
+
+
+def unique_slug(registry, scope, name):
+    """slugify(name), suffixed if another name in scope already has it"""
+    taken = taken_slugs(registry, scope)
+    base = slugify(name) or 'page'
+    slug = base
+    n = 1
+    while slug in taken and taken[slug] != name:
+        n += 1
+        slug = f"{base}-{n}"
+    if slug != base:
+        registry['collisions'].append({'scope': scope, 'name': name, 'slug': slug,
+                                       'base': base, 'taken_by': taken[base]})
+    return slug
+
+
+def add_redirect(registry, old, new):
+    """Record a 301 from old to new, re-pointing redirects that led to old"""
+    redirects = registry['redirects']
+    for source, target in list(redirects.items()):
+        if target == old:
+            redirects[source] = new
+    redirects[old] = new
+    # A page that exists again must not be redirected away
+    redirects.pop(new, None)
+
+
+def page_url(scope, slug):
+    return f"/{scope}/{slug}.html"
+
+
+def slug_for(registry, scope, name, previous_urls=()):
+    """Slug for name's page in scope (a URL directory such as
+    'locations/texas/houston'). previous_urls are where the page was
+    published before the registry knew it; each one that differs from the
+    new URL is redirected to it."""
+    names = registry['scopes'].setdefault(scope, {})
+    slug = names.get(name)
+    if slug is not None:
+        return slug
+    slug = unique_slug(registry, scope, name)
+    names[name] = slug
+    taken_slugs(registry, scope)[slug] = name
+    for url in previous_urls:
+        if url != page_url(scope, slug):
+            add_redirect(registry, url, page_url(scope, slug))
+    return slug
+
+
+def refresh_slugs(registry):
+    """Re-slug every registered name with the current slugify(), recording
+    redirects for the slugs that change. Returns the number changed."""
+    changed = 0
+    for scope, names in registry['scopes'].items():
+        registry['taken'][scope] = {}
+        for name, old_slug in sorted(names.items()):
+            slug = unique_slug(registry, scope, name)
+            names[name] = slug
+            registry['taken'][scope][slug] = name
+            if slug != old_slug:
+                add_redirect(registry, page_url(scope, old_slug), page_url(scope, slug))
+                changed += 1
+    return changed
+
+
+def save_registry(registry, write_stats=None):
+    data = {'scopes': registry['scopes'], 'redirects': registry['redirects']}
+    return write_if_changed(registry['path'], json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False),
+                            write_stats)
+
+
+def write_redirects(registry, root='.', write_stats=None):
+    """Replace the generated block of root/_redirects with the registry's redirects"""
+    path = Path(root) / REDIRECTS_FILE
+    text = path.read_text(encoding='utf-8') if path.exists() else ''
+    if REDIRECTS_BEGIN in text:
+        before, rest = text.split(REDIRECTS_BEGIN, 1)
+        after = rest.split(REDIRECTS_END, 1)[1] if REDIRECTS_END in rest else '\n'
+    else:
+        before, after = text, '\n'
+    if not registry['redirects'] and REDIRECTS_BEGIN not in text:
+        return 'unchanged'
+
+    lines = [f"{old}  {new}  301" for old, new in sorted(registry['redirects'].items())]
+    block = '\n'.join([REDIRECTS_BEGIN, *lines, REDIRECTS_END])
+    before = before.rstrip('\n') + '\n\n' if before.strip() else ''
+    return write_if_changed(path, before + block + after, write_stats)
+
+
+def print_collisions(registry):
+    for collision in registry['collisions']:
+        print(f"  Slug collision in {collision['scope']}: {collision['name']!r} -> {collision['slug']} "
+              f"({collision['base']} is {collision['taken_by']!r})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or refresh the slug registry")
+    parser.add_argument('--data-dir', default='api', help="directory holding slugs.json")
+    parser.add_argument('--root', default='.', help="site root holding _redirects")
+    parser.add_argument('--refresh', action='store_true', help="re-slug every name with the current slugify()")
+    args = parser.parse_args(argv)
+
+    registry = load_registry(args.data_dir)
+    if args.refresh:
+        changed = refresh_slugs(registry)
+        save_registry(registry)
+        write_redirects(registry, args.root)
+        print(f"Re-slugged: {changed} slugs changed")
+    print_collisions(registry)
+
+    scopes = registry['scopes']
+    print(f"{sum(len(names) for names in scopes.values())} slugs in {len(scopes)} scopes, "
+          f"{len(registry['redirects'])} redirects ({registry['path']})")
+
+
+if __name__ == '__main__':
+    profiling.run(main)
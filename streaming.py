@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON reading for data files too large to load at once.
+
+    iter_json_array('api/clinics.json', 'medical_centers')   # records one at a time
+
+Only one record is decoded at a time, so a pass over the data costs about
+the same peak memory whatever the file size.
+"""
+
+import json
+
+READ_SIZE = 1 << 16
+WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Incremental JSON tokens over a text file"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Read more data, dropping what has been consumed"""
+        data = self.f.read(max(READ_SIZE, len(self.buf) - self.pos))
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        self.eof = not data
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON stream, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more until it fits in the buffer"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # A number may continue past the end of the buffer
+            if end == len(self.buf) and not self.eof and not isinstance(value, (dict, list, str)):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_arrays(path, keys):
+    """Yield (key, item) for the items of the arrays under keys in a JSON
+    object file, one item at a time and in file order. Other values are
+    decoded and skipped; the file is not read past the last wanted array."""
+    wanted = set(keys)
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        reader.expect('{')
+        while wanted and reader.peek() != '}':
+            name = reader.value()
+            reader.expect(':')
+            if name in wanted:
+                wanted.discard(name)
+                reader.expect('[')
+                while reader.peek() != ']':
+                    yield name, reader.value()
+                    if reader.peek() != ',':
+                        break
+                    reader.pos += 1
+                reader.expect(']')
+            else:
+                reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+
+
+def iter_json_array(path, key):
+    """Yield the items of the array under key in a JSON object file, one at a time"""
+    for _, item in iter_json_arrays(path, [key]):
+        yield item
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Compiled page templates with shared partials.
+Template text is plain HTML with two kinds of placeholders:
+
+    {{ clinic.name }}           value from the render context; dots look up dict keys
+    {{ p.price_range.low:, }}   optional format spec, as in an f-string
+    {{> universal_nav }}        include another template or partial
+
+A context value that is an iterator (e.g. a generator of listing cards) is
+streamed into its slot chunk by chunk; render_iter() yields the page the
+same way so it can be written out without building the whole string.
+
+Each template is compiled once per process into a list of literal chunks and
+slots. Includes are inlined at compile time, so partials without slots (nav,
+footer, tailwind config) are rendered once and cached as part of the
+surrounding literal text; rendering a page only fills in its variable parts.
+The site-wide partials (site_partials.py) are inlined between include
+markers, so includes.py can resolve a changed partial in the built pages.
+"""
+
+import re
+from collections.abc import Iterator
+
+import includes
+import site_partials
+
+SLOT_RE = re.compile(r'\{\{\s*(>?)\s*([A-Za-z_][\w.]*)(?::([^}]*))?\s*\}\}')
+
+_sources = {}
+_compiled = {}
+
+
+def define(name, text):
+    """Register a template or partial under a name"""
+    if _sources.get(name) != text:
+        _sources[name] = text
+        # Anything compiled so far may have inlined the old text
+        _compiled.clear()
+
+
+def _compile(name, stack=()):
+    if name in stack:
+        raise ValueError(f"template include cycle: {' -> '.join(stack + (name,))}")
+    if name not in _sources:
+        raise KeyError(f"unknown template: {name}")
+
+    text = _sources[name]
+    parts = []
+    pos = 0
+    for match in SLOT_RE.finditer(text):
+        parts.append(text[pos:match.start()])
+        include, path, spec = match.groups()
+        if include and path in site_partials.PARTIALS:
+            parts.append(includes.opening(path))
+            parts.extend(_compile(path, stack + (name,)))
+            parts.append(includes.closing(path))
+        elif include:
+            parts.extend(_compile(path, stack + (name,)))
+        else:
+            parts.append((tuple(path.split('.')), spec or ''))
+        pos = match.end()
+    parts.append(text[pos:])
+
+    # Merge adjacent literal chunks so static partials become one string
+    merged = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        elif part != '':
+            merged.append(part)
+    return merged
+
+
+def compiled(name):
+    """The compiled chunks of a template, compiling it on first use"""
+    if name not in _compiled:
+        _compiled[name] = _compile(name)
+    return _compiled[name]
+
+
+def partials(name, stack=()):
+    """Names of the site partials a template includes, directly or through other templates"""
+    if name in stack:
+        raise ValueError(f"template include cycle: {' -> '.join(stack + (name,))}")
+    found = set()
+    for include, path, _ in SLOT_RE.findall(_sources[name]):
+        if include and path in site_partials.PARTIALS:
+            found.add(path)
+        elif include:
+            found |= partials(path, stack + (name,))
+    return found
+
+
+def _lookup(context, path):
+    value = context[path[0]]
+    for key in path[1:]:
+        value = value[key]
+    return value
+
+
+def render_iter(template, /, **context):
+    """Render a template as a sequence of string chunks"""
+    for part in compiled(template):
+        if isinstance(part, str):
+            yield part
+            continue
+        value = _lookup(context, part[0])
+        if isinstance(value, Iterator):
+            yield from value
+        else:
+            yield format(value, part[1])
+
+
+def render(template, /, **context):
+    """Render a template with the given context values"""
+    return ''.join(render_iter(template, **context))
+
+
+for _name, _text in site_partials.PARTIALS.items():
+    define(_name, _text)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+The incremental Airtable sync, run against airtable_stub.py.
+
+After a full pull, a sync must fetch only the records modified since the
+previous one, merge upserts and deletions into the snapshot in place and
+report the changed record IDs.
+
+Usage:
+    python3 -m pytest -q test_airtable_sync.py
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import airtable_stub
+import airtable_sync
+
+TABLE = 'tblPWikHvOPh26JdJ'
+
+
+def record(record_id, question, created='2025-06-01T00:00:00.000Z'):
+    return {'id': record_id, 'createdTime': created, 'fields': {'Question': question, 'Answer': 'A'},
+            'modified': created}
+
+
+def snapshot_records(root):
+    return airtable_sync.load_snapshot(airtable_sync.snapshot_path(root, TABLE))['records']
+
+
+@pytest.fixture
+def api():
+    """(tables, API URL) of a stub serving two records per page"""
+    tables = {TABLE: [record(f"rec{i}", f"Question {i}") for i in range(5)]}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), airtable_stub.make_handler(tables, max_page_size=2))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield tables, f"http://127.0.0.1:{server.server_address[1]}/v0"
+    server.shutdown()
+    server.server_close()
+
+
+def sync(root, api_url, full=False):
+    report = airtable_sync.run_sync(root, api_url, 'appTest', 'test', tables=[TABLE], full=full)
+    assert report['errors'] == {}
+    return report['tables'][TABLE]
+
+
+def test_incremental_sync(tmp_path, api):
+    tables, api_url = api
+    first = sync(tmp_path, api_url)
+    assert (first['mode'], first['fetched'], first['requests']) == ('full', 5, 3)
+    assert [r['id'] for r in snapshot_records(tmp_path)] == ['rec0', 'rec1', 'rec2', 'rec3', 'rec4']
+
+    # Nothing changed: only the ID pass's pages are requested
+    second = sync(tmp_path, api_url)
+    assert (second['mode'], second['fetched'], second['added'], second['updated'], second['deleted']) == \
+        ('incremental', 0, [], [], [])
+
+    now = airtable_stub.now()
+    tables[TABLE][1]['fields'] = {'Question': 'Question 1, edited', 'Answer': 'A'}
+    tables[TABLE][1]['modified'] = now
+    del tables[TABLE][3]
+    tables[TABLE].append(record('rec9', 'Question 9', created=now))
+
+    third = sync(tmp_path, api_url)
+    assert (third['fetched'], third['added'], third['updated'], third['deleted']) == (2, ['rec9'], ['rec1'], ['rec3'])
+    records = snapshot_records(tmp_path)
+    assert [r['id'] for r in records] == ['rec0', 'rec1', 'rec2', 'rec4', 'rec9']
+    assert records[1]['fields']['Question'] == 'Question 1, edited'
+    assert airtable_sync.changed_ids(tmp_path, TABLE) == ({'rec9', 'rec1'}, {'rec3'})
+
+
+def test_full_sync_matches_the_api(tmp_path, api):
+    tables, api_url = api
+    sync(tmp_path, api_url)
+    tables[TABLE][0]['fields'] = {'Question': 'Changed without a modified time'}
+    assert sync(tmp_path, api_url, full=True)['updated'] == ['rec0']
+    assert snapshot_records(tmp_path) == [airtable_stub.public(r) for r in tables[TABLE]]
+
+
+def test_failed_table_keeps_its_snapshot(tmp_path, api):
+    _, api_url = api
+    sync(tmp_path, api_url)
+    before = snapshot_records(tmp_path)
+    report = airtable_sync.run_sync(tmp_path, api_url, 'appTest', 'test', tables=[TABLE, 'tblMissing'])
+    assert set(report['errors']) == {'tblMissing'}
+    assert snapshot_records(tmp_path) == before
+
+
+def test_merge_records_keeps_order():
+    existing = [{'id': 'a', 'v': 1}, {'id': 'b', 'v': 1}, {'id': 'c', 'v': 1}]
+    records, changes = airtable_sync.merge_records(existing, [{'id': 'b', 'v': 2}, {'id': 'd', 'v': 1}],
+                                                   live_ids={'b', 'c', 'd'})
+    assert records == [{'id': 'b', 'v': 2}, {'id': 'c', 'v': 1}, {'id': 'd', 'v': 1}]
+    assert changes == {'added': ['d'], 'updated': ['b'], 'deleted': ['a']}
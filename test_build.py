@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Parallel page rendering in build.py.
+
+render_pages must yield the same (job, html, error) results, in job order,
+whether the jobs run serially or on a process pool, and a failing render
+is reported rather than aborting the build.
+
+Usage:
+    python3 -m pytest -q test_build.py
+"""
+
+import build
+
+
+def render_greeting(name):
+    if not name:
+        raise ValueError("no name")
+    return f"<h1>Hello {name}</h1>"
+
+
+def make_jobs(names):
+    return [{'path': f"{i}.html", 'render': render_greeting, 'args': (name,)} for i, name in enumerate(names)]
+
+
+def results(jobs, workers):
+    return [(job['path'], html, error) for job, html, error, _ in build.render_pages(jobs, workers)]
+
+
+def test_parallel_matches_serial():
+    jobs = make_jobs([f"clinic {i}" for i in range(40)])
+    serial = results(jobs, workers=1)
+    assert serial == results(jobs, workers=4)
+    assert [path for path, _, _ in serial] == [job['path'] for job in jobs]
+    assert serial[3] == ('3.html', '<h1>Hello clinic 3</h1>', None)
+
+
+def test_errors_are_collected():
+    jobs = make_jobs(['a', '', 'c'])
+    for workers in (1, 2):
+        assert results(jobs, workers) == [
+            ('0.html', '<h1>Hello a</h1>', None),
+            ('1.html', None, 'ValueError: no name'),
+            ('2.html', '<h1>Hello c</h1>', None),
+        ]
+
+
+def test_render_job_times_the_render():
+    html, error, seconds = build.render_job(render_greeting, ('x',))
+    assert (html, error) == ('<h1>Hello x</h1>', None)
+    assert seconds >= 0
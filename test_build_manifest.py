@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+The digest manifest deploys are diffed against.
+
+The manifest must list every published file with its digests, reuse the
+digests of files whose size and mtime did not change and diff into the
+added, changed, removed and unchanged deploy paths.
+
+Usage:
+    python3 -m pytest -q test_build_manifest.py
+"""
+
+import hashlib
+
+import pytest
+
+from build_manifest import build_manifest, diff_manifests, load_manifest, manifest_path, update_manifest
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / 'blog').mkdir()
+    (tmp_path / 'index.html').write_text('<h1>Home</h1>', encoding='utf-8')
+    (tmp_path / 'blog' / 'post.html').write_text('<h1>Post</h1>', encoding='utf-8')
+    return tmp_path
+
+
+def test_lists_published_files(site):
+    (site / '.build-cache').mkdir()
+    (site / '.build-cache' / 'graph.json').write_text('{}', encoding='utf-8')
+    (site / '__pycache__').mkdir()
+    (site / '__pycache__' / 'build.cpython-311.pyc').write_bytes(b'')
+    (site / '.env').write_text('TOKEN=x', encoding='utf-8')
+    (site / '.index.html.123.tmp').write_text('', encoding='utf-8')
+
+    manifest = build_manifest(site)
+    assert list(manifest['files']) == ['/index.html', '/blog/post.html']
+    entry = manifest['files']['/index.html']
+    assert entry['sha1'] == hashlib.sha1(b'<h1>Home</h1>').hexdigest()
+    assert entry['sha256'] == hashlib.sha256(b'<h1>Home</h1>').hexdigest()
+    assert entry['size'] == 13
+    assert manifest['hashed'] == 2
+
+
+def test_untouched_files_are_not_rehashed(site):
+    first = update_manifest(site)
+    assert first['hashed'] == 2
+    assert update_manifest(site)['hashed'] == 0
+
+    (site / 'index.html').write_text('<h1>Home!</h1>', encoding='utf-8')
+    second = update_manifest(site)
+    assert second['hashed'] == 1
+    assert load_manifest(manifest_path(site))['files'] == second['files']
+
+
+def test_diff(site):
+    old = build_manifest(site)
+    (site / 'index.html').write_text('<h1>New home</h1>', encoding='utf-8')
+    (site / 'blog' / 'post.html').unlink()
+    (site / 'faq.html').write_text('<h1>FAQ</h1>', encoding='utf-8')
+    (site / 'about.html').write_text('<h1>About</h1>', encoding='utf-8')
+    diff = diff_manifests(old, build_manifest(site, old))
+    assert diff == {'added': ['/about.html', '/faq.html'], 'changed': ['/index.html'],
+                    'removed': ['/blog/post.html'], 'unchanged': []}
+
+
+def test_unreadable_manifest_is_empty(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_text('{not json', encoding='utf-8')
+    assert load_manifest(path)['files'] == {}
+    assert load_manifest(tmp_path / 'missing.json')['files'] == {}
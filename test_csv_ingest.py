@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Streaming, validated ingestion of the research CSVs.
+
+Bad records must be reported and skipped without stopping the parse,
+record indexes (and so the IDs built from them) must not shift when other
+records are dropped, and the procedures must come from the CSV rows, with
+the curated values only filling the gaps.
+
+Usage:
+    python3 -m pytest -q test_csv_ingest.py
+"""
+
+import csv
+
+import pytest
+
+import csv_ingest
+import parse_sleep_data
+from csv_ingest import NUMBER, URL, YES_NO
+
+SCHEMA = {
+    'key': 'Name',
+    'required': ['Name'],
+    'columns': ['Website', 'Inspire Certified', 'Phone'],
+    'checks': {'Website': URL, 'Inspire Certified': YES_NO},
+}
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+def ingest(path, schema=SCHEMA, chunk_size=csv_ingest.CHUNK_ROWS):
+    report = csv_ingest.new_report(path.name)
+    rows = list(csv_ingest.iter_rows(path, schema, report, chunk_size))
+    return rows, report
+
+
+@pytest.fixture
+def centers(tmp_path):
+    return write_csv(tmp_path / 'centers.csv', [
+        ['Name', 'Website', 'Inspire Certified'],
+        ['Stanford', 'https://stanford.edu', 'Yes'],
+        ['', 'https://skipped.example', 'No'],
+        ['Short row', 'https://short.example'],
+        ['Penn\nSleep', 'penn.edu', 'Maybe'],
+        ['Houston', '', 'no'],
+    ])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_bad_records_are_reported_and_skipped(centers, chunk_size):
+    rows, report = ingest(centers, chunk_size=chunk_size)
+    # Indexes count every data record, so Houston keeps its index
+    assert [(index, row['Name']) for index, row in rows] == [(1, 'Stanford'), (4, 'Penn\nSleep'), (5, 'Houston')]
+    assert csv_ingest.format_report(report) == '3 accepted, 1 skipped, 1 rejected, 3 warnings'
+    assert report['errors'] == [{'line': 4, 'message': 'expected 3 fields, found 2'}]
+    assert report['warnings'] == [
+        {'line': 1, 'message': "missing column 'Phone', read as empty"},
+        {'line': 5, 'message': "Website: expected an http(s) URL ('penn.edu')"},
+        {'line': 5, 'message': "Inspire Certified: expected Yes or No ('Maybe')"},
+    ]
+
+
+def test_missing_required_column_rejects_the_file(tmp_path):
+    rows, report = ingest(write_csv(tmp_path / 'bad.csv', [['Title', 'Website'], ['x', 'y']]))
+    assert rows == []
+    assert report['errors'] == [{'line': 1, 'message': 'missing required columns: Name'}]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('', encoding='utf-8')
+    rows, report = ingest(path)
+    assert rows == [] and report['errors'] == [{'line': 1, 'message': 'file is empty'}]
+
+
+@pytest.mark.parametrize('value, number', [('5000', 5000), ('$5,000', 5000), ('40%', 40), ('1.5', 1.5), ('n/a', None)])
+def test_parse_number(value, number):
+    assert csv_ingest.parse_number(value) == number
+    assert NUMBER[1](value) == (number is not None)
+
+
+def test_procedures_come_from_the_csv(tmp_path):
+    write_csv(tmp_path / 'research_sleep_apnea_procedures.csv', [
+        ['Procedure Name', 'Description', 'Cost Low', 'Cost High', 'Median Cost', 'Insurance Covered'],
+        ['Uvulopalatopharyngoplasty', 'From the research', '$6,000', '$14,000', 'unknown', 'No'],
+        ['Palatal Implants', 'Pillar implants', '$2,000', '$4,000', '$3,000', 'No'],
+    ])
+    reports = {}
+    procedures = {p['id']: p for p in parse_sleep_data.parse_procedures(tmp_path, reports)}
+    curated = {p['id']: p for p in parse_sleep_data.KEY_PROCEDURES}
+
+    uppp = procedures['uppp']
+    assert (uppp['name'], uppp['slug'], uppp['description']) == ('Uvulopalatopharyngoplasty', 'uppp', 'From the research')
+    assert (uppp['cost_low'], uppp['cost_high'], uppp['insurance_covered']) == (6000, 14000, False)
+    # Not a number in the CSV: the curated value is used and reported
+    assert uppp['median_cost'] == curated['uppp']['median_cost']
+    assert uppp['recovery_time'] == curated['uppp']['recovery_time']
+
+    # Researched procedures without a curated entry are published from the CSV alone
+    assert procedures['palatal-implants'] == {
+        'id': 'palatal-implants', 'name': 'Palatal Implants', 'slug': 'palatal-implants',
+        'description': 'Pillar implants', 'cost_low': 2000, 'cost_high': 4000, 'median_cost': 3000,
+        'insurance_covered': False,
+    }
+    # Curated procedures the CSV does not list are kept whole
+    assert procedures['inspire'] == curated['inspire']
+
+    report = reports['research_sleep_apnea_procedures.csv']
+    gaps = report['gaps']
+    assert 'median_cost' in gaps['uppp'] and 'cost_low' not in gaps['uppp']
+    assert 'palatal-implants' not in gaps
+    assert gaps['inspire'] == list(parse_sleep_data.PROCEDURE_COLUMNS)
+    assert {'line': 2, 'message': "Median Cost: expected a number ('unknown')"} in report['warnings']
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+The per-state JSON shards of the directory and locations data.
+
+Expanding the shards with the index's key legend must give back exactly
+the directory and locations data they were cut from, and shards that are
+no longer produced must be deleted.
+
+Usage:
+    python3 -m pytest -q test_data_shards.py
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import data_shards
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'api').mkdir()
+    for path in (data_shards.DIRECTORY_JSON, data_shards.LOCATIONS_JSON):
+        shutil.copy(BASE_DIR / path, tmp_path / path)
+    return tmp_path
+
+
+def load(root, path):
+    with open(root / data_shards.SHARD_DIR / path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_shards_reassemble_the_data(root):
+    data_shards.write_shards(root)
+    index = load(root, data_shards.INDEX_FILE)
+    legend = index.pop('k')
+    assert legend == data_shards.LEGEND
+
+    states, cities, locations = {}, {}, {}
+    paths = {summary['u'] for summary in index['ss'].values()} | set(index['ci'].values())
+    for path in paths:
+        shard = data_shards.expand(load(root, path))
+        states.update(shard.get('states', {}))
+        cities.update(shard.get('cities', {}))
+        locations.update(shard.get('locations', {}))
+
+    directory = json.loads((root / data_shards.DIRECTORY_JSON).read_text(encoding='utf-8'))
+    assert (states, cities) == (directory['states'], directory['cities'])
+    assert locations == json.loads((root / data_shards.LOCATIONS_JSON).read_text(encoding='utf-8'))['locations']
+    # Every city is found through the index
+    for key, path in index['ci'].items():
+        assert key in data_shards.expand(load(root, path))['cities']
+
+
+def test_large_states_are_split_by_city():
+    cities = [{'name': f"City {i}", 'clinics': 5, 'avgPrice': 1000 * i} for i in range(1, 6)]
+    directory = {
+        'states': {'Texas': {'cities': cities}, 'Utah': {'cities': cities[:1]}},
+        'cities': {f"city-{i}": {'state': 'Texas', 'name': f"City {i}"} for i in range(1, 6)}
+                  | {'provo': {'state': 'Utah', 'name': 'Provo'}},
+    }
+    shards = data_shards.build_shards(directory, {'locations': {}})
+    assert shards['texas/city-3.json'] == {'cities': {'city-3': directory['cities']['city-3']}}
+    assert 'cities' not in shards['texas.json']
+    assert shards['utah.json']['cities'] == {'provo': directory['cities']['provo']}
+    index = shards[data_shards.INDEX_FILE]
+    assert index['cities']['city-3'] == 'texas/city-3.json' and index['cities']['provo'] == 'utah.json'
+    assert index['states']['texas'] == {'name': 'Texas', 'cities': 5, 'clinics': 25, 'avgPrice': 3000,
+                                        'providers': 0, 'path': 'texas.json'}
+
+
+def test_stale_shards_are_removed(root):
+    data_shards.write_shards(root)
+    stale = root / data_shards.SHARD_DIR / 'atlantis' / 'old.json'
+    stale.parent.mkdir()
+    stale.write_text('{}', encoding='utf-8')
+    stats = data_shards.write_shards(root)
+    assert stats['removed'] == 1
+    assert not stale.parent.exists()
+
+
+def test_keys_clashing_with_the_legend_are_refused():
+    with pytest.raises(ValueError, match='clash'):
+        data_shards.shard_json({'cities': {'n': {'name': 'A city keyed "n"'}}})
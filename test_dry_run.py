@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Dry-run mode of the HTML rewriters.
+
+A dry run must write nothing under the site root, report the diff and the
+counts of the files the chain would change and the transforms that
+applied but changed nothing, and give the same result on a process pool
+as in a single process.
+
+Usage:
+    python3 -m pytest -q test_dry_run.py
+"""
+
+import itertools
+
+import pytest
+
+import dry_run
+import html_pipeline
+
+_modules = itertools.count()
+
+NAV = '''
+def applies_to(page):
+    return True
+
+def transform(content, page):
+    return content.replace('<nav>old</nav>', '<nav>new</nav>')
+'''
+
+FOOTER = '''
+def applies_to(page):
+    return page['rel'].startswith('blog/')
+
+def transform(content, page):
+    return content.replace('<footer></footer>', '<footer>2026</footer>')
+'''
+
+FAILING = '''
+def applies_to(page):
+    return page['rel'] == 'broken.html'
+
+def transform(content, page):
+    raise ValueError("broken page")
+'''
+
+
+@pytest.fixture
+def make_transform(tmp_path, monkeypatch):
+    """Write a rewriter module and return its name"""
+    module_dir = tmp_path / 'modules'
+    module_dir.mkdir()
+    monkeypatch.syspath_prepend(str(module_dir))
+
+    def make(source):
+        name = f"dry_run_transform_{next(_modules)}"
+        (module_dir / f"{name}.py").write_text(source, encoding='utf-8')
+        return name
+    return make
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / 'site'
+    (root / 'blog').mkdir(parents=True)
+    (root / 'index.html').write_text('<nav>old</nav>\n<p>home</p>\n', encoding='utf-8')
+    (root / 'broken.html').write_text('<nav>old</nav>\n', encoding='utf-8')
+    for i in range(6):
+        (root / 'blog' / f"post-{i}.html").write_text(f"<nav>new</nav>\n<p>{i}</p>\n<footer></footer>",
+                                                      encoding='utf-8')
+    return root
+
+
+def snapshot(root):
+    return {path: path.read_bytes() for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_preview():
+    result = dry_run.preview('a.html', 'one\ntwo\n', 'one\n2\nthree\n', misses=['t'])
+    assert (result['lines_added'], result['lines_removed']) == (2, 1)
+    assert (result['bytes_added'], result['bytes_removed']) == (8, 4)
+    assert result['diff'].startswith('--- a/a.html\n+++ b/a.html\n')
+    assert result['misses'] == ['t']
+    assert dry_run.preview('a.html', 'one', 'two')['diff'].endswith('+two\n\\ No newline at end of file\n')
+    assert dry_run.preview('a.html', 'same', 'same')['changed'] is False
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_nothing_is_written(site, tmp_path, make_transform, workers):
+    before = snapshot(site)
+    names = [make_transform(NAV), make_transform(FOOTER), make_transform(FAILING)]
+    stats = html_pipeline.dry_run_pipeline(names, root=site, workers=workers, diff_out=tmp_path / 'out.diff')
+    assert snapshot(site) == before
+
+    assert (stats['files'], stats['touched'], stats['skipped']) == (8, 7, 0)
+    assert stats['errors'] == [('broken.html', f"{names[2]}: broken page")]
+    # NAV applied to the blog posts without changing them
+    assert stats['misses'] == {names[0]: 6}
+    diff = (tmp_path / 'out.diff').read_text(encoding='utf-8')
+    assert diff.count('+++ b/') == 7 and '-<nav>old</nav>\n+<nav>new</nav>\n' in diff
+
+
+def test_pool_matches_a_single_process(site, tmp_path, make_transform):
+    names = [make_transform(NAV), make_transform(FOOTER)]
+    serial = html_pipeline.dry_run_pipeline(names, root=site, workers=1, diff_out=tmp_path / 'serial.diff')
+    pooled = html_pipeline.dry_run_pipeline(names, root=site, workers=4, diff_out=tmp_path / 'pooled.diff')
+    for stats in (serial, pooled):
+        del stats['seconds'], stats['diff']
+    assert pooled == serial
+    assert (tmp_path / 'pooled.diff').read_text(encoding='utf-8') == \
+        (tmp_path / 'serial.diff').read_text(encoding='utf-8')
+
+
+def test_done_files_are_left_out(site, tmp_path, make_transform):
+    names = [make_transform(NAV)]
+    html_pipeline.run_pipeline(names, root=site)
+    stats = html_pipeline.dry_run_pipeline(names, root=site, diff_out=tmp_path / 'out.diff')
+    assert (stats['files'], stats['skipped']) == (0, 8)
+    assert html_pipeline.dry_run_pipeline(names, root=site, force=True, diff_out=tmp_path / 'out.diff')['files'] == 8
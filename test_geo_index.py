@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+The nearest-provider lookup tables.
+
+Addresses must be located by ZIP, else city, else state; every table must
+list the providers closest to its place, closest first, exactly as a
+brute-force search would; every ZIP3 prefix of a state must have a table;
+and tables no longer produced must be deleted.
+
+Usage:
+    python3 -m pytest -q test_geo_index.py
+"""
+
+import json
+import math
+import random
+
+import pytest
+
+import geo_index
+from validate_providers import ZIP_PREFIXES
+
+GAZETTEER = '''kind,name,state,lat,lng,zip3
+state,Texas,TX,31.0545,-97.5635,
+state,Colorado,CO,39.0598,-105.3111,
+place,Houston,TX,29.7604,-95.3698,770 772
+place,Austin,TX,30.2672,-97.7431,787
+place,Fort Worth|Ft Worth,TX,32.7555,-97.3308,761
+place,Denver,CO,39.7392,-104.9903,802
+'''
+CLINICS = [
+    {'id': 'a', 'name': 'By ZIP', 'city': 'Somewhere', 'state': 'TX', 'address': '1 Main St, Houston, TX 77030'},
+    {'id': 'b', 'name': 'By City', 'city': 'Austin', 'state': 'Texas', 'address': '2 Congress Ave'},
+    {'id': 'c', 'name': 'By Alias', 'city': 'Ft Worth', 'state': 'Texas'},
+    {'id': 'd', 'name': 'By State', 'city': 'Nowhere', 'state': 'Colorado'},
+    {'id': 'e', 'name': 'Unknown', 'city': 'Lima', 'state': 'Ohio'},
+]
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'api').mkdir()
+    (tmp_path / geo_index.GAZETTEER_CSV).write_text(GAZETTEER, encoding='utf-8')
+    (tmp_path / 'api' / 'clinics.json').write_text(json.dumps({'medical_centers': CLINICS}), encoding='utf-8')
+    return tmp_path
+
+
+def load(root, path):
+    return json.loads((root / geo_index.NEARBY_DIR / path).read_text(encoding='utf-8'))
+
+
+def test_geocode(root):
+    gazetteer = geo_index.load_gazetteer(root)
+    houston = gazetteer['places'][('TX', 'houston')]['point']
+    assert geo_index.geocode(gazetteer, 'TX', 'Austin', '1 Main St, Houston, TX 77030') == ('zip', houston)
+    # A ZIP from another state's address is not used
+    assert geo_index.geocode(gazetteer, 'TX', 'Houston', '1 Main St, Denver, CO 80202')[0] == 'city'
+    assert geo_index.geocode(gazetteer, 'TX', 'Ft Worth', '') == geo_index.geocode(gazetteer, 'TX', 'fort worth', None)
+    assert geo_index.geocode(gazetteer, 'CO', 'Nowhere', '')[0] == 'state'
+    assert geo_index.geocode(gazetteer, 'OH', 'Lima', '') is None
+
+
+def test_nearest_points_match_brute_force():
+    rng = random.Random(7)
+    points = [geo_index.unit_vector(rng.uniform(25, 49), rng.uniform(-124, -67)) for _ in range(300)]
+    tree = geo_index.build_tree(list(points))
+    for _ in range(50):
+        target = geo_index.unit_vector(rng.uniform(25, 49), rng.uniform(-124, -67))
+        expected = sorted((math.dist(point, target), point) for point in points)[:10]
+        found = geo_index.nearest_points(tree, target, 10)
+        assert [point for _, point in found] == [point for _, point in expected]
+        assert [distance for distance, _ in found] == pytest.approx([distance for distance, _ in expected])
+
+
+def test_tables(root):
+    stats = geo_index.write_tables(root)
+    assert stats['geocoded'] == {'zip': 1, 'city': 2, 'state': 1, 'unknown': 1}
+
+    houston = load(root, 'zip/770.json')
+    assert (houston['near'], houston['precision'], houston['columns']) == ('Houston, TX', 'city', geo_index.COLUMNS)
+    assert [row[0] for row in houston['providers']] == ['By ZIP', 'By City', 'By Alias', 'By State']
+    assert houston['providers'][0] == ['By ZIP', '/locations/texas/somewhere/by-zip.html', 'Somewhere', 'TX', 0.0]
+    distances = [row[4] for row in houston['providers']]
+    assert distances == sorted(distances) and 140 < distances[1] < 150
+
+    # Aliases share their place's table
+    assert load(root, 'city/tx/ft-worth.json') == load(root, 'city/tx/fort-worth.json')
+    assert load(root, 'state/co.json')['providers'][0][0] == 'By State'
+
+    # Every prefix of a gazetteer state has a table; unlisted ones use the state's
+    for code in ('TX', 'CO'):
+        for low, high in ZIP_PREFIXES[code]:
+            for number in range(low, high + 1):
+                assert (root / geo_index.NEARBY_DIR / 'zip' / f"{number:03d}.json").exists()
+    assert load(root, 'zip/750.json') == load(root, 'state/tx.json')
+    assert not (root / geo_index.NEARBY_DIR / 'zip' / '430.json').exists()
+
+    pages = {'locations/texas/somewhere/by-zip.html', 'locations/texas/austin/by-city.html'}
+    assert geo_index.missing_pages(stats, pages) == ['/locations/colorado/nowhere/by-state.html',
+                                                     '/locations/texas/ft-worth/by-alias.html']
+
+
+def test_stale_tables_are_removed(root):
+    geo_index.write_tables(root)
+    stale = root / geo_index.NEARBY_DIR / 'city' / 'oh' / 'lima.json'
+    stale.parent.mkdir()
+    stale.write_text('{}', encoding='utf-8')
+    assert geo_index.write_tables(root)['removed'] == 1
+    assert not stale.parent.exists()
+
+
+def test_no_providers_no_tables(root):
+    (root / 'api' / 'clinics.json').write_text(json.dumps({'medical_centers': []}), encoding='utf-8')
+    assert geo_index.write_tables(root)['tables'] == 0
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Parity of html_fields with the regex extractor it replaced.
+
+update_usa_clinics.extract_clinic_data must return what the old
+whole-page regexes (legacy_extract_clinic_data, kept here verbatim as the
+reference) returned for every checked-in page.
+
+Usage:
+    python3 -m pytest -q test_html_fields.py
+"""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import update_usa_clinics
+from html_pipeline import find_html_files
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def legacy_extract_clinic_data(filepath):
+    """Extract clinic data from existing HTML file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    data = {}
+
+    # Extract clinic name from title
+    title_match = re.search(r'<title>([^<]+)', content)
+    if title_match:
+        title = title_match.group(1)
+        # Extract clinic name (before " - Stem Cell" or " | ")
+        name_match = re.match(r'([^-|]+)', title)
+        if name_match:
+            data['name'] = name_match.group(1).strip()
+
+    # Extract from JSON-LD if available
+    jsonld_match = re.search(r'<script type="application/ld\+json">\s*(\{.*?\})\s*</script>', content, re.DOTALL)
+    if jsonld_match:
+        try:
+            jsonld = json.loads(jsonld_match.group(1))
+            if '@graph' in jsonld:
+                for item in jsonld['@graph']:
+                    if item.get('@type') and ('MedicalBusiness' in str(item.get('@type')) or 'LocalBusiness' in str(item.get('@type'))):
+                        if 'name' in item:
+                            data['name'] = item['name']
+                        if 'telephone' in item:
+                            data['phone'] = item['telephone']
+                        if 'address' in item and isinstance(item['address'], dict):
+                            addr = item['address']
+                            data['street'] = addr.get('streetAddress', '')
+                            data['city_name'] = addr.get('addressLocality', '')
+                            data['state_name'] = addr.get('addressRegion', '')
+                        if 'priceRange' in item:
+                            data['price_range'] = item['priceRange'].replace('$', '').replace(',', '')
+        except:
+            pass
+
+    # Extract description from meta tag
+    desc_match = re.search(r'<meta name="description" content="([^"]+)"', content)
+    if desc_match:
+        data['meta_description'] = desc_match.group(1)
+
+    # Extract specialty from content
+    specialty_match = re.search(r'<h3[^>]*>Specialty</h3>\s*<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+    if specialty_match:
+        data['specialty'] = specialty_match.group(1).strip()
+    else:
+        # Try to get from meta description
+        if 'meta_description' in data:
+            spec_match = re.search(r'offers? ([^.]+?) in', data['meta_description'])
+            if spec_match:
+                data['specialty'] = spec_match.group(1).strip()
+
+    # Extract about/description text
+    about_match = re.search(r'<h2[^>]*>About[^<]*</h2>\s*<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+    if about_match:
+        data['about'] = about_match.group(1).strip()
+
+    # Extract treatments offered
+    treatments = []
+    treatments_section = re.search(r'<h3[^>]*>Treatments Offered</h3>\s*<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE)
+    if treatments_section:
+        items = re.findall(r'<li>([^<]+)</li>', treatments_section.group(1))
+        treatments = [t.strip() for t in items]
+    data['treatments'] = treatments if treatments else ['Stem Cell Therapy', 'PRP Therapy', 'Regenerative Medicine']
+
+    # Extract conditions treated
+    conditions = []
+    conditions_section = re.search(r'<h3[^>]*>Conditions Treated</h3>\s*<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE)
+    if conditions_section:
+        items = re.findall(r'<li>([^<]+)</li>', conditions_section.group(1))
+        conditions = [c.strip() for c in items]
+    data['conditions'] = conditions if conditions else ['Knee Osteoarthritis', 'Back Pain', 'Shoulder Injuries', 'Hip Pain']
+
+    # Extract price range if not from JSON-LD
+    if 'price_range' not in data:
+        price_match = re.search(r'Price [Rr]ange[^$]*\$([0-9,]+)\s*[-–]\s*\$([0-9,]+)', content)
+        if price_match:
+            data['price_range'] = f"{price_match.group(1)} - {price_match.group(2)}"
+
+    # Extract phone if not from JSON-LD
+    if 'phone' not in data:
+        phone_match = re.search(r'(?:Phone|telephone)[^(]*(\([0-9]{3}\)\s*[0-9]{3}[-.]?[0-9]{4}|\+?[0-9]{1,3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', content, re.IGNORECASE)
+        if phone_match:
+            data['phone'] = phone_match.group(1)
+
+    # Extract address if not from JSON-LD
+    if 'street' not in data:
+        addr_match = re.search(r'<p[^>]*class="[^"]*text-slate-900[^"]*"[^>]*>([^<]+(?:St|Ave|Blvd|Dr|Rd|Way|Lane|Ct|Suite|#)[^<]*)</p>', content)
+        if addr_match:
+            data['street'] = addr_match.group(1).strip()
+
+    # Get slug from filename
+    data['slug'] = filepath.stem
+
+    # Extract other clinics in city
+    other_clinics = []
+    other_section = re.search(r'Other Clinics in.*?<div class="grid[^>]*>(.*?)</div>\s*</div>\s*</div>', content, re.DOTALL | re.IGNORECASE)
+    if other_section:
+        clinic_links = re.findall(r'<a href="([^"]+)"[^>]*>.*?<h3[^>]*>([^<]+)</h3>.*?<p[^>]*>([^<]+)</p>.*?<p[^>]*text-blue[^>]*>([^<]+)</p>', other_section.group(1), re.DOTALL)
+        for link, name, specialty, price in clinic_links:
+            other_clinics.append({
+                'href': link,
+                'name': name.strip(),
+                'specialty': specialty.strip(),
+                'price': price.strip()
+            })
+    data['other_clinics'] = other_clinics
+
+    return data
+
+
+@pytest.mark.parametrize('path', [path.relative_to(BASE_DIR).as_posix() for path in find_html_files(BASE_DIR)])
+def test_matches_legacy_extractor(path):
+    assert update_usa_clinics.extract_clinic_data(BASE_DIR / path) == legacy_extract_clinic_data(BASE_DIR / path)
+
+
+def test_phone_from_jsonld_without_graph(tmp_path):
+    # Provider pages carry their phone only in a flat JSON-LD object
+    page = tmp_path / 'provider.html'
+    page.write_text('''<html><head><title>Penn Sleep Surgery | SleepApneaMatch</title>
+    <script type="application/ld+json">
+    {"@context": "https://schema.org", "@type": "MedicalBusiness", "name": "Penn Sleep Surgery",
+     "telephone": "(215) 349-4182", "priceRange": "$$$"}
+    </script></head><body><h1>Penn Sleep Surgery</h1></body></html>''', encoding='utf-8')
+    data = update_usa_clinics.extract_clinic_data(page)
+    assert data['phone'] == '(215) 349-4182'
+    assert data == legacy_extract_clinic_data(page)
+
+
+def test_price_after_commented_heading(tmp_path):
+    page = tmp_path / 'index.html'
+    page.write_text('''<html><body><!-- Price Range Card -->
+    <div><span class="font-bold">$5,000 - $15,000</span></div></body></html>''', encoding='utf-8')
+    data = update_usa_clinics.extract_clinic_data(page)
+    assert data['price_range'] == '5,000 - 15,000'
+    assert data == legacy_extract_clinic_data(page)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+The single-pass HTML transform pipeline.
+
+run_pipeline must run each file through the transforms that apply to it,
+in chain order, write it only if it changed, leave a file whose transform
+failed untouched and skip files the ledger shows are done.
+
+Usage:
+    python3 -m pytest -q test_html_pipeline.py
+"""
+
+import itertools
+
+import pytest
+
+import html_pipeline
+
+_modules = itertools.count()
+
+
+@pytest.fixture
+def make_transform(tmp_path, monkeypatch):
+    """Write a rewriter module and return its name"""
+    module_dir = tmp_path / 'modules'
+    module_dir.mkdir()
+    monkeypatch.syspath_prepend(str(module_dir))
+
+    def make(source):
+        name = f"pipeline_transform_{next(_modules)}"
+        (module_dir / f"{name}.py").write_text(source, encoding='utf-8')
+        return name
+    return make
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / 'site'
+    (root / 'blog').mkdir(parents=True)
+    (root / 'index.html').write_text('<nav>old</nav>', encoding='utf-8')
+    (root / 'blog' / 'post.html').write_text('<nav>old</nav><p>post</p>', encoding='utf-8')
+    return root
+
+
+NAV = '''
+def applies_to(page):
+    return True
+
+def transform(content, page):
+    return content.replace('<nav>old</nav>', '<nav>new</nav>')
+'''
+
+BLOG_FOOTER = '''
+def applies_to(page):
+    return page['rel'].startswith('blog/')
+
+def transform(content, page):
+    # Sees the output of the transforms before it in the chain
+    assert '<nav>new</nav>' in content
+    return content + '<footer></footer>'
+'''
+
+FAILING = '''
+def applies_to(page):
+    return page['rel'] == 'index.html'
+
+def transform(content, page):
+    raise ValueError("broken page")
+'''
+
+
+def test_transforms_run_in_chain_order(site, make_transform):
+    stats = html_pipeline.run_pipeline([make_transform(NAV), make_transform(BLOG_FOOTER)], root=site)
+    assert (site / 'index.html').read_text(encoding='utf-8') == '<nav>new</nav>'
+    assert (site / 'blog' / 'post.html').read_text(encoding='utf-8') == '<nav>new</nav><p>post</p><footer></footer>'
+    assert (stats['files'], stats['updated'], stats['errors']) == (2, 2, [])
+
+
+def test_done_files_are_skipped(site, make_transform):
+    names = [make_transform(NAV)]
+    html_pipeline.run_pipeline(names, root=site)
+    stats = html_pipeline.run_pipeline(names, root=site)
+    assert (stats['skipped'], stats['updated']) == (2, 0)
+    assert html_pipeline.run_pipeline(names, root=site, force=True)['skipped'] == 0
+
+
+def test_failed_transform_leaves_file_untouched(site, make_transform):
+    stats = html_pipeline.run_pipeline([make_transform(NAV), make_transform(FAILING)], root=site)
+    assert (site / 'index.html').read_text(encoding='utf-8') == '<nav>old</nav>'
+    assert stats['errors'][0][0] == 'index.html'
+    assert stats['updated'] == 1
+
+
+def test_find_html_files_skips_tooling_dirs(site):
+    (site / '.build-cache').mkdir()
+    (site / '.build-cache' / 'cached.html').write_text('', encoding='utf-8')
+    (site / 'node_modules').mkdir()
+    (site / 'node_modules' / 'readme.html').write_text('', encoding='utf-8')
+    files = [path.relative_to(site).as_posix() for path in html_pipeline.find_html_files(site)]
+    assert files == ['index.html', 'blog/post.html']
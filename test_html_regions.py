@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Region splicing in html_regions.
+
+Replacing regions must give what the whole-document regexes it replaced
+gave: lazy, non-overlapping matches, edits resolved like successive
+re.sub calls.
+
+Usage:
+    python3 -m pytest -q test_html_regions.py
+"""
+
+import re
+
+import pytest
+
+from html_regions import index_page, regions, region_text, replace_regions, splice
+
+PAGE = '''<html><body>
+<!-- Navigation -->
+<nav class="top"><a href="/">Home</a></nav>
+<header><h1>Title</h1></header>
+<main>
+<nav id="crumbs">Home / Texas</nav>
+<!-- SEO Content Section -->
+<section>About sleep surgery</section>
+<div class="bg-amber-50 border-l-4 border-amber-400 p-4">Disclaimer</div>
+<a href="tel:+15551234567" class="btn">Call Now</a>
+</main>
+<!-- Footer -->
+<FOOTER class="dark">Old footer</FOOTER>
+</body></html>'''
+
+
+def regex_replace(pattern, text, content):
+    return re.sub(pattern, lambda _: text, content, flags=re.DOTALL | re.IGNORECASE)
+
+
+@pytest.mark.parametrize('name, pattern', [
+    ('nav', r'<nav[^>]*>.*?</nav>'),
+    ('nav_section', r'<!-- Navigation -->.*?</nav>'),
+    ('header', r'<header[^>]*>.*?</header>'),
+    ('footer', r'<footer[^>]*>.*?</footer>'),
+    ('footer_section', r'<!-- Footer -->.*?</footer>'),
+    ('seo', r'<!-- SEO Content Section -->.*?(?=<div class="bg-amber-50 border-l-4 border-amber-400)'),
+    ('lead_form', r'<a href="tel:[^"]*"\s*\n?\s*class="[^"]*"\s*>\s*Call Now\s*</a>'),
+])
+def test_matches_regex(name, pattern):
+    index = index_page(PAGE)
+    assert splice(PAGE, replace_regions(index, name, 'X')) == regex_replace(pattern, 'X', PAGE)
+
+
+def test_regions_do_not_overlap():
+    content = '<nav>a<nav>b</nav>c</nav><nav>d</nav>'
+    index = index_page(content)
+    assert [region_text(index, span) for span in regions(index, 'nav')] == ['<nav>a<nav>b</nav>', '<nav>d</nav>']
+
+
+def test_unterminated_region_is_not_replaced():
+    content = '<footer>open<nav>x</nav>'
+    index = index_page(content)
+    assert regions(index, 'footer') == []
+    assert splice(content, replace_regions(index, 'footer', 'X')) == content
+
+
+def test_several_regions_in_one_splice():
+    index = index_page(PAGE)
+    edits = replace_regions(index, 'header', '<header>New</header>')
+    edits += replace_regions(index, 'footer', '<footer>New</footer>')
+    expected = regex_replace(r'<header[^>]*>.*?</header>', '<header>New</header>', PAGE)
+    expected = regex_replace(r'<footer[^>]*>.*?</footer>', '<footer>New</footer>', expected)
+    assert splice(PAGE, edits) == expected
+
+
+def test_splice_resolves_overlaps_like_successive_subs():
+    content = '0123456789'
+    # The second edit falls inside the first and is dropped
+    assert splice(content, [(2, 6, 'A'), (3, 5, 'B')]) == '01A6789'
+    # The second edit contains the first and replaces it
+    assert splice(content, [(3, 5, 'B'), (2, 6, 'A')]) == '01A6789'
+    # Partly overlapping edits: the first one wins
+    assert splice(content, [(2, 5, 'A'), (4, 7, 'B')]) == '01A56789'
+    # Insertions at a point are kept
+    assert splice(content, [(0, 0, '<'), (10, 10, '>')]) == '<0123456789>'
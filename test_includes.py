@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Include markers for the site-wide partials.
+
+An edited partial must be resolved again in exactly the pages recorded
+with another version of it, with nothing outside its markers changed;
+rewriter edits must keep a page to one marked copy of a block; and records
+streamed through appending() must be read back with the index.
+
+Usage:
+    python3 -m pytest -q test_includes.py
+"""
+
+import pytest
+
+import includes
+import site_partials
+from includes import block, closing, opening
+
+NAV = 'universal_nav'
+FOOTER = 'universal_footer'
+
+
+@pytest.fixture
+def site(tmp_path):
+    pages = {
+        'index.html': f"<head></head>{block(NAV)}<main>home</main>{block(FOOTER)}",
+        'blog/post.html': f"{block(NAV)}<p>post</p>",
+        'about.html': f"{block(FOOTER)}",
+        'plain.html': '<p>no partials</p>',
+    }
+    for rel, content in pages.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+def read(root, rel):
+    return (root / rel).read_text(encoding='utf-8')
+
+
+def test_find_blocks():
+    content = f"a{opening(NAV)}nav{closing(NAV)}b{closing(FOOTER)}{opening(FOOTER)}"
+    assert includes.find_blocks(content) == [(NAV, 1, 1 + len(opening(NAV)), 4 + len(opening(NAV)),
+                                               4 + len(opening(NAV)) + len(closing(NAV)))]
+    assert includes.included(content) == {NAV: includes.text_version('nav')}
+    twice = f"{opening(NAV)}a{closing(NAV)}{opening(NAV)}b{closing(NAV)}"
+    assert includes.included(twice) == {NAV: 'mixed'}
+    assert includes.outside_blocks(f"</style>{opening(NAV)}</style>{closing(NAV)}", '</style>') == [0]
+
+
+def test_edited_partial_is_resolved_in_its_pages(site, monkeypatch):
+    index = {}
+    includes.scan(site, index)
+    assert sorted(index) == ['about.html', 'blog/post.html', 'index.html']
+    assert includes.update_pages(site, index)['stale'] == 0
+
+    monkeypatch.setitem(site_partials.PARTIALS, NAV, '<nav>edited</nav>')
+    assert includes.stale_pages(index) == ['blog/post.html', 'index.html']
+    about = read(site, 'about.html')
+    stats = includes.update_pages(site, index)
+    assert (stats['stale'], stats['updated'], stats['missing']) == (2, 2, 0)
+    assert read(site, 'index.html') == \
+        f"<head></head>{opening(NAV)}<nav>edited</nav>{closing(NAV)}<main>home</main>{block(FOOTER)}"
+    assert read(site, 'blog/post.html') == f"{opening(NAV)}<nav>edited</nav>{closing(NAV)}<p>post</p>"
+    assert read(site, 'about.html') == about
+    assert includes.stale_pages(index) == []
+
+
+def test_missing_pages_are_forgotten(site, monkeypatch):
+    index = {}
+    includes.scan(site, index)
+    (site / 'blog' / 'post.html').unlink()
+    monkeypatch.setitem(site_partials.PARTIALS, NAV, '<nav>edited</nav>')
+    assert includes.update_pages(site, index)['missing'] == 1
+    assert 'blog/post.html' not in index
+
+
+def test_widen():
+    content = f"<body>{block(NAV)}</body>"
+    _, start, inner_start, inner_end, end = includes.find_blocks(content)[0]
+    # Replacing the block's whole text replaces the block with its markers
+    assert includes.widen(content, [(inner_start, inner_end, '<nav>x</nav>')]) == [(start, end, '<nav>x</nav>')]
+    # An edit inside the block drops the markers
+    widened = includes.widen(content, [(inner_start + 1, inner_start + 2, 'x')])
+    assert sorted(widened) == [(start, inner_start, ''), (inner_start + 1, inner_start + 2, 'x'),
+                               (inner_end, end, '')]
+    # Edits outside blocks are left alone
+    assert includes.widen(content, [(0, 6, '<body class="x">')]) == [(0, 6, '<body class="x">')]
+
+
+def test_record_and_save(site, monkeypatch):
+    index = {}
+    includes.record_partials(index, 'index.html', [FOOTER, NAV])
+    assert index == {'index.html': {FOOTER: includes.partial_versions()[FOOTER],
+                                    NAV: includes.partial_versions()[NAV]}}
+    includes.record_partials(index, 'index.html', [])
+    assert index == {}
+    includes.record(index, 'plain.html', '<p></p>')
+    assert index == {}
+
+    includes.save_index(site, {'index.html': {NAV: 'old'}})
+    with includes.appending(site) as add:
+        add('blog/post.html', [NAV])
+        add('index.html', [])
+    assert includes.load_index(site) == {'blog/post.html': {NAV: includes.partial_versions()[NAV]}}
+    includes.save_index(site, includes.load_index(site))
+    assert not includes.log_path(site).exists()
+
+    with pytest.raises(KeyboardInterrupt):
+        with includes.appending(site) as add:
+            add('about.html', [FOOTER])
+            raise KeyboardInterrupt
+    assert 'about.html' not in includes.load_index(site)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+The per-location aggregates shared by pages, JSON-LD and data.json.
+
+Counts, prices and procedure coverage must match a direct count over the
+providers, and the table must be recomputed when the providers or the
+procedure catalogue change.
+
+Usage:
+    python3 -m pytest -q test_location_stats.py
+"""
+
+import json
+import os
+
+import pytest
+
+import location_stats
+
+CATALOGUE = [
+    {'id': 'uppp', 'slug': 'uppp', 'cost_low': 5000, 'cost_high': 15000},
+    {'id': 'inspire', 'slug': 'inspire', 'cost_low': 30000, 'cost_high': 65000},
+]
+CLINICS = {
+    'medical_centers': [
+        {'id': 'c1', 'name': 'A', 'city': 'Houston', 'state': 'TX', 'inspire_certified': True,
+         'procedures_offered': 'Inspire therapy, UPPP'},
+        {'id': 'c2', 'name': 'B', 'city': 'Austin', 'state': 'Texas', 'procedures_offered': 'UPPP',
+         'priceRange': '$4,000 - $8,000'},
+    ],
+    'independent_clinics': [
+        {'id': 'i1', 'name': 'C', 'city': 'Houston', 'state': 'Texas', 'procedures_offered': 'Balloon sinuplasty'},
+        {'id': 'i2', 'name': 'D', 'city': 'Denver', 'state': 'Colorado', 'inspire_certified': True,
+         'procedures_offered': 'Hypoglossal nerve stimulation'},
+    ],
+}
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    # A distinct mtime even on coarse-grained file systems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'api').mkdir()
+    write_json(tmp_path / 'api' / 'clinics.json', CLINICS)
+    write_json(tmp_path / 'api' / 'procedures.json', {'procedures': CATALOGUE})
+    return tmp_path
+
+
+def test_aggregates(root):
+    scopes = location_stats.load_stats(root)['scopes']
+    texas = scopes['medical_centers']['states']['Texas']
+    assert (texas['providers'], texas['inspire_certified'], texas['city_count']) == (2, 1, 2)
+    # Houston's center has no price of its own: its procedures' catalogue costs are used
+    assert texas['cities']['Houston']['price'] == {'low': 5000, 'median': 35000, 'high': 65000}
+    assert texas['cities']['Austin']['price'] == {'low': 4000, 'median': 6000, 'high': 8000}
+    assert texas['price'] == {'low': 4000, 'median': 20500, 'high': 65000}
+    assert texas['procedures'] == {'inspire': 1, 'uppp': 2}
+
+    combined = scopes['sleep_providers']
+    assert (combined['providers'], combined['state_count'], combined['city_count']) == (4, 2, 3)
+    assert combined['states']['Texas']['cities']['Houston']['providers'] == 2
+    # No catalogue procedure and no price range
+    assert scopes['independent_clinics']['states']['Texas']['price'] is None
+    assert combined['procedures'] == {'inspire': 2, 'uppp': 2}
+
+
+def test_recomputed_when_the_data_changes(root):
+    version = location_stats.data_version(root)
+    assert location_stats.data_version(root) == version
+
+    clinics = dict(CLINICS, independent_clinics=CLINICS['independent_clinics'][:1])
+    write_json(root / 'api' / 'clinics.json', clinics)
+    assert location_stats.load_stats(root)['scopes']['sleep_providers']['providers'] == 3
+    assert location_stats.data_version(root) != version
+
+    version = location_stats.data_version(root)
+    write_json(root / 'api' / 'procedures.json', {'procedures': [dict(CATALOGUE[0], cost_low=3000), CATALOGUE[1]]})
+    cities = location_stats.load_stats(root)['scopes']['medical_centers']['states']['Texas']['cities']
+    assert cities['Houston']['price'] == {'low': 3000, 'median': 34000, 'high': 65000}
+    # Its own price range wins over the catalogue
+    assert cities['Austin']['price'] == {'low': 4000, 'median': 6000, 'high': 8000}
+    assert location_stats.data_version(root) != version
+
+
+@pytest.mark.parametrize('text, price', [('$4,000 - $8,000', (4000, 8000)), ('From $ 12,500', (12500, 12500)),
+                                         ('Contact for pricing', None), (None, None)])
+def test_price_range(text, price):
+    assert location_stats.price_range(text) == price
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+The write-if-changed output layer.
+
+An unchanged file must keep its mtime, changed files are replaced
+atomically (no temp files left behind, mode kept) and every write is
+counted by status.
+
+Usage:
+    python3 -m pytest -q test_output_writer.py
+"""
+
+import os
+
+import pytest
+
+from output_writer import format_write_stats, new_write_stats, write_chunks_if_changed, write_if_changed
+
+
+def write_chunks(path, content, stats=None):
+    # Split mid-way through a multi-byte character to check chunks are joined as bytes
+    data = content.encode('utf-8')
+    return write_chunks_if_changed(path, [data[:5], data[5:], ''], stats)
+
+
+@pytest.mark.parametrize('write', [write_if_changed, write_chunks])
+def test_statuses(tmp_path, write):
+    path = tmp_path / 'locations' / 'index.html'
+    stats = new_write_stats()
+    assert write(path, '<p>São Paulo</p>', stats) == 'new'
+    assert write(path, '<p>São Paulo</p>', stats) == 'unchanged'
+    assert write(path, '<p>Rio</p>', stats) == 'changed'
+    assert path.read_text(encoding='utf-8') == '<p>Rio</p>'
+    assert stats == {'new': {'files': 1, 'bytes': 17}, 'changed': {'files': 1, 'bytes': 10},
+                     'unchanged': {'files': 1, 'bytes': 17}}
+    assert os.listdir(path.parent) == ['index.html']
+
+
+@pytest.mark.parametrize('write', [write_if_changed, write_chunks])
+def test_unchanged_file_is_not_touched(tmp_path, write):
+    path = tmp_path / 'page.html'
+    path.write_text('<p>same</p>', encoding='utf-8')
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert write(path, '<p>same</p>') == 'unchanged'
+    assert path.stat().st_mtime_ns == 1_000_000_000
+
+
+@pytest.mark.parametrize('write', [write_if_changed, write_chunks])
+def test_same_size_change_is_detected(tmp_path, write):
+    path = tmp_path / 'page.html'
+    path.write_text('<p>aaa</p>', encoding='utf-8')
+    assert write(path, '<p>bbb</p>') == 'changed'
+    assert path.read_text(encoding='utf-8') == '<p>bbb</p>'
+
+
+@pytest.mark.parametrize('write', [write_if_changed, write_chunks])
+def test_changed_file_keeps_its_mode(tmp_path, write):
+    path = tmp_path / 'deploy.sh'
+    path.write_text('echo old', encoding='utf-8')
+    path.chmod(0o755)
+    write(path, 'echo new')
+    assert path.stat().st_mode & 0o777 == 0o755
+
+
+def test_bytes_content(tmp_path):
+    path = tmp_path / 'image.webp'
+    assert write_if_changed(path, b'\x00\xff') == 'new'
+    assert path.read_bytes() == b'\x00\xff'
+
+
+def test_format_write_stats():
+    stats = new_write_stats()
+    stats['new'] = {'files': 2, 'bytes': 14438}
+    stats['unchanged'] = {'files': 85, 'bytes': 512}
+    assert format_write_stats(stats) == 'New: 2 (14.1 KB), Changed: 0 (0 B), Unchanged: 85 (512 B)'
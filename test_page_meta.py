@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+The page metadata index.
+
+Saving a generator's entries must replace exactly that generator's pages,
+entries streamed through appending() must be read back with the index and
+folded into it by the next save, an interrupted stream must leave the
+index as it was, and a changed index must be re-read.
+
+Usage:
+    python3 -m pytest -q test_page_meta.py
+"""
+
+import pytest
+
+import page_meta
+from build_graph import page_job
+
+HOUSTON = 'locations/texas/houston/houston-methodist.html'
+AUSTIN = 'locations/texas/austin/index.html'
+
+
+def render_page(name):
+    return name
+
+
+def page(generator, entity='e1', template='0123456789abcdef'):
+    return page_meta.entry(entity, generator, template, {'name': entity})
+
+
+def test_provider_fields():
+    record = {'name': 'Houston Methodist', 'phone': '', 'address': None, 'specializations': 'Inspire',
+              'priceRange': '$4,000 - $8,000'}
+    assert page_meta.provider_fields(record, 'Houston', 'TX') == {
+        'name': 'Houston Methodist', 'city': 'Houston', 'state': 'Texas', 'specialty': 'Inspire',
+        'price_low': 4000, 'price_high': 8000,
+    }
+
+
+def test_job_entry():
+    job = page_job(HOUSTON, render_page, ('x',), {}, entity='center-1', fields={'name': 'x'})
+    job['generator'] = 'regenerate_locations'
+    template = job['deps'][f"template:{__name__}.render_page"]
+    assert page_meta.job_entry(job) == {'entity': 'center-1', 'generator': 'regenerate_locations',
+                                        'template': template[:page_meta.TEMPLATE_DIGEST], 'fields': {'name': 'x'}}
+    assert page_meta.job_entry(dict(job, entity=None)) is None
+
+
+def test_save_replaces_the_generators_entries(tmp_path):
+    assert page_meta.load_index(tmp_path) == {}
+    page_meta.save_index(tmp_path, ['a', 'b'], {HOUSTON: page('a'), AUSTIN: page('b'), 'x.html': page('b')})
+    assert page_meta.save_index(tmp_path, ['b'], {AUSTIN: page('b', 'e2')}) == 'changed'
+    assert page_meta.load_index(tmp_path) == {HOUSTON: page('a'), AUSTIN: page('b', 'e2')}
+    assert page_meta.save_index(tmp_path, ['b'], {AUSTIN: page('b', 'e2')}) == 'unchanged'
+    assert page_meta.fields({'root': tmp_path, 'rel': AUSTIN}) == {'name': 'e2'}
+    assert page_meta.fields({'root': tmp_path, 'rel': 'unknown.html'}) is None
+
+
+def test_appended_entries(tmp_path):
+    page_meta.save_index(tmp_path, ['a', 'b'], {HOUSTON: page('a'), AUSTIN: page('b')})
+    version = page_meta.data_version(tmp_path)
+    with page_meta.appending(tmp_path, ['b']) as add:
+        add('new.html', page('b', 'e3'))
+    expected = {HOUSTON: page('a'), 'new.html': page('b', 'e3')}
+    assert page_meta.load_index(tmp_path) == expected
+    assert page_meta.data_version(tmp_path) != version
+
+    # The next save folds the log into the index
+    page_meta.save_index(tmp_path, [], {})
+    assert not page_meta.log_path(tmp_path).exists()
+    assert page_meta.read_index(tmp_path) == expected
+
+
+def test_interrupted_append_leaves_the_index(tmp_path):
+    page_meta.save_index(tmp_path, ['a'], {HOUSTON: page('a')})
+    with pytest.raises(KeyboardInterrupt):
+        with page_meta.appending(tmp_path, ['a']) as add:
+            add('new.html', page('a', 'e3'))
+            raise KeyboardInterrupt
+    assert page_meta.load_index(tmp_path) == {HOUSTON: page('a')}
+    assert list(page_meta.meta_path(tmp_path).parent.iterdir()) == [page_meta.meta_path(tmp_path)]
+
+
+def test_other_version_is_ignored(tmp_path, monkeypatch):
+    page_meta.save_index(tmp_path, ['a'], {HOUSTON: page('a')})
+    monkeypatch.setattr(page_meta, 'META_VERSION', page_meta.META_VERSION + 1)
+    assert page_meta.read_index(tmp_path) == {}
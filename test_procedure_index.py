@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Canonical procedure IDs for the free-text procedure lists.
+
+Aliases must match as whole words, misspellings of the long aliases must
+still match while different procedures with similar names must not, and
+the EXCLUDED phrases must not count for the procedure they resemble.
+
+Usage:
+    python3 -m pytest -q test_procedure_index.py
+"""
+
+import pytest
+
+from procedure_index import canonical_procedures, canonicalize, split_terms
+
+
+@pytest.mark.parametrize('value, procedures', [
+    ('Nasal surgery (septoplasty, turbinate reduction), UPPP', ['septoplasty', 'turbinate-reduction', 'uppp']),
+    ('Inspire therapy; Hypoglossal Nerve Stimulation, MMA', ['inspire', 'mma']),
+    ('Jaw surgery [bimaxillary advancement], T&A', ['mma', 'tonsillectomy']),
+    (['TORS', 'Transoral robotic surgery', 'UPPP'], ['tors', 'uppp']),
+    ('CPAP titration, oral appliances', []),
+    ('', []),
+    (None, []),
+])
+def test_canonical_procedures(value, procedures):
+    assert canonical_procedures(value) == procedures
+
+
+def test_split_terms():
+    assert split_terms('Nasal surgery (Septoplasty,  turbinate-reduction); septoplasty') == \
+        ['nasal surgery', 'septoplasty', 'turbinate reduction']
+
+
+@pytest.mark.parametrize('term, procedures', [
+    ('uvulopalatopharyngoplasy', ('uppp',)),
+    ('Uvulopalatopharingoplasty (modified)', ('uppp',)),
+    ('hypoglosal nerve stimulation', ('inspire',)),
+    ('maxilomandibular advancement', ('mma',)),
+])
+def test_misspellings_match(term, procedures):
+    assert canonicalize(term) == procedures
+
+
+def test_similar_procedures_do_not_match():
+    # A different palate operation, just under the cutoff
+    assert canonicalize('palatopharyngoplasty') == ()
+    assert canonicalize('expansion sphincter pharyngoplasty') == ()
+
+
+@pytest.mark.parametrize('term', ['mmx', 'tor', 'upp', 'inspired', 'inspir'])
+def test_short_aliases_are_exact_only(term):
+    assert canonicalize(term) == ()
+
+
+def test_excluded_phrases():
+    assert canonicalize('lingual tonsillectomy') == ()
+    assert canonicalize('Lingual Tonsillectomy with tongue advancement') == ('genioglossus-advancement',)
+    # The procedure is still found when named on its own
+    assert canonicalize('tonsillectomy and lingual tonsillectomy') == ('tonsillectomy',)
+    assert canonical_procedures('Lingual tonsillectomy, tonsillectomy') == ['tonsillectomy']
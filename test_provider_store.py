@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+The indexed SQLite provider store.
+
+Queries must return the api/clinics.json records they match, in source
+order (or state/city order when grouped), and the store must be rebuilt
+when the data it was built from changes.
+
+Usage:
+    python3 -m pytest -q test_provider_store.py
+"""
+
+import json
+import os
+
+import pytest
+
+import provider_store
+
+CLINICS = {
+    'medical_centers': [
+        {'id': 'center-1', 'name': 'Houston Methodist Sleep Center', 'slug': 'houston-methodist',
+         'city': 'Houston', 'state': 'TX', 'inspire_certified': True,
+         'procedures_offered': 'Inspire therapy, UPPP'},
+        {'id': 'center-2', 'name': 'Stanford Sleep Surgery', 'slug': 'stanford-sleep-surgery',
+         'city': 'Redwood City', 'state': 'California', 'inspire_certified': False,
+         'procedures_offered': 'Maxillomandibular advancement, septoplasty'},
+    ],
+    'independent_clinics': [
+        {'id': 'clinic-1', 'name': 'Austin ENT', 'slug': 'austin-ent-old', 'city': 'Austin', 'state': 'Texas',
+         'inspire_certified': True, 'procedures_offered': 'Nasal surgery (septoplasty, turbinate reduction)'},
+        {'id': 'clinic-2', 'name': 'Bayou Sinus', 'city': 'Houston', 'state': 'Texas',
+         'procedures_offered': 'Balloon sinuplasty'},
+    ],
+}
+
+
+def write_clinics(root, data):
+    (root / 'api').mkdir(exist_ok=True)
+    (root / 'api' / 'clinics.json').write_text(json.dumps(data), encoding='utf-8')
+
+
+@pytest.fixture
+def root(tmp_path):
+    write_clinics(tmp_path, CLINICS)
+    return tmp_path
+
+
+def ids(records):
+    return [record['id'] for record in records]
+
+
+def test_filters(root):
+    assert ids(provider_store.iter_providers(root)) == ['center-1', 'center-2', 'clinic-1', 'clinic-2']
+    # State abbreviations are stored and queried by the full name
+    assert ids(provider_store.iter_providers(root, state='TX')) == ['center-1', 'clinic-1', 'clinic-2']
+    assert ids(provider_store.iter_providers(root, state='Texas', city='Houston')) == ['center-1', 'clinic-2']
+    assert ids(provider_store.iter_providers(root, inspire_certified=True)) == ['center-1', 'clinic-1']
+    assert ids(provider_store.iter_providers(root, source=['independent_clinics'])) == ['clinic-1', 'clinic-2']
+    assert ids(provider_store.iter_providers(root, procedure='septoplasty')) == ['center-2', 'clinic-1']
+    # Free text is canonicalized to procedure IDs
+    assert ids(provider_store.iter_providers(root, procedure='jaw surgery')) == ['center-2']
+    assert ids(provider_store.iter_providers(root, procedure='no such procedure')) == []
+
+
+def test_records_are_returned_as_stored(root):
+    assert list(provider_store.iter_providers(root, source='medical_centers')) == CLINICS['medical_centers']
+
+
+def test_iter_cities(root):
+    cities = [(state, city, ids(records)) for state, city, records in provider_store.iter_cities(root)]
+    assert cities == [
+        ('California', 'Redwood City', ['center-2']),
+        ('Texas', 'Austin', ['clinic-1']),
+        ('Texas', 'Houston', ['center-1', 'clinic-2']),
+    ]
+
+
+def test_procedure_locations(root):
+    index = provider_store.procedure_locations(root)
+    assert index['septoplasty'] == {'California': {'Redwood City': ['center-2']}, 'Texas': {'Austin': ['clinic-1']}}
+    assert index['inspire'] == {'Texas': {'Houston': ['center-1']}}
+    assert 'balloon-sinuplasty' not in index
+
+
+def test_lookups(root):
+    assert provider_store.get_provider('clinic-2', root)['name'] == 'Bayou Sinus'
+    assert provider_store.get_provider('missing', root) is None
+    assert provider_store.find_provider('texas', 'houston', 'houston-methodist', root)['id'] == 'center-1'
+    # Independent clinics are published under slugify(name), not their record's slug
+    assert provider_store.find_provider('texas', 'austin', 'austin-ent', root)['id'] == 'clinic-1'
+    assert provider_store.find_provider('texas', 'austin', 'austin-ent-old', root) is None
+
+
+def test_rebuilt_when_the_data_changes(root):
+    assert provider_store.update_store(root) is True
+    assert provider_store.update_store(root) is False
+
+    changed = {**CLINICS, 'independent_clinics': CLINICS['independent_clinics'][:1]}
+    write_clinics(root, changed)
+    clinics_json = root / 'api' / 'clinics.json'
+    stat = clinics_json.stat()
+    os.utime(clinics_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert ids(provider_store.iter_providers(root)) == ['center-1', 'center-2', 'clinic-1']
+
+
+def test_missing_data_gives_an_empty_store(tmp_path):
+    assert list(provider_store.iter_providers(tmp_path)) == []
+
+
+@pytest.mark.parametrize('source', sorted(provider_store.MODULE_SOURCES))
+def test_stem_cell_tables_are_opt_in(root, source):
+    groups = list(provider_store.city_groups(source))
+    assert groups and all(city_data['clinics'] is not None for _, _, _, city_data in groups)
+    assert ids(provider_store.iter_providers(root, source=source)) == []
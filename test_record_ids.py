@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Stable, content-addressed record IDs.
+
+A record's ID must depend on its natural key only, so adding, removing or
+reordering CSV rows leaves the other records' IDs alone, and changed IDs
+must be paired into migrations by key or, for a renamed record, by its
+address and phone.
+
+Usage:
+    python3 -m pytest -q test_record_ids.py
+"""
+
+import csv
+import json
+
+import parse_sleep_data
+from record_ids import ID_MIGRATIONS, assign_id, find_migrations, merge_migrations, record_key, resolve, stable_id
+
+HEADER = ['Center Name', 'City', 'State', 'Address', 'Phone']
+CENTERS = [
+    ['Stanford Sleep Surgery', 'Redwood City', 'California', '450 Broadway', '650-723-6601'],
+    ['Penn Sleep Surgery', 'Philadelphia', 'Pennsylvania', '800 Walnut St', '215-349-4182'],
+    ['Houston Methodist', 'Houston', 'TX', '6550 Fannin St', '713-790-3333'],
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+
+def center_ids(tmp_path, rows):
+    write_csv(tmp_path / 'research_medical_centers.csv', [HEADER] + rows)
+    return {center['name']: center['id'] for center in parse_sleep_data.parse_medical_centers(tmp_path, {})}
+
+
+def test_ids_do_not_depend_on_row_order(tmp_path):
+    ids = center_ids(tmp_path, CENTERS)
+    assert center_ids(tmp_path, CENTERS[::-1]) == ids
+    # A new first row leaves the others' IDs alone
+    added = center_ids(tmp_path, [['New Clinic', 'Austin', 'Texas', '', '']] + CENTERS)
+    assert {name: added[name] for name in ids} == ids
+
+
+def test_key_is_normalized():
+    assert record_key(' Houston  Methodist ', 'HOUSTON', 'Texas') == record_key('houston methodist', 'Houston', 'texas')
+    assert stable_id('center', record_key('a', 'b')) != stable_id('center', record_key('a b'))
+    # State abbreviations give the same provider key as the full name
+    center = {'name': 'Houston Methodist', 'city': 'Houston'}
+    assert parse_sleep_data.provider_key(dict(center, state='TX')) == \
+        parse_sleep_data.provider_key(dict(center, state='Texas'))
+
+
+def test_duplicate_keys_get_suffixes():
+    ids = {}
+    first = assign_id(ids, 'faq', 'same question')
+    assert assign_id(ids, 'faq', 'same question') == f"{first}-2"
+    assert assign_id(ids, 'faq', 'same question') == f"{first}-3"
+
+
+def test_migrations_pair_by_key_then_secondary_key():
+    previous = [
+        ('stanford', 'center-1', 'addr-1'),
+        ('penn', 'center-2', 'addr-2'),
+        ('old name', 'center-3', 'addr-3'),
+        ('gone', 'center-4', 'addr-4'),
+        ('twin a', 'center-5', 'shared'),
+        ('twin b', 'center-6', 'shared'),
+    ]
+    current = [
+        ('stanford', 'center-1', 'addr-1'),
+        ('penn', 'center-2b', 'addr-2'),
+        ('new name', 'center-3b', 'addr-3'),
+        ('twin c', 'center-7', 'shared'),
+        ('unknown', 'center-8', None),
+    ]
+    # Renames sharing a secondary key are ambiguous and not paired; removed records are left out
+    assert find_migrations(previous, current) == {'center-2': 'center-2b', 'center-3': 'center-3b'}
+
+
+def test_merged_migrations_point_at_the_current_id():
+    merged = merge_migrations({'a': 'b', 'x': 'y'}, {'b': 'c', 'y': 'x'})
+    assert merged == {'a': 'c', 'b': 'c', 'y': 'x'}
+    assert resolve(merged, 'a') == 'c'
+    assert resolve(merged, 'unchanged') == 'unchanged'
+
+
+def test_renamed_provider_is_migrated(tmp_path):
+    research, output = tmp_path / 'research', tmp_path / 'site' / 'api'
+    research.mkdir()
+    write_csv(research / 'research_independent_clinics.csv', [['Clinic Name', 'City', 'State']])
+    write_csv(research / 'research_sleep_apnea_procedures.csv', [['Procedure Name']])
+    write_csv(research / 'research_faqs.csv', [['Question', 'Answer']])
+    write_csv(research / 'research_clinical_studies.csv', [['Study Name']])
+    args = ['--research-dir', str(research), '--output-dir', str(output)]
+
+    write_csv(research / 'research_medical_centers.csv', [HEADER] + CENTERS)
+    parse_sleep_data.main(args)
+    before = center_ids(research, CENTERS)
+
+    renamed = [['Penn Medicine Sleep Surgery'] + CENTERS[1][1:]] + CENTERS[:1] + CENTERS[2:]
+    write_csv(research / 'research_medical_centers.csv', [HEADER] + renamed)
+    parse_sleep_data.main(args)
+    after = center_ids(research, renamed)
+
+    migrations = json.loads((output / ID_MIGRATIONS).read_text(encoding='utf-8'))['migrations']
+    assert migrations == {before['Penn Sleep Surgery']: after['Penn Medicine Sleep Surgery']}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+The slug registry and its redirects.
+
+A registered name must keep its slug, a colliding name must get a
+suffixed slug and be reported, and every slug change must leave a 301
+from the old URL in the generated block of _redirects.
+
+Usage:
+    python3 -m pytest -q test_slugs.py
+"""
+
+import json
+
+import pytest
+
+import provider_store
+import slugs
+from slugs import REDIRECTS_BEGIN, REDIRECTS_END, load_registry, save_registry, slug_for, slugify, write_redirects
+
+SCOPE = 'locations/texas/houston'
+
+
+@pytest.mark.parametrize('text, slug', [
+    ('Houston ENT & Allergy', 'houston-ent-allergy'),
+    ("  St. Luke's  Sleep Center ", 'st-lukes-sleep-center'),
+    ('Winston-Salem', 'winston-salem'),
+    ('--', ''),
+])
+def test_slugify(text, slug):
+    assert slugify(text) == slug
+
+
+def test_registered_slugs_are_kept(tmp_path, monkeypatch):
+    registry = load_registry(tmp_path)
+    assert slug_for(registry, SCOPE, 'Houston ENT & Allergy') == 'houston-ent-allergy'
+    save_registry(registry)
+
+    # A later change to slugify() does not move registered pages
+    monkeypatch.setattr(slugs, 'unique_slug', lambda *args: 'changed')
+    reloaded = load_registry(tmp_path)
+    assert slug_for(reloaded, SCOPE, 'Houston ENT & Allergy') == 'houston-ent-allergy'
+
+
+def test_collisions_are_suffixed_per_scope(tmp_path):
+    registry = load_registry(tmp_path)
+    assert slug_for(registry, SCOPE, 'Sleep Center') == 'sleep-center'
+    assert slug_for(registry, SCOPE, 'Sleep  Center!') == 'sleep-center-2'
+    assert slug_for(registry, SCOPE, 'Sleep Center?') == 'sleep-center-3'
+    assert slug_for(registry, 'locations/texas/austin', 'Sleep Center!') == 'sleep-center'
+    assert [(c['name'], c['slug'], c['taken_by']) for c in registry['collisions']] == [
+        ('Sleep  Center!', 'sleep-center-2', 'Sleep Center'),
+        ('Sleep Center?', 'sleep-center-3', 'Sleep Center'),
+    ]
+
+
+def test_previous_urls_are_redirected(tmp_path):
+    registry = load_registry(tmp_path)
+    slug_for(registry, SCOPE, 'Houston ENT & Allergy',
+             previous_urls=['/locations/texas/houston/houston-ent-and-allergy.html',
+                            '/locations/texas/houston/houston-ent-allergy.html'])
+    assert registry['redirects'] == {
+        '/locations/texas/houston/houston-ent-and-allergy.html': '/locations/texas/houston/houston-ent-allergy.html',
+    }
+
+
+def test_refresh_chains_redirects(tmp_path):
+    registry = load_registry(tmp_path)
+    registry['scopes'][SCOPE] = {'Houston ENT': 'old-slug'}
+    slugs.add_redirect(registry, '/locations/texas/houston/older-slug.html', '/locations/texas/houston/old-slug.html')
+    assert slugs.refresh_slugs(registry) == 1
+    assert registry['scopes'][SCOPE] == {'Houston ENT': 'houston-ent'}
+    # Every old URL goes straight to the current one
+    assert registry['redirects'] == {
+        '/locations/texas/houston/older-slug.html': '/locations/texas/houston/houston-ent.html',
+        '/locations/texas/houston/old-slug.html': '/locations/texas/houston/houston-ent.html',
+    }
+
+
+def test_write_redirects_keeps_hand_written_rules(tmp_path):
+    (tmp_path / '_redirects').write_text('/old-blog  /blog/  301\n', encoding='utf-8')
+    registry = load_registry(tmp_path)
+    slugs.add_redirect(registry, '/a.html', '/b.html')
+    write_redirects(registry, tmp_path)
+    expected = f"/old-blog  /blog/  301\n\n{REDIRECTS_BEGIN}\n/a.html  /b.html  301\n{REDIRECTS_END}\n"
+    assert (tmp_path / '_redirects').read_text(encoding='utf-8') == expected
+
+    # Rewriting replaces the generated block only
+    slugs.add_redirect(registry, '/c.html', '/d.html')
+    write_redirects(registry, tmp_path)
+    text = (tmp_path / '_redirects').read_text(encoding='utf-8')
+    assert text.startswith('/old-blog  /blog/  301\n\n')
+    assert text.count(REDIRECTS_BEGIN) == 1 and '/c.html  /d.html  301' in text
+
+
+def test_no_redirects_file_without_redirects(tmp_path):
+    assert write_redirects(load_registry(tmp_path), tmp_path) == 'unchanged'
+    assert not (tmp_path / '_redirects').exists()
+
+
+def test_store_links_to_the_registered_slug(tmp_path):
+    api = tmp_path / 'api'
+    api.mkdir()
+    clinic = {'id': 'clinic-1', 'name': 'Houston ENT & Allergy', 'slug': 'stale-record-slug',
+              'city': 'Houston', 'state': 'TX'}
+    (api / 'clinics.json').write_text(json.dumps({'independent_clinics': [clinic]}), encoding='utf-8')
+    registry = load_registry(api)
+    registry['scopes'][SCOPE] = {'Houston ENT & Allergy': 'houston-ent-allergy-2'}
+    save_registry(registry)
+    assert [path for _, path in provider_store.iter_provider_pages(tmp_path)] == \
+        [('texas', 'houston', 'houston-ent-allergy-2')]
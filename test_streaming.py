@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Streaming, memory-bounded page generation.
+
+iter_json_arrays must yield what json.load gives, whatever the read
+buffer size, and regenerate_locations.stream_pages must write the same
+location pages as the incremental build.
+
+Usage:
+    python3 -m pytest -q test_streaming.py
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import build
+import regenerate_locations
+import streaming
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DATA = {
+    'meta': {'version': '1.0', 'nested': [1, {'a': [2, 3]}]},
+    'medical_centers': [
+        {'name': 'Stanford Sleep Surgery', 'city': 'Redwood City', 'rating': 4.85, 'tags': ['inspire', 'mma']},
+        {'name': 'Café "Sleep" Clinic', 'city': 'São Paulo', 'patients': 123456789},
+    ],
+    'skipped': 'x' * 200,
+    'independent_clinics': [],
+    'empty': {},
+}
+
+
+@pytest.mark.parametrize('read_size', [1, 7, 1 << 16])
+def test_iter_json_arrays_matches_json_load(tmp_path, monkeypatch, read_size):
+    monkeypatch.setattr(streaming, 'READ_SIZE', read_size)
+    path = tmp_path / 'clinics.json'
+    path.write_text(json.dumps(DATA, indent=2, ensure_ascii=False), encoding='utf-8')
+    items = list(streaming.iter_json_arrays(path, ['medical_centers', 'independent_clinics']))
+    assert items == [('medical_centers', center) for center in DATA['medical_centers']]
+    assert list(streaming.iter_json_array(path, 'medical_centers')) == DATA['medical_centers']
+
+
+def test_stops_after_the_last_wanted_array(tmp_path):
+    # Whatever follows the wanted array is never parsed
+    path = tmp_path / 'clinics.json'
+    path.write_text('{"medical_centers": [1, 2], "broken": ', encoding='utf-8')
+    assert list(streaming.iter_json_array(path, 'medical_centers')) == [1, 2]
+
+
+def test_malformed_json_raises(tmp_path):
+    path = tmp_path / 'clinics.json'
+    path.write_text('["not", "an", "object"]', encoding='utf-8')
+    with pytest.raises(ValueError, match="expected '{'"):
+        list(streaming.iter_json_array(path, 'medical_centers'))
+
+
+def test_stream_pages_match_the_build(tmp_path):
+    streamed, built = tmp_path / 'streamed', tmp_path / 'built'
+    for root in (streamed, built):
+        (root / 'api').mkdir(parents=True)
+        shutil.copy(BASE_DIR / 'api' / 'clinics.json', root / 'api')
+
+    stats = regenerate_locations.stream_pages(streamed)
+    assert build.run_build(['regenerate_locations'], root=built)['errors'] == []
+
+    pages = sorted(path.relative_to(streamed) for path in (streamed / 'locations').rglob('*.html'))
+    assert pages == sorted(path.relative_to(built) for path in (built / 'locations').rglob('*.html'))
+    assert stats['pages'] == len(pages)
+    for page in pages:
+        assert (streamed / page).read_bytes() == (built / page).read_bytes(), page
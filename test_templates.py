@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+The compiled template engine.
+
+Rendering must fill slots like the f-strings it replaced (dotted lookups,
+format specs), inline includes, mark site partials for includes.py and
+stream iterator values.
+
+Usage:
+    python3 -m pytest -q test_templates.py
+"""
+
+import pytest
+
+import includes
+import site_partials
+import templates
+
+
+def test_slots_and_format_specs():
+    templates.define('test_price', '<b>{{ p.name }}</b> from ${{p.price_range.low:,}} ({{ count }} clinics)')
+    html = templates.render('test_price', p={'name': 'UPPP', 'price_range': {'low': 5000}}, count=3)
+    assert html == '<b>UPPP</b> from $5,000 (3 clinics)'
+
+
+def test_includes_are_inlined():
+    templates.define('test_card', '<div>{{ name }}</div>')
+    templates.define('test_list', '<ul>{{> test_card }}</ul>')
+    assert templates.render('test_list', name='Stanford') == '<ul><div>Stanford</div></ul>'
+    assert templates.compiled('test_list')[0] == '<ul><div>'
+
+
+def test_site_partials_are_marked():
+    name = next(iter(site_partials.PARTIALS))
+    templates.define('test_page', f'<head>{{{{> {name} }}}}</head>')
+    html = templates.render('test_page')
+    assert html == f'<head>{includes.opening(name)}{site_partials.PARTIALS[name]}{includes.closing(name)}</head>'
+    templates.define('test_name', '{{ name }}')
+    templates.define('test_outer', '{{> test_page }}{{> test_name }}')
+    assert templates.partials('test_outer') == {name}
+
+
+def test_iterators_are_streamed():
+    templates.define('test_grid', '<div>{{ cards }}</div>')
+    chunks = list(templates.render_iter('test_grid', cards=(f'<a>{i}</a>' for i in range(3))))
+    assert chunks == ['<div>', '<a>0</a>', '<a>1</a>', '<a>2</a>', '</div>']
+
+
+def test_redefining_recompiles():
+    templates.define('test_inner', 'old')
+    templates.define('test_wrapper', '[{{> test_inner }}]')
+    assert templates.render('test_wrapper') == '[old]'
+    templates.define('test_inner', 'new')
+    assert templates.render('test_wrapper') == '[new]'
+
+
+def test_errors():
+    templates.define('test_cycle_a', '{{> test_cycle_b }}')
+    templates.define('test_cycle_b', '{{> test_cycle_a }}')
+    with pytest.raises(ValueError, match='include cycle'):
+        templates.render('test_cycle_a')
+    with pytest.raises(KeyError, match='unknown template'):
+        templates.render('test_missing')
+    templates.define('test_slot', '{{ clinic.name }}')
+    with pytest.raises(KeyError):
+        templates.render('test_slot', clinic={})
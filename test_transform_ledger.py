@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+The ledger of the HTML rewriters applied to each file.
+
+A recorded file must be current until anything changes it, its transforms
+or the data they read; a file that was only touched must be recognised by
+its hash; and a recording must keep the earlier transforms only when they
+were recorded for the same content.
+
+Usage:
+    python3 -m pytest -q test_transform_ledger.py
+"""
+
+import itertools
+import os
+
+import pytest
+
+import transform_ledger
+from transform_ledger import content_current, is_current, load_ledger, record, save_ledger, transform_version
+
+_modules = itertools.count()
+
+NAV = {'update_nav': 'v1'}
+SCHEMA = {'add_schema_markup': 's1'}
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / 'index.html'
+    path.write_text('<nav>new</nav>', encoding='utf-8')
+    return {'root': tmp_path, 'rel': 'index.html', 'path': path}
+
+
+@pytest.fixture
+def make_module(tmp_path, monkeypatch):
+    """Write a module and return its name"""
+    module_dir = tmp_path / 'modules'
+    module_dir.mkdir()
+    monkeypatch.syspath_prepend(str(module_dir))
+
+    def make(source):
+        name = f"ledger_module_{next(_modules)}"
+        (module_dir / f"{name}.py").write_text(source, encoding='utf-8')
+        return name
+    return make
+
+
+def test_current_until_changed(page):
+    ledger = {}
+    assert not is_current(ledger, page, NAV)
+    record(ledger, page, '<nav>old</nav>', '<nav>new</nav>', NAV)
+    assert is_current(ledger, page, NAV)
+    assert not is_current(ledger, page, {'update_nav': 'v2'})
+    assert not is_current(ledger, page, {**NAV, **SCHEMA})
+
+    # Edited by something else
+    page['path'].write_text('<nav>edited</nav>', encoding='utf-8')
+    assert not is_current(ledger, page, NAV)
+    assert not content_current(ledger, page, '<nav>edited</nav>', NAV)
+
+    page['path'].unlink()
+    assert not is_current(ledger, page, NAV)
+
+
+def test_touched_file_is_current_by_content(page):
+    ledger = {}
+    record(ledger, page, '<nav>old</nav>', '<nav>new</nav>', NAV)
+    stat = page['path'].stat()
+    os.utime(page['path'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert not is_current(ledger, page, NAV)
+    assert content_current(ledger, page, '<nav>new</nav>', NAV)
+    assert not content_current(ledger, page, '<nav>new</nav>', {'update_nav': 'v2'})
+
+
+def test_earlier_transforms_kept_for_unchanged_content(page):
+    ledger = {}
+    record(ledger, page, '<nav>old</nav>', '<nav>new</nav>', NAV)
+    # A transform that changed nothing keeps the earlier ones
+    record(ledger, page, '<nav>new</nav>', '<nav>new</nav>', SCHEMA)
+    assert ledger['index.html']['transforms'] == {**NAV, **SCHEMA}
+    assert is_current(ledger, page, {**NAV, **SCHEMA})
+
+    # New content invalidates them
+    page['path'].write_text('<nav>new</nav><script></script>', encoding='utf-8')
+    record(ledger, page, '<nav>new</nav>', '<nav>new</nav><script></script>', SCHEMA)
+    assert ledger['index.html']['transforms'] == SCHEMA
+    assert not is_current(ledger, page, NAV)
+
+
+def test_content_other_than_recorded_drops_earlier_transforms(page):
+    ledger = {}
+    record(ledger, page, '<nav>old</nav>', '<nav>new</nav>', NAV)
+    # Unchanged by this transform, but not the content the ledger recorded
+    record(ledger, page, '<nav>hand edit</nav>', '<nav>hand edit</nav>', SCHEMA)
+    assert ledger['index.html']['transforms'] == SCHEMA
+
+
+def test_save_and_load(page, monkeypatch):
+    ledger = {}
+    record(ledger, page, '<nav>old</nav>', '<nav>new</nav>', NAV)
+    assert save_ledger(page['root'], ledger) == 'new'
+    assert save_ledger(page['root'], ledger) == 'unchanged'
+    assert load_ledger(page['root']) == ledger
+    monkeypatch.setattr(transform_ledger, 'LEDGER_VERSION', transform_ledger.LEDGER_VERSION + 1)
+    assert load_ledger(page['root']) == {}
+
+
+def test_version_follows_the_data_of_deps(tmp_path, make_module):
+    data = tmp_path / 'data.txt'
+    data.write_text('houston', encoding='utf-8')
+    dep = make_module("def data_version(root):\n    return (root / 'data.txt').read_text()\n")
+    plain = make_module("VALUE = 1\n")
+    transform = make_module(f"TRANSFORM_DEPS = [{dep!r}, {plain!r}]\n")
+    independent = make_module(f"TRANSFORM_DEPS = [{plain!r}]\n")
+
+    version = transform_version(transform, tmp_path)
+    other = transform_version(independent, tmp_path)
+    assert len(version) == transform_ledger.VERSION_DIGEST
+    assert transform_version(transform, tmp_path) == version
+
+    data.write_text('austin', encoding='utf-8')
+    assert transform_version(transform, tmp_path) != version
+    # Transforms that do not read the data keep their version
+    assert transform_version(independent, tmp_path) == other
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Validation of the providers in the store.
+
+Each check must flag the records it is about and pass clean ones, and a
+record must be validated again only when it changes, with the findings of
+cached records still counted in the report.
+
+Usage:
+    python3 -m pytest -q test_validate_providers.py
+"""
+
+import json
+import os
+
+import pytest
+
+import validate_providers
+
+CLEAN = {'id': 'clean', 'name': 'Houston Methodist', 'city': 'Houston', 'state': 'TX', 'phone': '(713) 790-3333 ext. 12',
+         'address': '6550 Fannin St, Houston, TX 77030', 'website': 'https://www.houstonmethodist.org/sleep',
+         'priceRange': '$4,000 - $8,000'}
+
+
+def row(**fields):
+    """A FIELDS_QUERY row for a US record"""
+    values = dict(dict.fromkeys(validate_providers.COLUMNS), rowid=1, id='x', source='medical_centers',
+                  name='Clinic', country='United States', state='Texas', city='Houston')
+    values.update(fields)
+    return tuple(values[column] for column in validate_providers.COLUMNS)
+
+
+@pytest.mark.parametrize('fields, issue', [
+    ({'name': 'N/A'}, ['required', 'name is missing']),
+    ({'city': ' '}, ['required', 'city is missing']),
+    ({'phone': '713-790-333'}, ['phone', "9 digits in phone '713-790-333'"]),
+    ({'phone': 'call us'}, ['phone', "unexpected characters in phone 'call us'"]),
+    ({'address': '1 Main St, Dallas, OK 75201'}, ['zip_state', 'address is in OK, record state is Texas']),
+    ({'address': '1 Main St, Dallas, TX 10001'}, ['zip_state', 'ZIP 10001 is not a TX ZIP code']),
+    ({'website': 'www.example.com'}, ['url', "malformed website URL 'www.example.com'"]),
+    ({'price': '$9,000 - $4,000'}, ['price', "price range low is above high in '$9,000 - $4,000'"]),
+])
+def test_checks(fields, issue):
+    assert validate_providers.validate_batch([row(**fields), row()]) == [[issue], []]
+
+
+def test_checks_pass_valid_records():
+    fields = {'phone': '+1 713 790 3333', 'address': '1 Main St, Dallas, TX 75201-1234',
+              'website': 'http://example.com:8080/a?b', 'price': '$4,000 - $9,000'}
+    assert validate_providers.validate_batch([row(**fields)]) == [[]]
+    # Outside the US: no ZIP check, 7 to 15 phone digits
+    assert validate_providers.validate_batch([row(country='Mexico', phone='55 1234 5678',
+                                                  address='1 Main St, TX 75201', state='Jalisco')]) == [[]]
+
+
+def write_clinics(root, clinics):
+    path = root / 'api' / 'clinics.json'
+    path.write_text(json.dumps({'medical_centers': clinics}), encoding='utf-8')
+    # A distinct mtime even on coarse-grained file systems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'api').mkdir()
+    write_clinics(tmp_path, [CLEAN, dict(CLEAN, id='bad-phone', name='B', phone='555-0100'),
+                             dict(CLEAN, id='bad-url', name='C', website='not a url')])
+    return tmp_path
+
+
+def test_unchanged_records_are_not_validated_again(root):
+    first = validate_providers.run_validation(root)
+    assert (first['providers'], first['validated'], first['with_issues']) == (3, 3, 2)
+    assert first['counts'] == {'phone': 1, 'url': 1}
+    assert [issue['id'] for issue in first['issues']['phone']] == ['bad-phone']
+
+    second = validate_providers.run_validation(root)
+    assert (second['validated'], second['cached']) == (0, 3)
+    # Cached findings are still reported
+    assert (second['counts'], second['issues']) == (first['counts'], first['issues'])
+
+    write_clinics(root, [CLEAN, dict(CLEAN, id='bad-phone', name='B', phone='713-555-0100')])
+    third = validate_providers.run_validation(root)
+    assert (third['providers'], third['validated'], third['cached'], third['with_issues']) == (2, 1, 1, 0)
+    # Removed records are dropped from the cache
+    cache = json.loads(validate_providers.cache_path(root, validate_providers.CACHE_FILE).read_text(encoding='utf-8'))
+    assert len(cache['records']) == 2
+
+
+def test_cache_from_another_version_is_ignored(root, monkeypatch):
+    validate_providers.run_validation(root)
+    monkeypatch.setattr(validate_providers, 'module_hash', lambda name: 'changed')
+    assert validate_providers.run_validation(root)['validated'] == 3
+
+
+def test_strict_fails_on_findings(root):
+    with pytest.raises(SystemExit) as exc:
+        validate_providers.main(['--root', str(root), '--strict'])
+    assert exc.value.code == 1
+    write_clinics(root, [CLEAN])
+    assert validate_providers.main(['--root', str(root), '--strict'])['with_issues'] == 0
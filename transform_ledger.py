@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Ledger of the HTML rewriters applied to each file.
+
+For every file a rewriter has processed, .build-cache/transform-ledger.json
+records its size, mtime, content hash and the version of each transform
+applied to that content:
+
+    {"locations/texas/index.html":
+        {"size": 48211, "mtime": 1760659200123456789, "hash": "9c1f...",
+         "transforms": {"add_schema_markup": "4be0c2d1a9f3", "update_nav": "07aa31d5e2c8"}}}
+
+A transform's version is the hash of its module's source and of the
+modules its output also depends on, listed in the module's TRANSFORM_DEPS
+(site_partials for the nav and footer, page_meta for the page data, ...);
+a dep that holds site data adds it through its data_version(root). So
+editing a rewriter, a partial it injects or the data it reads re-runs it
+everywhere. Before reading a file, a rewriter asks the
+ledger whether the file is unchanged since it was recorded (one stat call)
+and every transform it would run is recorded at its current version:
+
+    ledger = load_ledger(root)
+    if is_current(ledger, page, versions):
+        ...                             # skip without reading the file
+    record(ledger, page, original, content, versions)
+    save_ledger(root, ledger)
+
+A file edited by anything else no longer matches its size and mtime and is
+processed again; one that was only touched is recognised by its hash
+(content_current) and skipped after the read.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+from pathlib import Path
+
+import output_writer
+from build_graph import CACHE_DIR, module_hash
+
+LEDGER_FILE = 'transform-ledger.json'
+LEDGER_VERSION = 1
+# Characters of the module hash kept as a transform's version
+VERSION_DIGEST = 12
+
+
+def ledger_path(root='.'):
+    return Path(root) / CACHE_DIR / LEDGER_FILE
+
+
+def transform_version(name, root='.'):
+    """Version of the transform in module name: its source, the sources of
+    its TRANSFORM_DEPS and the data_version(root) of the deps that have one"""
+    parts = [module_hash(name)]
+    for dep in getattr(importlib.import_module(name), 'TRANSFORM_DEPS', []):
+        parts.append(module_hash(dep))
+        data_version = getattr(importlib.import_module(dep), 'data_version', None)
+        if data_version is not None:
+            parts.append(data_version(root))
+    return content_hash('|'.join(parts))[:VERSION_DIGEST]
+
+
+def load_ledger(root='.'):
+    """{rel path: entry} of the files recorded under root"""
+    path = ledger_path(root)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == LEDGER_VERSION:
+            return data['files']
+    return {}
+
+
+def save_ledger(root, ledger):
+    path = ledger_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'version': LEDGER_VERSION, 'files': dict(sorted(ledger.items()))}
+    return output_writer.write_if_changed(path, json.dumps(data, separators=(',', ':')))
+
+
+def content_hash(content):
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def applied(entry, versions):
+    """Whether every transform in {name: version} is recorded in entry at that version"""
+    return all(entry['transforms'].get(name) == version for name, version in versions.items())
+
+
+def is_current(ledger, page, versions):
+    """Whether page is unchanged since recorded and already went through versions, from its stat alone"""
+    entry = ledger.get(page['rel'])
+    if entry is None or not applied(entry, versions):
+        return False
+    try:
+        stat = os.stat(page['path'])
+    except FileNotFoundError:
+        return False
+    return entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns
+
+
+def content_current(ledger, page, content, versions):
+    """Whether content is what the ledger recorded for page after versions"""
+    entry = ledger.get(page['rel'])
+    return entry is not None and applied(entry, versions) and entry['hash'] == content_hash(content)
+
+
+def record(ledger, page, original, content, versions):
+    """Record that versions turned original into content, now on disk at page['path'].
+    Transforms recorded before stay valid only if the content is the one they were recorded for."""
+    entry = ledger.get(page['rel'])
+    transforms = {}
+    if entry is not None and content == original and entry['hash'] == content_hash(original):
+        transforms = entry['transforms']
+    stat = os.stat(page['path'])
+    ledger[page['rel']] = {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'hash': content_hash(content),
+        'transforms': {**transforms, **versions},
+    }
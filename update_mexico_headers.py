@@ -8,6 +8,8 @@ import os
 import re
 from pathlib import Path
 
+import profiling
+
 # Map city directories to their image files
 CITY_IMAGES = {
     'cancun': '/assets/images/cities/cancun.jpg',
@@ -108,4 +110,4 @@ def main():
     print(f"  Errors: {len(errors)} files")
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
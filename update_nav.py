@@ -6,59 +6,13 @@ Uses the index.html nav as template but converts to static links.
 
 import os
 import re
-from pathlib import Path
-
-# Universal navigation HTML (static version for non-SPA pages)
-UNIVERSAL_NAV = '''<nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200" x-data="{ mobileMenu: false, locationsOpen: false }">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <img src="/assets/images/logo-icon.png" alt="StemCellPrices.com" class="w-8 h-8 rounded-lg">
-                    <span class="text-xl font-bold tracking-tight text-slate-900">StemCellPrices.com<span class="text-brand-600">.</span></span>
-                </a>
-                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
-                    <a href="/" class="hover:text-brand-600 transition">Find Clinics</a>
-                    <a href="/#cost-guide" class="hover:text-brand-600 transition">Cost Guide</a>
-                    <a href="/conditions/" class="hover:text-brand-600 transition">Conditions</a>
-                    <div class="relative" @mouseenter="locationsOpen = true" @mouseleave="locationsOpen = false">
-                        <a href="/locations/" class="hover:text-brand-600 transition inline-flex items-center gap-1">Locations <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path></svg></a>
-                        <div x-show="locationsOpen" x-cloak class="absolute top-full left-0 pt-0 w-64 bg-white rounded-xl shadow-xl border border-slate-200 py-2 z-50 max-h-96 overflow-y-auto">
-                            <a href="/locations/" class="block px-4 py-2 text-sm font-bold text-brand-600 hover:bg-brand-50">View All 30 States &rarr;</a>
-                            <div class="border-t border-slate-100 my-2"></div>
-                            <a href="/locations/california/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">California</a>
-                            <a href="/locations/texas/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Texas</a>
-                            <a href="/locations/florida/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Florida</a>
-                            <a href="/locations/new-york/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">New York</a>
-                            <a href="/locations/arizona/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Arizona</a>
-                            <a href="/locations/colorado/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Colorado</a>
-                            <a href="/locations/illinois/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Illinois</a>
-                            <a href="/locations/georgia/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Georgia</a>
-                            <a href="/locations/washington/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Washington</a>
-                            <a href="/locations/massachusetts/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Massachusetts</a>
-                            <div class="border-t border-slate-100 my-2"></div>
-                            <p class="px-4 py-1 text-xs text-slate-400 uppercase tracking-wider">International</p>
-                            <a href="/locations/mexico/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Mexico</a>
-                            <a href="/locations/caribbean/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Caribbean</a>
-                        </div>
-                    </div>
-                </div>
-                <div class="flex items-center gap-4">
-                    <a href="/#clinic-login" class="hidden sm:block text-sm font-bold text-brand-700 bg-brand-50 px-4 py-2 rounded-full hover:bg-brand-100 transition">Clinic Login</a>
-                    <button class="md:hidden p-2" @click="mobileMenu = !mobileMenu">
-                        <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path></svg>
-                    </button>
-                </div>
-            </div>
-            <div x-show="mobileMenu" x-cloak class="md:hidden py-4 border-t border-slate-100">
-                <div class="flex flex-col space-y-3">
-                    <a href="/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Find Clinics</a>
-                    <a href="/#cost-guide" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Cost Guide</a>
-                    <a href="/conditions/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Conditions</a>
-                    <a href="/locations/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Locations</a>
-                </div>
-            </div>
-        </div>
-    </nav>'''
+
+import html_regions
+import includes
+import profiling
+from site_partials import UNIVERSAL_NAV
+
+TRANSFORM_DEPS = ['includes', 'site_partials']
 
 # Patterns to match various existing nav structures
 NAV_PATTERNS = [
@@ -68,6 +22,9 @@ NAV_PATTERNS = [
     r'<header[^>]*>.*?<nav[^>]*>.*?</nav>.*?</header>',
 ]
 
+# Opening tag of the styled site nav, matched at a <nav> region start
+SITE_NAV_TAG = re.compile(r'<nav\s+class="[^"]*(?:bg-white|sticky|shadow)[^"]*"')
+
 def needs_alpine(content):
     """Check if the page needs Alpine.js added"""
     return 'alpinejs' not in content.lower()
@@ -95,37 +52,36 @@ TAILWIND_CONFIG = '''<script>
         }
     </script>'''
 
-def update_page(filepath):
-    """Update a single page with the universal nav"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Skip index.html - it has the SPA version
-    if filepath.name == 'index.html' and filepath.parent.name == 'stem cells':
-        return False, "Skipped (main index.html)"
-
-    original_content = content
-
+def find_site_nav(index):
+    """Span of the page's site navigation: a styled <nav> inside <body>, else the <header>, else any <nav>"""
+    body = html_regions.markers(index, 'body')
+    if body:
+        for marker in html_regions.markers(index, 'nav'):
+            if marker[0] >= body[0][1] and SITE_NAV_TAG.match(index['content'], marker[0]):
+                end = html_regions.region_end(index, 'nav', marker)
+                if end != -1:
+                    return (marker[0], end)
+                break
+
+    for region in ['header', 'nav']:
+        spans = html_regions.regions(index, region)
+        if spans:
+            return spans[0]
+    return None
+
+def applies_to(page):
+    """Every page except the main index.html, which has the SPA nav"""
+    return page['rel'] != 'index.html'
+
+def transform(content, page):
+    """Replace a single page's nav with the universal nav"""
     # Try to find and replace existing nav
-    # First try: look for <nav> that's a direct child of body or after header
-    nav_match = re.search(r'(<body[^>]*>.*?)(<nav\s+class="[^"]*(?:bg-white|sticky|shadow)[^"]*".*?</nav>)', content, re.DOTALL)
-
-    if nav_match:
-        # Replace the nav
-        before_nav = nav_match.group(1)
-        content = content[:nav_match.start(2)] + UNIVERSAL_NAV + content[nav_match.end(2):]
-    else:
-        # Try header pattern
-        header_match = re.search(r'<header[^>]*>.*?</header>', content, re.DOTALL)
-        if header_match:
-            content = content[:header_match.start()] + UNIVERSAL_NAV + content[header_match.end():]
-        else:
-            # Try simple nav pattern
-            simple_nav = re.search(r'<nav[^>]*>.*?</nav>', content, re.DOTALL)
-            if simple_nav:
-                content = content[:simple_nav.start()] + UNIVERSAL_NAV + content[simple_nav.end():]
-            else:
-                return False, "No nav found"
+    index = html_regions.index_page(content)
+    span = find_site_nav(index)
+    if span is None:
+        # No nav found
+        return content
+    content = html_regions.splice(content, includes.widen(content, [(*span, includes.block('universal_nav'))]))
 
     # Add Alpine.js if needed
     if needs_alpine(content):
@@ -147,47 +103,11 @@ def update_page(filepath):
         elif '</head>' in content:
             content = content.replace('</head>', '    <style>[x-cloak] { display: none !important; }</style>\n</head>')
 
-    if content == original_content:
-        return False, "No changes made"
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    return True, "Updated"
+    return content
 
 def main():
-    root = Path('.')
-    updated = 0
-    skipped = 0
-    errors = []
-
-    # Find all HTML files
-    html_files = list(root.glob('**/*.html'))
-
-    # Exclude certain files
-    exclude = ['index.html']  # Main index has SPA nav
-
-    for html_file in html_files:
-        # Skip the main index.html
-        if html_file.name == 'index.html' and html_file.parent == root:
-            print(f"Skipped: {html_file} (main SPA page)")
-            skipped += 1
-            continue
-
-        try:
-            success, result = update_page(html_file)
-            if success:
-                print(f"Updated: {html_file}")
-                updated += 1
-            else:
-                print(f"Skipped: {html_file} - {result}")
-                skipped += 1
-        except Exception as e:
-            errors.append((html_file, str(e)))
-            print(f"Error: {html_file} - {e}")
-
-    print(f"\n{'='*50}")
-    print(f"Summary: Updated {updated}, Skipped {skipped}, Errors {len(errors)}")
+    from html_pipeline import main as pipeline_main
+    pipeline_main(transforms=['update_nav'], root='.')
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
@@ -7,13 +7,25 @@ Features:
 - Treatment tags (colored pills instead of bullet lists)
 - "Why Choose [City] for Stem Cell Therapy?" section
 - "Other Clinics in [City]" section with navigation links
+
+Usage:
+    python3 update_usa_clinics.py              # rewrite the pages in place
+    python3 update_usa_clinics.py --dry-run    # diffs and stats only, see dry_run.py
 """
 
+import argparse
 import os
 import re
-import json
 from pathlib import Path
-from html.parser import HTMLParser
+
+import dry_run
+import html_fields
+import includes
+import output_writer
+import page_meta
+import profiling
+import provider_store
+import templates
 
 # State display names
 STATE_NAMES = {
@@ -32,120 +44,98 @@ STATE_NAMES = {
     'wisconsin': 'Wisconsin', 'wyoming': 'Wyoming'
 }
 
+# Fields every clinic page should have; dry runs count the pages missing each
+SCRAPED_FIELDS = ['name', 'phone', 'street', 'specialty', 'price_range']
+
 def slug_to_display(slug):
     """Convert slug to display name"""
     return STATE_NAMES.get(slug, slug.replace('-', ' ').title())
 
-def extract_clinic_data(filepath):
-    """Extract clinic data from existing HTML file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
+def extract_clinic_data(filepath, cache=None):
+    """Extract clinic data from existing HTML file (fields cached by file hash in cache, see html_fields)"""
+    fields = html_fields.file_fields(filepath, cache)
     data = {}
 
-    # Extract clinic name from title
-    title_match = re.search(r'<title>([^<]+)', content)
-    if title_match:
-        title = title_match.group(1)
-        # Extract clinic name (before " - Stem Cell" or " | ")
-        name_match = re.match(r'([^-|]+)', title)
+    # Extract clinic name from title (before " - Stem Cell" or " | ")
+    if fields['title']:
+        name_match = re.match(r'([^-|]+)', fields['title'])
         if name_match:
             data['name'] = name_match.group(1).strip()
 
     # Extract from JSON-LD if available
-    jsonld_match = re.search(r'<script type="application/ld\+json">\s*(\{.*?\})\s*</script>', content, re.DOTALL)
-    if jsonld_match:
-        try:
-            jsonld = json.loads(jsonld_match.group(1))
-            if '@graph' in jsonld:
-                for item in jsonld['@graph']:
-                    if item.get('@type') and ('MedicalBusiness' in str(item.get('@type')) or 'LocalBusiness' in str(item.get('@type'))):
-                        if 'name' in item:
-                            data['name'] = item['name']
-                        if 'telephone' in item:
-                            data['phone'] = item['telephone']
-                        if 'address' in item and isinstance(item['address'], dict):
-                            addr = item['address']
-                            data['street'] = addr.get('streetAddress', '')
-                            data['city_name'] = addr.get('addressLocality', '')
-                            data['state_name'] = addr.get('addressRegion', '')
-                        if 'priceRange' in item:
-                            data['price_range'] = item['priceRange'].replace('$', '').replace(',', '')
-        except:
-            pass
-
-    # Extract description from meta tag
-    desc_match = re.search(r'<meta name="description" content="([^"]+)"', content)
-    if desc_match:
-        data['meta_description'] = desc_match.group(1)
-
-    # Extract specialty from content
-    specialty_match = re.search(r'<h3[^>]*>Specialty</h3>\s*<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
-    if specialty_match:
-        data['specialty'] = specialty_match.group(1).strip()
-    else:
-        # Try to get from meta description
-        if 'meta_description' in data:
-            spec_match = re.search(r'offers? ([^.]+?) in', data['meta_description'])
-            if spec_match:
-                data['specialty'] = spec_match.group(1).strip()
-
-    # Extract about/description text
-    about_match = re.search(r'<h2[^>]*>About[^<]*</h2>\s*<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
-    if about_match:
-        data['about'] = about_match.group(1).strip()
-
-    # Extract treatments offered
-    treatments = []
-    treatments_section = re.search(r'<h3[^>]*>Treatments Offered</h3>\s*<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE)
-    if treatments_section:
-        items = re.findall(r'<li>([^<]+)</li>', treatments_section.group(1))
-        treatments = [t.strip() for t in items]
-    data['treatments'] = treatments if treatments else ['Stem Cell Therapy', 'PRP Therapy', 'Regenerative Medicine']
-
-    # Extract conditions treated
-    conditions = []
-    conditions_section = re.search(r'<h3[^>]*>Conditions Treated</h3>\s*<ul[^>]*>(.*?)</ul>', content, re.DOTALL | re.IGNORECASE)
-    if conditions_section:
-        items = re.findall(r'<li>([^<]+)</li>', conditions_section.group(1))
-        conditions = [c.strip() for c in items]
-    data['conditions'] = conditions if conditions else ['Knee Osteoarthritis', 'Back Pain', 'Shoulder Injuries', 'Hip Pain']
-
-    # Extract price range if not from JSON-LD
-    if 'price_range' not in data:
-        price_match = re.search(r'Price [Rr]ange[^$]*\$([0-9,]+)\s*[-–]\s*\$([0-9,]+)', content)
-        if price_match:
-            data['price_range'] = f"{price_match.group(1)} - {price_match.group(2)}"
-
-    # Extract phone if not from JSON-LD
-    if 'phone' not in data:
-        phone_match = re.search(r'(?:Phone|telephone)[^(]*(\([0-9]{3}\)\s*[0-9]{3}[-.]?[0-9]{4}|\+?[0-9]{1,3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', content, re.IGNORECASE)
-        if phone_match:
-            data['phone'] = phone_match.group(1)
-
-    # Extract address if not from JSON-LD
-    if 'street' not in data:
-        addr_match = re.search(r'<p[^>]*class="[^"]*text-slate-900[^"]*"[^>]*>([^<]+(?:St|Ave|Blvd|Dr|Rd|Way|Lane|Ct|Suite|#)[^<]*)</p>', content)
-        if addr_match:
-            data['street'] = addr_match.group(1).strip()
+    jsonld = fields['jsonld']
+    if isinstance(jsonld, dict) and isinstance(jsonld.get('@graph'), list):
+        for item in jsonld['@graph']:
+            if not isinstance(item, dict):
+                continue
+            if item.get('@type') and ('MedicalBusiness' in str(item.get('@type')) or 'LocalBusiness' in str(item.get('@type'))):
+                if 'name' in item:
+                    data['name'] = item['name']
+                if 'telephone' in item:
+                    data['phone'] = item['telephone']
+                if 'address' in item and isinstance(item['address'], dict):
+                    addr = item['address']
+                    data['street'] = addr.get('streetAddress', '')
+                    data['city_name'] = addr.get('addressLocality', '')
+                    data['state_name'] = addr.get('addressRegion', '')
+                if 'priceRange' in item:
+                    data['price_range'] = str(item['priceRange']).replace('$', '').replace(',', '')
+
+    if fields['meta_description']:
+        data['meta_description'] = fields['meta_description']
+
+    # Specialty from its section, else from the meta description
+    if fields['specialty']:
+        data['specialty'] = fields['specialty']
+    elif 'meta_description' in data:
+        spec_match = re.search(r'offers? ([^.]+?) in', data['meta_description'])
+        if spec_match:
+            data['specialty'] = spec_match.group(1).strip()
+
+    if fields['about']:
+        data['about'] = fields['about']
+
+    data['treatments'] = fields['treatments'] or ['Stem Cell Therapy', 'PRP Therapy', 'Regenerative Medicine']
+    data['conditions'] = fields['conditions'] or ['Knee Osteoarthritis', 'Back Pain', 'Shoulder Injuries', 'Hip Pain']
+
+    # Price, phone and address from the page text if not from JSON-LD
+    if 'price_range' not in data and fields['price']:
+        data['price_range'] = fields['price']
+    if 'phone' not in data and fields['phone']:
+        data['phone'] = fields['phone']
+    if 'street' not in data and fields['address']:
+        data['street'] = fields['address']
 
     # Get slug from filename
     data['slug'] = filepath.stem
+    data['other_clinics'] = [dict(clinic) for clinic in fields['other_clinics']]
+
+    return data
 
-    # Extract other clinics in city
-    other_clinics = []
-    other_section = re.search(r'Other Clinics in.*?<div class="grid[^>]*>(.*?)</div>\s*</div>\s*</div>', content, re.DOTALL | re.IGNORECASE)
-    if other_section:
-        clinic_links = re.findall(r'<a href="([^"]+)"[^>]*>.*?<h3[^>]*>([^<]+)</h3>.*?<p[^>]*>([^<]+)</p>.*?<p[^>]*text-blue[^>]*>([^<]+)</p>', other_section.group(1), re.DOTALL)
-        for link, name, specialty, price in clinic_links:
-            other_clinics.append({
-                'href': link,
-                'name': name.strip(),
-                'specialty': specialty.strip(),
-                'price': price.strip()
-            })
-    data['other_clinics'] = other_clinics
+def clinic_data_from_record(record, filepath):
+    """Page data for a clinic from its provider store record, in the shape extract_clinic_data returns"""
+    data = {
+        'name': record.get('name', ''),
+        'city_name': record.get('city', ''),
+        'state_name': record.get('state', ''),
+        'slug': filepath.stem,
+        'other_clinics': [],
+    }
+    fields = {
+        'phone': ['phone'],
+        'street': ['address'],
+        'specialty': ['specialty', 'specializations'],
+        'about': ['description', 'notes'],
+        'price_range': ['price_range', 'priceRange'],
+    }
+    for key, names in fields.items():
+        values = [record[name] for name in names if record.get(name)]
+        if values:
+            data[key] = values[0]
 
+    treatments = record.get('treatments') or [p.strip() for p in record.get('procedures_offered', '').split(',') if p.strip()]
+    data['treatments'] = treatments if treatments else ['Stem Cell Therapy', 'PRP Therapy', 'Regenerative Medicine']
+    data['conditions'] = [] if treatments else ['Knee Osteoarthritis', 'Back Pain', 'Shoulder Injuries', 'Hip Pain']
     return data
 
 def get_state_features(state_slug):
@@ -199,151 +189,66 @@ def get_state_features(state_slug):
 
     return features.get(state_slug, default_features)
 
-def generate_clinic_page(data, state_slug, city_slug, filepath):
-    """Generate new clinic page HTML using Mexico template format"""
-
-    state_name = slug_to_display(state_slug)
-    city_name = data.get('city_name', slug_to_display(city_slug))
-    clinic_name = data.get('name', 'Stem Cell Clinic')
-    clinic_slug = data.get('slug', filepath.stem)
-    specialty = data.get('specialty', 'Regenerative Medicine')
-    phone = data.get('phone', '')
-    street = data.get('street', city_name)
-    price_range = data.get('price_range', '4,000 - 10,000')
-    about = data.get('about', f'{clinic_name} offers stem cell therapy and regenerative medicine treatments in {city_name}, {state_name}.')
-    treatments = data.get('treatments', [])
-    conditions = data.get('conditions', [])
-    other_clinics = data.get('other_clinics', [])
-
-    # Format price range with $ signs if not already present
-    if '$' not in price_range:
-        price_parts = price_range.replace(',', '').split('-')
-        if len(price_parts) == 2:
-            try:
-                low = int(price_parts[0].strip())
-                high = int(price_parts[1].strip())
-                price_range = f"${low:,} - ${high:,}"
-            except:
-                price_range = f"${price_range}"
-
-    # Generate treatments HTML (colored tags)
-    treatments_html = ''
-    all_items = treatments + conditions
-    for item in all_items[:8]:  # Limit to 8 items
-        treatments_html += f'<div class="bg-blue-50 text-blue-700 px-4 py-2 rounded-lg text-sm font-medium">{item}</div>'
-
-    # Generate features HTML
-    features_html = ''
-    feature_items = [
-        'Board-certified physicians',
-        'Modern treatment facilities',
-        'Personalized care plans',
-        'Follow-up support'
-    ]
-    for feature in feature_items:
-        features_html += f'''<div class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path></svg><span class="text-gray-700">{feature}</span></div>'''
-
-    # Generate Why Choose section
-    state_features = get_state_features(state_slug)
-    why_choose_html = ''
-    for title, desc in state_features:
-        why_choose_html += f'''<li class="flex items-start gap-2">
-                            <span class="text-blue-500 mt-1">&#10003;</span>
-                            <span><strong>{title}</strong> - {desc}</span>
-                        </li>'''
-
-    # Generate other clinics HTML
-    other_clinics_html = f'''<a href="/locations/{state_slug}/{city_slug}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
-                    <div class="text-blue-600 font-semibold">&larr; View All {city_name} Clinics</div>
-                    <p class="text-gray-500 text-sm mt-1">Compare verified clinics</p>
-                </a>
-                <a href="/conditions/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
-                    <div class="text-blue-600 font-semibold">Treatment Guides</div>
-                    <p class="text-gray-500 text-sm mt-1">Knee, hip, shoulder, spine</p>
-                </a>
-                <a href="/locations/{state_slug}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
-                    <div class="text-blue-600 font-semibold">All {state_name} Locations</div>
-                    <p class="text-gray-500 text-sm mt-1">Browse clinics statewide</p>
-                </a>'''
-
-    # Try to use city-specific background image, fallback to state or generic
-    city_bg = f'/assets/images/cities/{city_slug}-large.webp'
-
-    html = f'''<!DOCTYPE html>
+# Clinic detail page; see templates.py for the {{ }} placeholder syntax
+CLINIC_PAGE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{clinic_name} - Stem Cell Clinic in {city_name}, {state_name} | StemCellPrices.com</title>
-    <meta name="description" content="{clinic_name} offers stem cell therapy in {city_name}, {state_name}. {specialty}. Prices from {price_range}. Get a free consultation today.">
-    <meta name="keywords" content="{clinic_name}, stem cell therapy {city_name}, stem cell clinic {state_name}, regenerative medicine, {specialty.lower()} {city_name}">
-    <link rel="canonical" href="https://stemcellprices.com/locations/{state_slug}/{city_slug}/{clinic_slug}.html">
+    <title>{{clinic_name}} - Stem Cell Clinic in {{city_name}}, {{state_name}} | StemCellPrices.com</title>
+    <meta name="description" content="{{clinic_name}} offers stem cell therapy in {{city_name}}, {{state_name}}. {{specialty}}. Prices from {{price_range}}. Get a free consultation today.">
+    <meta name="keywords" content="{{clinic_name}}, stem cell therapy {{city_name}}, stem cell clinic {{state_name}}, regenerative medicine, {{specialty_lower}} {{city_name}}">
+    <link rel="canonical" href="https://stemcellprices.com/locations/{{state_slug}}/{{city_slug}}/{{clinic_slug}}.html">
 
     <!-- Open Graph -->
-    <meta property="og:title" content="{clinic_name} - Stem Cell Clinic in {city_name}, {state_name}">
-    <meta property="og:description" content="{specialty}. Prices from {price_range}. Get a free quote.">
-    <meta property="og:url" content="https://stemcellprices.com/locations/{state_slug}/{city_slug}/{clinic_slug}.html">
+    <meta property="og:title" content="{{clinic_name}} - Stem Cell Clinic in {{city_name}}, {{state_name}}">
+    <meta property="og:description" content="{{specialty}}. Prices from {{price_range}}. Get a free quote.">
+    <meta property="og:url" content="https://stemcellprices.com/locations/{{state_slug}}/{{city_slug}}/{{clinic_slug}}.html">
     <meta property="og:type" content="business.business">
 
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        brand: {{
-                            50: '#f0f7ff',
-                            100: '#e0effe',
-                            600: '#2563eb',
-                            700: '#1d4ed8',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
+    {{> tailwind_brand_config }}
     <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>
     <script src="/assets/js/tracking.js"></script>
 
     <!-- Schema.org Structured Data -->
     <script type="application/ld+json">
-    {{
+    {
         "@context": "https://schema.org",
         "@graph": [
-            {{
+            {
                 "@type": "MedicalBusiness",
-                "name": "{clinic_name}",
-                "description": "{about}",
-                "address": {{
+                "name": "{{clinic_name}}",
+                "description": "{{about}}",
+                "address": {
                     "@type": "PostalAddress",
-                    "streetAddress": "{street}",
-                    "addressLocality": "{city_name}",
-                    "addressRegion": "{state_name}",
+                    "streetAddress": "{{street}}",
+                    "addressLocality": "{{city_name}}",
+                    "addressRegion": "{{state_name}}",
                     "addressCountry": "US"
-                }},
-                "telephone": "{phone}",
-                "priceRange": "{price_range}",
-                "medicalSpecialty": "{specialty}",
-                "url": "https://stemcellprices.com/locations/{state_slug}/{city_slug}/{clinic_slug}.html"
-            }},
-            {{
+                },
+                "telephone": "{{phone}}",
+                "priceRange": "{{price_range}}",
+                "medicalSpecialty": "{{specialty}}",
+                "url": "https://stemcellprices.com/locations/{{state_slug}}/{{city_slug}}/{{clinic_slug}}.html"
+            },
+            {
                 "@type": "BreadcrumbList",
                 "itemListElement": [
-                    {{"@type": "ListItem", "position": 1, "name": "Home", "item": "https://stemcellprices.com/"}},
-                    {{"@type": "ListItem", "position": 2, "name": "Locations", "item": "https://stemcellprices.com/locations/"}},
-                    {{"@type": "ListItem", "position": 3, "name": "{state_name}", "item": "https://stemcellprices.com/locations/{state_slug}/"}},
-                    {{"@type": "ListItem", "position": 4, "name": "{city_name}", "item": "https://stemcellprices.com/locations/{state_slug}/{city_slug}/"}},
-                    {{"@type": "ListItem", "position": 5, "name": "{clinic_name}"}}
+                    {"@type": "ListItem", "position": 1, "name": "Home", "item": "https://stemcellprices.com/"},
+                    {"@type": "ListItem", "position": 2, "name": "Locations", "item": "https://stemcellprices.com/locations/"},
+                    {"@type": "ListItem", "position": 3, "name": "{{state_name}}", "item": "https://stemcellprices.com/locations/{{state_slug}}/"},
+                    {"@type": "ListItem", "position": 4, "name": "{{city_name}}", "item": "https://stemcellprices.com/locations/{{state_slug}}/{{city_slug}}/"},
+                    {"@type": "ListItem", "position": 5, "name": "{{clinic_name}}"}
                 ]
-            }}
+            }
         ]
-    }}
+    }
     </script>
     <script src="/assets/js/clinic-gallery.js"></script>
     <style>
-        [x-cloak] {{ display: none !important; }}
-        .hero-gradient {{ background: linear-gradient(135deg, rgba(15, 23, 42, 0.7) 0%, rgba(30, 58, 138, 0.5) 100%); }}
-        .price-panel {{
+        [x-cloak] { display: none !important; }
+        .hero-gradient { background: linear-gradient(135deg, rgba(15, 23, 42, 0.7) 0%, rgba(30, 58, 138, 0.5) 100%); }
+        .price-panel {
             background: rgba(15, 23, 42, 0.75);
             backdrop-filter: blur(12px);
             -webkit-backdrop-filter: blur(12px);
@@ -351,64 +256,15 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
             border-radius: 16px;
             padding: 16px 24px;
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-        }}
+        }
     </style>
 </head>
 <body class="bg-gray-50">
     <!-- Header -->
-    <nav class="sticky top-0 z-50 bg-white/80 backdrop-blur-md border-b border-slate-200" x-data="{{ mobileMenu: false, locationsOpen: false }}">
-        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
-            <div class="flex justify-between h-16 items-center">
-                <a href="/" class="flex items-center gap-2">
-                    <img src="/assets/images/logo-icon.png" alt="StemCellPrices.com" class="w-8 h-8 rounded-lg">
-                    <span class="text-xl font-bold tracking-tight text-slate-900">StemCellPrices.com<span class="text-brand-600">.</span></span>
-                </a>
-                <div class="hidden md:flex space-x-8 text-sm font-semibold text-slate-600">
-                    <a href="/" class="hover:text-brand-600 transition">Find Clinics</a>
-                    <a href="/#cost-guide" class="hover:text-brand-600 transition">Cost Guide</a>
-                    <a href="/conditions/" class="hover:text-brand-600 transition">Conditions</a>
-                    <div class="relative" @mouseenter="locationsOpen = true" @mouseleave="locationsOpen = false">
-                        <a href="/locations/" class="hover:text-brand-600 transition inline-flex items-center gap-1">Locations <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path></svg></a>
-                        <div x-show="locationsOpen" x-cloak class="absolute top-full left-0 pt-0 w-64 bg-white rounded-xl shadow-xl border border-slate-200 py-2 z-50 max-h-96 overflow-y-auto">
-                            <a href="/locations/" class="block px-4 py-2 text-sm font-bold text-brand-600 hover:bg-brand-50">View All 30 States &rarr;</a>
-                            <div class="border-t border-slate-100 my-2"></div>
-                            <a href="/locations/california/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">California</a>
-                            <a href="/locations/texas/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Texas</a>
-                            <a href="/locations/florida/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Florida</a>
-                            <a href="/locations/new-york/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">New York</a>
-                            <a href="/locations/arizona/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Arizona</a>
-                            <a href="/locations/colorado/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Colorado</a>
-                            <a href="/locations/illinois/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Illinois</a>
-                            <a href="/locations/georgia/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Georgia</a>
-                            <a href="/locations/washington/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Washington</a>
-                            <a href="/locations/massachusetts/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Massachusetts</a>
-                            <div class="border-t border-slate-100 my-2"></div>
-                            <p class="px-4 py-1 text-xs text-slate-400 uppercase tracking-wider">International</p>
-                            <a href="/locations/mexico/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Mexico</a>
-                            <a href="/locations/caribbean/" class="block px-4 py-2 text-sm text-slate-600 hover:bg-brand-50 hover:text-brand-600">Caribbean</a>
-                        </div>
-                    </div>
-                </div>
-                <div class="flex items-center gap-4">
-                    <a href="/#clinic-login" class="hidden sm:block text-sm font-bold text-brand-700 bg-brand-50 px-4 py-2 rounded-full hover:bg-brand-100 transition">Clinic Login</a>
-                    <button class="md:hidden p-2" @click="mobileMenu = !mobileMenu">
-                        <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path></svg>
-                    </button>
-                </div>
-            </div>
-            <div x-show="mobileMenu" x-cloak class="md:hidden py-4 border-t border-slate-100">
-                <div class="flex flex-col space-y-3">
-                    <a href="/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Find Clinics</a>
-                    <a href="/#cost-guide" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Cost Guide</a>
-                    <a href="/conditions/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Conditions</a>
-                    <a href="/locations/" class="px-4 py-2 text-sm font-semibold text-slate-600 hover:bg-brand-50 rounded-lg">Locations</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    {{> universal_nav }}
 
     <!-- Hero Section -->
-    <section class="relative bg-cover bg-center text-white py-16" style="background-image: url('{city_bg}');">
+    <section class="relative bg-cover bg-center text-white py-16" style="background-image: url('{{city_bg}}');">
         <div class="absolute inset-0 hero-gradient"></div>
         <div class="relative max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
             <!-- Breadcrumb -->
@@ -418,11 +274,11 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                     <li>/</li>
                     <li><a href="/locations/" class="hover:text-white">Locations</a></li>
                     <li>/</li>
-                    <li><a href="/locations/{state_slug}/" class="hover:text-white">{state_name}</a></li>
+                    <li><a href="/locations/{{state_slug}}/" class="hover:text-white">{{state_name}}</a></li>
                     <li>/</li>
-                    <li><a href="/locations/{state_slug}/{city_slug}/" class="hover:text-white">{city_name}</a></li>
+                    <li><a href="/locations/{{state_slug}}/{{city_slug}}/" class="hover:text-white">{{city_name}}</a></li>
                     <li>/</li>
-                    <li class="text-white font-medium">{clinic_name}</li>
+                    <li class="text-white font-medium">{{clinic_name}}</li>
                 </ol>
             </nav>
 
@@ -430,21 +286,21 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                 <div>
                     <div class="flex items-center gap-3 mb-4">
                         <span class='bg-green-400 text-green-900 px-3 py-1 rounded-full text-sm font-semibold'>&#10003; Verified</span>
-                        <span class="bg-white/20 px-3 py-1 rounded-full text-sm">{state_name}</span>
+                        <span class="bg-white/20 px-3 py-1 rounded-full text-sm">{{state_name}}</span>
                     </div>
-                    <h1 class="text-4xl font-bold mb-2">{clinic_name}</h1>
-                    <p class="text-xl text-blue-100 mb-4">{specialty}</p>
+                    <h1 class="text-4xl font-bold mb-2">{{clinic_name}}</h1>
+                    <p class="text-xl text-blue-100 mb-4">{{specialty}}</p>
                     <p class="text-blue-200">
                         <svg class="w-5 h-5 inline mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                             <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"></path>
                             <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15 11a3 3 0 11-6 0 3 3 0 016 0z"></path>
                         </svg>
-                        {street}, {city_name}
+                        {{street}}, {{city_name}}
                     </p>
                 </div>
                 <div class="mt-6 md:mt-0 text-right price-panel">
                     <div class="text-emerald-400 text-sm font-semibold mb-1">Price Range</div>
-                    <div class="text-3xl font-bold text-white">{price_range}</div>
+                    <div class="text-3xl font-bold text-white">{{price_range}}</div>
                 </div>
             </div>
         </div>
@@ -458,7 +314,7 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                 <!-- About -->
                 <div class="bg-white rounded-xl shadow-sm p-6">
                     <!-- Clinic Image Gallery -->
-                    <div x-data="clinicGallery('{clinic_slug}')" x-init="init()" @keydown.window="handleKeydown($event)" class="mb-6">
+                    <div x-data="clinicGallery('{{clinic_slug}}')" x-init="init()" @keydown.window="handleKeydown($event)" class="mb-6">
                         <!-- Loading state -->
                         <template x-if="loading">
                             <div class="w-full h-64 bg-slate-100 rounded-xl animate-pulse flex items-center justify-center">
@@ -549,15 +405,15 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                             </div>
                         </template>
                     </div>
-                    <h2 class="text-2xl font-bold text-gray-900 mb-4">About {clinic_name}</h2>
-                    <p class="text-gray-600 leading-relaxed">{about}</p>
+                    <h2 class="text-2xl font-bold text-gray-900 mb-4">About {{clinic_name}}</h2>
+                    <p class="text-gray-600 leading-relaxed">{{about}}</p>
                 </div>
 
                 <!-- Treatments -->
                 <div class="bg-white rounded-xl shadow-sm p-6">
                     <h2 class="text-2xl font-bold text-gray-900 mb-4">Treatments Offered</h2>
                     <div class="grid grid-cols-2 md:grid-cols-3 gap-3">
-                        {treatments_html}
+                        {{treatments_html}}
                     </div>
                 </div>
 
@@ -565,15 +421,15 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                 <div class="bg-white rounded-xl shadow-sm p-6">
                     <h2 class="text-2xl font-bold text-gray-900 mb-4">Clinic Features</h2>
                     <div class="grid grid-cols-2 gap-4">
-                        {features_html}
+                        {{features_html}}
                     </div>
                 </div>
 
                 <!-- Why Choose This City -->
                 <div class="bg-gradient-to-r from-blue-50 to-indigo-50 rounded-xl p-6">
-                    <h2 class="text-2xl font-bold text-gray-900 mb-4">Why Choose {city_name} for Stem Cell Therapy?</h2>
+                    <h2 class="text-2xl font-bold text-gray-900 mb-4">Why Choose {{city_name}} for Stem Cell Therapy?</h2>
                     <ul class="space-y-3 text-gray-700">
-                        {why_choose_html}
+                        {{why_choose_html}}
                     </ul>
                 </div>
             </div>
@@ -583,9 +439,9 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                 <div class="bg-white rounded-xl shadow-sm p-6 sticky top-24">
                     <h3 class="text-xl font-bold text-gray-900 mb-4">Get a Free Quote</h3>
                     <form id="leadForm" class="space-y-4">
-                        <input type="hidden" id="clinicName" value="{clinic_name}">
-                        <input type="hidden" id="clinicCity" value="{city_name}">
-                        <input type="hidden" id="clinicState" value="{state_name}">
+                        <input type="hidden" id="clinicName" value="{{clinic_name}}">
+                        <input type="hidden" id="clinicCity" value="{{city_name}}">
+                        <input type="hidden" id="clinicState" value="{{state_name}}">
 
                         <div>
                             <label class="block text-sm font-medium text-gray-700 mb-1">Full Name *</label>
@@ -634,72 +490,21 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
 
         <!-- Other Clinics in City -->
         <div class="mt-12">
-            <h2 class="text-2xl font-bold text-gray-900 mb-6">Other Clinics in {city_name}</h2>
+            <h2 class="text-2xl font-bold text-gray-900 mb-6">Other Clinics in {{city_name}}</h2>
             <div class="grid grid-cols-1 md:grid-cols-3 gap-6">
-                {other_clinics_html}
+                {{other_clinics_html}}
             </div>
         </div>
     </main>
 
-    <!-- Footer -->
-    <footer class="bg-slate-900">
-        <div class="max-w-7xl mx-auto px-4 py-12">
-            <div class="grid grid-cols-2 md:grid-cols-4 gap-8">
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Conditions</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/knee-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Knee</a></li>
-                        <li><a href="/hip-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Hip</a></li>
-                        <li><a href="/shoulder-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Shoulder</a></li>
-                        <li><a href="/spine-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Spine</a></li>
-                        <li><a href="/neck-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">Neck</a></li>
-                        <li><a href="/si-joint-cost-guide/" class="text-gray-400 hover:text-blue-400 text-sm">SI Joint</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Top Locations</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/locations/california/los-angeles/" class="text-gray-400 hover:text-blue-400 text-sm">Los Angeles</a></li>
-                        <li><a href="/locations/new-york/new-york-city/" class="text-gray-400 hover:text-blue-400 text-sm">New York</a></li>
-                        <li><a href="/locations/florida/miami/" class="text-gray-400 hover:text-blue-400 text-sm">Miami</a></li>
-                        <li><a href="/locations/texas/houston/" class="text-gray-400 hover:text-blue-400 text-sm">Houston</a></li>
-                        <li><a href="/locations/arizona/scottsdale/" class="text-gray-400 hover:text-blue-400 text-sm">Scottsdale</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Mexico</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/locations/mexico/" class="text-gray-400 hover:text-blue-400 text-sm">All Mexico Clinics</a></li>
-                        <li><a href="/locations/mexico/tijuana/" class="text-gray-400 hover:text-blue-400 text-sm">Tijuana</a></li>
-                        <li><a href="/locations/mexico/cancun/" class="text-gray-400 hover:text-blue-400 text-sm">Cancun</a></li>
-                        <li><a href="/locations/mexico/puerto-vallarta/" class="text-gray-400 hover:text-blue-400 text-sm">Puerto Vallarta</a></li>
-                    </ul>
-                </div>
-                <div>
-                    <h3 class="text-white font-semibold mb-4">Company</h3>
-                    <ul class="space-y-2">
-                        <li><a href="/#cost-guide" class="text-gray-400 hover:text-blue-400 text-sm">Cost Guide</a></li>
-                        <li><a href="/locations/" class="text-gray-400 hover:text-blue-400 text-sm">All Locations</a></li>
-                        <li><a href="/privacy-policy/" class="text-gray-400 hover:text-blue-400 text-sm">Privacy Policy</a></li>
-                        <li><a href="/terms-of-service/" class="text-gray-400 hover:text-blue-400 text-sm">Terms of Service</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="border-t border-gray-800 mt-8 pt-8">
-                <div class="flex flex-col md:flex-row justify-between items-center gap-4">
-                    <p class="text-gray-400 text-sm">&copy; 2025 StemCellPrices.com. All rights reserved.</p>
-                    <p class="text-gray-500 text-xs">The information on this website is for educational purposes only and should not be considered medical advice.</p>
-                </div>
-            </div>
-        </div>
-    </footer>
+    {{> universal_footer }}
 
     <script>
         // Lead form submission
-        document.getElementById('leadForm').addEventListener('submit', function(e) {{
+        document.getElementById('leadForm').addEventListener('submit', function(e) {
             e.preventDefault();
 
-            const lead = {{
+            const lead = {
                 clinic: document.getElementById('clinicName').value,
                 city: document.getElementById('clinicCity').value,
                 state: document.getElementById('clinicState').value,
@@ -710,7 +515,7 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
                 message: document.getElementById('message').value,
                 timestamp: new Date().toISOString(),
                 source: window.location.href
-            }};
+            };
 
             // Store lead
             const leads = JSON.parse(localStorage.getItem('stemcell_leads') || '[]');
@@ -718,30 +523,118 @@ def generate_clinic_page(data, state_slug, city_slug, filepath):
             localStorage.setItem('stemcell_leads', JSON.stringify(leads));
 
             // Track conversion
-            if (typeof gtag !== 'undefined') {{
-                gtag('event', 'generate_lead', {{
+            if (typeof gtag !== 'undefined') {
+                gtag('event', 'generate_lead', {
                     'event_category': 'Lead',
                     'event_label': lead.clinic,
                     'value': 1
-                }});
-            }}
+                });
+            }
 
             alert('Thank you! Your request has been submitted. The clinic will contact you within 24-48 hours.');
             this.reset();
-        }});
+        });
     </script>
 </body>
 </html>'''
 
-    return html
+templates.define('usa_clinic_page', CLINIC_PAGE_TEMPLATE)
 
-def main():
-    root = Path('.')
-    updated = 0
-    skipped = 0
-    errors = []
+def generate_clinic_page(data, state_slug, city_slug, filepath):
+    """Generate new clinic page HTML using Mexico template format"""
 
-    # Find all USA clinic HTML files (exclude Mexico and index files)
+    state_name = slug_to_display(state_slug)
+    city_name = data.get('city_name', slug_to_display(city_slug))
+    clinic_name = data.get('name', 'Stem Cell Clinic')
+    clinic_slug = data.get('slug', filepath.stem)
+    specialty = data.get('specialty', 'Regenerative Medicine')
+    phone = data.get('phone', '')
+    street = data.get('street', city_name)
+    price_range = data.get('price_range', '4,000 - 10,000')
+    about = data.get('about', f'{clinic_name} offers stem cell therapy and regenerative medicine treatments in {city_name}, {state_name}.')
+    treatments = data.get('treatments', [])
+    conditions = data.get('conditions', [])
+    other_clinics = data.get('other_clinics', [])
+
+    # Format price range with $ signs if not already present
+    if '$' not in price_range:
+        price_parts = price_range.replace(',', '').split('-')
+        if len(price_parts) == 2:
+            try:
+                low = int(price_parts[0].strip())
+                high = int(price_parts[1].strip())
+                price_range = f"${low:,} - ${high:,}"
+            except:
+                price_range = f"${price_range}"
+
+    # Generate treatments HTML (colored tags)
+    treatments_html = ''
+    all_items = treatments + conditions
+    for item in all_items[:8]:  # Limit to 8 items
+        treatments_html += f'<div class="bg-blue-50 text-blue-700 px-4 py-2 rounded-lg text-sm font-medium">{item}</div>'
+
+    # Generate features HTML
+    features_html = ''
+    feature_items = [
+        'Board-certified physicians',
+        'Modern treatment facilities',
+        'Personalized care plans',
+        'Follow-up support'
+    ]
+    for feature in feature_items:
+        features_html += f'''<div class="flex items-center gap-2"><svg class="w-5 h-5 text-green-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path></svg><span class="text-gray-700">{feature}</span></div>'''
+
+    # Generate Why Choose section
+    state_features = get_state_features(state_slug)
+    why_choose_html = ''
+    for title, desc in state_features:
+        why_choose_html += f'''<li class="flex items-start gap-2">
+                            <span class="text-blue-500 mt-1">&#10003;</span>
+                            <span><strong>{title}</strong> - {desc}</span>
+                        </li>'''
+
+    # Generate other clinics HTML
+    other_clinics_html = f'''<a href="/locations/{state_slug}/{city_slug}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
+                    <div class="text-blue-600 font-semibold">&larr; View All {city_name} Clinics</div>
+                    <p class="text-gray-500 text-sm mt-1">Compare verified clinics</p>
+                </a>
+                <a href="/conditions/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
+                    <div class="text-blue-600 font-semibold">Treatment Guides</div>
+                    <p class="text-gray-500 text-sm mt-1">Knee, hip, shoulder, spine</p>
+                </a>
+                <a href="/locations/{state_slug}/" class="bg-white rounded-xl shadow-sm p-6 hover:shadow-md transition">
+                    <div class="text-blue-600 font-semibold">All {state_name} Locations</div>
+                    <p class="text-gray-500 text-sm mt-1">Browse clinics statewide</p>
+                </a>'''
+
+    # Try to use city-specific background image, fallback to state or generic
+    city_bg = f'/assets/images/cities/{city_slug}-large.webp'
+
+    html = templates.render(
+        'usa_clinic_page',
+        clinic_name=clinic_name,
+        city_name=city_name,
+        state_name=state_name,
+        specialty=specialty,
+        price_range=price_range,
+        specialty_lower=specialty.lower(),
+        state_slug=state_slug,
+        city_slug=city_slug,
+        clinic_slug=clinic_slug,
+        about=about,
+        street=street,
+        phone=phone,
+        city_bg=city_bg,
+        treatments_html=treatments_html,
+        features_html=features_html,
+        why_choose_html=why_choose_html,
+        other_clinics_html=other_clinics_html,
+    )
+
+    return html
+
+def clinic_files(root):
+    """(state_slug, city_slug, path) of every USA clinic page under root (not Mexico, not index pages)"""
     for state_dir in (root / 'locations').iterdir():
         if not state_dir.is_dir():
             continue
@@ -753,43 +646,88 @@ def main():
             print(f"Skipping: {state_slug} (Mexico already has template)")
             continue
 
-        # Skip index.html files
-        if state_slug == 'index.html':
-            continue
-
         # Process each city in the state
         for city_dir in state_dir.iterdir():
             if not city_dir.is_dir():
                 continue
 
-            city_slug = city_dir.name
-
             # Process each clinic file in the city
             for clinic_file in city_dir.glob('*.html'):
-                # Skip index files
-                if clinic_file.name == 'index.html':
-                    continue
+                if clinic_file.name != 'index.html':
+                    yield state_slug, city_dir.name, clinic_file
+
+def load_clinic_data(root, state_slug, city_slug, clinic_file, fields_cache=None):
+    """Page data of a clinic: its provider store record if there is one - by the entity
+    the page index recorded for the page, else by its URL; scraped from the existing file otherwise"""
+    meta = page_meta.lookup({'root': root, 'rel': clinic_file.relative_to(root).as_posix()})
+    record = provider_store.get_provider(meta['entity'], root) if meta else None
+    record = record or provider_store.find_provider(state_slug, city_slug, clinic_file.stem, root)
+    return clinic_data_from_record(record, clinic_file) if record else extract_clinic_data(clinic_file, fields_cache)
+
+def preview_clinic_page(root, state_slug, city_slug, clinic_file):
+    """Dry-run result of rewriting one clinic page (see dry_run.py); the misses
+    are the SCRAPED_FIELDS its data lacks"""
+    rel = clinic_file.relative_to(root).as_posix()
+    try:
+        original = clinic_file.read_text(encoding='utf-8')
+        data = load_clinic_data(root, state_slug, city_slug, clinic_file)
+        new_html = generate_clinic_page(data, state_slug, city_slug, clinic_file)
+    except Exception as e:
+        return dry_run.failed(rel, str(e))
+    misses = [f"missing:{field}" for field in SCRAPED_FIELDS if not data.get(field)]
+    return dry_run.preview(rel, original, new_html, misses)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite the USA clinic pages in the Mexico clinic template")
+    parser.add_argument('--root', default='.', help="site root holding locations/")
+    dry_run.add_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    root = Path(args.root)
+    updated = 0
+    skipped = 0
+    errors = []
 
-                try:
-                    # Extract data from existing file
-                    data = extract_clinic_data(clinic_file)
+    if args.dry_run:
+        items = [(root, *clinic) for clinic in clinic_files(root)]
+        stats = dry_run.collect(dry_run.run(preview_clinic_page, items, dry_run.default_workers(args.jobs)),
+                                dry_run.diff_path(root, args.diff_out))
+        dry_run.print_summary(stats)
+        return stats
+
+    fields_cache = html_fields.load_cache(root)
+    include_index = includes.load_index(root)
+    write_stats = output_writer.new_write_stats()
+    for state_slug, city_slug, clinic_file in clinic_files(root):
+        try:
+            with profiling.stage('load'):
+                data = load_clinic_data(root, state_slug, city_slug, clinic_file, fields_cache)
 
-                    # Generate new HTML
-                    new_html = generate_clinic_page(data, state_slug, city_slug, clinic_file)
+            # Generate new HTML
+            new_html = profiling.timed_page(clinic_file.as_posix(), generate_clinic_page,
+                                            data, state_slug, city_slug, clinic_file)
 
-                    # Write updated file
-                    with open(clinic_file, 'w', encoding='utf-8') as f:
-                        f.write(new_html)
+            # Write updated file
+            with profiling.stage('write'):
+                status = output_writer.write_if_changed(clinic_file, new_html, write_stats)
+            includes.record_partials(include_index, clinic_file.relative_to(root).as_posix(),
+                                     templates.partials('usa_clinic_page'))
 
-                    print(f"Updated: {clinic_file}")
-                    updated += 1
+            if status != 'unchanged':
+                print(f"Updated: {clinic_file}")
+            updated += 1
 
-                except Exception as e:
-                    errors.append((clinic_file, str(e)))
-                    print(f"Error: {clinic_file} - {e}")
+        except Exception as e:
+            errors.append((clinic_file, str(e)))
+            print(f"Error: {clinic_file} - {e}")
 
+    html_fields.save_cache(root, fields_cache)
+    includes.save_index(root, include_index)
     print(f"\n{'='*50}")
     print(f"Summary: Updated {updated}, Skipped {skipped}, Errors {len(errors)}")
+    print(f"Written files - {output_writer.format_write_stats(write_stats)}")
 
     if errors:
         print("\nErrors:")
@@ -797,4 +735,4 @@ def main():
             print(f"  {filepath}: {error}")
 
 if __name__ == '__main__':
-    main()
+    profiling.run(main)
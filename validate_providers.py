@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Validation of every provider in the store, run on each build.
+
+Checks required fields, phone formats, US ZIP/state consistency of the
+address, website URL shape and price ranges (low <= high). Records are
+read from the store BATCH_SIZE at a time with their fields pulled out by
+SQLite (json_extract), and each check runs over a whole column of the
+batch rather than record by record.
+
+Results are cached by record hash in .build-cache/validation.json, so a
+record is validated again only when it (or this module) changes; the
+fields of unchanged records are not even extracted.
+Findings are warnings: the counts are printed and the first
+MAX_REPORTED of each check are written to
+.build-cache/validation-report.json. With --strict any finding fails the
+run.
+
+Usage:
+    python3 validate_providers.py            # validate the store, print a summary
+    python3 validate_providers.py --strict   # exit 1 if any provider has issues
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+import output_writer
+import profiling
+import provider_store
+from build_graph import CACHE_DIR, module_hash
+
+CACHE_FILE = 'validation.json'
+REPORT_FILE = 'validation-report.json'
+BATCH_SIZE = 5000
+# Findings listed per check in the report; the rest are only counted
+MAX_REPORTED = 50
+
+# Columns 1-6 are everything the checks depend on, hashed to find the records to validate
+RECORDS_QUERY = 'SELECT rowid, source, name, country, state, city, record, id FROM providers ORDER BY rowid'
+COLUMNS = ['rowid', 'id', 'source', 'name', 'country', 'state', 'city', 'phone', 'address', 'website', 'price']
+FIELDS_QUERY = '''
+SELECT rowid, id, source, name, country, state, city,
+       json_extract(record, '$.phone'),
+       json_extract(record, '$.address'),
+       json_extract(record, '$.website'),
+       coalesce(json_extract(record, '$.priceRange'), json_extract(record, '$.price_range'))
+FROM providers WHERE rowid IN ({}) ORDER BY rowid
+'''
+REQUIRED = ['name', 'city', 'state']
+
+STATE_CODES = {name: code for code, name in provider_store.STATE_ABBREVIATIONS.items()}
+STATE_CODES['Washington DC'] = 'DC'
+# First three ZIP digits per state
+ZIP_PREFIXES = {
+    'AL': [(350, 369)], 'AK': [(995, 999)], 'AZ': [(850, 865)], 'AR': [(716, 729)],
+    'CA': [(900, 961)], 'CO': [(800, 816)], 'CT': [(60, 69)], 'DE': [(197, 199)],
+    'DC': [(200, 200), (202, 205), (569, 569)], 'FL': [(320, 349)], 'GA': [(300, 319), (398, 399)],
+    'HI': [(967, 968)], 'ID': [(832, 838)], 'IL': [(600, 629)], 'IN': [(460, 479)], 'IA': [(500, 528)],
+    'KS': [(660, 679)], 'KY': [(400, 427)], 'LA': [(700, 714)], 'ME': [(39, 49)],
+    'MD': [(206, 219)], 'MA': [(10, 27), (55, 55)], 'MI': [(480, 499)], 'MN': [(550, 567)],
+    'MS': [(386, 397)], 'MO': [(630, 658)], 'MT': [(590, 599)], 'NE': [(680, 693)],
+    'NV': [(889, 898)], 'NH': [(30, 38)], 'NJ': [(70, 89)], 'NM': [(870, 884)],
+    'NY': [(5, 5), (100, 149)], 'NC': [(270, 289)], 'ND': [(580, 588)], 'OH': [(430, 459)],
+    'OK': [(730, 749)], 'OR': [(970, 979)], 'PA': [(150, 196)], 'RI': [(28, 29)],
+    'SC': [(290, 299)], 'SD': [(570, 577)], 'TN': [(370, 385)], 'TX': [(733, 733), (750, 799), (885, 885)],
+    'UT': [(840, 847)], 'VT': [(50, 54), (56, 59)], 'VA': [(201, 201), (220, 246)],
+    'WA': [(980, 994)], 'WV': [(247, 268)], 'WI': [(530, 549)], 'WY': [(820, 831)],
+}
+
+PHONE = re.compile(r'^\+?[\d\s().-]+(?:\s*(?:x|ext\.?)\s*\d+)?$', re.IGNORECASE)
+EXTENSION = re.compile(r'\s*(?:x|ext\.?)\s*\d+$', re.IGNORECASE)
+NON_DIGITS = re.compile(r'\D')
+STATE_ZIP = re.compile(r'\b([A-Z]{2})\.?\s+(\d{5})(?:-\d{4})?\b')
+URL = re.compile(r'^https?://[a-z0-9-]+(?:\.[a-z0-9-]+)+(?::\d+)?(?:[/?#]\S*)?$', re.IGNORECASE)
+PRICE = re.compile(r'\$\s*(\d[\d,]*)')
+
+
+def text(value):
+    return '' if value is None else str(value).strip()
+
+
+def check_required(batch):
+    for column in REQUIRED:
+        for i, value in enumerate(batch[column]):
+            if not text(value) or text(value).upper() == 'N/A':
+                yield i, 'required', f"{column} is missing"
+
+
+def check_phones(batch):
+    for i, (phone, country) in enumerate(zip(batch['phone'], batch['country'])):
+        phone = text(phone)
+        if not phone:
+            continue
+        if not PHONE.match(phone):
+            yield i, 'phone', f"unexpected characters in phone {phone!r}"
+            continue
+        digits = NON_DIGITS.sub('', EXTENSION.sub('', phone))
+        if country == 'United States':
+            valid = len(digits) == 10 or (len(digits) == 11 and digits[0] == '1')
+        else:
+            valid = 7 <= len(digits) <= 15
+        if not valid:
+            yield i, 'phone', f"{len(digits)} digits in phone {phone!r}"
+
+
+def check_zip_state(batch):
+    for i, (address, state, country) in enumerate(zip(batch['address'], batch['state'], batch['country'])):
+        if country != 'United States':
+            continue
+        matches = STATE_ZIP.findall(text(address))
+        if not matches:
+            continue
+        address_state, zip_code = matches[-1]
+        expected = STATE_CODES.get(state)
+        if expected is None:
+            yield i, 'zip_state', f"unknown US state {state!r}"
+        elif address_state != expected:
+            yield i, 'zip_state', f"address is in {address_state}, record state is {state}"
+        elif not any(low <= int(zip_code[:3]) <= high for low, high in ZIP_PREFIXES[expected]):
+            yield i, 'zip_state', f"ZIP {zip_code} is not a {expected} ZIP code"
+
+
+def check_urls(batch):
+    for i, website in enumerate(batch['website']):
+        website = text(website)
+        if website and not URL.match(website):
+            yield i, 'url', f"malformed website URL {website[:60]!r}"
+
+
+def check_prices(batch):
+    for i, price in enumerate(batch['price']):
+        prices = [int(value.replace(',', '')) for value in PRICE.findall(text(price))]
+        if len(prices) >= 2 and prices[0] > prices[1]:
+            yield i, 'price', f"price range low is above high in {text(price)!r}"
+
+
+CHECKS = [check_required, check_phones, check_zip_state, check_urls, check_prices]
+
+
+def record_hash(row):
+    """Hash of what the checks read from a RECORDS_QUERY row"""
+    return hashlib.sha1('\x1f'.join(row[1:7]).encode('utf-8')).hexdigest()
+
+
+def validate_batch(rows):
+    """Issues per FIELDS_QUERY row, [[check, message], ...], running each check over whole columns"""
+    batch = dict(zip(COLUMNS, zip(*rows)))
+    issues = [[] for _ in rows]
+    for check in CHECKS:
+        for i, name, message in check(batch):
+            issues[i].append([name, message])
+    return issues
+
+
+def cache_path(root, name):
+    return Path(root) / CACHE_DIR / name
+
+
+def load_cache(root, version):
+    path = cache_path(root, CACHE_FILE)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == version:
+            return cache['records']
+    return {}
+
+
+def new_report():
+    return {'providers': 0, 'validated': 0, 'cached': 0, 'with_issues': 0, 'counts': {}, 'issues': {}}
+
+
+def add_issues(report, row, issues):
+    """Count a RECORDS_QUERY row's issues in the report"""
+    if issues:
+        report['with_issues'] += 1
+    for name, message in issues:
+        report['counts'][name] = report['counts'].get(name, 0) + 1
+        listed = report['issues'].setdefault(name, [])
+        if len(listed) < MAX_REPORTED:
+            listed.append({'id': row[7], 'source': row[1], 'name': row[2], 'message': message})
+
+
+def run_validation(root='.'):
+    """Validate every provider in the store under root. Returns the report."""
+    start = time.perf_counter()
+    version = module_hash(__name__)
+    cache = load_cache(root, version)
+    results = {}
+    report = new_report()
+
+    with closing(provider_store.open_store(root)) as conn:
+        cursor = conn.execute(RECORDS_QUERY)
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            keys = {row[0]: record_hash(row) for row in rows}
+            pending = [rowid for rowid, key in keys.items() if key not in cache]
+            if pending:
+                fields = conn.execute(FIELDS_QUERY.format(', '.join('?' * len(pending))), pending).fetchall()
+                for row, issues in zip(fields, validate_batch(fields)):
+                    cache[keys[row[0]]] = issues
+            for row, key in zip(rows, keys.values()):
+                results[key] = cache[key]
+                add_issues(report, row, cache[key])
+            report['providers'] += len(rows)
+            report['validated'] += len(pending)
+
+    report['cached'] = report['providers'] - report['validated']
+    report['counts'] = dict(sorted(report['counts'].items()))
+    # Only the records still in the store are kept
+    if report['validated'] or len(results) != len(cache):
+        path = cache_path(root, CACHE_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        output_writer.write_if_changed(path, json.dumps({'version': version, 'records': results},
+                                                        separators=(',', ':')))
+    output_writer.write_if_changed(cache_path(root, REPORT_FILE), json.dumps(report, indent=2, ensure_ascii=False))
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def format_report(report):
+    """One-line summary of a validation run"""
+    counts = ', '.join(f"{name} {count}" for name, count in report['counts'].items())
+    return (f"{report['providers']} providers, {report['with_issues']} with issues"
+            f"{f' ({counts})' if counts else ''}, {report['validated']} validated, {report['cached']} cached")
+
+
+def print_issues(report, limit=5):
+    for name, listed in report['issues'].items():
+        print(f"\n  {name}: {report['counts'][name]}")
+        for issue in listed[:limit]:
+            print(f"    {issue['name'] or issue['id']} ({issue['source']}): {issue['message']}")
+        if report['counts'][name] > limit:
+            print(f"    ... {report['counts'][name] - limit} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the providers in the store")
+    parser.add_argument('--root', default='.', help="site root holding api/clinics.json")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 if any provider has issues")
+    args = parser.parse_args(argv)
+
+    report = run_validation(args.root)
+    print_issues(report)
+    print(f"\n{'='*50}")
+    print(f"Validation: {format_report(report)}")
+    print(f"Report written to {cache_path(args.root, REPORT_FILE)}")
+    print(f"Finished in {report['seconds']}s")
+    if args.strict and report['with_issues']:
+        sys.exit(1)
+    return report
+
+
+if __name__ == '__main__':
+    profiling.run(main)